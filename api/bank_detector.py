@@ -2,8 +2,254 @@
 UK Bank Detection System
 Detects which UK bank a statement belongs to based on PDF content
 """
-import re
-from typing import Optional
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+# Bank patterns with priority order (most specific first)
+BANK_PATTERNS: Dict[str, List[str]] = {
+    'barclays': [
+        'barclays bank uk plc',
+        'barclays bank',
+        'barclays.co.uk',
+        'bukb',
+        'barclays'
+    ],
+    'hsbc': [
+        'hsbc uk bank',
+        'hsbc bank plc',
+        'hsbc.co.uk',
+        'hsbc'
+    ],
+    'lloyds': [
+        'lloyds bank plc',
+        'lloyds banking group',
+        'lloyds.co.uk',
+        'lloyds bank'
+    ],
+    'natwest': [
+        'natwest bank plc',
+        'national Westminster bank',
+        'natwest.com',
+        'natwest'
+    ],
+    'santander': [
+        'santander uk plc',
+        'santander.co.uk',
+        'santander'
+    ],
+    'wise': [
+        'wise',
+        'transferwise',
+        'wise.com'
+    ],
+    'monzo': [
+        'monzo bank limited',
+        'monzo bank',
+        'monzo.com',
+        'monzo'
+    ],
+    'starling': [
+        'starling bank limited',
+        'starling bank',
+        'starlingbank.com',
+        'starling'
+    ],
+    'revolut': [
+        'revolut bank uab',
+        'revolut ltd',
+        'revolut.com',
+        'revolut'
+    ],
+    'anna': [
+        'anna is an electronic money account',
+        'payrnet ltd',
+        'anna subscription',
+        'anna money',
+        'anna.money',
+        'absolutely no nonsense admin',
+        'anna'
+    ],
+    'tide': [
+        'tide platform',
+        'tide.co',
+        'tide'
+    ],
+    'caf': [
+        'charities aid foundation',
+        'caf bank limited',
+        'caf bank',
+        'cafbank.org',
+        'caf charity account',
+        'charity account',
+        'caf'
+    ]
+}
+
+
+# Once the leader is this far ahead after a page, later pages are not read
+DECISIVE_LEAD = 2.0
+
+
+class _PatternAutomaton:
+    """
+    Aho-Corasick automaton over all bank patterns.
+    
+    Finds every pattern occurring in a text in a single pass, instead of one
+    regex search per pattern.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        
+        # Trie of all patterns
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node] += (index,)
+        
+        # Failure links, breadth first
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, ...]]:
+        """Yield the pattern indexes ending at each position with a match"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                yield output[node]
+
+
+# Built once at import: (bank, pattern) pairs in BANK_PATTERNS order
+_PATTERN_INDEX: List[Tuple[str, str]] = [
+    (bank, pattern.lower())
+    for bank, patterns in BANK_PATTERNS.items()
+    for pattern in patterns
+]
+_AUTOMATON = _PatternAutomaton([pattern for _, pattern in _PATTERN_INDEX])
+
+# Highest score each bank could reach if every one of its patterns matched
+_MAX_SCORES: Dict[str, float] = {
+    bank: sum(len(pattern) / 10 for pattern in patterns)
+    for bank, patterns in BANK_PATTERNS.items()
+}
+
+
+class BankDetector:
+    """
+    Incremental bank detector.
+    
+    Feed it text page by page; every bank is scored in a single pass over
+    each page. Scoring matches detect_uk_bank: each pattern found anywhere
+    adds len(pattern) / 10 to its bank.
+    
+    Usage:
+        detector = BankDetector()
+        for page_text in page_texts:
+            detector.feed(page_text)
+            if detector.is_decided():
+                break
+        bank_id = detector.best()
+    """
+    
+    def __init__(self):
+        self._found = [False] * len(_PATTERN_INDEX)
+        self._scores: Dict[str, float] = {}
+        self.finished = False  # True once no further text can change the result
+    
+    def feed(self, text: str):
+        """
+        Scan more text (stops early once the leader can't be overtaken)
+        
+        Args:
+            text: Text of the next page(s)
+        """
+        if self.finished or not text:
+            return
+        
+        for indexes in _AUTOMATON.iter_matches(text.lower()):
+            new_match = False
+            for index in indexes:
+                if not self._found[index]:
+                    self._found[index] = True
+                    new_match = True
+            if new_match:
+                self._update_scores()
+                if self._is_unbeatable():
+                    self.finished = True
+                    return
+    
+    def scores(self) -> Dict[str, float]:
+        """Scores of banks with at least one match"""
+        return dict(self._scores)
+    
+    def best(self) -> str:
+        """
+        Bank with the highest score so far
+        
+        Returns:
+            Bank identifier, or 'unknown' if nothing matched
+        """
+        if self._scores:
+            return max(self._scores, key=self._scores.get)
+        return 'unknown'
+    
+    def is_decided(self, decisive_lead: float = DECISIVE_LEAD) -> bool:
+        """
+        Whether reading more pages is unlikely to change the result.
+        
+        True when the leader can't be overtaken at all, or is ahead of the
+        runner-up by at least decisive_lead.
+        """
+        if self.finished:
+            return True
+        if not self._scores:
+            return False
+        ranked = sorted(self._scores.values(), reverse=True)
+        runner_up = ranked[1] if len(ranked) > 1 else 0.0
+        return ranked[0] - runner_up >= decisive_lead
+    
+    def _update_scores(self):
+        """Recompute bank scores (summed in pattern order so ties and rounding never shift)"""
+        scores: Dict[str, float] = {}
+        for index, (bank, pattern) in enumerate(_PATTERN_INDEX):
+            if self._found[index]:
+                # More specific patterns get higher scores
+                scores[bank] = scores.get(bank, 0) + len(pattern) / 10
+        self._scores = scores
+    
+    def _is_unbeatable(self) -> bool:
+        """True if no other bank could catch the leader whatever text follows"""
+        leader = self.best()
+        lead_score = self._scores[leader]
+        return all(
+            lead_score > max_score + 1e-9
+            for bank, max_score in _MAX_SCORES.items()
+            if bank != leader
+        )
 
 
 def detect_uk_bank(pdf_text: str) -> str:
@@ -20,106 +266,27 @@ def detect_uk_bank(pdf_text: str) -> str:
     if not pdf_text or not isinstance(pdf_text, str):
         return 'unknown'
     
-    pdf_text_lower = pdf_text.lower()
-    
-    # Define bank patterns with priority order (most specific first)
-    bank_patterns = {
-        'barclays': [
-            'barclays bank uk plc',
-            'barclays bank',
-            'barclays.co.uk',
-            'bukb',
-            'barclays'
-        ],
-        'hsbc': [
-            'hsbc uk bank',
-            'hsbc bank plc',
-            'hsbc.co.uk',
-            'hsbc'
-        ],
-        'lloyds': [
-            'lloyds bank plc',
-            'lloyds banking group',
-            'lloyds.co.uk',
-            'lloyds bank'
-        ],
-        'natwest': [
-            'natwest bank plc',
-            'national Westminster bank',
-            'natwest.com',
-            'natwest'
-        ],
-        'santander': [
-            'santander uk plc',
-            'santander.co.uk',
-            'santander'
-        ],
-        'wise': [
-            'wise',
-            'transferwise',
-            'wise.com'
-        ],
-        'monzo': [
-            'monzo bank limited',
-            'monzo bank',
-            'monzo.com',
-            'monzo'
-        ],
-        'starling': [
-            'starling bank limited',
-            'starling bank',
-            'starlingbank.com',
-            'starling'
-        ],
-        'revolut': [
-            'revolut bank uab',
-            'revolut ltd',
-            'revolut.com',
-            'revolut'
-        ],
-        'anna': [
-            'anna is an electronic money account',
-            'payrnet ltd',
-            'anna subscription',
-            'anna money',
-            'anna.money',
-            'absolutely no nonsense admin',
-            'anna'
-        ],
-        'tide': [
-            'tide platform',
-            'tide.co',
-            'tide'
-        ],
-        'caf': [
-            'charities aid foundation',
-            'caf bank limited',
-            'caf bank',
-            'cafbank.org',
-            'caf charity account',
-            'charity account',
-            'caf'
-        ]
-    }
-    
-    # Score each bank based on pattern matches
-    bank_scores = {}
-    
-    for bank, patterns in bank_patterns.items():
-        score = 0
-        for pattern in patterns:
-            # Case-insensitive search
-            if re.search(re.escape(pattern), pdf_text_lower, re.IGNORECASE):
-                # More specific patterns get higher scores
-                score += len(pattern) / 10
-        if score > 0:
-            bank_scores[bank] = score
-    
-    # Return bank with highest score
-    if bank_scores:
-        return max(bank_scores, key=bank_scores.get)
-    
-    return 'unknown'
+    detector = BankDetector()
+    detector.feed(pdf_text)
+    return detector.best()
+
+
+# Human-readable names, keyed by bank identifier
+BANK_DISPLAY_NAMES: Dict[str, str] = {
+    'barclays': 'Barclays',
+    'hsbc': 'HSBC',
+    'lloyds': 'Lloyds Bank',
+    'natwest': 'NatWest',
+    'santander': 'Santander',
+    'wise': 'Wise',
+    'monzo': 'Monzo',
+    'starling': 'Starling Bank',
+    'revolut': 'Revolut',
+    'anna': 'ANNA Money',
+    'tide': 'Tide',
+    'caf': 'CAF Bank',
+    'unknown': 'Unknown Bank'
+}
 
 
 def get_bank_display_name(bank_id: str) -> str:
@@ -132,21 +299,4 @@ def get_bank_display_name(bank_id: str) -> str:
     Returns:
         Display name (e.g., 'Barclays', 'Wise')
     """
-    bank_names = {
-        'barclays': 'Barclays',
-        'hsbc': 'HSBC',
-        'lloyds': 'Lloyds Bank',
-        'natwest': 'NatWest',
-        'santander': 'Santander',
-        'wise': 'Wise',
-        'monzo': 'Monzo',
-        'starling': 'Starling Bank',
-        'revolut': 'Revolut',
-        'anna': 'ANNA Money',
-        'tide': 'Tide',
-        'caf': 'CAF Bank',
-        'unknown': 'Unknown Bank'
-    }
-    
-    return bank_names.get(bank_id.lower(), 'Unknown Bank')
-
+    return BANK_DISPLAY_NAMES.get(bank_id.lower(), 'Unknown Bank')
@@ -0,0 +1,203 @@
+"""
+Fingerprint-based bank detection
+Identifies the bank from PDF structure (document info, embedded fonts and
+first-page images). Fingerprints are learned from successful conversions
+that text detection agreed with, and are checked against the first page's
+text on every use.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+
+# Optional JSON file the fingerprint table is persisted to (in-memory only if unset)
+BANK_FINGERPRINTS_PATH = os.getenv('BANK_FINGERPRINTS_PATH', '')
+
+# Successful conversions needed before a fingerprint is trusted
+BANK_FINGERPRINT_MIN_CONFIRMATIONS = int(os.getenv('BANK_FINGERPRINT_MIN_CONFIRMATIONS', '2'))
+
+# Marks a fingerprint seen with more than one bank (never trusted again)
+_AMBIGUOUS = '*'
+
+
+def _normalize_info(value) -> str:
+    """Normalize a document info string (version numbers masked)"""
+    if isinstance(value, bytes):
+        value = value.decode('latin-1', errors='ignore')
+    return re.sub(r'\d+', '#', str(value or '')).strip().lower()
+
+
+def _name(value) -> str:
+    """Name of a PDF name object (e.g. /Helvetica -> 'Helvetica')"""
+    from pdfminer.pdftypes import resolve1
+    value = resolve1(value)
+    return str(getattr(value, 'name', value) or '')
+
+
+def compute_fingerprint(session) -> Optional[str]:
+    """
+    Fingerprint a PDF from structure alone.
+
+    Uses the Producer/Creator document info (versions masked), the font names
+    and image/form XObject sizes of the first page. The Title is left out as
+    it usually carries the account holder's name. Nothing is laid out: only
+    the first page's resource dictionary is read.
+
+    Args:
+        session: Open PdfSession
+
+    Returns:
+        Hex fingerprint, or None if the PDF has nothing distinctive (no
+        embedded fonts and no images, e.g. plain generated documents)
+    """
+    # Deferred: the PDF is already open, so pdfminer is loaded by now
+    from pdfminer.pdftypes import resolve1
+
+    info = session.metadata or {}
+    page = session.pages[0].page_obj
+    resources = resolve1(page.resources) or {}
+
+    fonts = set()
+    embedded_fonts = False
+    for font in (resolve1(resources.get('Font')) or {}).values():
+        base_font = _name((resolve1(font) or {}).get('BaseFont'))
+        # Subset-embedded fonts are prefixed with a random tag, e.g. ABCDEF+Arial
+        if re.match(r'^[A-Z]{6}\+', base_font):
+            embedded_fonts = True
+            base_font = base_font[7:]
+        fonts.add(base_font)
+
+    xobjects = set()
+    for xobject in (resolve1(resources.get('XObject')) or {}).values():
+        attrs = getattr(resolve1(xobject), 'attrs', {})
+        subtype = _name(attrs.get('Subtype'))
+        if subtype == 'Image':
+            xobjects.add(f"Image:{resolve1(attrs.get('Width'))}x{resolve1(attrs.get('Height'))}")
+        elif subtype == 'Form':
+            bbox = resolve1(attrs.get('BBox')) or []
+            xobjects.add('Form:' + ','.join(str(round(float(resolve1(v)))) for v in bbox))
+
+    if not embedded_fonts and not xobjects:
+        return None
+
+    signature = [
+        _normalize_info(info.get('Producer')),
+        _normalize_info(info.get('Creator')),
+        sorted(fonts),
+        sorted(xobjects),
+    ]
+    return hashlib.sha1(json.dumps(signature).encode()).hexdigest()
+
+
+class FingerprintTable:
+    """
+    Learned fingerprint -> bank table.
+
+    A fingerprint identifies a bank once it has been confirmed by
+    min_confirmations successful conversions of that bank and never by
+    another one. A fingerprint that named the wrong bank is never trusted
+    again.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 min_confirmations: int = BANK_FINGERPRINT_MIN_CONFIRMATIONS):
+        """
+        Args:
+            path: JSON file to load and persist the table (optional)
+            min_confirmations: Confirmations needed before lookup() trusts a fingerprint
+        """
+        self.path = path
+        self.min_confirmations = min_confirmations
+        self._table: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._table = json.load(f)
+            except (OSError, ValueError):
+                self._table = {}
+
+    def lookup(self, fingerprint: Optional[str]) -> Optional[str]:
+        """
+        Bank identified by a fingerprint
+
+        Args:
+            fingerprint: Value from compute_fingerprint()
+
+        Returns:
+            Bank identifier, or None if the fingerprint is unknown or untrusted
+        """
+        if not fingerprint:
+            return None
+        with self._lock:
+            banks = self._table.get(fingerprint, {})
+            if len(banks) != 1 or _AMBIGUOUS in banks:
+                return None
+            bank_id, confirmations = next(iter(banks.items()))
+        return bank_id if confirmations >= self.min_confirmations else None
+
+    def confirm(self, fingerprint: Optional[str], bank_id: str):
+        """Record a successful conversion of a bank with this fingerprint"""
+        if not fingerprint:
+            return
+        with self._lock:
+            banks = self._table.setdefault(fingerprint, {})
+            banks[bank_id] = banks.get(bank_id, 0) + 1
+            if len(banks) > 1:
+                banks[_AMBIGUOUS] = 1
+            snapshot = json.dumps(self._table)
+        self._save(snapshot)
+
+    def reject(self, fingerprint: Optional[str], bank_id: str):
+        """Record that a fingerprint named the wrong bank (the fingerprint is dropped from use)"""
+        if not fingerprint:
+            return
+        with self._lock:
+            banks = self._table.setdefault(fingerprint, {})
+            banks[_AMBIGUOUS] = 1
+            snapshot = json.dumps(self._table)
+        self._save(snapshot)
+
+    def known_fingerprints(self) -> List[str]:
+        """Fingerprints that currently identify a bank"""
+        with self._lock:
+            fingerprints = list(self._table)
+        return [fp for fp in fingerprints if self.lookup(fp)]
+
+    def _save(self, snapshot: str):
+        """Persist the table atomically (if a path is configured)"""
+        if not self.path:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+
+# Process-wide table so fingerprints learned by one conversion serve the next
+_fingerprint_table: Optional[FingerprintTable] = None
+_fingerprint_table_lock = threading.Lock()
+
+
+def get_fingerprint_table() -> FingerprintTable:
+    """
+    Get the shared fingerprint table.
+
+    Persisted to BANK_FINGERPRINTS_PATH when it is set.
+
+    Returns:
+        Shared FingerprintTable instance
+    """
+    global _fingerprint_table
+    if _fingerprint_table is None:
+        with _fingerprint_table_lock:
+            if _fingerprint_table is None:
+                _fingerprint_table = FingerprintTable(BANK_FINGERPRINTS_PATH or None)
+    return _fingerprint_table
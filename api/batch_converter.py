@@ -0,0 +1,255 @@
+"""
+Batch conversion of several statements in one request.
+Files are converted concurrently on a bounded process pool, so a batch takes
+about as long as its slowest file rather than the sum of all of them. Each
+file gets its own result; one bad file never fails the batch.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+import io
+import os
+import threading
+import time
+
+from converter import get_converter
+from parsers import get_parser_logger
+from result_cache import cache_key, get_result_cache
+
+
+# Pool size (BATCH_WORKERS=1 converts in-process, one file at a time)
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '0')) or (os.cpu_count() or 1)
+
+# Most files accepted in one batch
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', '24'))
+
+# Maximum size of each PDF in a batch
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+logger = get_parser_logger('batch')
+
+
+def validate_upload(filename: Optional[str], size: int) -> Optional[str]:
+    """
+    Check one uploaded file before conversion
+
+    Args:
+        filename: Client-supplied file name
+        size: File size in bytes
+
+    Returns:
+        Error message, or None if the file can be converted
+    """
+    if not filename:
+        return 'No file name provided.'
+    if not filename.lower().endswith('.pdf'):
+        return 'Invalid file type. Only PDF files are supported.'
+    if size == 0:
+        return 'File is empty.'
+    if size > MAX_FILE_SIZE:
+        return 'File too large. Maximum size is 10MB.'
+    return None
+
+
+def _file_error(message: str, error_code: str) -> Dict:
+    """Failure result for a file that was never converted"""
+    return {
+        'success': False,
+        'bank': 'unknown',
+        'bank_display_name': 'Unknown',
+        'transactions': [],
+        'count': 0,
+        'validation_errors': [],
+        'validation_warnings': [],
+        'accuracy_score': 0.0,
+        'processing_time_ms': 0,
+        'error': message,
+        'error_code': error_code,
+        'recoverable': False,
+    }
+
+
+def _init_worker():
+    """Pool initializer: the batch is the unit of parallelism, so no nested page pools"""
+    from parsers import pdf_session
+    pdf_session.PARSER_WORKERS = 1
+
+
+def _convert_in_worker(pdf_bytes: bytes) -> Dict:
+    """Convert one file inside a pool worker (or in-process as a fallback)"""
+    try:
+        return get_converter().convert(io.BytesIO(pdf_bytes))
+    except Exception as e:
+        return _file_error(f'Conversion failed: {str(e)}', 'UNEXPECTED_ERROR')
+
+
+# Warm pool shared by batch requests (workers keep their converter and parsers).
+# Sized once at BATCH_WORKERS and never resized, since other batches may be using it.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Shared process pool with BATCH_WORKERS processes"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, initializer=_init_worker)
+        return _pool
+
+
+def _discard_pool(pool):
+    """Drop a broken pool so the next batch starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if pool is None or _pool is not pool:
+            # Already replaced by another batch
+            return
+        _pool = None
+    pool.shutdown(wait=False)
+
+
+def convert_batch_iter(files: List[Tuple[str, bytes]],
+                       workers: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Convert several PDFs concurrently, yielding each result as it finishes.
+
+    Cached results are yielded first, then conversions in completion order.
+
+    Args:
+        files: (filename, pdf bytes) for each uploaded file
+        workers: Files converted at once (defaults to BATCH_WORKERS, capped
+                 at the number of files that need converting)
+
+    Yields:
+        convert() result dictionaries with 'index' (position in files) and
+        'filename' added, plus 'cache': 'hit'|'miss' for converted files
+    """
+    cache = get_result_cache()
+    pending = []
+
+    for index, (filename, pdf_bytes) in enumerate(files):
+        error = validate_upload(filename, len(pdf_bytes))
+        if error:
+            yield {'index': index, 'filename': filename, **_file_error(error, 'INVALID_FILE')}
+            continue
+
+        lookup_start = time.time()
+        key = cache_key(pdf_bytes)
+        cached = cache.get(key)
+        if cached is not None:
+            cached['cache'] = 'hit'
+            cached['processing_time_ms'] = int((time.time() - lookup_start) * 1000)
+            yield {'index': index, 'filename': filename, **cached}
+        else:
+            pending.append((index, filename, key, pdf_bytes))
+
+    workers = min(BATCH_WORKERS if workers is None else workers, len(pending))
+
+    def finish(index, filename, key, result):
+        cache.put(key, result)
+        result['cache'] = 'miss'
+        return {'index': index, 'filename': filename, **result}
+
+    if workers > 1:
+        queued, pending = pending, []
+        futures = {}
+        pool = None
+
+        while queued or futures:
+            # At most `workers` of this batch's files in flight on the shared pool
+            while queued and len(futures) < workers:
+                item = queued.pop(0)
+                try:
+                    pool = pool or _get_pool()
+                    futures[pool.submit(_convert_in_worker, item[3])] = item
+                except Exception as e:
+                    logger.warning(f"Batch pool unavailable, converting serially: {e}")
+                    pending.append(item)
+                    pending.extend(queued)
+                    queued = []
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker died (e.g. out of memory): retry the file in-process
+                    logger.warning(f"Batch worker failed on {item[1]}: {e}")
+                    pending.append(item)
+                    continue
+                index, filename, key, _ = item
+                yield finish(index, filename, key, result)
+
+        if pending:
+            _discard_pool(pool)
+
+    for index, filename, key, pdf_bytes in pending:
+        yield finish(index, filename, key, _convert_in_worker(pdf_bytes))
+
+
+def batch_summary(results: List[Dict], start_time: float) -> Dict:
+    """
+    Totals for a finished batch
+
+    Args:
+        results: Per-file results from convert_batch_iter
+        start_time: time.time() when the batch started
+
+    Returns:
+        Dictionary with file, success and failure counts and elapsed time
+    """
+    succeeded = sum(1 for result in results if result.get('success'))
+    return {
+        'files': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'processing_time_ms': int((time.time() - start_time) * 1000),
+    }
+
+
+def convert_batch(files: List[Tuple[str, bytes]], workers: Optional[int] = None) -> Dict:
+    """
+    Convert several PDFs concurrently and collect the results.
+
+    Args:
+        files: (filename, pdf bytes) for each uploaded file
+        workers: Files converted at once (defaults to BATCH_WORKERS)
+
+    Returns:
+        Dictionary with 'success' (True if every file converted), 'results'
+        (one convert() result per file, in upload order) and 'summary'
+    """
+    start_time = time.time()
+    results = sorted(convert_batch_iter(files, workers), key=lambda result: result['index'])
+    summary = batch_summary(results, start_time)
+    return {
+        'success': summary['failed'] == 0,
+        'results': results,
+        'summary': summary,
+    }
+
+
+def convert_batch_events(files: List[Tuple[str, bytes]],
+                         workers: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Streaming batch conversion: one event per file as it finishes.
+
+    Args:
+        files: (filename, pdf bytes) for each uploaded file
+        workers: Files converted at once (defaults to BATCH_WORKERS)
+
+    Yields:
+        {'event': 'file', ...convert_batch_iter() result} per file, then
+        {'event': 'complete', ...batch_summary()}
+    """
+    start_time = time.time()
+    results = []
+    for result in convert_batch_iter(files, workers):
+        # Only outcomes are kept for the summary, not transactions
+        results.append({'success': result.get('success')})
+        yield {'event': 'file', **result}
+    yield {'event': 'complete', **batch_summary(results, start_time)}
@@ -5,13 +5,29 @@ from http.server import BaseHTTPRequestHandler
 import json
 import os
 import sys
-import tempfile
 import re
+import time
 
 # Add api directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from converter import BankStatementConverter
+from converter import get_converter
+from multipart import (
+    BufferReader,
+    MultipartError,
+    discard_body,
+    find_file_part,
+    parse_boundary,
+    read_body,
+)
+from result_cache import cache_key, get_result_cache
+
+
+# Maximum size of an uploaded PDF
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+# Allowance for multipart headers and boundaries around the file part
+MAX_MULTIPART_OVERHEAD = 64 * 1024
 
 
 class handler(BaseHTTPRequestHandler):
@@ -33,74 +49,74 @@ class handler(BaseHTTPRequestHandler):
             content_length = int(self.headers.get('Content-Length', 0))
             content_type = self.headers.get('Content-Type', '')
             
-            # Read request body
-            body = self.rfile.read(content_length)
-            
-            # Parse multipart form data
             if 'multipart/form-data' not in content_type:
                 self._send_error(400, 'Invalid content type. Expected multipart/form-data.')
                 return
             
-            # Extract file from multipart data
-            boundary = content_type.split('boundary=')[1]
-            parts = self._parse_multipart(body, boundary)
+            # Reject oversized uploads without buffering them
+            if content_length > MAX_FILE_SIZE + MAX_MULTIPART_OVERHEAD:
+                discard_body(self.rfile, content_length)
+                self._send_error(400, 'File too large. Maximum size is 10MB.')
+                return
             
-            file_data = None
-            filename = None
+            boundary = parse_boundary(content_type)
+            if not boundary:
+                self._send_error(400, 'Invalid content type. Missing multipart boundary.')
+                return
             
-            for part in parts:
-                if 'filename=' in part.get('headers', {}).get('Content-Disposition', ''):
-                    file_data = part['body']
-                    # Extract filename from Content-Disposition header
-                    disp = part.get('headers', {}).get('Content-Disposition', '')
-                    if 'filename=' in disp:
-                        filename = disp.split('filename=')[1].strip('"')
-                    break
+            # Read request body into one buffer; the file part is a view into it
+            body = read_body(self.rfile, content_length)
             
-            if not file_data or not filename:
+            try:
+                upload = find_file_part(body, boundary)
+            except MultipartError as e:
+                self._send_error(400, f'Malformed upload: {str(e)}')
+                return
+            
+            if upload is None or not upload.data or not upload.filename:
                 self._send_error(400, 'No file provided. Please upload a PDF file.')
                 return
             
+            file_data = upload.data
+            filename = upload.filename
+            
             if not filename.lower().endswith('.pdf'):
                 self._send_error(400, 'Invalid file type. Only PDF files are supported.')
                 return
             
             # Check file size (10MB max)
-            if len(file_data) > 10 * 1024 * 1024:
+            if len(file_data) > MAX_FILE_SIZE:
                 self._send_error(400, 'File too large. Maximum size is 10MB.')
                 return
             
-            # Save file temporarily
-            temp_dir = tempfile.mkdtemp()
-            # Sanitize filename
-            safe_filename = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
-            temp_path = os.path.join(temp_dir, safe_filename)
+            # Streaming mode: NDJSON events as transactions are parsed (bypasses the cache)
+            if self._wants_stream():
+                converter = get_converter()
+                self._send_ndjson(converter.convert_iter(BufferReader(file_data)))
+                return
+            
+            # Serve repeat uploads from the result cache
+            lookup_start = time.time()
+            cache = get_result_cache()
+            key = cache_key(file_data)
+            cached = cache.get(key)
+            if cached is not None:
+                cached['cache'] = 'hit'
+                cached['processing_time_ms'] = int((time.time() - lookup_start) * 1000)
+                self._send_json(cached, 200)
+                return
             
             try:
-                with open(temp_path, 'wb') as f:
-                    f.write(file_data)
-                
-                # Convert statement
-                converter = BankStatementConverter()
-                result = converter.convert(temp_path)
-                
-                # Clean up temp file
-                os.remove(temp_path)
-                os.rmdir(temp_dir)
+                # Convert statement straight from the request buffer (no temp file)
+                converter = get_converter()
+                result = converter.convert(BufferReader(file_data))
+                cache.put(key, result)
+                result['cache'] = 'miss'
                 
                 # Return result
                 self._send_json(result, 200 if result.get('success') else 400)
                 
             except Exception as e:
-                # Clean up on error
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                if os.path.exists(temp_dir):
-                    try:
-                        os.rmdir(temp_dir)
-                    except:
-                        pass
-                
                 import traceback
                 error_trace = traceback.format_exc()
                 print(f"ERROR in convert: {str(e)}")
@@ -121,43 +137,19 @@ class handler(BaseHTTPRequestHandler):
             response = {
                 'status': 'healthy',
                 'version': '2.0',
-                'service': 'Bank Statement Converter (Python)'
+                'service': 'Bank Statement Converter (Python)',
+                'cache': get_result_cache().stats()
             }
             self._send_json(response, 200)
         else:
             self._send_error(404, 'Not found')
     
-    def _parse_multipart(self, body, boundary):
-        """Parse multipart/form-data"""
-        parts = []
-        boundary_bytes = ('--' + boundary).encode()
-        sections = body.split(boundary_bytes)
-        
-        for section in sections[1:-1]:  # Skip first and last empty sections
-            if not section.strip():
-                continue
-            
-            # Split headers and body
-            header_end = section.find(b'\r\n\r\n')
-            if header_end == -1:
-                continue
-            
-            headers_raw = section[:header_end].decode('utf-8', errors='ignore')
-            body_data = section[header_end + 4:].rstrip(b'\r\n--')
-            
-            # Parse headers
-            headers = {}
-            for line in headers_raw.split('\r\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    headers[key.strip()] = value.strip()
-            
-            parts.append({
-                'headers': headers,
-                'body': body_data
-            })
-        
-        return parts
+    def _wants_stream(self):
+        """Whether the client asked for a streamed NDJSON response"""
+        return (
+            'application/x-ndjson' in self.headers.get('Accept', '') or
+            re.search(r'[?&]stream=(1|true)\b', self.path) is not None
+        )
     
     def _send_json(self, data, status_code=200):
         """Send JSON response"""
@@ -169,6 +161,19 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(response)
     
+    def _send_ndjson(self, events):
+        """Stream events as newline-delimited JSON, flushing each line"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        # No Content-Length: the response ends when the connection closes
+        self.close_connection = True
+        for event in events:
+            self.wfile.write(json.dumps(event).encode('utf-8') + b'\n')
+            self.wfile.flush()
+    
     def _send_error(self, status_code, message):
         """Send error response"""
         error_data = {
@@ -0,0 +1,95 @@
+"""
+Vercel serverless function for batch bank statement conversion
+"""
+import os
+import sys
+
+# Add api directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_converter import (
+    BATCH_MAX_FILES,
+    BATCH_WORKERS,
+    MAX_FILE_SIZE,
+    convert_batch,
+    convert_batch_events,
+)
+from convert import MAX_MULTIPART_OVERHEAD, handler as ConvertHandler
+from multipart import MultipartError, discard_body, iter_file_parts, parse_boundary, read_body
+
+
+class handler(ConvertHandler):
+    """
+    Vercel serverless function handler for batch conversion
+
+    Accepts several PDFs in one multipart request and converts them
+    concurrently. Responds with one result per file (in upload order), or
+    streams NDJSON events as each file finishes.
+    """
+    
+    def do_POST(self):
+        """Handle POST requests for batch PDF conversion"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            content_type = self.headers.get('Content-Type', '')
+            
+            if 'multipart/form-data' not in content_type:
+                self._send_error(400, 'Invalid content type. Expected multipart/form-data.')
+                return
+            
+            if content_length > BATCH_MAX_FILES * (MAX_FILE_SIZE + MAX_MULTIPART_OVERHEAD):
+                discard_body(self.rfile, content_length)
+                self._send_error(400, f'Batch too large. Maximum is {BATCH_MAX_FILES} files of 10MB.')
+                return
+            
+            boundary = parse_boundary(content_type)
+            if not boundary:
+                self._send_error(400, 'Invalid content type. Missing multipart boundary.')
+                return
+            
+            body = read_body(self.rfile, content_length)
+            
+            try:
+                # Copied out of the request buffer: each file is sent to a worker process
+                files = [(upload.filename, bytes(upload.data)) for upload in iter_file_parts(body, boundary)]
+            except MultipartError as e:
+                self._send_error(400, f'Malformed upload: {str(e)}')
+                return
+            del body
+            
+            if not files:
+                self._send_error(400, 'No files provided. Please upload one or more PDF files.')
+                return
+            
+            if len(files) > BATCH_MAX_FILES:
+                self._send_error(400, f'Too many files. Maximum is {BATCH_MAX_FILES} per batch.')
+                return
+            
+            # Streaming mode: one NDJSON event per file as it finishes
+            if self._wants_stream():
+                self._send_ndjson(convert_batch_events(files))
+                return
+            
+            # Per-file failures are reported in the results, not as an HTTP error
+            self._send_json(convert_batch(files), 200)
+            
+        except Exception as e:
+            import traceback
+            error_trace = traceback.format_exc()
+            print(f"ERROR in batch handler: {str(e)}")
+            print(f"Traceback: {error_trace}")
+            self._send_error(500, f'Server error: {str(e)}')
+    
+    def do_GET(self):
+        """Handle GET requests for health check"""
+        if self.path.endswith('/health'):
+            response = {
+                'status': 'healthy',
+                'version': '2.0',
+                'service': 'Bank Statement Converter (Python, batch)',
+                'workers': BATCH_WORKERS,
+                'max_files': BATCH_MAX_FILES,
+            }
+            self._send_json(response, 200)
+        else:
+            self._send_error(404, 'Not found')
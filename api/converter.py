@@ -2,17 +2,24 @@
 Main Bank Statement Converter Orchestrator
 Provides robust bank detection, parsing, and error handling.
 """
-from typing import Dict, List, Optional
-import pdfplumber
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 import os
 import sys
+import threading
 import time
 
 # Handle both relative imports (when used as module) and absolute imports (when run directly)
 try:
-    from .bank_detector import detect_uk_bank, get_bank_display_name
+    from .bank_detector import BankDetector, get_bank_display_name
+    from .bank_fingerprint import compute_fingerprint, get_fingerprint_table
     from .parsers import (
         get_parser,
+        ChunkCheckpoint,
+        run_chunks,
+        PdfSession,
+        TransactionTable,
+        refresh_current_year,
+        BaseBankParser,
         get_parser_logger,
         ParserException,
         BankDetectionError,
@@ -22,15 +29,22 @@ try:
         ParserResult,
         list_supported_banks,
     )
-    from .utils import calculate_accuracy_score
+    from .utils import calculate_accuracy_score, accuracy_from_counts
 except ImportError:
     # Fallback for direct execution
     api_dir = os.path.dirname(os.path.abspath(__file__))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
-    from bank_detector import detect_uk_bank, get_bank_display_name
+    from bank_detector import BankDetector, get_bank_display_name
+    from bank_fingerprint import compute_fingerprint, get_fingerprint_table
     from parsers import (
         get_parser,
+        ChunkCheckpoint,
+        run_chunks,
+        PdfSession,
+        TransactionTable,
+        refresh_current_year,
+        BaseBankParser,
         get_parser_logger,
         ParserException,
         BankDetectionError,
@@ -40,13 +54,23 @@ except ImportError:
         ParserResult,
         list_supported_banks,
     )
-    from utils import calculate_accuracy_score
+    from utils import calculate_accuracy_score, accuracy_from_counts
 
 
 # Initialize logger
 logger = get_parser_logger('converter')
 
 
+class BankSelection(NamedTuple):
+    """Outcome of bank detection"""
+    bank_id: str
+    bank_display_name: str
+    parser: BaseBankParser
+    fingerprint: Optional[str]  # PDF fingerprint (None if not distinctive)
+    method: str                 # 'fingerprint' or 'text'
+    text_agrees: bool           # Text detection found the same bank
+
+
 class BankStatementConverter:
     """Main converter orchestrator with improved error handling and logging"""
     
@@ -54,12 +78,19 @@ class BankStatementConverter:
         self.supported_banks = list_supported_banks()
         logger.info(f"Initialized converter with {len(self.supported_banks)} supported banks")
     
-    def convert(self, pdf_file) -> Dict:
+    def convert(self, pdf_file, progress: Optional[Callable[[int, int], None]] = None,
+                chunk_pages: Optional[int] = None, checkpoint: Optional[ChunkCheckpoint] = None) -> Dict:
         """
         Main conversion method with structured error handling.
         
         Args:
             pdf_file: File-like object or file path to PDF
+            progress: Called with (pages_done, pages_total) as pages are laid out
+            chunk_pages: If set, statements longer than this are parsed as
+                         page-range chunks in parallel and merged (for parsers
+                         that support it, see parsers.chunking)
+            checkpoint: Where finished chunks are saved, so an interrupted
+                        chunked conversion resumes instead of starting over
             
         Returns:
             Dictionary with keys:
@@ -73,45 +104,33 @@ class BankStatementConverter:
                 'validation_warnings': list,
                 'accuracy_score': float,
                 'processing_time_ms': int,
+                'metadata': dict (page counts by kind and skipped_page_ratio,
+                                  see PdfSession.page_stats),
                 'error': str (if failed),
                 'error_code': str (if failed)
             }
         """
         start_time = time.time()
+        # Year-less dates and year sanity checks use one current year per conversion
+        refresh_current_year()
+        
+        session = PdfSession(pdf_file, on_progress=progress)
         
         try:
-            # Step 1: Detect bank
-            logger.info("Starting bank detection...")
-            pdf_text = self._extract_text_for_detection(pdf_file)
-            
-            if not pdf_text or len(pdf_text.strip()) < 50:
-                raise PDFExtractionError("PDF contains no readable text. It may be scanned or image-based.")
-            
-            bank_id = detect_uk_bank(pdf_text)
-            bank_display_name = get_bank_display_name(bank_id)
-            
-            logger.info(f"Detected bank: {bank_display_name} ({bank_id})")
-            
-            if bank_id == 'unknown':
-                raise BankDetectionError(
-                    "Could not identify the bank from the PDF content. "
-                    "Please ensure this is a valid UK bank statement."
-                )
-            
-            # Step 2: Get appropriate parser
-            if bank_id not in self.supported_banks:
-                raise UnsupportedBankError(
-                    bank_id,
-                    f"Parser for {bank_display_name} is not yet available. "
-                    f"Supported banks: {', '.join(self.supported_banks)}"
-                )
+            # Steps 1-2: Detect bank and get appropriate parser
+            selection = self._select_parser(session)
+            bank_id, bank_display_name, parser = selection[:3]
             
-            parser = get_parser(bank_id)
-            logger.info(f"Using {parser.__class__.__name__}")
+            # Skip boilerplate pages (T&Cs, notices) and crop page furniture from here on
+            parser.prepare_pages(session)
             
             # Step 3: Extract transactions
             logger.info("Extracting transactions...")
-            transactions = parser.extract_transactions(pdf_file)
+            if chunk_pages and parser.SUPPORTS_CHUNKING and session.page_count > chunk_pages:
+                transactions = self._extract_chunked(session, selection, chunk_pages, checkpoint)
+            else:
+                # Parser reuses the open session (pages laid out during detection are memoized)
+                transactions = parser.extract_transactions(session)
             
             if not transactions:
                 raise NoTransactionsFoundError(
@@ -122,101 +141,323 @@ class BankStatementConverter:
             
             logger.info(f"Extracted {len(transactions)} transactions")
             
-            # Step 4: Normalize transactions
-            normalized_transactions = []
-            for txn in transactions:
-                normalized = parser.normalize_transaction(txn)
-                normalized_transactions.append(normalized)
+            # Step 4: Normalize transactions into columns (dicts are rebuilt for the response)
+            table = TransactionTable.from_transactions(transactions)
             
             # Step 5: Validate
-            validation_errors = parser.validate_running_balance(normalized_transactions)
-            validation_warnings = parser.validate_transaction_count(normalized_transactions)
+            validation_errors = parser.validate_running_balance(table)
+            validation_warnings = parser.validate_transaction_count(table)
             
             if validation_errors:
                 logger.warning(f"Found {len(validation_errors)} validation errors")
             
             # Step 6: Calculate accuracy
-            accuracy_score = calculate_accuracy_score(normalized_transactions, validation_errors)
+            accuracy_score = calculate_accuracy_score(table, validation_errors)
             
             processing_time = int((time.time() - start_time) * 1000)
             logger.info(f"Conversion complete in {processing_time}ms with {accuracy_score:.1f}% accuracy")
+            if selection.text_agrees:
+                get_fingerprint_table().confirm(selection.fingerprint, bank_id)
             
             # Step 7: Format response
             return {
                 'success': True,
                 'bank': bank_id,
                 'bank_display_name': bank_display_name,
-                'transactions': normalized_transactions,
-                'count': len(normalized_transactions),
+                'transactions': table.to_dicts(),
+                'count': len(table),
                 'validation_errors': validation_errors,
                 'validation_warnings': validation_warnings,
                 'accuracy_score': accuracy_score,
-                'processing_time_ms': processing_time
+                'processing_time_ms': processing_time,
+                'metadata': session.page_stats()
             }
             
         except ParserException as e:
-            processing_time = int((time.time() - start_time) * 1000)
             logger.error(f"Parser error: {e.message}")
+            return self._parser_error_response(e, start_time)
             
-            return {
-                'success': False,
-                'bank': getattr(e, 'details', {}).get('bank_name', 'unknown'),
-                'bank_display_name': get_bank_display_name(getattr(e, 'details', {}).get('bank_name', 'unknown')),
-                'transactions': [],
-                'count': 0,
-                'validation_errors': [],
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}")
+            
+            import traceback
+            traceback.print_exc()
+            
+            return self._unexpected_error_response(e, start_time)
+        
+        finally:
+            session.close()
+    
+    def _extract_chunked(self, session: PdfSession, selection: BankSelection, chunk_pages: int,
+                         checkpoint: Optional[ChunkCheckpoint]) -> List[Dict]:
+        """
+        Extract transactions as page-range chunks merged in order.
+        
+        Falls back to a normal single-pass parse when the merged chunks hold
+        no transactions (e.g. a statement that needs table extraction).
+        
+        Args:
+            session: Open PdfSession
+            selection: Detected bank and parser
+            chunk_pages: Pages per chunk
+            checkpoint: Optional store of finished chunks to resume from
+            
+        Returns:
+            Raw transactions from the parser
+        """
+        parser = selection.parser
+        context = parser.chunk_context(session)
+        
+        # Chunks are laid out in other processes, so progress is per chunk
+        progress = session.on_progress
+        session.on_progress = None
+        pages_done = [0]
+        
+        def on_chunk(chunk):
+            pages_done[0] += chunk.end_page - chunk.start_page
+            if progress is not None:
+                progress(pages_done[0], session.page_count)
+        
+        try:
+            chunks = run_chunks(session, selection.bank_id, chunk_pages, context,
+                                checkpoint=checkpoint, on_chunk=on_chunk)
+        finally:
+            session.on_progress = progress
+        
+        logger.info(f"Merging {len(chunks)} chunks of {chunk_pages} pages")
+        transactions = parser.merge_chunks(chunks, context)
+        if checkpoint is not None:
+            checkpoint.clear()
+        
+        if not transactions:
+            transactions = parser.extract_transactions(session)
+        return transactions
+    
+    def convert_iter(self, pdf_file) -> Iterator[Dict]:
+        """
+        Streaming conversion: yields events as the statement is parsed.
+        
+        Transactions are released as the parser completes them and validated
+        on the fly, so the converter never holds the full transaction list.
+        They arrive page by page only from parsers that stream (see
+        BaseBankParser._iter_transaction_batches); others hand over the
+        whole statement as one batch.
+        
+        Args:
+            pdf_file: File-like object or file path to PDF
+            
+        Yields:
+            Event dictionaries, in order:
+            {'event': 'start', 'bank': str, 'bank_display_name': str}
+            {'event': 'transaction', 'transaction': dict}  (one per transaction)
+            {'event': 'complete', ...convert() result keys except 'transactions'}
+            or, on failure at any point, a final
+            {'event': 'error', ...convert() error keys}
+        """
+        start_time = time.time()
+        refresh_current_year()
+        
+        session = PdfSession(pdf_file)
+        
+        try:
+            selection = self._select_parser(session)
+            bank_id, bank_display_name, parser = selection[:3]
+            parser.prepare_pages(session)
+            yield {'event': 'start', 'bank': bank_id, 'bank_display_name': bank_display_name}
+            
+            count = 0
+            validation_errors = []
+            for txn, error in parser.check_running_balance(parser.extract_transactions_iter(session)):
+                count += 1
+                if error:
+                    validation_errors.append(error)
+                yield {'event': 'transaction', 'transaction': txn.to_dict()}
+            
+            if not count:
+                raise NoTransactionsFoundError(
+                    bank_display_name,
+                    "No transactions could be extracted from the PDF. "
+                    "Please ensure it is a valid bank statement with transaction data."
+                )
+            
+            if validation_errors:
+                logger.warning(f"Found {len(validation_errors)} validation errors")
+            
+            accuracy_score = accuracy_from_counts(count, len(validation_errors))
+            processing_time = int((time.time() - start_time) * 1000)
+            logger.info(f"Streamed {count} transactions in {processing_time}ms with {accuracy_score:.1f}% accuracy")
+            if selection.text_agrees:
+                get_fingerprint_table().confirm(selection.fingerprint, bank_id)
+            
+            yield {
+                'event': 'complete',
+                'success': True,
+                'bank': bank_id,
+                'bank_display_name': bank_display_name,
+                'count': count,
+                'validation_errors': validation_errors,
+                # validate_transaction_count only warns when nothing was extracted
                 'validation_warnings': [],
-                'accuracy_score': 0.0,
+                'accuracy_score': accuracy_score,
                 'processing_time_ms': processing_time,
-                'error': e.user_message,
-                'error_code': e.error_code,
-                'recoverable': e.recoverable
+                'metadata': session.page_stats()
             }
             
+        except ParserException as e:
+            logger.error(f"Parser error: {e.message}")
+            response = self._parser_error_response(e, start_time)
+            response.pop('transactions')
+            yield {'event': 'error', **response}
+            
         except Exception as e:
-            processing_time = int((time.time() - start_time) * 1000)
             logger.error(f"Unexpected error: {str(e)}")
             
             import traceback
             traceback.print_exc()
             
-            return {
-                'success': False,
-                'bank': 'unknown',
-                'bank_display_name': 'Unknown',
-                'transactions': [],
-                'count': 0,
-                'validation_errors': [],
-                'validation_warnings': [],
-                'accuracy_score': 0.0,
-                'processing_time_ms': processing_time,
-                'error': f'Conversion failed: {str(e)}',
-                'error_code': 'UNEXPECTED_ERROR',
-                'recoverable': False
-            }
+            response = self._unexpected_error_response(e, start_time)
+            response.pop('transactions')
+            yield {'event': 'error', **response}
+        
+        finally:
+            session.close()
+    
+    def _select_parser(self, session: PdfSession) -> BankSelection:
+        """
+        Detect the bank and get its parser
+        
+        Known fingerprints (document info, fonts, first-page images) name
+        the bank; the first page is still scanned for bank patterns (usually
+        enough to decide), and a fingerprint that disagrees with the text is
+        rejected in favour of it.
+        
+        Args:
+            session: PdfSession shared with the parser
+            
+        Returns:
+            BankSelection (unpacks as bank_id, bank_display_name, parser, ...)
+            
+        Raises:
+            PDFExtractionError: If the PDF has no readable text
+            BankDetectionError: If the bank could not be identified
+            UnsupportedBankError: If there is no parser for the bank
+        """
+        logger.info("Starting bank detection...")
+        fingerprint = self._fingerprint(session)
+        fingerprint_bank_id = get_fingerprint_table().lookup(fingerprint)
+        text_bank_id, pdf_text = self._detect_bank(session)
+        
+        if not pdf_text or len(pdf_text.strip()) < 50:
+            raise PDFExtractionError("PDF contains no readable text. It may be scanned or image-based.")
+        
+        bank_id, method = text_bank_id, 'text'
+        if fingerprint_bank_id is not None:
+            if text_bank_id in (fingerprint_bank_id, 'unknown'):
+                bank_id, method = fingerprint_bank_id, 'fingerprint'
+            else:
+                logger.warning(f"Fingerprint {fingerprint[:12]} misidentified {text_bank_id} as {fingerprint_bank_id}")
+                get_fingerprint_table().reject(fingerprint, fingerprint_bank_id)
+        
+        bank_display_name = get_bank_display_name(bank_id)
+        
+        logger.info(f"Detected bank: {bank_display_name} ({bank_id}) by {method}")
+        
+        if bank_id == 'unknown':
+            raise BankDetectionError(
+                "Could not identify the bank from the PDF content. "
+                "Please ensure this is a valid UK bank statement."
+            )
+        
+        if bank_id not in self.supported_banks:
+            raise UnsupportedBankError(
+                bank_id,
+                f"Parser for {bank_display_name} is not yet available. "
+                f"Supported banks: {', '.join(self.supported_banks)}"
+            )
+        
+        parser = get_parser(bank_id)
+        logger.info(f"Using {parser.__class__.__name__}")
+        return BankSelection(bank_id, bank_display_name, parser, fingerprint, method,
+                             text_agrees=text_bank_id == bank_id)
+    
+    def _fingerprint(self, session: PdfSession) -> Optional[str]:
+        """Fingerprint the PDF (None if it can't be read or isn't distinctive)"""
+        try:
+            return compute_fingerprint(session)
+        except Exception as e:
+            logger.debug(f"Could not fingerprint PDF: {str(e)}")
+            return None
     
-    def _extract_text_for_detection(self, pdf_file) -> str:
+    def _parser_error_response(self, e: ParserException, start_time: float) -> Dict:
+        """Build the failure response for a ParserException"""
+        processing_time = int((time.time() - start_time) * 1000)
+        bank_name = getattr(e, 'details', {}).get('bank_name', 'unknown')
+        
+        return {
+            'success': False,
+            'bank': bank_name,
+            'bank_display_name': get_bank_display_name(bank_name),
+            'transactions': [],
+            'count': 0,
+            'validation_errors': [],
+            'validation_warnings': [],
+            'accuracy_score': 0.0,
+            'processing_time_ms': processing_time,
+            'error': e.user_message,
+            'error_code': e.error_code,
+            'recoverable': e.recoverable
+        }
+    
+    def _unexpected_error_response(self, e: Exception, start_time: float) -> Dict:
+        """Build the failure response for an unexpected exception"""
+        processing_time = int((time.time() - start_time) * 1000)
+        
+        return {
+            'success': False,
+            'bank': 'unknown',
+            'bank_display_name': 'Unknown',
+            'transactions': [],
+            'count': 0,
+            'validation_errors': [],
+            'validation_warnings': [],
+            'accuracy_score': 0.0,
+            'processing_time_ms': processing_time,
+            'error': f'Conversion failed: {str(e)}',
+            'error_code': 'UNEXPECTED_ERROR',
+            'recoverable': False
+        }
+    
+    def _detect_bank(self, session: PdfSession) -> Tuple[str, str]:
         """
-        Extract text from first page for bank detection
+        Detect the bank page by page from the first few pages
+        
+        Stops reading as soon as the detector is decided (usually after the
+        first page), so later pages are left for the parser to lay out.
         
         Args:
-            pdf_file: File-like object or file path
+            session: PdfSession shared with the parser
             
         Returns:
-            Text content from first few pages
+            Tuple of (bank_id, text of the pages read)
         """
+        detector = BankDetector()
+        pdf_text = ''
+        
         try:
-            with pdfplumber.open(pdf_file) as pdf:
-                text = ''
-                # Get text from first 3 pages (usually enough for bank detection)
-                for page in pdf.pages[:3]:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + '\n'
-                return text
+            # First 3 pages are always enough for bank detection
+            for page in session.pages[:3]:
+                page_text = page.extract_text()
+                if page_text:
+                    pdf_text += page_text + '\n'
+                    detector.feed(page_text)
+                
+                if detector.is_decided() and len(pdf_text.strip()) >= 50:
+                    break
         except Exception as e:
             logger.error(f"Error extracting text for detection: {str(e)}")
-            return ''
+            return 'unknown', ''
+        
+        return detector.best(), pdf_text
     
     def get_supported_banks(self) -> List[Dict]:
         """
@@ -235,6 +476,30 @@ class BankStatementConverter:
 
 
 # Convenience function for direct usage
+# Process-wide converter reused across requests (conversions share no state)
+_converter: Optional[BankStatementConverter] = None
+_converter_lock = threading.Lock()
+
+
+def get_converter() -> BankStatementConverter:
+    """
+    Get the shared, warm converter.
+    
+    The converter and the parsers it hands out are stateless, so a single
+    instance serves every request, including concurrent ones on threaded
+    servers.
+    
+    Returns:
+        Shared BankStatementConverter instance
+    """
+    global _converter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                _converter = BankStatementConverter()
+    return _converter
+
+
 def convert_statement(pdf_path: str) -> Dict:
     """
     Convert a bank statement PDF to structured data.
@@ -245,5 +510,4 @@ def convert_statement(pdf_path: str) -> Dict:
     Returns:
         Conversion result dictionary
     """
-    converter = BankStatementConverter()
-    return converter.convert(pdf_path)
+    return get_converter().convert(pdf_path)
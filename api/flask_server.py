@@ -2,18 +2,24 @@
 Flask development server for Python parser (local development only)
 Run this separately: python3 api/flask_server.py
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
 import sys
 import tempfile
 import re
+import time
+import io
+import json
 import traceback
 
 # Add api directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from converter import BankStatementConverter
+from converter import get_converter
+from result_cache import cache_key, get_result_cache
+from batch_converter import BATCH_MAX_FILES, convert_batch, convert_batch_events, validate_upload
+from job_queue import ensure_workers, get_job_store
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -29,15 +35,41 @@ def convert_pdf():
             return jsonify({'success': False, 'error': 'No selected file'}), 400
 
         if file and file.filename.lower().endswith('.pdf'):
+            file_data = file.read()
+
+            # Streaming mode: NDJSON events as transactions are parsed (bypasses the cache)
+            if request.args.get('stream') in ('1', 'true') or \
+                    'application/x-ndjson' in request.headers.get('Accept', ''):
+                converter = get_converter()
+                events = converter.convert_iter(io.BytesIO(file_data))
+                return Response(
+                    (json.dumps(event) + '\n' for event in events),
+                    mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache'}
+                )
+
+            # Serve repeat uploads from the result cache
+            lookup_start = time.time()
+            cache = get_result_cache()
+            key = cache_key(file_data)
+            cached = cache.get(key)
+            if cached is not None:
+                cached['cache'] = 'hit'
+                cached['processing_time_ms'] = int((time.time() - lookup_start) * 1000)
+                return jsonify(cached), 200
+
             # Save file temporarily
             temp_dir = tempfile.mkdtemp()
             safe_filename = re.sub(r'[^a-zA-Z0-9._-]', '_', file.filename)
             temp_path = os.path.join(temp_dir, safe_filename)
-            file.save(temp_path)
+            with open(temp_path, 'wb') as f:
+                f.write(file_data)
 
             try:
-                converter = BankStatementConverter()
+                converter = get_converter()
                 result = converter.convert(temp_path)
+                cache.put(key, result)
+                result['cache'] = 'miss'
                 return jsonify(result), 200
             except Exception as e:
                 traceback.print_exc()
@@ -57,12 +89,73 @@ def convert_pdf():
         traceback.print_exc()
         return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
 
+@app.route('/api/convert/batch', methods=['POST'])
+def convert_pdf_batch():
+    try:
+        uploads = request.files.getlist('files') + request.files.getlist('file')
+        if not uploads:
+            return jsonify({'success': False, 'error': 'No files provided'}), 400
+
+        if len(uploads) > BATCH_MAX_FILES:
+            return jsonify({'success': False, 'error': f'Too many files. Maximum is {BATCH_MAX_FILES} per batch.'}), 400
+
+        files = [(upload.filename, upload.read()) for upload in uploads]
+
+        # Streaming mode: one NDJSON event per file as it finishes
+        if request.args.get('stream') in ('1', 'true') or \
+                'application/x-ndjson' in request.headers.get('Accept', ''):
+            return Response(
+                (json.dumps(event) + '\n' for event in convert_batch_events(files)),
+                mimetype='application/x-ndjson',
+                headers={'Cache-Control': 'no-cache'}
+            )
+
+        # Per-file failures are reported in the results, not as an HTTP error
+        return jsonify(convert_batch(files)), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a PDF for background conversion; poll /api/jobs/<job_id> for the result"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'success': False, 'error': 'No file part'}), 400
+
+        file = request.files['file']
+        file_data = file.read()
+        error = validate_upload(file.filename, len(file_data))
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+
+        job_id = get_job_store().submit(file.filename, file_data)
+        ensure_workers()
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'poll_url': f'/api/jobs/{job_id}'
+        }), 202
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status and progress of a job, with the conversion result once done"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify(job), 200
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({
         'status': 'ok',
         'version': '1.0.0',
-        'service': 'Bank Statement Converter (Python - Local Dev)'
+        'service': 'Bank Statement Converter (Python - Local Dev)',
+        'cache': get_result_cache().stats()
     }), 200
 
 if __name__ == '__main__':
@@ -76,5 +169,7 @@ if __name__ == '__main__':
     
     print(f"🐍 Python Flask server starting on port {port}...")
     print(f"📡 Available at: http://localhost:{port}/api/convert")
+    print(f"📦 Batch uploads: http://localhost:{port}/api/convert/batch")
+    print(f"⏳ Background jobs: http://localhost:{port}/api/jobs")
     app.run(debug=True, port=port)
 
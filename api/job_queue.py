@@ -0,0 +1,548 @@
+"""
+Asynchronous conversion jobs.
+Submitting a statement returns a job id straight away. Worker processes
+pull queued jobs, convert them outside any HTTP request, and record
+progress and results in a job store that clients poll.
+
+Run standalone workers (self-hosted):
+    python api/job_queue.py --workers 4
+"""
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+import io
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from converter import get_converter
+from parsers import CHUNK_PAGES, ChunkCheckpoint, get_parser_logger
+from result_cache import cache_key, get_result_cache
+
+
+# Environment configuration
+JOB_STORE_BACKEND = os.getenv('JOB_STORE_BACKEND', 'sqlite')
+JOB_STORE_DIR = os.getenv('JOB_STORE_DIR', '') or os.path.join(tempfile.gettempdir(), 'bank-converter-jobs')
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+# Finished page-range chunks of running jobs, so a requeued job resumes
+JOB_CHUNK_DIR = os.getenv('JOB_CHUNK_DIR', '') or os.path.join(JOB_STORE_DIR, 'chunks')
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '0.5'))
+# Running jobs whose worker has not reported for this long are requeued
+JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', '600'))
+# Finished jobs and their results are deleted after this long
+JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', str(24 * 3600)))
+
+# Attempts before a job that keeps losing its worker is failed
+JOB_MAX_ATTEMPTS = 3
+
+# Seconds between progress writes while a job runs
+PROGRESS_INTERVAL = 1.0
+
+# Seconds between purges of expired jobs by an idle worker
+PURGE_INTERVAL = 3600
+
+# Seconds the web server's workers get to finish their job at exit (the
+# job of a worker terminated after that is requeued once stale)
+WORKER_STOP_TIMEOUT = 30
+
+# Job states
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+logger = get_parser_logger('jobs')
+
+
+class JobStore(ABC):
+    """
+    Storage backend for conversion jobs.
+
+    Holds the queue (submitted PDFs waiting for a worker), each job's status
+    and progress, and finished results. Implementations must make claim()
+    atomic across processes, so one job is never run by two workers, and
+    only let the worker holding a job report on it: a job requeued from a
+    worker that went silent belongs to its new worker, and the old one's
+    late progress, result or failure is dropped.
+
+    Job status dictionaries look like:
+        {
+            'job_id': str,
+            'status': 'queued' | 'running' | 'done' | 'failed',
+            'filename': str,
+            'progress': {'pages_done': int, 'pages_total': int},
+            'attempts': int,
+            'submitted_at': float, 'started_at': float, 'finished_at': float,
+            'error': str (failed jobs),
+            'result': dict (done jobs: the BankStatementConverter.convert result)
+        }
+    """
+
+    @abstractmethod
+    def submit(self, filename: str, pdf_bytes: bytes) -> str:
+        """Queue a PDF for conversion and return its job id"""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[str]:
+        """Atomically take the oldest queued job (None if the queue is empty)"""
+
+    @abstractmethod
+    def load_pdf(self, job_id: str) -> bytes:
+        """PDF bytes of a claimed job"""
+
+    @abstractmethod
+    def report_progress(self, job_id: str, worker_id: str, pages_done: int, pages_total: int):
+        """Record progress of a job this worker holds (also serves as its heartbeat)"""
+
+    @abstractmethod
+    def finish(self, job_id: str, worker_id: str, result: Dict) -> bool:
+        """Store the conversion result of a job this worker holds; False if it no longer does"""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Mark a job this worker holds failed; False if it no longer holds it"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Status dictionary of a job (None if unknown)"""
+
+    @abstractmethod
+    def requeue_stale(self, stale_seconds: int) -> int:
+        """Requeue running jobs whose worker went silent; returns how many"""
+
+    @abstractmethod
+    def purge(self, older_than_seconds: int) -> int:
+        """Delete finished jobs older than this; returns how many"""
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Job store on the local filesystem for local and self-hosted use.
+
+    Job rows live in SQLite (WAL mode, so the web server and any number of
+    worker processes can share it). Uploaded PDFs and results are kept as
+    files beside the database rather than as blobs.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            filename TEXT,
+            status TEXT NOT NULL,
+            submitted_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            heartbeat_at REAL,
+            worker TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            pages_done INTEGER NOT NULL DEFAULT 0,
+            pages_total INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, submitted_at);
+    """
+
+    def __init__(self, root: str = JOB_STORE_DIR):
+        """
+        Args:
+            root: Directory for the database, uploaded PDFs and results
+        """
+        self.root = root
+        self.db_path = os.path.join(root, 'jobs.sqlite3')
+        self._pdf_dir = os.path.join(root, 'pdfs')
+        self._result_dir = os.path.join(root, 'results')
+        os.makedirs(self._pdf_dir, exist_ok=True)
+        os.makedirs(self._result_dir, exist_ok=True)
+        # sqlite3 connections can't be shared between threads
+        self._local = threading.local()
+
+        db = self._db()
+        db.execute('PRAGMA journal_mode=WAL')
+        db.executescript(self.SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; transactions are explicit)"""
+        # Keyed by pid too: a forked worker must not reuse its parent's connection
+        if getattr(self._local, 'pid', None) != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return self._local.db
+
+    def _pdf_path(self, job_id: str) -> str:
+        return os.path.join(self._pdf_dir, f"{job_id}.pdf")
+
+    def _result_path(self, job_id: str) -> str:
+        return os.path.join(self._result_dir, f"{job_id}.json")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def submit(self, filename: str, pdf_bytes: bytes) -> str:
+        job_id = uuid.uuid4().hex
+        # File first: a queued row always has its PDF
+        self._write_atomic(self._pdf_path(job_id), pdf_bytes)
+        self._db().execute(
+            "INSERT INTO jobs (id, filename, status, submitted_at) VALUES (?, ?, ?, ?)",
+            (job_id, filename, JOB_QUEUED, time.time()),
+        )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[str]:
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY submitted_at LIMIT 1",
+                (JOB_QUEUED,),
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                db.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, started_at = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (JOB_RUNNING, worker_id, now, now, row['id']),
+                )
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return row['id'] if row is not None else None
+
+    def load_pdf(self, job_id: str) -> bytes:
+        with open(self._pdf_path(job_id), 'rb') as f:
+            return f.read()
+
+    def report_progress(self, job_id: str, worker_id: str, pages_done: int, pages_total: int):
+        self._db().execute(
+            "UPDATE jobs SET pages_done = ?, pages_total = ?, heartbeat_at = ? "
+            "WHERE id = ? AND status = ? AND worker = ?",
+            (pages_done, pages_total, time.time(), job_id, JOB_RUNNING, worker_id),
+        )
+
+    def _settle(self, job_id: str, worker_id: str, assignments: str, params: tuple,
+                result: Optional[Dict] = None) -> bool:
+        """Move a job this worker holds out of running (False if it no longer holds it)"""
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            updated = db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status = ? AND worker = ?",
+                params + (job_id, JOB_RUNNING, worker_id),
+            ).rowcount
+            # Written inside the transaction: only the holder writes it, and a
+            # done row always has its result
+            if updated and result is not None:
+                self._write_atomic(self._result_path(job_id), json.dumps(result).encode('utf-8'))
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        if updated:
+            self._remove(self._pdf_path(job_id))
+        return bool(updated)
+
+    def finish(self, job_id: str, worker_id: str, result: Dict) -> bool:
+        return self._settle(job_id, worker_id, "status = ?, finished_at = ?, pages_done = pages_total",
+                            (JOB_DONE, time.time()), result)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        return self._settle(job_id, worker_id, "status = ?, finished_at = ?, error = ?",
+                            (JOB_FAILED, time.time(), error))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            'job_id': row['id'],
+            'status': row['status'],
+            'filename': row['filename'],
+            'progress': {'pages_done': row['pages_done'], 'pages_total': row['pages_total']},
+            'attempts': row['attempts'],
+            'submitted_at': row['submitted_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+        }
+        if row['status'] == JOB_FAILED:
+            job['error'] = row['error']
+        elif row['status'] == JOB_DONE:
+            try:
+                with open(self._result_path(job_id), 'r', encoding='utf-8') as f:
+                    job['result'] = json.load(f)
+            except (OSError, ValueError):
+                job['status'] = JOB_FAILED
+                job['error'] = 'Result is no longer available.'
+        return job
+
+    def requeue_stale(self, stale_seconds: int) -> int:
+        db = self._db()
+        cutoff = time.time() - stale_seconds
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            stale = db.execute(
+                "SELECT id, attempts FROM jobs WHERE status = ? AND heartbeat_at < ?",
+                (JOB_RUNNING, cutoff),
+            ).fetchall()
+            for row in stale:
+                if row['attempts'] >= JOB_MAX_ATTEMPTS:
+                    db.execute(
+                        "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                        (JOB_FAILED, time.time(), 'Conversion worker stopped repeatedly.', row['id']),
+                    )
+                else:
+                    db.execute(
+                        "UPDATE jobs SET status = ?, worker = NULL, pages_done = 0 WHERE id = ?",
+                        (JOB_QUEUED, row['id']),
+                    )
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        if stale:
+            logger.warning(f"Requeued {len(stale)} stale job(s)")
+        return len(stale)
+
+    def purge(self, older_than_seconds: int) -> int:
+        db = self._db()
+        cutoff = time.time() - older_than_seconds
+        rows = db.execute(
+            "SELECT id FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (JOB_DONE, JOB_FAILED, cutoff),
+        ).fetchall()
+        for row in rows:
+            self._remove(self._result_path(row['id']))
+            self._remove(self._pdf_path(row['id']))
+            db.execute("DELETE FROM jobs WHERE id = ?", (row['id'],))
+        return len(rows)
+
+
+# Available backends, selected with JOB_STORE_BACKEND
+JOB_STORE_BACKENDS = {
+    'sqlite': SQLiteJobStore,
+}
+
+# Process-wide store (each process opens its own connections)
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """
+    Get the shared job store, configured from the environment.
+
+    JOB_STORE_BACKEND picks the backend (default 'sqlite'), JOB_STORE_DIR
+    where the SQLite backend keeps its files.
+
+    Returns:
+        Shared JobStore instance
+    """
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                backend = JOB_STORE_BACKENDS.get(JOB_STORE_BACKEND)
+                if backend is None:
+                    raise ValueError(f"Unknown JOB_STORE_BACKEND: {JOB_STORE_BACKEND}")
+                _job_store = backend()
+    return _job_store
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def _progress_reporter(store: JobStore, job_id: str, worker_id: str) -> Callable[[int, int], None]:
+    """Progress callback writing to the store at most every PROGRESS_INTERVAL"""
+    last_report = [0.0]
+
+    def report(pages_done: int, pages_total: int):
+        now = time.time()
+        if pages_done == pages_total or now - last_report[0] >= PROGRESS_INTERVAL:
+            last_report[0] = now
+            store.report_progress(job_id, worker_id, pages_done, pages_total)
+
+    return report
+
+
+def process_job(store: JobStore, job_id: str, worker_id: str):
+    """
+    Convert one claimed job and record its outcome
+
+    Args:
+        store: Job store the job was claimed from
+        job_id: Claimed job id
+        worker_id: Worker that claimed it
+    """
+    try:
+        pdf_bytes = store.load_pdf(job_id)
+
+        cache = get_result_cache()
+        key = cache_key(pdf_bytes)
+        result = cache.get(key)
+        if result is not None:
+            result['cache'] = 'hit'
+        else:
+            # Long statements run as checkpointed chunks: a job requeued after
+            # its worker died only parses the chunks that were not finished
+            result = get_converter().convert(
+                io.BytesIO(pdf_bytes), progress=_progress_reporter(store, job_id, worker_id),
+                chunk_pages=CHUNK_PAGES, checkpoint=ChunkCheckpoint(JOB_CHUNK_DIR, key),
+            )
+            cache.put(key, result)
+            result['cache'] = 'miss'
+
+        if store.finish(job_id, worker_id, result):
+            logger.info(f"Job {job_id} done ({result.get('count', 0)} transactions)")
+        else:
+            logger.warning(f"Job {job_id} was requeued from {worker_id}, dropping its result")
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {str(e)}")
+        store.fail(job_id, worker_id, f'Conversion failed: {str(e)}')
+
+
+def run_worker(stop_event: Optional[threading.Event] = None,
+               poll_interval: float = JOB_POLL_INTERVAL):
+    """
+    Pull and convert queued jobs until stopped
+
+    Args:
+        stop_event: Set (threading or multiprocessing Event) to stop the
+                    worker after its current job (runs forever if None)
+        poll_interval: Seconds to wait when the queue is empty
+    """
+    store = get_job_store()
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    logger.info(f"Job worker {worker_id} started")
+    last_purge = 0.0
+
+    while stop_event is None or not stop_event.is_set():
+        store.requeue_stale(JOB_STALE_SECONDS)
+        job_id = store.claim(worker_id)
+        if job_id is not None:
+            process_job(store, job_id, worker_id)
+            continue
+
+        # Idle: clear out expired jobs now and then
+        if time.time() - last_purge > PURGE_INTERVAL:
+            store.purge(JOB_RETENTION_SECONDS)
+            last_purge = time.time()
+        if stop_event is None:
+            time.sleep(poll_interval)
+        else:
+            stop_event.wait(poll_interval)
+
+
+def start_workers(count: int = JOB_WORKERS, stop_event=None) -> List:
+    """
+    Start worker processes in the background
+
+    Workers are not daemonic, since conversions use process pools of their
+    own (page prefetch, chunks); stop them with stop_workers().
+
+    Args:
+        count: Number of worker processes
+        stop_event: multiprocessing Event the workers stop on (a new one if None)
+
+    Returns:
+        The started multiprocessing.Process objects, each with its stop_event
+    """
+    import multiprocessing
+
+    stop_event = stop_event or multiprocessing.Event()
+    workers = []
+    for _ in range(count):
+        worker = multiprocessing.Process(target=run_worker, args=(stop_event,))
+        worker.start()
+        worker.stop_event = stop_event
+        workers.append(worker)
+    return workers
+
+
+def stop_workers(workers: List, timeout: Optional[float] = None):
+    """
+    Stop workers after their current job and wait for them to exit
+
+    Args:
+        workers: Processes from start_workers()
+        timeout: Seconds to wait before terminating workers still running (None: wait)
+    """
+    for worker in workers:
+        worker.stop_event.set()
+    deadline = None if timeout is None else time.time() + timeout
+    for worker in workers:
+        worker.join(None if deadline is None else max(0.0, deadline - time.time()))
+        if worker.is_alive():
+            logger.warning(f"Job worker {worker.pid} did not stop, terminating it")
+            worker.terminate()
+            worker.join()
+
+
+# Workers started on demand by the web server
+_background_workers: List = []
+_background_workers_lock = threading.Lock()
+_stop_registered = False
+
+
+def ensure_workers(count: int = JOB_WORKERS):
+    """Start background workers for this process if none are running (stopped at exit)"""
+    global _stop_registered
+    with _background_workers_lock:
+        if not _stop_registered:
+            # Registered after multiprocessing's own exit handler (which joins
+            # child processes), so the workers are told to stop first
+            import atexit
+            import multiprocessing.util  # noqa: F401
+            atexit.register(_stop_background_workers)
+            _stop_registered = True
+        alive = [worker for worker in _background_workers if worker.is_alive()]
+        if len(alive) < count:
+            alive += start_workers(count - len(alive))
+        _background_workers[:] = alive
+
+
+def _stop_background_workers():
+    """Stop the web server's workers (at interpreter exit)"""
+    with _background_workers_lock:
+        workers = list(_background_workers)
+        _background_workers.clear()
+    stop_workers(workers, timeout=WORKER_STOP_TIMEOUT)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Run conversion job workers')
+    arg_parser.add_argument('--workers', type=int, default=JOB_WORKERS, help='Worker processes')
+    arg_parser.add_argument('--purge', action='store_true',
+                            help='Delete finished jobs older than JOB_RETENTION_SECONDS and exit')
+    args = arg_parser.parse_args()
+
+    if args.purge:
+        print(f"Purged {get_job_store().purge(JOB_RETENTION_SECONDS)} job(s)")
+    else:
+        print(f"Starting {args.workers} job worker(s) on {JOB_STORE_DIR}")
+        processes = start_workers(args.workers)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            print("Stopping workers after their current job")
+            stop_workers(processes)
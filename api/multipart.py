@@ -0,0 +1,234 @@
+"""
+In-place multipart/form-data parsing for uploads.
+The request body is received into a single buffer and the uploaded file is
+handed on as a view into it, so it is never copied or written to disk.
+"""
+import io
+import re
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+
+# Bytes requested from the socket per read
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class MultipartError(ValueError):
+    """Malformed multipart/form-data body"""
+    pass
+
+
+class UploadedFile(NamedTuple):
+    """File part of a multipart body"""
+    filename: str
+    content_type: str
+    data: memoryview
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable read-only file over a bytes-like object.
+
+    Stands in for BytesIO, which would copy a memoryview on construction.
+    Only the ranges actually read (e.g. by pdfminer) are copied out.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data: bytes, bytearray or memoryview
+        """
+        super().__init__()
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            base = 0
+        elif whence == io.SEEK_CUR:
+            base = self._position
+        elif whence == io.SEEK_END:
+            base = len(self._view)
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = self._position + size
+        data = self._view[self._position:end].tobytes()
+        self._position += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def getbuffer(self) -> memoryview:
+        """The underlying data, without copying"""
+        return self._view
+
+
+def parse_boundary(content_type: str) -> Optional[str]:
+    """
+    Boundary parameter of a multipart Content-Type header
+
+    Args:
+        content_type: Content-Type header value
+
+    Returns:
+        Boundary string, or None if the header has none
+    """
+    match = re.search(r'boundary=(?:"([^"]+)"|([^;\s]+))', content_type, re.IGNORECASE)
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def read_body(stream, content_length: int) -> bytearray:
+    """
+    Receive a request body into a single preallocated buffer.
+
+    Args:
+        stream: Binary input stream supporting readinto (e.g. handler.rfile)
+        content_length: Value of the Content-Length header
+
+    Returns:
+        Body bytes (shorter than content_length if the client stopped early)
+    """
+    buffer = bytearray(content_length)
+    view = memoryview(buffer)
+    received = 0
+    while received < content_length:
+        count = stream.readinto(view[received:received + READ_CHUNK_SIZE])
+        if not count:
+            break
+        received += count
+    view.release()
+    if received < content_length:
+        del buffer[received:]
+    return buffer
+
+
+def discard_body(stream, content_length: int):
+    """
+    Read and drop a request body (so the client still gets the response)
+
+    Args:
+        stream: Binary input stream supporting readinto
+        content_length: Value of the Content-Length header
+    """
+    scratch = bytearray(READ_CHUNK_SIZE)
+    view = memoryview(scratch)
+    remaining = content_length
+    while remaining > 0:
+        count = stream.readinto(view[:min(remaining, READ_CHUNK_SIZE)])
+        if not count:
+            break
+        remaining -= count
+
+
+def iter_parts(body, boundary: str) -> Iterator[Tuple[Dict[str, str], memoryview]]:
+    """
+    Iterate over the parts of a multipart body without copying them.
+
+    Args:
+        body: Raw body (bytes or bytearray)
+        boundary: Boundary from the Content-Type header
+
+    Yields:
+        Tuple of (headers with lowercase names, part content as a memoryview)
+
+    Raises:
+        MultipartError: If the body is not valid multipart data
+    """
+    delimiter = b'--' + boundary.encode('latin-1')
+    part_end = b'\r\n' + delimiter
+    view = memoryview(body)
+
+    position = body.find(delimiter)
+    if position == -1:
+        raise MultipartError("Multipart boundary not found in request body")
+
+    while True:
+        position += len(delimiter)
+        # Close delimiter: --boundary--
+        if body[position:position + 2] == b'--':
+            return
+
+        line_end = body.find(b'\r\n', position)
+        header_end = body.find(b'\r\n\r\n', line_end) if line_end != -1 else -1
+        if header_end == -1:
+            raise MultipartError("Truncated multipart headers")
+
+        content_start = header_end + 4
+        content_end = body.find(part_end, content_start)
+        if content_end == -1:
+            raise MultipartError("Truncated multipart part")
+
+        headers = {}
+        for line in bytes(body[line_end + 2:header_end]).decode('utf-8', errors='ignore').split('\r\n'):
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+
+        yield headers, view[content_start:content_end]
+        position = content_end + 2
+
+
+def iter_file_parts(body, boundary: str) -> Iterator[UploadedFile]:
+    """
+    Uploaded files in a multipart body, in order
+
+    Args:
+        body: Raw body (bytes or bytearray)
+        boundary: Boundary from the Content-Type header
+
+    Yields:
+        UploadedFile viewing into body for each part that carries a filename
+
+    Raises:
+        MultipartError: If the body is not valid multipart data
+    """
+    for headers, content in iter_parts(body, boundary):
+        disposition = headers.get('content-disposition', '')
+        match = re.search(r'filename="([^"]*)"|filename=([^;\s]+)', disposition)
+        if match:
+            yield UploadedFile(
+                filename=match.group(1) if match.group(1) is not None else match.group(2),
+                content_type=headers.get('content-type', ''),
+                data=content,
+            )
+
+
+def find_file_part(body, boundary: str) -> Optional[UploadedFile]:
+    """
+    First uploaded file in a multipart body
+
+    Args:
+        body: Raw body (bytes or bytearray)
+        boundary: Boundary from the Content-Type header
+
+    Returns:
+        UploadedFile viewing into body, or None if no part carries a filename
+
+    Raises:
+        MultipartError: If the body is not valid multipart data
+    """
+    return next(iter_file_parts(body, boundary), None)
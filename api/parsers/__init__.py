@@ -5,6 +5,23 @@ Provides parsers for UK bank statement PDFs.
 
 # Import core modules
 from .base_parser import BaseBankParser
+from .pdf_session import PdfSession, SessionPage, open_pdf_session
+from .page_classifier import PageClassifier, TRANSACTION, SUMMARY, BOILERPLATE
+from .page_region import TransactionRegion, find_transaction_region
+from .line_lexer import (
+    LineLexer, BlockGrouper, Line, Block,
+    DATE_START, TYPE_CODE, AMOUNT, BALANCE, BALANCE_MARKER, HEADER, FOOTER, END,
+)
+from .chunking import ChunkResult, ChunkCheckpoint, chunk_ranges, run_chunks, CHUNK_PAGES
+from .transaction import Transaction
+from .dates import parse_date, parse_date_universal, current_year, refresh_current_year
+from .money import NO_BALANCE, parse_pence, to_pence, format_pence
+from .amounts import AmountToken, AmountTokenizer
+from .cleaning import Rule, RuleSet, cached_cleaner
+from .layout import ColumnLayout, LayoutColumn, LayoutRow, read_layout_rows
+from .transaction_table import TransactionTable
+from .strategy import StrategyScheduler, get_strategy_scheduler, calculate_extraction_confidence
+from .table_tuning import TableSettingsTuner, get_table_tuner, producer_fingerprint
 from .logger import (
     get_parser_logger,
     ParsingContext,
@@ -42,36 +59,39 @@ from .config import (
     TYPE_CODE_NAMES,
 )
 
-# Import individual parsers
-from .barclays_parser import BarclaysParser
-from .monzo_parser import MonzoParser
-from .lloyds_parser import LloydsParser
-from .hsbc_parser import HSBCParser
-from .revolut_parser import RevolutParser
-from .natwest_parser import NatWestParser
-from .santander_parser import SantanderParser
-from .anna_parser import ANNAParser
-from .wise_parser import WiseParser
-from .tide_parser import TideParser
+from .registry import LazyParserRegistry
+
+# Parser registry for easy access (parser modules are imported on first lookup)
+PARSER_REGISTRY = LazyParserRegistry(__name__, {
+    'barclays': ('.barclays_parser', 'BarclaysParser'),
+    'monzo': ('.monzo_parser', 'MonzoParser'),
+    'lloyds': ('.lloyds_parser', 'LloydsParser'),
+    'hsbc': ('.hsbc_parser', 'HSBCParser'),
+    'revolut': ('.revolut_parser', 'RevolutParser'),
+    'natwest': ('.natwest_parser', 'NatWestParser'),
+    'santander': ('.santander_parser', 'SantanderParser'),
+    'anna': ('.anna_parser', 'ANNAParser'),
+    'wise': ('.wise_parser', 'WiseParser'),
+    'tide': ('.tide_parser', 'TideParser'),
+})
+
+_PARSER_CLASS_NAMES = PARSER_REGISTRY.class_names()
 
-# Parser registry for easy access
-PARSER_REGISTRY = {
-    'barclays': BarclaysParser,
-    'monzo': MonzoParser,
-    'lloyds': LloydsParser,
-    'hsbc': HSBCParser,
-    'revolut': RevolutParser,
-    'natwest': NatWestParser,
-    'santander': SantanderParser,
-    'anna': ANNAParser,
-    'wise': WiseParser,
-    'tide': TideParser,
-}
+
+def __getattr__(name: str):
+    """Resolve parser classes (e.g. parsers.BarclaysParser) through the lazy registry"""
+    bank_id = _PARSER_CLASS_NAMES.get(name)
+    if bank_id is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return PARSER_REGISTRY[bank_id]
 
 
 def get_parser(bank_id: str) -> BaseBankParser:
     """
-    Get a parser instance for a specific bank.
+    Get the parser instance for a specific bank.
+    
+    Parsers are stateless, so the instance is created once and shared
+    across conversions (and threads).
     
     Args:
         bank_id: Bank identifier (e.g., 'barclays', 'monzo')
@@ -82,10 +102,10 @@ def get_parser(bank_id: str) -> BaseBankParser:
     Raises:
         UnsupportedBankError: If bank is not supported
     """
-    parser_class = PARSER_REGISTRY.get(bank_id.lower())
-    if not parser_class:
+    bank_id = bank_id.lower()
+    if bank_id not in PARSER_REGISTRY:
         raise UnsupportedBankError(bank_id)
-    return parser_class()
+    return PARSER_REGISTRY.instance(bank_id)
 
 
 def list_supported_banks() -> list:
@@ -97,6 +117,81 @@ __all__ = [
     # Base classes
     'BaseBankParser',
     
+    # PDF session
+    'PdfSession',
+    'SessionPage',
+    'open_pdf_session',
+    
+    # Page classification
+    'PageClassifier',
+    'TRANSACTION',
+    'SUMMARY',
+    'BOILERPLATE',
+    
+    # Transaction-region cropping
+    'TransactionRegion',
+    'find_transaction_region',
+    
+    # Line lexing and block grouping
+    'LineLexer',
+    'BlockGrouper',
+    'Line',
+    'Block',
+    'DATE_START',
+    'TYPE_CODE',
+    'AMOUNT',
+    'BALANCE',
+    'BALANCE_MARKER',
+    'HEADER',
+    'FOOTER',
+    'END',
+    
+    # Chunked parsing
+    'ChunkResult',
+    'ChunkCheckpoint',
+    'chunk_ranges',
+    'run_chunks',
+    'CHUNK_PAGES',
+    
+    # Shared date engine
+    'parse_date',
+    'parse_date_universal',
+    'current_year',
+    'refresh_current_year',
+    
+    # Transaction records, integer-pence money and columnar post-processing
+    'Transaction',
+    'NO_BALANCE',
+    'parse_pence',
+    'to_pence',
+    'format_pence',
+    'TransactionTable',
+    
+    # Single-pass amount tokenizer
+    'AmountToken',
+    'AmountTokenizer',
+    
+    # Description-cleaning rule engine
+    'Rule',
+    'RuleSet',
+    'cached_cleaner',
+    
+    # Geometric word-layout engine
+    'ColumnLayout',
+    'LayoutColumn',
+    'LayoutRow',
+    'read_layout_rows',
+    
+    # Extraction strategy scheduling
+    'StrategyScheduler',
+    'get_strategy_scheduler',
+    'calculate_extraction_confidence',
+    
+    # Table-settings autotuning
+    'TableSettingsTuner',
+    'get_table_tuner',
+    'producer_fingerprint',
+    
     # Logging
     'get_parser_logger',
     'ParsingContext',
@@ -146,6 +241,7 @@ __all__ = [
     'TideParser',
 
     # Registry
+    'LazyParserRegistry',
     'PARSER_REGISTRY',
     'get_parser',
     'list_supported_banks',
@@ -0,0 +1,156 @@
+"""
+Single-pass amount tokenizer.
+Statement lines mix money with numbers that look like money to a bare
+regex: account numbers, sort codes, card references and payment references.
+An AmountTokenizer scans a line once with one compiled alternation,
+classifies each span it finds, and converts money spans straight into pence,
+keeping every span's character offsets so parsers can cut descriptions
+around them.
+
+Each parser builds one tokenizer for its line shapes (which noise to
+recognise and what money looks like on its statements) as a class attribute.
+"""
+from typing import Iterable, List, NamedTuple, Optional
+import re
+
+
+# Span kinds
+MONEY = 'money'
+ACCOUNT_NUMBER = 'account_number'
+SORT_CODE = 'sort_code'
+CARD_REF = 'card_ref'
+REFERENCE = 'reference'
+
+# Noise that must not be read as money, in the order it is recognised
+NOISE_PATTERNS = {
+    ACCOUNT_NUMBER: r'\b\d{10,}\b',          # 12345678901
+    CARD_REF: r'\bCD\s+\d+',                 # CD 1234
+    SORT_CODE: r'\b\d{2}-\d{2}-\d{2}\b',     # 20-00-00
+    REFERENCE: r'\b[A-Z]{2,}\d{8,}\b',       # FPI12345678
+}
+ALL_NOISE = tuple(NOISE_PATTERNS)
+
+# Money shapes used by the parsers
+MONEY_GROUPED = r'\d{1,5}(?:,\d{3})*\.\d{2}'     # 1,234.56 (at most 5 leading digits)
+MONEY_PLAIN = r'\d{1,5}\.\d{2}'                  # 1234.56
+MONEY_LOOSE = r'[\d,]+\.\d{2}'                   # any digits/commas, 2 decimals
+MONEY_POUNDS = r'£[\d,]+\.\d{2}'                 # £1,234.56
+MONEY_DECIMAL = r'[\d,]+\.\d{1,2}'               # 1,234.5 or 1,234.56
+MONEY_TRAILING = r'[\d,]+\.?\d{1,2}'             # 1234, 1,234.5 or 1,234.56
+
+
+def span_pence(span: str) -> int:
+    """
+    Pence for a matched money span.
+
+    Spans are already known to be digits and commas with at most two
+    decimals (and maybe a pound sign), so they skip parse_pence's sign and
+    bracket handling.
+    """
+    pounds, _, fraction = span.replace('£', '').replace(',', '').partition('.')
+    pence = int(pounds) * 100 if pounds else 0
+    if fraction:
+        pence += int(fraction) * 10 if len(fraction) == 1 else int(fraction)
+    return pence
+
+
+def _two_decimal_pence(span: str) -> int:
+    """span_pence for shapes that always end in exactly two decimals"""
+    return int(span.replace('£', '').replace(',', '').replace('.', ''))
+
+
+class AmountToken(NamedTuple):
+    """One classified span of a line"""
+    kind: str
+    start: int
+    end: int
+    text: str
+    pence: Optional[int]   # None for noise spans
+
+
+class AmountTokenizer:
+    """
+    Scan lines for money and money-like noise in one pass.
+
+    Usage:
+        AMOUNTS = AmountTokenizer(MONEY_PLAIN, noise=(ACCOUNT_NUMBER, CARD_REF))
+        pence = AMOUNTS.amounts("TESCO CD 1234 12.50 1,010.00")
+    """
+
+    __slots__ = ('pattern', 'noise', '_scanner', '_money_only', '_trailing', '_pence', '_needs_point')
+
+    def __init__(self, money: str = MONEY_GROUPED, noise: Iterable[str] = ALL_NOISE):
+        """
+        Args:
+            money: Regex for a money span (no capturing groups)
+            noise: Noise kinds (keys of NOISE_PATTERNS) to recognise and skip
+        """
+        self.pattern = money
+        self.noise = tuple(noise)
+        alternatives = [f"(?P<{kind}>{NOISE_PATTERNS[kind]})" for kind in self.noise]
+        alternatives.append(f"(?P<{MONEY}>{money})")
+        self._scanner = re.compile('|'.join(alternatives))
+        self._money_only = not self.noise
+        self._trailing = re.compile(f"({money})\\s*$")
+        self._pence = _two_decimal_pence if money.endswith(r'\.\d{2}') else span_pence
+        # Most shapes need a decimal point, so lines without one are skipped
+        # without running the regex at all (about 40% of statement lines)
+        self._needs_point = r'\.' in money and r'\.?' not in money
+
+    def tokens(self, text: str) -> List[AmountToken]:
+        """Every money and noise span, left to right"""
+        pence = self._pence
+        tokens = []
+        for match in self._scanner.finditer(text):
+            kind = match.lastgroup
+            span = match.group()
+            tokens.append(AmountToken(
+                kind, match.start(), match.end(), span,
+                pence(span) if kind == MONEY else None,
+            ))
+        return tokens
+
+    def money(self, text: str) -> List[AmountToken]:
+        """The money spans only"""
+        if self._needs_point and '.' not in text:
+            return []
+        return [token for token in self.tokens(text) if token.kind == MONEY]
+
+    def amounts(self, text: str) -> List[int]:
+        """Money values in pence, left to right"""
+        if self._needs_point and '.' not in text:
+            return []
+        pence = self._pence
+        if self._money_only:
+            return [pence(span) for span in self._scanner.findall(text)]
+        return [
+            pence(match.group()) for match in self._scanner.finditer(text)
+            if match.lastgroup == MONEY
+        ]
+
+    def has_amount(self, text: str) -> bool:
+        """Whether the text holds any money span"""
+        if self._needs_point and '.' not in text:
+            return False
+        if self._money_only:
+            return self._scanner.search(text) is not None
+        return any(match.lastgroup == MONEY for match in self._scanner.finditer(text))
+
+    def strip_money(self, text: str) -> str:
+        """The text with its money spans removed (noise is kept)"""
+        if self._needs_point and '.' not in text:
+            return text
+        if self._money_only:
+            return self._scanner.sub('', text)
+        return self._scanner.sub(lambda match: '' if match.lastgroup == MONEY else match.group(), text)
+
+    def trailing(self, text: str) -> Optional[AmountToken]:
+        """
+        The money span that ends the text (trailing whitespace allowed),
+        found the way a `(money)\\s*$` search would, or None
+        """
+        match = self._trailing.search(text)
+        if match is None:
+            return None
+        span = match.group(1)
+        return AmountToken(MONEY, match.start(1), match.end(1), span, self._pence(span))
@@ -2,48 +2,89 @@
 ANNA Bank Statement Parser
 Handles multi-line transactions with Processed/Created dates
 """
-import pdfplumber
+from functools import lru_cache
 import re
 from typing import List, Dict
-from datetime import datetime
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
+    from .transaction import Transaction
+    from .dates import parse_date
+    from .amounts import AmountTokenizer, MONEY_GROUPED
+    from .cleaning import Rule, RuleSet, cached_cleaner
     from .config import get_config, get_type_name
+    from .line_lexer import DATE_START, FOOTER, HEADER, Block, BlockGrouper, LineLexer
     from ..utils import clean_description
 except ImportError:
     api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
+    from parsers.transaction import Transaction
+    from parsers.dates import parse_date
+    from parsers.amounts import AmountTokenizer, MONEY_GROUPED
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
     from parsers.config import get_config, get_type_name
+    from parsers.line_lexer import DATE_START, FOOTER, HEADER, Block, BlockGrouper, LineLexer
     from utils import clean_description
 
 
 class ANNAParser(BaseBankParser):
     """Parser for ANNA Business Bank UK statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('anna')
-        self.config = get_config('anna')
+    # Money on ANNA lines: 1,234.56 with no noise to skip
+    AMOUNTS = AmountTokenizer(MONEY_GROUPED, noise=())
+
+    # Transaction type codes, unless the bank config lists its own
+    TYPE_CODES = ('POS', 'FEE', 'DD', 'FP', 'P2P', 'ATM', 'TFR', 'SO')
+
+    # How text lines group into transactions (see parsers.line_lexer)
+    BLOCKS = BlockGrouper(stop=(DATE_START, FOOTER, HEADER), skip=(FOOTER,))
+
+    # Description cleaning rules (see _clean_anna_description)
+    DESCRIPTION_RULES = RuleSet(
+        # Remove common ANNA patterns
+        Rule(r'ANNA Subscription,?\s*', flags=re.IGNORECASE),
+
+        # Remove invoice/reference numbers
+        (
+            Rule(r'\bINV\d+\b'),
+            Rule(r'\b[A-Z]{2,}\d{6,}\b'),
+        ),
+
+        # Clean up
+        Rule(r'\s+', ' '),
+    )
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def line_lexer(cls) -> LineLexer:
+        """
+        The lexer for ANNA lines, built on first use and shared by every instance.
+
+        A transaction line starts with its processed and created dates and a
+        type code; the codes come from the bank config when it lists them.
+        """
+        config = get_config('anna')
+        type_codes = config.metadata.get('type_codes', cls.TYPE_CODES) if config else cls.TYPE_CODES
+        date_pattern = r'(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})'
+        return LineLexer(
+            r'^' + date_pattern + r'\s+' + date_pattern + r'\s+(' + '|'.join(type_codes) + r')\b',
+            header=r'^(?=.*Processed on)(?=.*Created on)',
+            footer=r'ANNA is an Electronic Money|^(?=.*Page)(?=.*/)',
+            amounts=cls.AMOUNTS,
+        )
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """Extract transactions from ANNA statement"""
         transactions = []
 
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
 
             transactions = self._parse_anna_text(all_text)
 
@@ -57,95 +98,24 @@ class ANNAParser(BaseBankParser):
     def _parse_anna_text(self, text: str) -> List[Dict]:
         """Parse transactions from ANNA statement text using block-based approach"""
         transactions = []
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = self.line_lexer().lex_lines(line for line in text.split('\n') if line.strip())
 
         self.logger.info(f"Processing {len(lines)} lines")
 
-        # Date pattern: DD MMM YYYY
-        date_pattern = r'(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})'
-        amount_pattern = r'\d{1,5}(?:,\d{3})*\.\d{2}'
-
-        # Transaction type codes
-        type_codes = self.config.metadata.get('type_codes', ['POS', 'FEE', 'DD', 'FP', 'P2P', 'ATM', 'TFR', 'SO']) if self.config else ['POS', 'FEE', 'DD', 'FP', 'P2P', 'ATM', 'TFR', 'SO']
-
         # Find header line
         header_idx = -1
         for i, line in enumerate(lines):
-            if 'Processed on' in line and 'Created on' in line and 'Paid out' in line:
+            if HEADER in line.tokens and 'Paid out' in line.text:
                 header_idx = i
-                self.logger.debug(f"Found header at line {i}: {line}")
+                self.logger.debug(f"Found header at line {i}: {line.text}")
                 break
 
         if header_idx == -1:
             self.logger.warning("No header found")
             return transactions
 
-        # Group lines into transaction blocks
-        self.logger.debug("Grouping lines into transaction blocks...")
-        blocks = []
-        i = header_idx + 1
-
-        while i < len(lines):
-            line = lines[i]
-
-            # Skip footer lines
-            if 'ANNA is an Electronic Money' in line or 'Page' in line and '/' in line:
-                i += 1
-                continue
-
-            # Check for transaction start (two dates + type code)
-            transaction_start_pattern = (
-                r'^' + date_pattern + r'\s+' + date_pattern + r'\s+(' + '|'.join(type_codes) + r')\b'
-            )
-            match = re.match(transaction_start_pattern, line)
-
-            if match:
-                processed_date = match.group(1)
-                created_date = match.group(2)
-                tx_type = match.group(3)
-
-                block_lines = [line]
-                block_start_idx = i
-
-                j = i + 1
-                found_amounts = bool(re.findall(amount_pattern, line))
-
-                while j < len(lines):
-                    next_line = lines[j]
-
-                    if re.match(transaction_start_pattern, next_line):
-                        break
-
-                    if 'ANNA is an Electronic Money' in next_line or ('Page' in next_line and '/' in next_line):
-                        break
-
-                    if 'Processed on' in next_line and 'Created on' in next_line:
-                        break
-
-                    block_lines.append(next_line)
-
-                    if re.search(amount_pattern, next_line):
-                        found_amounts = True
-                        j += 1
-                        break
-
-                    j += 1
-
-                if found_amounts:
-                    blocks.append({
-                        'lines': block_lines,
-                        'processed_date': processed_date,
-                        'created_date': created_date,
-                        'type': tx_type,
-                        'start_idx': block_start_idx,
-                        'end_idx': j - 1
-                    })
-                    self.logger.debug(f"Block {len(blocks)}: {len(block_lines)} lines")
-
-                i = j
-            else:
-                i += 1
-
+        # Group lines into transaction blocks (two dates + type code start one)
+        blocks = self.BLOCKS.group(lines, start=header_idx + 1)
         self.logger.debug(f"Created {len(blocks)} transaction blocks")
 
         # Parse each block
@@ -164,17 +134,15 @@ class ANNAParser(BaseBankParser):
 
         return transactions
 
-    def _parse_anna_transaction_block(self, block: Dict, block_num: int) -> Dict:
+    def _parse_anna_transaction_block(self, block: Block, block_num: int) -> Transaction:
         """Parse a transaction block into a transaction dictionary"""
-        block_lines = block['lines']
-        processed_date = block['processed_date']
-        created_date = block['created_date']
-        tx_type = block['type']
+        block_lines = block.lines
+        processed_date, created_date, tx_type = block.first.date_match.groups()
 
         combined_text = ' '.join(block_lines)
 
-        amount_pattern = r'(\d{1,5}(?:,\d{3})*\.\d{2})'
-        amounts = re.findall(amount_pattern, combined_text)
+        money = self.AMOUNTS.money(combined_text)
+        amounts = [token.pence for token in money]
 
         if len(amounts) < 2:
             self.logger.debug(f"Block {block_num}: Not enough amounts ({len(amounts)}), skipping")
@@ -183,29 +151,19 @@ class ANNAParser(BaseBankParser):
         balance = None
 
         if len(amounts) == 2:
-            paid_out_str = amounts[0].replace(',', '')
-            paid_in_str = amounts[1].replace(',', '')
-        elif len(amounts) >= 3:
-            paid_out_str = amounts[-3].replace(',', '')
-            paid_in_str = amounts[-2].replace(',', '')
-            balance_str = amounts[-1].replace(',', '')
-            try:
-                balance = float(balance_str)
-            except:
-                balance = None
+            paid_out = amounts[0] / 100
+            paid_in = amounts[1] / 100
         else:
-            self.logger.debug(f"Block {block_num}: Only 1 amount found, skipping")
-            return None
-
-        paid_out = float(paid_out_str) if paid_out_str else 0.0
-        paid_in = float(paid_in_str) if paid_in_str else 0.0
+            paid_out = amounts[-3] / 100
+            paid_in = amounts[-2] / 100
+            balance = amounts[-1] / 100
 
         # Extract description
         description = combined_text
         description = re.sub(r'\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4}', '', description)
         description = re.sub(r'\b(' + tx_type + r')\b', '', description, count=1)
-        for amount in amounts:
-            description = description.replace(amount, '')
+        for token in money:
+            description = description.replace(token.text, '')
         description = description.replace('£', '')
         description = self._clean_anna_description(description)
 
@@ -223,11 +181,9 @@ class ANNAParser(BaseBankParser):
         type_name = type_names.get(tx_type, tx_type)
 
         # Parse date
-        try:
-            date_obj = datetime.strptime(created_date, '%d %b %Y')
-            parsed_date = date_obj.strftime('%Y-%m-%d')
-        except Exception as e:
-            self.logger.debug(f"Block {block_num}: Invalid date: {created_date} - {e}")
+        parsed_date = parse_date(created_date, ('%d %b %Y',))
+        if not parsed_date:
+            self.logger.debug(f"Block {block_num}: Invalid date: {created_date}")
             return None
 
         if paid_in > 0:
@@ -241,14 +197,14 @@ class ANNAParser(BaseBankParser):
 
         final_description = f"{type_name} - {description}" if description else type_name
 
-        transaction = {
-            'date': parsed_date,
-            'description': final_description,
-            'debit': debit,
-            'credit': credit,
-            'balance': balance,
-            'type': tx_category
-        }
+        transaction = Transaction(
+            date=parsed_date,
+            description=final_description,
+            debit=debit,
+            credit=credit,
+            balance=balance,
+            type=tx_category
+        )
 
         amount_display = f"£{credit:.2f}" if credit > 0 else f"-£{debit:.2f}"
         balance_display = f"£{balance:.2f}" if balance else "N/A"
@@ -256,22 +212,13 @@ class ANNAParser(BaseBankParser):
 
         return transaction
 
+    @cached_cleaner
     def _clean_anna_description(self, text: str) -> str:
         """Clean ANNA transaction description"""
         if not text:
             return ""
 
-        cleaned = text
-
-        # Remove common ANNA patterns
-        cleaned = re.sub(r'ANNA Subscription,?\s*', '', cleaned, flags=re.IGNORECASE)
-
-        # Remove invoice/reference numbers
-        cleaned = re.sub(r'\bINV\d+\b', '', cleaned)
-        cleaned = re.sub(r'\b[A-Z]{2,}\d{6,}\b', '', cleaned)
-
-        # Clean up
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = self.DESCRIPTION_RULES.apply(text)
         cleaned = cleaned.strip()
         cleaned = cleaned.strip('.,;:- ')
 
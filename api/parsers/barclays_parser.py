@@ -2,18 +2,22 @@
 Barclays Bank Statement Parser
 Uses table extraction for accurate parsing with text fallback
 """
-import pdfplumber
 import re
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
+from dataclasses import replace
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
+    from .transaction import Transaction
+    from .pdf_session import PdfSession
+    from .chunking import CARRIED_DATE, ChunkResult
+    from .dates import current_year, parse_date, to_uk_date
+    from .cleaning import Rule, RuleSet, cached_cleaner
     from .config import get_config, should_skip_line
+    from .line_lexer import DATE_START, HEADER, LineLexer
     from ..utils import parse_uk_date, parse_uk_amount, clean_description
 except ImportError:
     # Fallback for direct execution
@@ -21,17 +25,81 @@ except ImportError:
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
+    from parsers.transaction import Transaction
+    from parsers.pdf_session import PdfSession
+    from parsers.chunking import CARRIED_DATE, ChunkResult
+    from parsers.dates import current_year, parse_date, to_uk_date
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
     from parsers.config import get_config, should_skip_line
+    from parsers.line_lexer import DATE_START, HEADER, LineLexer
     from utils import parse_uk_date, parse_uk_amount, clean_description
 
 
 class BarclaysParser(BaseBankParser):
     """Parser for Barclays Bank UK statements"""
     
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('barclays')
+    TABLE_SETTINGS = {
+        "vertical_strategy": "lines",
+        "horizontal_strategy": "lines",
+        "snap_tolerance": 3,
+        "join_tolerance": 3,
+    }
+    
+    # Continuation lines read after a dated line when parsing a block
+    MAX_LOOK_AHEAD = 25
+    
+    # Text-fallback amounts sit at the end of the line; a block's amount may
+    # be whole pounds, an undated line's must have a decimal point. A single
+    # anchored search beats the shared AmountTokenizer here (see
+    # benchmarks/bench_amount_tokenizer.py), so these stay plain regexes.
+    AMOUNT_AT_END = re.compile(r'([\d,]+\.?\d{1,2})\s*$')
+    UNDATED_AMOUNT_AT_END = re.compile(r'([\d,]+\.\d{1,2})\s*$')
+    
+    # Text-fallback lines: a transaction opens with DD MMM (and maybe the year);
+    # pages repeat the column header row. Lines are lexed once however often
+    # the block and section scans revisit them.
+    LEXER = LineLexer(
+        re.compile(r'^(\d{1,2}\s+\w{3})(\s+\d{4})?', re.IGNORECASE),
+        header=r'^(?=.*Date)(?=.*Description)(?=.*Money (?:out|in))',
+    )
+    
+    # Description cleaning rules (see _clean_barclays_description)
+    DESCRIPTION_RULES = RuleSet(
+        # 1. Remove numbered prefixes like (1), (2), etc.
+        # 2. Remove "Ref: XXXXX" patterns (can include spaces, slashes, dots, alphanumerics)
+        # Handle patterns like "Ref: 010436111", "Ref: Mpl 231/248", "Ref: Mobile-Channel", "Ref: Wallet Transfer", "Ref: 0804228R475.23173"
+        (
+            Rule(r'^\(\d+\)\s*'),
+            Rule(r'\s*Ref:\s*[A-Za-z0-9\-_/\.\s]+$', flags=re.IGNORECASE),
+        ),
+        Rule(r'\s*Ref:\s*[A-Za-z0-9\-_/\.]+', flags=re.IGNORECASE),
+        
+        # 3. Remove "On DD MMM" or "On DD" or just "On" date suffixes (e.g., "On 01 Apr", "On 31 Mar", "On 01", "On")
+        Rule(r'\s+On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?$', flags=re.IGNORECASE),
+        Rule(r'\s+On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?\s*$', flags=re.IGNORECASE),
+        # Also remove "On DD" without month (partial dates from truncation)
+        Rule(r'\s+On\s+\d{1,2}\s*$', flags=re.IGNORECASE),
+        # Also remove just "On" at the end (completely truncated date)
+        Rule(r'\s+On\s*$', flags=re.IGNORECASE),
+        
+        # 4. Remove asterisks and trailing codes (e.g., *WR9P2, *6Wdamq77L2)
+        # Keep the merchant name but remove the code after asterisk
+        Rule(r'\*[A-Za-z0-9]+(?:\s|$)', ' '),
+        
+        # 5. Convert "Giro Received From" to "Received From"
+        Rule(r'^Giro\s+Received\s+From\s+', 'Received From ', flags=re.IGNORECASE),
+        
+        # 6. Format transfer descriptions with commas
+        # "Transfer to Sort Code XX-XX-XX Account XXXXXXXX" -> "Transfer to Sort Code XX-XX-XX, Account XXXXXXXX"
+        Rule(r'(Sort\s+Code\s+[\d\-]+)\s+(Account\s+\d+)', r'\1, \2', flags=re.IGNORECASE),
+        # Also handle "Transfer From Sort Code BL-UE-R Account Wards" pattern
+        Rule(r'(Sort\s+Code\s+[A-Za-z0-9\-]+)\s+(Account\s+[A-Za-z0-9]+)', r'\1, \2', flags=re.IGNORECASE),
+        
+        # Clean up extra whitespace
+        Rule(r'\s+', ' '),
+    )
+    
+    SUPPORTS_CHUNKING = True
     
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """
@@ -47,83 +115,242 @@ class BarclaysParser(BaseBankParser):
         - PDF uses text layout, not structured tables
         """
         transactions = []
-        statement_year = self._extract_year_from_header(pdf_path)
+        
+        with self.open_pdf(pdf_path) as pdf:
+            for batch in self._iter_transaction_batches(pdf):
+                transactions.extend(batch)
+        
+        self.logger.info(f"Extracted {len(transactions)} transactions")
+        return transactions
+    
+    def _iter_transaction_batches(self, pdf: PdfSession) -> Iterator[List[Dict]]:
+        """
+        Parse the statement page by page, yielding transactions as they complete.
+        
+        Text parsing is used (table extraction often fails for Barclays); the
+        tables are only laid out when text parsing finds nothing.
+        
+        Args:
+            pdf: Open PdfSession
+            
+        Yields:
+            Transactions with missing balances filled, in statement order
+        """
+        statement_year = self._extract_year_from_header(pdf)
+        
+        # Parse from text (more reliable for Barclays multi-page statements)
+        page_texts = (page.extract_text() for page in pdf.pages)
+        found_text_transactions = False
+        for batch in self._fill_missing_balances(self._iter_text_batches(page_texts, statement_year)):
+            found_text_transactions = True
+            yield batch
+        
+        if not found_text_transactions:
+            yield self._calculate_missing_balances(self._extract_from_tables(pdf, statement_year))
+    
+    def chunk_context(self, pdf: PdfSession) -> Dict:
+        """Statement year, shared by every chunk"""
+        return {'year': self._extract_year_from_header(pdf)}
+    
+    def parse_page_texts(self, page_texts: List[str], context: Dict) -> List[Dict]:
+        """Text parse of the whole statement, as extract_transactions() streams it"""
+        batches = self._fill_missing_balances(self._iter_text_batches(iter(page_texts), context['year']))
+        return [txn for batch in batches for txn in batch]
+    
+    def parse_chunk(self, page_texts: List[str], start_page: int, end_page: int, is_last: bool,
+                    context: Dict) -> ChunkResult:
+        """
+        Parse a page range of the statement text on its own.
+        
+        A chunk after the first assumes it starts inside the transaction
+        section with an unknown current date (rows before its first dated
+        line get CARRIED_DATE). Its boundary state records every line it
+        stepped to and the lines left unparsed at its end (a block that may
+        continue onto the next chunk), so merge_chunks can check where the
+        chunk's own parse agrees with a parse of the whole document.
+        
+        Args:
+            page_texts: Text of each page in the range
+            start_page: Index of the first page
+            end_page: Index of the page after the last one
+            is_last: Whether the range ends the statement
+            context: Result of chunk_context()
+            
+        Returns:
+            ChunkResult (transaction positions are line indexes in the chunk)
+        """
+        year = context['year']
+        lines = [line for page_text in page_texts if page_text for line in page_text.split('\n')]
+        if is_last:
+            # As in PdfSession.full_text(), which ends in a newline
+            lines.append('')
+        visited = []
+        parsed = []
+        
+        if start_page == 0:
+            i = self._find_transaction_start(lines, 0, is_last)
+            current_date = None
+        else:
+            i = 0
+            current_date = CARRIED_DATE
+        
+        in_transactions = i >= 0
+        if in_transactions:
+            limit = len(lines) if is_last else len(lines) - self.MAX_LOOK_AHEAD
+            parsed, i, current_date = self._parse_lines(lines, i, limit, current_date, year, visited)
+        else:
+            i = 0
+        
+        return ChunkResult(
+            start_page=start_page,
+            end_page=end_page,
+            transactions=[txn for _, txn in parsed],
+            positions=[position for position, _ in parsed],
+            state={
+                'year': year,
+                'lines': lines,
+                'visited': visited,
+                'tail_start': i,
+                'last_date': current_date,
+                'in_transactions': in_transactions,
+            },
+        )
+    
+    def merge_chunks(self, chunks: List[ChunkResult], context: Dict) -> List[Dict]:
+        """
+        Stitch chunks into the transactions a single pass would find.
+        
+        At each seam the previous chunk's unparsed lines are put in front of
+        the next chunk and parsed with the true current date, until the parse
+        steps onto a line the chunk itself stepped to with a compatible date.
+        From there the chunk's own transactions are identical, so they are
+        taken as they are (with carried dates filled in). Duplicates are then
+        dropped across the whole statement and balances filled across seams.
+        
+        Args:
+            chunks: Every chunk of the statement, in order
+            context: Result of chunk_context()
+            
+        Returns:
+            Transactions with missing balances filled (empty if none found)
+        """
+        year = context['year']
+        transactions = []
+        carried_lines: List[str] = []
+        current_date = None
+        in_transactions = False
+        
+        for index, chunk in enumerate(chunks):
+            state = chunk.state
+            if index == 0:
+                transactions.extend(chunk.transactions)
+                carried_lines = state['lines'][state['tail_start']:]
+                current_date = state['last_date']
+                in_transactions = state['in_transactions']
+                continue
+            
+            lines = carried_lines + state['lines']
+            offset = len(carried_lines)
+            is_last = index == len(chunks) - 1
+            limit = len(lines) if is_last else len(lines) - self.MAX_LOOK_AHEAD
+            
+            i = 0
+            if not in_transactions:
+                i = self._find_transaction_start(lines, 0, is_last)
+                if i < 0:
+                    carried_lines = lines
+                    continue
+                in_transactions = True
+            
+            # Parse across the seam until this parse and the chunk's own line up
+            visited = {position: date for position, date in state['visited']}
+            while i < limit:
+                chunk_date = visited.get(i - offset, '') if i >= offset else ''
+                if chunk_date == CARRIED_DATE or (chunk_date != '' and chunk_date == current_date):
+                    break
+                parsed, i, current_date = self._parse_lines(lines, i, i + 1, current_date, year)
+                transactions.extend(txn for _, txn in parsed)
+            
+            if i >= limit:
+                # Never lined up: the seam parse covered the whole chunk
+                carried_lines = lines[i:]
+                continue
+            
+            aligned = i - offset
+            for position, txn in zip(chunk.positions, chunk.transactions):
+                if position < aligned:
+                    continue
+                if txn['date'] == CARRIED_DATE:
+                    # A single pass skips dateless rows until a date is known
+                    if current_date is None:
+                        continue
+                    txn = replace(txn, date=current_date)
+                transactions.append(txn)
+            
+            if state['last_date'] != CARRIED_DATE:
+                current_date = state['last_date']
+            carried_lines = state['lines'][state['tail_start']:]
+        
+        transactions = self._deduplicate_transactions(transactions, set())
+        return self._calculate_missing_balances(transactions)
+    
+    def _extract_from_tables(self, pdf: PdfSession, year: str) -> List[Dict]:
+        """Extract transactions from ruled tables on every page"""
+        transactions = []
         last_known_balance = None
         
-        with pdfplumber.open(pdf_path) as pdf:
-            # First try table extraction
-            for page_num, page in enumerate(pdf.pages):
-                tables = page.extract_tables({
-                    "vertical_strategy": "lines",
-                    "horizontal_strategy": "lines",
-                    "snap_tolerance": 3,
-                    "join_tolerance": 3,
-                })
+        for page_num, page in enumerate(pdf.pages):
+            tables = page.extract_tables(self.TABLE_SETTINGS)
+            
+            for table in tables:
+                if not table or len(table) < 2:
+                    continue
                 
-                for table in tables:
-                    if not table or len(table) < 2:
-                        continue
-                    
-                    # Skip header rows and find transaction rows
-                    for row in table:
-                        if self._is_transaction_row(row):
-                            txn = self._parse_barclays_row(row, statement_year, last_known_balance)
-                            if txn:
-                                transactions.append(txn)
-                                # Update last known balance if present
-                                if txn.get('balance') is not None:
-                                    last_known_balance = txn['balance']
-            
-            # Always use text-based parsing (table extraction often fails for Barclays)
-            # Extract text from ALL pages
-            full_text = ''
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    full_text += page_text + '\n'
-            
-            # Parse from text (more reliable for Barclays multi-page statements)
-            text_transactions = self._parse_from_text(full_text, statement_year)
-            if text_transactions:
-                transactions = text_transactions  # Use text-based parsing results
-        
-        # Fill in missing balances by calculation
-        transactions = self._calculate_missing_balances(transactions)
+                # Skip header rows and find transaction rows
+                for row in table:
+                    if self._is_transaction_row(row):
+                        txn = self._parse_barclays_row(row, year, last_known_balance)
+                        if txn:
+                            transactions.append(txn)
+                            # Update last known balance if present
+                            if txn.get('balance') is not None:
+                                last_known_balance = txn['balance']
         
-        self.logger.info(f"Extracted {len(transactions)} transactions")
         return transactions
     
-    def _extract_year_from_header(self, pdf_path: str) -> str:
+    def _extract_year_from_header(self, pdf) -> str:
         """
         Extract year from statement header
         Example: "01 - 28 Apr 2023" -> 2023 or "28 Apr 2023" -> 2023
+        
+        Args:
+            pdf: Open PdfSession (first page text is shared with detection)
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                first_page_text = pdf.pages[0].extract_text()
-                
-                # Look for "DD - DD MMM YYYY" pattern (statement period)
-                year_pattern = r'\d{1,2}\s+-\s+\d{1,2}\s+\w{3}\s+(\d{4})'
-                match = re.search(year_pattern, first_page_text)
-                if match:
-                    return match.group(1)
-                
-                # Look for "DD MMM YYYY" pattern (simple date)
-                simple_date_pattern = r'\d{1,2}\s+[A-Za-z]{3}\s+(\d{4})'
-                match = re.search(simple_date_pattern, first_page_text)
-                if match:
-                    return match.group(1)
-                
-                # Fallback: look for "Statement date DD MMM YYYY"
-                statement_date_pattern = r'Statement date\s+\d{1,2}\s+\w{3}\s+(\d{4})'
-                match = re.search(statement_date_pattern, first_page_text, re.IGNORECASE)
-                if match:
-                    return match.group(1)
+            first_page_text = pdf.pages[0].extract_text()
+            
+            # Look for "DD - DD MMM YYYY" pattern (statement period)
+            year_pattern = r'\d{1,2}\s+-\s+\d{1,2}\s+\w{3}\s+(\d{4})'
+            match = re.search(year_pattern, first_page_text)
+            if match:
+                return match.group(1)
+            
+            # Look for "DD MMM YYYY" pattern (simple date)
+            simple_date_pattern = r'\d{1,2}\s+[A-Za-z]{3}\s+(\d{4})'
+            match = re.search(simple_date_pattern, first_page_text)
+            if match:
+                return match.group(1)
+            
+            # Fallback: look for "Statement date DD MMM YYYY"
+            statement_date_pattern = r'Statement date\s+\d{1,2}\s+\w{3}\s+(\d{4})'
+            match = re.search(statement_date_pattern, first_page_text, re.IGNORECASE)
+            if match:
+                return match.group(1)
         except Exception as e:
             self.logger.warning(f"Error extracting year from header: {e}")
         
         # Default to current year
-        return str(datetime.now().year)
+        return str(current_year())
     
     def _is_transaction_row(self, row: List[Optional[str]]) -> bool:
         """
@@ -149,7 +376,7 @@ class BarclaysParser(BaseBankParser):
         
         return True
     
-    def _parse_barclays_row(self, row: List[Optional[str]], year: str, last_balance: Optional[float]) -> Optional[Dict]:
+    def _parse_barclays_row(self, row: List[Optional[str]], year: str, last_balance: Optional[float]) -> Optional[Transaction]:
         """
         Parse a single Barclays transaction row from table
         
@@ -183,15 +410,15 @@ class BarclaysParser(BaseBankParser):
             # Determine income/expense for type field
             type_field = 'income' if credit > 0 else 'expense'
             
-            return {
-                'date': parsed_date,
-                'description': clean_desc or 'Barclays Transaction',
-                'debit': debit,
-                'credit': credit,
-                'balance': parsed_balance,
-                'type': type_field,
-                'transaction_category': transaction_type
-            }
+            return Transaction(
+                date=parsed_date,
+                description=clean_desc or 'Barclays Transaction',
+                debit=debit,
+                credit=credit,
+                balance=parsed_balance,
+                type=type_field,
+                category=transaction_type
+            )
             
         except Exception as e:
             self.logger.debug(f"Error parsing row: {e}")
@@ -202,33 +429,124 @@ class BarclaysParser(BaseBankParser):
         Parse transactions from text when table extraction fails
         Uses column-aware text parsing based on spacing/alignment
         """
-        transactions = []
-        lines = text.split('\n')
+        return [txn for batch in self._iter_text_batches([text], year) for txn in batch]
+    
+    def _iter_text_batches(self, page_texts: Iterable[str], year: str) -> Iterator[List[Dict]]:
+        """
+        Incremental form of _parse_from_text, fed one page of text at a time.
+        
+        Pages are split into the lines PdfSession.full_text() would give
+        (including the empty line after its final newline), and a line is
+        only parsed once MAX_LOOK_AHEAD lines after it are known (or the text
+        has ended), so the result is identical to parsing the whole text at
+        once while transactions are released page by page.
         
-        # Find first transaction section (start processing from here)
+        Args:
+            page_texts: Text of each page, in order
+            year: Statement year
+            
+        Yields:
+            Batches of deduplicated transactions
+        """
+        lines: List[str] = []
         tx_start = -1
-        for i, line in enumerate(lines):
-            if 'Date' in line and 'Description' in line and ('Money out' in line or 'Money in' in line):
-                tx_start = i + 1
-                break
+        header_scanned = 0
+        i = 0
+        current_date = None
+        seen = set()
+        pages = iter(page_texts)
+        text_complete = False
+        
+        while not text_complete:
+            page_text = next(pages, None)
+            if page_text is None:
+                text_complete = True
+                lines.append('')
+            elif page_text:
+                lines.extend(page_text.split('\n'))
+            
+            if tx_start < 0:
+                tx_start = self._find_transaction_start(lines, header_scanned, text_complete)
+                header_scanned = len(lines)
+                
+                if tx_start < 0:
+                    if text_complete:
+                        return
+                    continue
+                i = tx_start
+            
+            # Lines near the end may still gain continuation lines from the next page
+            limit = len(lines) if text_complete else len(lines) - self.MAX_LOOK_AHEAD
+            parsed, i, current_date = self._parse_lines(lines, i, limit, current_date, year)
+            
+            unique_transactions = self._deduplicate_transactions([txn for _, txn in parsed], seen)
+            if unique_transactions:
+                yield unique_transactions
+            
+            # Drop lines that have been fully parsed
+            del lines[:i]
+            i = 0
+    
+    def _find_transaction_start(self, lines: List[str], scan_from: int, text_complete: bool) -> int:
+        """
+        Index of the first line of the transaction section
+        
+        Args:
+            lines: Text lines read so far
+            scan_from: Lines before this were already searched for the header
+            text_complete: Whether lines holds the whole text (enables the
+                           first-dated-line fallback)
+            
+        Returns:
+            Line index, or -1 if not found (yet)
+        """
+        for k in range(scan_from, len(lines)):
+            if HEADER in self.LEXER.lex(lines[k]).tokens:
+                return k + 1
         
         # If no header found, find first transaction date
-        if tx_start < 0:
-            for i, line in enumerate(lines):
-                if re.match(r'^\d{1,2}\s+\w{3}', line.strip(), re.IGNORECASE) and \
+        if text_complete:
+            for k, line in enumerate(lines):
+                if DATE_START in self.LEXER.lex(line).tokens and \
                    ('start balance' not in line.lower() and 'end balance' not in line.lower()):
-                    tx_start = i
-                    break
-        
-        if tx_start < 0:
-            return []
-        
-        # Process ALL lines from tx_start to end
-        i = tx_start
-        current_date = None
+                    return k
+        return -1
+    
+    def _deduplicate_transactions(self, transactions: List[Dict], seen: set) -> List[Dict]:
+        """Drop transactions already seen (same date, amount and description start)"""
+        unique_transactions = []
+        for txn in transactions:
+            key = (txn['date'], round(txn.get('debit', 0) + txn.get('credit', 0), 2), txn['description'][:30])
+            if key not in seen:
+                seen.add(key)
+                unique_transactions.append(txn)
+        return unique_transactions
+    
+    def _parse_lines(self, lines: List[str], i: int, limit: int, current_date: Optional[str], year: str,
+                     visited: Optional[List[int]] = None) -> Tuple[List[Tuple[int, Dict]], int, Optional[str]]:
+        """
+        Parse transaction lines from index i until reaching limit
+        
+        Args:
+            lines: Text lines
+            i: Index to start at
+            limit: Stop at the first line index at or past this (a block
+                   started before it may read further)
+            current_date: Date carried to rows without their own date
+            year: Statement year
+            visited: If given, (line index, current date) is appended for
+                     every line the parser steps to
+            
+        Returns:
+            Tuple of ([(line index, transaction)], next index, current date)
+        """
+        parsed = []
         
-        while i < len(lines):
-            line = lines[i].strip()
+        while i < limit:
+            if visited is not None:
+                visited.append((i, current_date))
+            lexed = self.LEXER.lex(lines[i])
+            line = lexed.text
             
             # Skip empty lines and headers
             if not line:
@@ -236,13 +554,13 @@ class BarclaysParser(BaseBankParser):
                 continue
             
             # Skip header lines but continue processing
-            if 'Date' in line and 'Description' in line and ('Money out' in line or 'Money in' in line):
+            if HEADER in lexed.tokens:
                 i += 1
                 continue
             
             # Look for date at start (DD MMM format)
-            date_match = re.match(r'^(\d{1,2}\s+\w{3})(\s+\d{4})?', line, re.IGNORECASE)
-                
+            date_match = lexed.date_match
+            
             if date_match:
                 date_str = date_match.group(1)
 
@@ -257,28 +575,28 @@ class BarclaysParser(BaseBankParser):
                 if is_balance_line:
                     i += 1
                     continue
-                
+            
                 parsed_date = self._parse_barclays_date(date_str, year)
                 if parsed_date:
                     current_date = parsed_date
-                    
+                
                     # Parse transaction with improved logic
                     txn_result = self._parse_transaction_block(lines, i, current_date, year)
-                    
+                
                     if txn_result:
                         txn, next_index = txn_result
                         if txn:
-                            transactions.append(txn)
+                            parsed.append((i, txn))
                         i = next_index
                         continue
             
             # Check for transactions WITHOUT dates on their own line
             if current_date and not date_match:
-                amount_match = re.search(r'([\d,]+\.\d{1,2})\s*$', line)
+                amount_match = self.UNDATED_AMOUNT_AT_END.search(line)
                 if amount_match:
                     amount = parse_uk_amount(amount_match.group(1))
                     desc_text = line[:amount_match.start()].strip()
-                    
+                
                     # Skip if not a transaction
                     if (desc_text.lower().startswith('ref:') or 
                         desc_text.lower().startswith('on ') or
@@ -287,14 +605,14 @@ class BarclaysParser(BaseBankParser):
                         len(desc_text) < 3):
                         i += 1
                         continue
-                    
+                
                     is_transaction_line = (
                         amount >= 0.01 and amount < 100000 and
                         len(desc_text) >= 3 and
                         (re.match(r'^(card payment|direct debit|dd|transfer|bill payment|standing order)', desc_text, re.IGNORECASE) or
                          re.match(r'^[A-Z][a-zA-Z0-9\s&\-\.]+', desc_text))
                     )
-                    
+                
                     if is_transaction_line:
                         classification = self._classify_money_flow(desc_text)
                         if classification['is_income']:
@@ -303,51 +621,40 @@ class BarclaysParser(BaseBankParser):
                         else:
                             debit = amount
                             credit = 0.0
-                        
+                    
                         # Apply Barclays-specific cleaning
                         clean_desc = self._clean_barclays_description(desc_text)
-                        
-                        transactions.append({
-                            'date': current_date,
-                            'description': clean_desc,
-                            'debit': debit,
-                            'credit': credit,
-                            'balance': None,
-                            'type': 'income' if credit > 0 else 'expense',
-                            'transaction_category': classification['category']
-                        })
+                    
+                        parsed.append((i, Transaction(
+                            date=current_date,
+                            description=clean_desc,
+                            debit=debit,
+                            credit=credit,
+                            balance=None,
+                            type='income' if credit > 0 else 'expense',
+                            category=classification['category']
+                        )))
             
             i += 1
         
-        # Remove duplicates
-        seen = set()
-        unique_transactions = []
-        for txn in transactions:
-            key = (txn['date'], round(txn.get('debit', 0) + txn.get('credit', 0), 2), txn['description'][:30])
-            if key not in seen:
-                seen.add(key)
-                unique_transactions.append(txn)
-        
-        return unique_transactions
+        return parsed, i, current_date
     
-    def _parse_transaction_block(self, lines: List[str], start_idx: int, date: str, year: str) -> Optional[Tuple[Dict, int]]:
+    def _parse_transaction_block(self, lines: List[str], start_idx: int, date: str, year: str) -> Optional[Tuple[Transaction, int]]:
         """Parse a complete transaction block starting at start_idx"""
-        line = lines[start_idx].strip()
-        date_match = re.match(r'^(\d{1,2}\s+\w{3})', line, re.IGNORECASE)
-        if not date_match:
+        first = self.LEXER.lex(lines[start_idx])
+        if not first.date_match:
             return None
         
-        text_after_date = line[date_match.end():].strip()
+        text_after_date = first.text[first.date_match.end(1):].strip()
         
         description_parts = []
         amounts_found = []
         
         # Parse current line
-        amount_on_same_line = re.search(r'([\d,]+\.?\d{1,2})\s*$', text_after_date)
+        amount_on_same_line = self.AMOUNT_AT_END.search(text_after_date)
         
         if amount_on_same_line:
-            amount_str = amount_on_same_line.group(1)
-            amounts_found.append(parse_uk_amount(amount_str))
+            amounts_found.append(parse_uk_amount(amount_on_same_line.group(1)))
             desc_text = text_after_date[:amount_on_same_line.start()].strip()
             if desc_text:
                 description_parts.append(desc_text)
@@ -357,14 +664,14 @@ class BarclaysParser(BaseBankParser):
         
         # Look ahead for continuation lines
         j = start_idx + 1
-        max_look_ahead = 25
         found_amount = bool(amounts_found)
         
-        while j < len(lines) and j < start_idx + max_look_ahead:
-            next_line = lines[j].strip()
+        while j < len(lines) and j < start_idx + self.MAX_LOOK_AHEAD:
+            lexed = self.LEXER.lex(lines[j])
+            next_line = lexed.text
             
             # Stop if we hit a new transaction date
-            if next_line and re.match(r'^\d{1,2}\s+\w{3}', next_line, re.IGNORECASE):
+            if DATE_START in lexed.tokens:
                 break
             
             if not next_line:
@@ -382,10 +689,9 @@ class BarclaysParser(BaseBankParser):
                 continue
             
             # Check for amounts
-            amount_match = re.search(r'([\d,]+\.?\d{1,2})\s*$', next_line)
+            amount_match = self.AMOUNT_AT_END.search(next_line)
             if amount_match:
-                amount_str = amount_match.group(1)
-                parsed_amount = parse_uk_amount(amount_str)
+                parsed_amount = parse_uk_amount(amount_match.group(1))
                 
                 if parsed_amount >= 0.01 and parsed_amount < 100000:
                     if not found_amount:
@@ -460,16 +766,16 @@ class BarclaysParser(BaseBankParser):
                 money_out = amounts_found[0]
         
         if money_out > 0 or money_in > 0:
-            return {
-                'date': date,
-                'description': full_description or 'Barclays Transaction',
-                'debit': money_out,
-                'credit': money_in,
-                'balance': balance,
-                'type': 'income' if money_in > 0 else 'expense',
-                'transaction_category': classification['category'],
-                'classification_confidence': classification['confidence']
-            }, j
+            return Transaction(
+                date=date,
+                description=full_description or 'Barclays Transaction',
+                debit=money_out,
+                credit=money_in,
+                balance=balance,
+                type='income' if money_in > 0 else 'expense',
+                category=classification['category'],
+                extra={'classification_confidence': classification['confidence']}
+            ), j
         
         return None, j
     
@@ -570,26 +876,16 @@ class BarclaysParser(BaseBankParser):
     
     def _parse_barclays_date(self, date_str: str, year: str) -> Optional[str]:
         """Parse Barclays date format: 'DD MMM' -> 'DD/MM/YYYY'"""
-        try:
-            full_date_str = f"{date_str} {year}"
-            parts = date_str.split()
-            if len(parts) == 2:
-                day, month = parts
-                month = month.capitalize()
-                full_date_str = f"{day} {month} {year}"
-            
-            parsed = datetime.strptime(full_date_str, '%d %b %Y')
-            return parsed.strftime('%d/%m/%Y')
-        except Exception as e:
-            self.logger.debug(f"Error parsing date '{date_str}': {e}")
-            # Fallback: try to parse and convert to UK format
-            iso_date = parse_uk_date(f"{date_str} {year}")
-            if iso_date and len(iso_date) == 10:
-                # Convert YYYY-MM-DD to DD/MM/YYYY
-                parts = iso_date.split('-')
-                if len(parts) == 3:
-                    return f"{parts[2]}/{parts[1]}/{parts[0]}"
-            return None
+        iso_date = parse_date(f"{date_str} {year}", ('%d %b %Y',))
+        if iso_date:
+            return to_uk_date(iso_date)
+        
+        self.logger.debug(f"Error parsing date '{date_str}'")
+        # Fallback: try to parse and convert to UK format
+        iso_date = parse_uk_date(f"{date_str} {year}")
+        if iso_date and len(iso_date) == 10:
+            return to_uk_date(iso_date)
+        return None
     
     def _parse_amount(self, amount_str: str) -> float:
         """Parse UK amount format"""
@@ -597,6 +893,7 @@ class BarclaysParser(BaseBankParser):
             return 0.0
         return parse_uk_amount(amount_str)
     
+    @cached_cleaner
     def _clean_barclays_description(self, description: str) -> str:
         """
         Clean Barclays transaction description for CSV output.
@@ -612,53 +909,7 @@ class BarclaysParser(BaseBankParser):
         if not description:
             return ""
         
-        cleaned = description.strip()
-        
-        # 1. Remove numbered prefixes like (1), (2), etc.
-        cleaned = re.sub(r'^\(\d+\)\s*', '', cleaned)
-        
-        # 2. Remove "Ref: XXXXX" patterns (can include spaces, slashes, dots, alphanumerics)
-        # Handle patterns like "Ref: 010436111", "Ref: Mpl 231/248", "Ref: Mobile-Channel", "Ref: Wallet Transfer", "Ref: 0804228R475.23173"
-        cleaned = re.sub(r'\s*Ref:\s*[A-Za-z0-9\-_/\.\s]+$', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\s*Ref:\s*[A-Za-z0-9\-_/\.]+', '', cleaned, flags=re.IGNORECASE)
-        
-        # 3. Remove "On DD MMM" or "On DD" or just "On" date suffixes (e.g., "On 01 Apr", "On 31 Mar", "On 01", "On")
-        cleaned = re.sub(r'\s+On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?$', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\s+On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?\s*$', '', cleaned, flags=re.IGNORECASE)
-        # Also remove "On DD" without month (partial dates from truncation)
-        cleaned = re.sub(r'\s+On\s+\d{1,2}\s*$', '', cleaned, flags=re.IGNORECASE)
-        # Also remove just "On" at the end (completely truncated date)
-        cleaned = re.sub(r'\s+On\s*$', '', cleaned, flags=re.IGNORECASE)
-        
-        # 4. Remove asterisks and trailing codes (e.g., *WR9P2, *6Wdamq77L2)
-        # Keep the merchant name but remove the code after asterisk
-        cleaned = re.sub(r'\*[A-Za-z0-9]+(?:\s|$)', ' ', cleaned)
-        
-        # 5. Convert "Giro Received From" to "Received From"
-        cleaned = re.sub(r'^Giro\s+Received\s+From\s+', 'Received From ', cleaned, flags=re.IGNORECASE)
-        
-        # 6. Format transfer descriptions with commas
-        # "Transfer to Sort Code XX-XX-XX Account XXXXXXXX" -> "Transfer to Sort Code XX-XX-XX, Account XXXXXXXX"
-        cleaned = re.sub(
-            r'(Sort\s+Code\s+[\d\-]+)\s+(Account\s+\d+)',
-            r'\1, \2',
-            cleaned,
-            flags=re.IGNORECASE
-        )
-        
-        # Also handle "Transfer From Sort Code BL-UE-R Account Wards" pattern
-        cleaned = re.sub(
-            r'(Sort\s+Code\s+[A-Za-z0-9\-]+)\s+(Account\s+[A-Za-z0-9]+)',
-            r'\1, \2',
-            cleaned,
-            flags=re.IGNORECASE
-        )
-        
-        # Clean up "Card Payment to" - remove "to" prefix redundancy from description
-        # But keep the full pattern for clarity
-        
-        # Clean up extra whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = self.DESCRIPTION_RULES.apply(description.strip()).strip()
         
         # Remove trailing punctuation
         cleaned = cleaned.rstrip('.,;:- ')
@@ -671,46 +922,37 @@ class BarclaysParser(BaseBankParser):
     
     def _calculate_missing_balances(self, transactions: List[Dict]) -> List[Dict]:
         """Calculate missing balances based on known balances and debits/credits"""
-        if not transactions:
-            return transactions
-        
-        # Find first known balance
-        first_balance_idx = None
-        for i, txn in enumerate(transactions):
-            if txn.get('balance') is not None:
-                first_balance_idx = i
-                break
-        
-        if first_balance_idx is None:
-            return transactions
+        return [txn for batch in self._fill_missing_balances([transactions]) for txn in batch]
+    
+    def _fill_missing_balances(self, batches: Iterable[List[Dict]]) -> Iterator[List[Dict]]:
+        """
+        Streaming form of _calculate_missing_balances.
         
-        # Calculate forward
-        current_balance = transactions[first_balance_idx]['balance']
+        Transactions before the first known balance are held back until it
+        arrives (they are calculated backwards from it); after that each batch
+        is calculated forwards and released immediately.
         
-        for i in range(first_balance_idx + 1, len(transactions)):
-            if transactions[i]['credit'] > 0:
-                current_balance += transactions[i]['credit']
-            if transactions[i]['debit'] > 0:
-                current_balance -= transactions[i]['debit']
+        Args:
+            batches: Batches of transactions in statement order
             
-            if transactions[i].get('balance') is None:
-                transactions[i]['balance'] = round(current_balance, 2)
-            else:
-                current_balance = transactions[i]['balance']
+        Yields:
+            The same batches with missing balances filled in
+        """
+        pending: List[Dict] = []
+        current_balance = None
         
-        # Calculate backwards
-        if first_balance_idx > 0:
-            current_balance = transactions[first_balance_idx]['balance']
+        for transactions in batches:
+            if current_balance is None:
+                pending.extend(transactions)
+                if all(txn.get('balance') is None for txn in pending):
+                    continue
+                transactions, pending = pending, []
             
-            for i in range(first_balance_idx - 1, -1, -1):
-                if transactions[i]['credit'] > 0:
-                    current_balance -= transactions[i]['credit']
-                if transactions[i]['debit'] > 0:
-                    current_balance += transactions[i]['debit']
-                
-                if transactions[i].get('balance') is None:
-                    transactions[i]['balance'] = round(current_balance, 2)
-                else:
-                    current_balance = transactions[i]['balance']
+            current_balance = self.fill_balances(transactions, current_balance)
+            
+            if transactions:
+                yield transactions
         
-        return transactions
+        # No known balance at all: nothing to calculate from
+        if pending:
+            yield pending
@@ -23,7 +23,6 @@ Key Techniques:
 Author: Bank Statement Converter Team
 Last Updated: December 2024
 """
-import pdfplumber
 import re
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -33,6 +32,8 @@ import os
 # Handle imports
 try:
     from .base_parser import BaseBankParser
+    from .pdf_session import PdfSession
+    from .strategy import get_strategy_scheduler
     from .logger import get_parser_logger
     from .config import get_config, should_skip_line
     from ..utils import parse_uk_date, parse_uk_amount, clean_description
@@ -41,6 +42,8 @@ except ImportError:
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
+    from parsers.pdf_session import PdfSession
+    from parsers.strategy import get_strategy_scheduler
     from parsers.logger import get_parser_logger
     from parsers.config import get_config, should_skip_line
     from utils import parse_uk_date, parse_uk_amount, clean_description
@@ -61,6 +64,15 @@ class BarclaysParserOptimized(BaseBankParser):
     DATE_PATTERN = r'^\d{1,2}\s+\w{3}'  # DD MMM
     HEADER_PATTERN = r'Date\s+Description\s+Money\s+out\s+Money\s+in\s+Balance'
     
+    # Table extraction settings
+    # (not prefetched: the strategy scheduler usually skips tables for Barclays)
+    TABLE_SETTINGS = {
+        "vertical_strategy": "lines",
+        "horizontal_strategy": "lines",
+        "snap_tolerance": 3,
+        "join_tolerance": 3,
+    }
+    
     # Money flow classification patterns
     INCOME_PATTERNS = [
         (['bill payment from'], 'credit', 0.98),
@@ -99,9 +111,10 @@ class BarclaysParserOptimized(BaseBankParser):
         
         Strategy:
         1. Extract statement year from header
-        2. Try table extraction first (structured approach)
-        3. Always try text extraction (more reliable for Barclays)
-        4. Use text results (Barclays PDFs work better with text parsing)
+        2. Run the historically better of text/table extraction first
+           (text by default: Barclays PDFs work better with text parsing)
+        3. Run the other only if the first isn't confident enough
+        4. Prefer text results whenever text extraction found anything
         5. Calculate missing balances
         6. Return deduplicated, sorted transactions
         """
@@ -109,24 +122,24 @@ class BarclaysParserOptimized(BaseBankParser):
         statement_year = None
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
+            with self.open_pdf(pdf_path) as pdf:
                 # Step 1: Extract year from statement header
                 statement_year = self._extract_year_from_header(pdf)
                 self.logger.info(f"Statement year: {statement_year}")
                 
-                # Step 2: Try table extraction
-                table_transactions = self._extract_from_tables(pdf, statement_year)
-                self.logger.debug(f"Table extraction: {len(table_transactions)} transactions")
-                
-                # Step 3: Extract from text (primary method for Barclays)
-                text_transactions = self._extract_from_text(pdf, statement_year)
-                self.logger.debug(f"Text extraction: {len(text_transactions)} transactions")
-                
-                # Step 4: Use text results (more reliable for Barclays multi-page)
-                if text_transactions:
-                    transactions = text_transactions
-                else:
-                    transactions = table_transactions
+                # Steps 2-4: Confidence-gated table/text extraction
+                method, transactions = get_strategy_scheduler().run(
+                    'barclays',
+                    {
+                        'table': lambda: self._extract_from_tables(pdf, statement_year),
+                        'text': lambda: self._extract_from_text(pdf, statement_year),
+                    },
+                    threshold=self.config.strategy_confidence_threshold,
+                    default_order=self.config.extraction_order,
+                    # Text results are more reliable for Barclays multi-page statements
+                    select=lambda results: 'text' if results['text'][0] else 'table',
+                )
+                self.logger.debug(f"Using {method} extraction: {len(transactions)} transactions")
             
             # Step 5: Fill in missing balances
             transactions = self._calculate_missing_balances(transactions)
@@ -148,7 +161,7 @@ class BarclaysParserOptimized(BaseBankParser):
     # METADATA EXTRACTION
     # =========================================================================
     
-    def _extract_year_from_header(self, pdf: pdfplumber.PDF) -> str:
+    def _extract_year_from_header(self, pdf: PdfSession) -> str:
         """
         Extract year from statement header.
         
@@ -184,7 +197,7 @@ class BarclaysParserOptimized(BaseBankParser):
     # TABLE EXTRACTION
     # =========================================================================
     
-    def _extract_from_tables(self, pdf: pdfplumber.PDF, year: str) -> List[Dict]:
+    def _extract_from_tables(self, pdf: PdfSession, year: str) -> List[Dict]:
         """
         Extract transactions from PDF tables.
         
@@ -194,12 +207,7 @@ class BarclaysParserOptimized(BaseBankParser):
         last_known_balance = None
         
         for page_num, page in enumerate(pdf.pages):
-            tables = page.extract_tables({
-                "vertical_strategy": "lines",
-                "horizontal_strategy": "lines",
-                "snap_tolerance": 3,
-                "join_tolerance": 3,
-            })
+            tables = page.extract_tables(self.TABLE_SETTINGS)
             
             for table in tables:
                 if not table or len(table) < 2:
@@ -273,7 +281,7 @@ class BarclaysParserOptimized(BaseBankParser):
     # TEXT EXTRACTION (Primary method for Barclays)
     # =========================================================================
     
-    def _extract_from_text(self, pdf: pdfplumber.PDF, year: str) -> List[Dict]:
+    def _extract_from_text(self, pdf: PdfSession, year: str) -> List[Dict]:
         """
         Extract transactions from text.
         
@@ -281,11 +289,7 @@ class BarclaysParserOptimized(BaseBankParser):
         with text-based parsing (especially multi-page statements).
         """
         # Combine text from all pages
-        full_text = ''
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                full_text += page_text + '\n'
+        full_text = pdf.full_text()
         
         return self._parse_barclays_text(full_text, year)
     
@@ -706,48 +710,8 @@ class BarclaysParserOptimized(BaseBankParser):
     # =========================================================================
     
     def _calculate_missing_balances(self, transactions: List[Dict]) -> List[Dict]:
-        """Calculate missing balances from known values"""
-        if not transactions:
-            return transactions
-        
-        # Find first known balance
-        first_balance_idx = None
-        for i, txn in enumerate(transactions):
-            if txn.get('balance') is not None:
-                first_balance_idx = i
-                break
-        
-        if first_balance_idx is None:
-            return transactions
-        
-        # Calculate forward
-        current_balance = transactions[first_balance_idx]['balance']
-        
-        for i in range(first_balance_idx + 1, len(transactions)):
-            credit = transactions[i].get('credit', 0) or 0
-            debit = transactions[i].get('debit', 0) or 0
-            current_balance = current_balance + credit - debit
-            
-            if transactions[i].get('balance') is None:
-                transactions[i]['balance'] = round(current_balance, 2)
-            else:
-                current_balance = transactions[i]['balance']
-        
-        # Calculate backward
-        if first_balance_idx > 0:
-            current_balance = transactions[first_balance_idx]['balance']
-            
-            for i in range(first_balance_idx - 1, -1, -1):
-                credit = transactions[i + 1].get('credit', 0) or 0
-                debit = transactions[i + 1].get('debit', 0) or 0
-                current_balance = current_balance - credit + debit
-                
-                if transactions[i].get('balance') is None:
-                    transactions[i]['balance'] = round(current_balance, 2)
-                else:
-                    current_balance = transactions[i]['balance']
-        
-        return transactions
+        """Calculate missing balances from known values (see BaseBankParser.fill_balances)"""
+        return self.calculate_missing_balances(transactions)
     
     # =========================================================================
     # DEDUPLICATION
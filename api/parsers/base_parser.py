@@ -3,9 +3,8 @@ Base parser class for all UK bank statement parsers.
 Provides common functionality, logging, and error handling.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime
-import pdfplumber
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator, Any, Callable
+from contextlib import contextmanager
 import re
 import os
 
@@ -22,11 +21,40 @@ from .exceptions import (
     ParserResult,
 )
 from .config import get_config, BankConfig
+from .pdf_session import PdfSession, open_pdf_session
+from .chunking import ChunkResult
+from .transaction import Transaction
+from .transaction_table import TransactionTable, safe_float, safe_balance
+from .reconciliation import BALANCE_TOLERANCE, fill_missing_balances
+from .money import NO_BALANCE, format_pence, is_sub_penny, parse_pence, to_pence
+from .dates import current_year, parse_date, parse_date_universal
+from .amounts import AmountTokenizer
+from .layout import LayoutColumn, LayoutRow, read_layout_rows
+from .table_tuning import get_table_tuner, producer_fingerprint
+from .page_classifier import PageClassifier, bank_page_classifier
+from .page_region import TransactionRegion, statement_region
+from .line_lexer import date_blocks, date_blocks_by_page
+
+# Default amount tokenizer: 1,234.56 with every kind of money-like noise skipped
+SAFE_AMOUNTS = AmountTokenizer()
 
 
 class BaseBankParser(ABC):
     """Base class for all UK bank parsers"""
     
+    # Table settings extract_transactions() uses per page, so a parallel
+    # prefetch lays them out alongside the text (empty for text-only parsers)
+    PREFETCH_TABLE_SETTINGS: List[Optional[Dict[str, Any]]] = []
+    
+    # Statement columns for the geometric layout engine (see parsers.layout).
+    # Parsers that declare them read pages with extract_layout_rows(), and a
+    # parallel prefetch lays out words instead of text
+    LAYOUT_COLUMNS: Tuple[LayoutColumn, ...] = ()
+    
+    # Whether chunk_context/parse_chunk/merge_chunks are implemented, so long
+    # statements can be parsed as independent page ranges (see parsers.chunking)
+    SUPPORTS_CHUNKING = False
+    
     def __init__(self):
         # Get parser name from class name (e.g., "BarclaysParser" -> "barclays")
         class_name = self.__class__.__name__
@@ -40,27 +68,227 @@ class BaseBankParser(ABC):
         self.config = get_config(self.parser_name)
     
     @abstractmethod
-    def extract_transactions(self, pdf_path: str) -> List[Dict]:
+    def extract_transactions(self, pdf_path: str) -> List[Transaction]:
         """
         Extract transactions from PDF
         
         Args:
-            pdf_path: Path to PDF file or file-like object
+            pdf_path: Path to PDF file, file-like object or open PdfSession
             
         Returns:
-            List of dicts with keys: date, description, debit, credit, balance, type
-            Format:
-            {
-                'date': 'YYYY-MM-DD',
-                'description': str,
-                'debit': float (or 0.0),
-                'credit': float (or 0.0),
-                'balance': float (or None),
-                'type': 'income' or 'expense'
-            }
+            List of Transaction records (see parsers.transaction):
+            Transaction(
+                date='YYYY-MM-DD',
+                description=str,
+                debit=float (or 0.0),
+                credit=float (or 0.0),
+                balance=float (or None),
+                type='income' or 'expense'
+            )
         """
         pass
     
+    def extract_transactions_iter(self, pdf_path) -> Iterator[Transaction]:
+        """
+        Stream normalized transactions as the statement is parsed.
+        
+        Only parsers that override _iter_transaction_batches (Barclays)
+        release transactions as each page completes; the rest sort, dedupe or
+        cross-reference the whole document and yield everything once
+        extract_transactions() finishes. Text parsers grouping lines by date
+        can stream with iter_line_blocks().
+        
+        Args:
+            pdf_path: Path to PDF file, file-like object or open PdfSession
+            
+        Yields:
+            Normalized Transaction records, in statement order
+        """
+        with self.open_pdf(pdf_path) as pdf:
+            for batch in self._iter_transaction_batches(pdf):
+                for txn in batch:
+                    yield self.normalize_transaction(txn)
+    
+    def _iter_transaction_batches(self, pdf: PdfSession) -> Iterator[List[Dict]]:
+        """
+        Yield raw transactions in batches, in statement order.
+        
+        Override in parsers that can release transactions before the whole
+        document is parsed (e.g. with iter_line_blocks()); the default is a
+        single batch, so peak memory only stays flat for parsers that do.
+        
+        Args:
+            pdf: Open PdfSession
+        """
+        yield self.extract_transactions(pdf)
+    
+    def chunk_context(self, pdf: PdfSession) -> Dict[str, Any]:
+        """
+        Document-level state every chunk needs (e.g. the statement year),
+        worked out once before chunks are parsed.
+        
+        Args:
+            pdf: Open PdfSession
+        """
+        return {}
+    
+    def parse_chunk(self, page_texts: List[str], start_page: int, end_page: int, is_last: bool,
+                    context: Dict[str, Any]) -> ChunkResult:
+        """
+        Parse one page range without knowing what came before it.
+        
+        The default parses the range in one non-chunked pass with
+        parse_page_texts() and records no boundary state, which is only
+        exact when no transaction straddles the range's edges; parsers that
+        set SUPPORTS_CHUNKING override this and merge_chunks.
+        
+        Args:
+            page_texts: Text of each page in the range
+            start_page: Index of the first page (0 for the start of the document)
+            end_page: Index of the page after the last one
+            is_last: Whether the range ends the document
+            context: Result of chunk_context()
+            
+        Returns:
+            ChunkResult with the chunk's transactions and boundary state
+        """
+        return ChunkResult(start_page, end_page, transactions=self.parse_page_texts(page_texts, context))
+    
+    def merge_chunks(self, chunks: List[ChunkResult], context: Dict[str, Any]) -> List[Dict]:
+        """
+        Stitch parsed chunks back into the document's transactions.
+        
+        The default concatenates the chunks' transactions in order.
+        
+        Args:
+            chunks: Every chunk of the document, in order
+            context: Result of chunk_context()
+            
+        Returns:
+            Raw transactions, as extract_transactions() would return them
+            (empty if the text held none, so the caller can fall back)
+        """
+        return [txn for chunk in chunks for txn in chunk.transactions]
+    
+    def parse_page_texts(self, page_texts: List[str], context: Dict[str, Any]) -> List[Dict]:
+        """
+        Parse transactions from page texts in a single pass.
+        
+        The reference a chunked parse must reproduce. Parsers that need more
+        than the text (tables, word positions) return nothing, the default,
+        so a chunked conversion falls back to extract_transactions().
+        
+        Args:
+            page_texts: Text of each page, in order
+            context: Result of chunk_context()
+            
+        Returns:
+            Raw transactions, as extract_transactions() would return them
+        """
+        return []
+    
+    @contextmanager
+    def open_pdf(self, pdf_path) -> Iterator[PdfSession]:
+        """
+        Get a PDF session for parsing.
+        
+        Reuses the converter's session when one is passed in, so pages already
+        laid out during bank detection are not extracted again. Pages are
+        prepared for extraction first (see prepare_pages). Long documents
+        are laid out across a process pool first (see PdfSession.prefetch).
+        
+        Args:
+            pdf_path: Path to PDF file, file-like object or PdfSession
+            
+        Yields:
+            The PdfSession
+        """
+        with open_pdf_session(pdf_path) as pdf:
+            if not pdf.prepared:
+                self.prepare_pages(pdf)
+            pdf.prefetch(self.PREFETCH_TABLE_SETTINGS, words=bool(self.LAYOUT_COLUMNS))
+            yield pdf
+    
+    def prepare_pages(self, pdf: PdfSession):
+        """
+        Set a session up to extract only what this parser reads.
+        
+        Pages are classified as they are extracted, so boilerplate pages are
+        skipped (see page_classifier), and pages after the first are cropped
+        to the transaction region (see page_region).
+        
+        Args:
+            pdf: Open PdfSession
+        """
+        pdf.classify_pages(self.page_classifier())
+        pdf.crop_pages(self.transaction_region(pdf))
+        pdf.prepared = True
+    
+    def transaction_region(self, pdf: PdfSession) -> Optional[TransactionRegion]:
+        """
+        Where this statement's transaction table sits on its continuation pages.
+        
+        Args:
+            pdf: Open PdfSession
+            
+        Returns:
+            TransactionRegion, or None to extract whole pages
+        """
+        if not self.config:
+            return None
+        return statement_region(pdf.pages, self.config.header_keywords, self.config.footer_keywords)
+    
+    def page_classifier(self) -> Optional[PageClassifier]:
+        """
+        Classifier for this bank's pages, keyed on its column headings.
+        
+        Returns:
+            PageClassifier, or None when page skipping is turned off
+            (PARSER_SKIP_PAGES=0)
+        """
+        return bank_page_classifier(self.config.header_keywords if self.config else ())
+    
+    def extract_layout_rows(self, pdf: PdfSession) -> List[LayoutRow]:
+        """
+        Read the statement table by word position, one extract_words() pass per page.
+        
+        Each page's header row (per LAYOUT_COLUMNS) fixes the column
+        positions; pages without one reuse the previous page's columns.
+        
+        Args:
+            pdf: Open PdfSession
+            
+        Returns:
+            Rows below the header, in document order (empty if no page
+            has the header, so the caller can fall back to text parsing)
+        """
+        rows = []
+        layout = None
+        for page_num, page in enumerate(pdf.pages):
+            layout, page_rows = read_layout_rows(page.extract_words(), self.LAYOUT_COLUMNS, page_num, layout)
+            rows.extend(page_rows)
+        return rows
+    
+    def read_tuned_tables(self, pdf: PdfSession, page, candidates: List[Optional[Dict[str, Any]]],
+                          read: Callable[[List[List[List[Optional[str]]]]], List[Dict]]) -> List[Dict]:
+        """
+        Read a page's tables with the first table settings that produce rows.
+        
+        Settings are tried in the order that has worked for this bank and
+        PDF producer before (see parsers.table_tuning), so statements from a
+        known producer usually need one table detection per page.
+        
+        Args:
+            pdf: Open PdfSession (its producer keys the learned order)
+            page: Page of the session
+            candidates: Table settings in default order
+            read: Parses a page's tables into transactions (empty if none are valid)
+            
+        Returns:
+            Transactions from the first settings that produced any
+        """
+        return get_table_tuner().read_tables(page, self.parser_name, producer_fingerprint(pdf), candidates, read)
+    
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
         Extract text from all pages of a PDF.
@@ -74,20 +302,18 @@ class BaseBankParser(ABC):
         Raises:
             PDFExtractionError: If text extraction fails
         """
+        from pdfminer.pdfparser import PDFSyntaxError
+        
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
             
             if not all_text.strip():
                 raise PDFExtractionError("PDF contains no extractable text")
             
             return all_text
             
-        except pdfplumber.pdfminer.pdfparser.PDFSyntaxError as e:
+        except PDFSyntaxError as e:
             raise PDFExtractionError(f"Invalid PDF format: {str(e)}")
         except Exception as e:
             if "password" in str(e).lower():
@@ -154,14 +380,10 @@ class BaseBankParser(ABC):
         if year and not re.search(r'\d{4}', date_str):
             date_str = f"{date_str} {year}"
         
-        for fmt in formats:
-            try:
-                # Handle format with year
-                if '%Y' in fmt or '%y' in fmt:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
+        # Only formats with a year can give a full date
+        iso_date = parse_date(date_str, tuple(fmt for fmt in formats if '%Y' in fmt or '%y' in fmt))
+        if iso_date:
+            return iso_date
         
         # Log but don't raise - let caller handle
         self.logger.debug(f"Could not parse date: '{date_str}'")
@@ -177,6 +399,11 @@ class BaseBankParser(ABC):
         Returns:
             Float value (0.0 if parsing fails)
         """
+        # Plain amounts are read digit by digit as pence, never through float
+        pence = parse_pence(amount_str)
+        if pence:
+            return pence / 100
+        
         if not amount_str:
             return 0.0
         
@@ -197,61 +424,88 @@ class BaseBankParser(ABC):
             is_negative = True
             clean = clean[1:]
         
+        # Sub-penny amounts are not money: reject them rather than round them
+        if is_sub_penny(clean):
+            return 0.0
+        
         try:
             amount = float(clean)
             return -amount if is_negative else amount
         except (ValueError, TypeError):
             return 0.0
     
-    def validate_running_balance(self, transactions: List[Dict]) -> List[str]:
+    def validate_running_balance(self, transactions) -> List[str]:
         """
         Validate that running balance is correct
         
         Args:
-            transactions: List of transaction dictionaries
+            transactions: List of transaction dictionaries or TransactionTable
             
         Returns:
             List of validation error messages
         """
-        errors = []
-        
-        if not transactions or len(transactions) < 2:
-            return errors
-        
-        # Start with first transaction's balance (or calculate from scratch)
-        first_balance = transactions[0].get('balance')
-        
-        # If no balance in first transaction, try to calculate from scratch
-        if first_balance is None:
-            # Skip validation if we don't have starting balance
-            return errors
+        if isinstance(transactions, TransactionTable):
+            return [
+                self._balance_error(index, transactions.date(index), expected, actual)
+                for index, expected, actual in transactions.balance_mismatches()
+            ]
+        return [error for _, error in self.check_running_balance(transactions) if error]
+    
+    def _balance_error(self, index: int, date, expected: int, actual: int) -> str:
+        """Validation message for a running balance mismatch (balances in pence)"""
+        return (
+            f"Transaction {index+1} ({date}): "
+            f"Balance mismatch. Expected £{format_pence(expected)}, "
+            f"got £{format_pence(actual)} (diff: £{format_pence(abs(expected - actual))})"
+        )
+    
+    def check_running_balance(self, transactions: Iterable[Dict]) -> Iterator[Tuple[Dict, Optional[str]]]:
+        """
+        Streaming form of validate_running_balance.
         
-        calculated_balance = float(first_balance)
+        Args:
+            transactions: Transactions in statement order (any iterable)
+            
+        Yields:
+            (transaction, error message or None) for every transaction
+        """
+        calculated_balance = None
         
-        for i, txn in enumerate(transactions[1:], 1):
-            # Calculate expected balance
-            credit = float(txn.get('credit', 0) or 0)
-            debit = float(txn.get('debit', 0) or 0)
+        for i, txn in enumerate(transactions):
+            if i == 0:
+                # Start with first transaction's balance
+                # (validation is skipped if we don't have a starting balance)
+                first_balance = txn.get('balance')
+                if first_balance is not None:
+                    calculated_balance = to_pence(first_balance)
+                yield txn, None
+                continue
+            
+            if calculated_balance is None:
+                yield txn, None
+                continue
+            
+            # Calculate expected balance (in pence, so exact)
+            credit = to_pence(txn.get('credit', 0) or 0)
+            debit = to_pence(txn.get('debit', 0) or 0)
             
             # Add credits, subtract debits
             calculated_balance = calculated_balance + credit - debit
             
             # Get actual balance from statement
             actual_balance = txn.get('balance')
+            error = None
             
             if actual_balance is not None:
-                actual_balance = float(actual_balance)
+                actual_balance = to_pence(actual_balance)
                 
                 # Check if it matches statement balance (within 1p tolerance)
-                diff = abs(calculated_balance - actual_balance)
-                if diff > 0.01:
-                    errors.append(
-                        f"Transaction {i+1} ({txn.get('date', 'unknown date')}): "
-                        f"Balance mismatch. Expected £{calculated_balance:.2f}, "
-                        f"got £{actual_balance:.2f} (diff: £{diff:.2f})"
+                if abs(calculated_balance - actual_balance) > BALANCE_TOLERANCE:
+                    error = self._balance_error(
+                        i, txn.get('date', 'unknown date'), calculated_balance, actual_balance
                     )
-        
-        return errors
+            
+            yield txn, error
     
     def validate_transaction_count(self, transactions: List[Dict], expected_count: Optional[int] = None) -> List[str]:
         """
@@ -278,61 +532,41 @@ class BaseBankParser(ABC):
         
         return warnings
     
-    def normalize_transaction(self, txn: Dict) -> Dict:
+    def normalize_transaction(self, txn: Transaction) -> Transaction:
         """
         Normalize transaction format
 
         Args:
-            txn: Transaction dictionary
+            txn: Transaction record (or transaction dictionary)
 
         Returns:
-            Normalized transaction with all required fields
-        """
-        # Safely convert to float, handling None and NaN
-        def safe_float(val):
-            if val is None:
-                return 0.0
-            try:
-                f = float(val)
-                # Check for NaN
-                if f != f:  # NaN check
-                    return 0.0
-                return f
-            except (ValueError, TypeError):
-                return 0.0
-
+            New normalized Transaction with all required fields
+        """
         # Ensure all fields exist
-        normalized = {
-            'date': txn.get('date', ''),
-            'description': str(txn.get('description', '')).strip(),
-            'debit': safe_float(txn.get('debit', 0)),
-            'credit': safe_float(txn.get('credit', 0)),
-            'balance': txn.get('balance'),
-            'type': txn.get('type', 'expense')
-        }
+        debit = safe_float(txn.get('debit', 0))
+        credit = safe_float(txn.get('credit', 0))
+        txn_type = txn.get('type', 'expense')
 
         # Calculate amount and type if not set
-        if normalized['credit'] > 0:
-            normalized['amount'] = normalized['credit']
-            normalized['type'] = 'income'
-        elif normalized['debit'] > 0:
-            normalized['amount'] = normalized['debit']
-            normalized['type'] = 'expense'
+        if credit > 0:
+            amount = credit
+            txn_type = 'income'
+        elif debit > 0:
+            amount = debit
+            txn_type = 'expense'
         else:
-            normalized['amount'] = 0.0
+            amount = 0.0
 
-        # Handle balance - convert None to None (not NaN)
-        if normalized['balance'] is not None:
-            try:
-                bal = float(normalized['balance'])
-                if bal != bal:  # NaN check
-                    normalized['balance'] = None
-                else:
-                    normalized['balance'] = bal
-            except (ValueError, TypeError):
-                normalized['balance'] = None
-
-        return normalized
+        return Transaction(
+            date=txn.get('date', ''),
+            description=str(txn.get('description', '')).strip(),
+            debit=debit,
+            credit=credit,
+            # Handle balance - convert None to None (not NaN)
+            balance=safe_balance(txn.get('balance')),
+            type=txn_type,
+            amount=amount,
+        )
     
     def should_skip_line(self, line: str) -> bool:
         """
@@ -462,6 +696,9 @@ class BaseBankParser(ABC):
     MIN_AMOUNT = 0.01
     MAX_AMOUNT = 99999.99
     
+    # Amount tokenizer for this bank's line shapes (parsers override it)
+    AMOUNTS = SAFE_AMOUNTS
+    
     # Month mappings for manual parsing
     MONTH_MAP = {
         'jan': 1, 'january': 1,
@@ -482,8 +719,9 @@ class BaseBankParser(ABC):
         """
         Extract amounts from text with noise removal.
         
-        CRITICAL: This removes account numbers and card references BEFORE
-        extracting amounts to avoid false positives.
+        CRITICAL: Account numbers and card references are recognised in the
+        same scan as amounts (see SAFE_AMOUNTS) and skipped to avoid false
+        positives, whatever this parser's own AMOUNTS profile is.
         
         Args:
             text: Text to extract amounts from
@@ -498,30 +736,14 @@ class BaseBankParser(ABC):
         if not text:
             return []
         
-        cleaned = text
-        
-        # Remove account numbers (10+ digits)
-        cleaned = re.sub(r'\b\d{10,}\b', ' ', cleaned)
-        # Remove card numbers (CD XXXX patterns)
-        cleaned = re.sub(r'\bCD\s+\d+', ' ', cleaned)
-        # Remove sort codes (XX-XX-XX)
-        cleaned = re.sub(r'\b\d{2}-\d{2}-\d{2}\b', ' ', cleaned)
-        # Remove reference codes (letters + 8+ digits)
-        cleaned = re.sub(r'\b[A-Z]{2,}\d{8,}\b', ' ', cleaned)
-        
-        # Extract amounts (max 5 digits before decimal, exactly 2 after)
-        amount_pattern = r'(\d{1,5}(?:,\d{3})*\.\d{2})'
-        matches = re.findall(amount_pattern, cleaned)
-        
-        # Convert and validate
+        # One pass skips account numbers, card references, sort codes and
+        # reference codes, and reads amounts (max 5 digits before the decimal,
+        # exactly 2 after) as pence
         amounts = []
-        for match in matches:
-            try:
-                amount = float(match.replace(',', ''))
-                if self.MIN_AMOUNT <= amount <= max_amount:
-                    amounts.append(amount)
-            except ValueError:
-                continue
+        for pence in SAFE_AMOUNTS.amounts(text):
+            amount = pence / 100
+            if self.MIN_AMOUNT <= amount <= max_amount:
+                amounts.append(amount)
         
         return amounts
     
@@ -545,60 +767,10 @@ class BaseBankParser(ABC):
         if not date_str:
             return None
         
-        date_str = date_str.strip()
-        
-        # Remove ordinal suffixes (1st, 2nd, 3rd, 4th, etc.)
-        date_str = re.sub(r'(\d+)(st|nd|rd|th)\b', r'\1', date_str, flags=re.IGNORECASE)
-        
-        # UK date formats to try
-        formats = [
-            '%d/%m/%Y',       # 18/09/2023
-            '%d/%m/%y',       # 18/09/23
-            '%d-%m-%Y',       # 18-09-2023
-            '%d-%m-%y',       # 18-09-23
-            '%d %B %Y',       # 18 September 2023
-            '%d %b %Y',       # 18 Sep 2023
-            '%d %b %y',       # 18 Sep 23
-        ]
-        
-        # Append year if not present
-        if year and not re.search(r'\d{4}', date_str) and not re.search(r'\d{2}$', date_str):
-            date_str_with_year = f"{date_str} {year}"
-        else:
-            date_str_with_year = date_str
-        
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_str_with_year, fmt)
-                # Validate year is reasonable
-                current_year = datetime.now().year
-                if abs(date_obj.year - current_year) <= 3:
-                    return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        # Manual parsing fallback for "DD MMM" format
-        match = re.match(r'(\d{1,2})\s+([A-Za-z]{3,9})(?:\s+(\d{2,4}))?', date_str)
-        if match:
-            day = int(match.group(1))
-            month_str = match.group(2).lower()[:3]
-            year_str = match.group(3) or year
-            
-            month = self.MONTH_MAP.get(month_str)
-            if month and year_str:
-                try:
-                    if len(str(year_str)) == 2:
-                        year_int = 2000 + int(year_str) if int(year_str) < 50 else 1900 + int(year_str)
-                    else:
-                        year_int = int(year_str)
-                    
-                    date_obj = datetime(year_int, month, day)
-                    return date_obj.strftime('%Y-%m-%d')
-                except (ValueError, TypeError):
-                    pass
-        
-        self.logger.debug(f"Could not parse date: '{date_str}'")
-        return None
+        iso_date = parse_date_universal(date_str, year, current_year())
+        if iso_date is None:
+            self.logger.debug(f"Could not parse date: '{date_str.strip()}'")
+        return iso_date
     
     def group_lines_into_blocks(self, lines: List[str], date_pattern: str, max_block_lines: int = 10) -> List[Dict]:
         """
@@ -615,50 +787,26 @@ class BaseBankParser(ABC):
         Returns:
             List of block dicts with 'lines', 'date_line', 'start_idx'
         """
-        blocks = []
-        i = 0
+        return date_blocks(lines, date_pattern, max_block_lines)
+    
+    def iter_line_blocks(self, page_texts: Iterable[str], date_pattern: str,
+                         max_block_lines: int = 10) -> Iterator[List[Dict]]:
+        """
+        Page-incremental group_lines_into_blocks() for streaming parsers.
         
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if not line:
-                i += 1
-                continue
-            
-            # Check if line starts with date
-            date_match = re.match(date_pattern, line, re.IGNORECASE)
-            
-            if date_match:
-                block_lines = [line]
-                start_idx = i
-                
-                # Look ahead for continuation lines
-                j = i + 1
-                while j < len(lines) and j < i + max_block_lines:
-                    next_line = lines[j].strip()
-                    
-                    # Stop if we hit another date line
-                    if next_line and re.match(date_pattern, next_line, re.IGNORECASE):
-                        break
-                    
-                    if next_line:
-                        block_lines.append(next_line)
-                    
-                    j += 1
-                
-                blocks.append({
-                    'lines': block_lines,
-                    'date_line': line,
-                    'date_match': date_match.group(0),
-                    'start_idx': start_idx,
-                    'end_idx': j - 1
-                })
-                
-                i = j
-            else:
-                i += 1
+        Blocks are released as each page completes; a block still open at
+        the end of a page waits for the next one. The blocks are those
+        group_lines_into_blocks() finds on the lines of pdf.full_text().
         
-        return blocks
+        Args:
+            page_texts: Text of each page, e.g. (page.extract_text() for page in pdf.pages)
+            date_pattern: Regex for detecting dates
+            max_block_lines: Maximum lines per block
+            
+        Yields:
+            The block dicts completed by each page (indexes count over all pages)
+        """
+        return date_blocks_by_page(page_texts, date_pattern, max_block_lines)
     
     def look_backward_for_merchant(self, lines: List[str], current_idx: int, max_lookback: int = 3) -> str:
         """
@@ -713,53 +861,47 @@ class BaseBankParser(ABC):
         Works both forward and backward from the first known balance.
         
         Args:
-            transactions: List of transactions (may have None balances)
+            transactions: List of transactions (may have None balances) or
+                          TransactionTable (filled in place)
             
         Returns:
             Transactions with balances filled in
         """
-        if not transactions or len(transactions) < 2:
-            return transactions
-        
-        # Find first known balance
-        first_balance_idx = None
-        for i, txn in enumerate(transactions):
-            if txn.get('balance') is not None:
-                first_balance_idx = i
-                break
+        if isinstance(transactions, TransactionTable):
+            return transactions.fill_missing_balances()
         
-        if first_balance_idx is None:
+        if not transactions or len(transactions) < 2:
             return transactions
         
-        # Calculate forward
-        current_balance = float(transactions[first_balance_idx]['balance'])
-        
-        for i in range(first_balance_idx + 1, len(transactions)):
-            credit = float(transactions[i].get('credit', 0) or 0)
-            debit = float(transactions[i].get('debit', 0) or 0)
-            current_balance = current_balance + credit - debit
-            
-            if transactions[i].get('balance') is None:
-                transactions[i]['balance'] = round(current_balance, 2)
-            else:
-                current_balance = float(transactions[i]['balance'])
+        self.fill_balances(transactions)
+        return transactions
+    
+    def fill_balances(self, transactions: List[Dict], opening_balance: Optional[int] = None) -> Optional[int]:
+        """
+        Fill missing balances in place with the reconciliation engine.
         
-        # Calculate backward
-        if first_balance_idx > 0:
-            current_balance = float(transactions[first_balance_idx]['balance'])
+        Args:
+            transactions: Transactions in statement order
+            opening_balance: Running balance before the first transaction in
+                             pence, if known (otherwise rows before the first
+                             known balance are worked backwards from it)
             
-            for i in range(first_balance_idx - 1, -1, -1):
-                # Reverse the calculation: to get previous balance
-                credit = float(transactions[i + 1].get('credit', 0) or 0)
-                debit = float(transactions[i + 1].get('debit', 0) or 0)
-                current_balance = current_balance - credit + debit
-                
-                if transactions[i].get('balance') is None:
-                    transactions[i]['balance'] = round(current_balance, 2)
-                else:
-                    current_balance = float(transactions[i]['balance'])
+        Returns:
+            Running balance after the last transaction in pence (None if
+            there was nothing to work from), for carrying into the next batch
+        """
+        debits = [to_pence(txn.get('debit', 0) or 0) for txn in transactions]
+        credits = [to_pence(txn.get('credit', 0) or 0) for txn in transactions]
+        balances = [
+            NO_BALANCE if txn.get('balance') is None else to_pence(txn['balance'])
+            for txn in transactions
+        ]
+        filled, closing = fill_missing_balances(debits, credits, balances, opening_balance)
         
-        return transactions
+        for txn, balance in zip(transactions, filled):
+            if txn.get('balance') is None and balance != NO_BALANCE:
+                txn['balance'] = balance / 100
+        return closing
     
     def deduplicate_transactions(self, transactions: List[Dict]) -> List[Dict]:
         """
@@ -768,11 +910,15 @@ class BaseBankParser(ABC):
         Uses date + amount + description prefix as key.
         
         Args:
-            transactions: List of transactions (may have duplicates)
+            transactions: List of transactions (may have duplicates) or
+                          TransactionTable
             
         Returns:
-            List with duplicates removed
+            List (or TransactionTable) with duplicates removed
         """
+        if isinstance(transactions, TransactionTable):
+            return transactions.deduplicated()
+        
         seen = set()
         unique = []
         
@@ -6,10 +6,10 @@ This is the foundation that all bank-specific parsers should inherit from.
 Implements the hybrid extraction strategy (table → text → validation).
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from dataclasses import dataclass
-import pdfplumber
 import re
 import os
 
@@ -22,6 +22,16 @@ from .exceptions import (
     ParserResult,
 )
 from .config import get_config, BankConfig
+from .pdf_session import PdfSession, open_pdf_session
+from .dates import current_year, parse_date, strip_ordinals
+from .line_lexer import date_blocks, date_blocks_by_page
+from .money import NO_BALANCE, to_pence
+from .reconciliation import fill_missing_balances
+from .strategy import (
+    get_strategy_scheduler,
+    calculate_extraction_confidence,
+    DEFAULT_CONFIDENCE_THRESHOLD,
+)
 
 
 @dataclass
@@ -64,7 +74,7 @@ class EnhancedBaseBankParser(ABC):
     # =========================================================================
     
     # UK Date formats to try (in order of specificity)
-    UK_DATE_FORMATS = [
+    UK_DATE_FORMATS = (
         '%d/%m/%Y',       # 18/09/2023
         '%d/%m/%y',       # 18/09/23
         '%d-%m-%Y',       # 18-09-2023
@@ -73,7 +83,7 @@ class EnhancedBaseBankParser(ABC):
         '%d %b %Y',       # 18 Sep 2023
         '%d %b %y',       # 18 Sep 23
         '%d %b',          # 18 Sep (needs year inference)
-    ]
+    )
     
     # Month mappings for manual parsing
     MONTH_MAP = {
@@ -111,6 +121,9 @@ class EnhancedBaseBankParser(ABC):
         "snap_tolerance": 5,
     }
     
+    # Table settings laid out per page by a parallel prefetch
+    PREFETCH_TABLE_SETTINGS: List[Optional[Dict[str, Any]]] = []
+    
     def __init__(self):
         class_name = self.__class__.__name__
         self.parser_name = class_name.replace('Parser', '').lower()
@@ -128,13 +141,13 @@ class EnhancedBaseBankParser(ABC):
         
         Strategy:
         1. Extract metadata (year, account info) from first page
-        2. Try table extraction (most accurate for structured PDFs)
-        3. Try text extraction (handles edge cases)
+        2. Run the historically better of table/text extraction first
+        3. Run the other only if the first isn't confident enough
         4. Use whichever yields better results
         5. Post-process (fill balances, dedupe, validate)
         
         Args:
-            pdf_path: Path to PDF file or file-like object
+            pdf_path: Path to PDF file, file-like object or open PdfSession
             
         Returns:
             List of normalized transaction dictionaries
@@ -142,24 +155,25 @@ class EnhancedBaseBankParser(ABC):
         transactions = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
+            with self.open_pdf(pdf_path) as pdf:
                 # Step 1: Extract metadata
                 metadata = self._extract_metadata(pdf)
                 self.logger.info(f"Extracted metadata: year={metadata.get('year')}")
                 
-                # Step 2: Try table extraction
-                table_result = self._try_table_extraction(pdf, metadata)
-                
-                # Step 3: Try text extraction
-                text_result = self._try_text_extraction(pdf, metadata)
-                
-                # Step 4: Choose best result
-                if table_result.confidence > text_result.confidence:
-                    transactions = table_result.transactions
-                    self.logger.info(f"Using table extraction ({table_result.confidence:.0%} confidence, {len(transactions)} txns)")
-                else:
-                    transactions = text_result.transactions
-                    self.logger.info(f"Using text extraction ({text_result.confidence:.0%} confidence, {len(transactions)} txns)")
+                # Steps 2-4: Confidence-gated table/text extraction
+                method, transactions = get_strategy_scheduler().run(
+                    self.parser_name,
+                    {
+                        'table': lambda: self._try_table_extraction(pdf, metadata).transactions,
+                        'text': lambda: self._try_text_extraction(pdf, metadata).transactions,
+                    },
+                    threshold=self.config.strategy_confidence_threshold if self.config else DEFAULT_CONFIDENCE_THRESHOLD,
+                    default_order=self.config.extraction_order if self.config else None,
+                    # If both had to run, tables must beat text outright
+                    select=lambda results: 'table' if results['table'][1] > results['text'][1] else 'text',
+                    confidence=self._calculate_confidence,
+                )
+                self.logger.info(f"Using {method} extraction ({self._calculate_confidence(transactions):.0%} confidence, {len(transactions)} txns)")
             
             # Step 5: Post-process
             transactions = self._post_process(transactions, metadata)
@@ -173,7 +187,7 @@ class EnhancedBaseBankParser(ABC):
         
         return transactions
     
-    def _try_table_extraction(self, pdf: pdfplumber.PDF, metadata: Dict) -> ExtractionResult:
+    def _try_table_extraction(self, pdf: PdfSession, metadata: Dict) -> ExtractionResult:
         """Attempt table-based extraction"""
         try:
             transactions = self._extract_from_tables(pdf, metadata)
@@ -193,7 +207,7 @@ class EnhancedBaseBankParser(ABC):
                 warnings=[str(e)]
             )
     
-    def _try_text_extraction(self, pdf: pdfplumber.PDF, metadata: Dict) -> ExtractionResult:
+    def _try_text_extraction(self, pdf: PdfSession, metadata: Dict) -> ExtractionResult:
         """Attempt text-based extraction"""
         try:
             transactions = self._extract_from_text(pdf, metadata)
@@ -222,34 +236,14 @@ class EnhancedBaseBankParser(ABC):
         - Completeness of fields
         - Balance reconciliation
         """
-        if not transactions:
-            return 0.0
-        
-        score = 0.0
-        
-        # Base score from transaction count
-        score += min(len(transactions) / 10, 1.0) * 0.3  # 30% for having transactions
-        
-        # Completeness score
-        complete_count = sum(
-            1 for txn in transactions
-            if txn.get('date') and txn.get('description') and 
-            (txn.get('debit', 0) > 0 or txn.get('credit', 0) > 0)
-        )
-        score += (complete_count / len(transactions)) * 0.4  # 40% for completeness
-        
-        # Balance score
-        has_balance = sum(1 for txn in transactions if txn.get('balance') is not None)
-        score += (has_balance / len(transactions)) * 0.3  # 30% for balances
-        
-        return min(score, 1.0)
+        return calculate_extraction_confidence(transactions)
     
     # =========================================================================
     # ABSTRACT METHODS (Bank-Specific Implementation Required)
     # =========================================================================
     
     @abstractmethod
-    def _extract_from_tables(self, pdf: pdfplumber.PDF, metadata: Dict) -> List[Dict]:
+    def _extract_from_tables(self, pdf: PdfSession, metadata: Dict) -> List[Dict]:
         """
         Extract transactions from PDF tables.
         
@@ -259,7 +253,7 @@ class EnhancedBaseBankParser(ABC):
         3. Parse rows into transaction dictionaries
         
         Args:
-            pdf: Open pdfplumber PDF object
+            pdf: Open PdfSession
             metadata: Extracted metadata (year, etc.)
             
         Returns:
@@ -268,7 +262,7 @@ class EnhancedBaseBankParser(ABC):
         pass
     
     @abstractmethod
-    def _extract_from_text(self, pdf: pdfplumber.PDF, metadata: Dict) -> List[Dict]:
+    def _extract_from_text(self, pdf: PdfSession, metadata: Dict) -> List[Dict]:
         """
         Extract transactions from PDF text.
         
@@ -278,7 +272,7 @@ class EnhancedBaseBankParser(ABC):
         3. Parse blocks into transaction dictionaries
         
         Args:
-            pdf: Open pdfplumber PDF object
+            pdf: Open PdfSession
             metadata: Extracted metadata (year, etc.)
             
         Returns:
@@ -302,12 +296,12 @@ class EnhancedBaseBankParser(ABC):
     # METADATA EXTRACTION
     # =========================================================================
     
-    def _extract_metadata(self, pdf: pdfplumber.PDF) -> Dict:
+    def _extract_metadata(self, pdf: PdfSession) -> Dict:
         """
         Extract metadata from statement (year, account info, etc.)
         
         Args:
-            pdf: Open pdfplumber PDF object
+            pdf: Open PdfSession
             
         Returns:
             Dictionary with:
@@ -316,7 +310,7 @@ class EnhancedBaseBankParser(ABC):
             - statement_period: Statement period if found (str)
         """
         metadata = {
-            'year': str(datetime.now().year),
+            'year': str(current_year()),
             'account_number': None,
             'statement_period': None,
         }
@@ -495,7 +489,7 @@ class EnhancedBaseBankParser(ABC):
         date_str = date_str.strip()
         
         # Handle ordinal dates (1st, 2nd, 3rd, 4th, etc.)
-        date_str = re.sub(r'(\d+)(st|nd|rd|th)\b', r'\1', date_str, flags=re.IGNORECASE)
+        date_str = strip_ordinals(date_str)
         
         if formats is None:
             formats = self.UK_DATE_FORMATS
@@ -504,18 +498,10 @@ class EnhancedBaseBankParser(ABC):
         if year and not re.search(r'\d{4}', date_str):
             date_str = f"{date_str} {year}"
         
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_str, fmt)
-                
-                # Validate year is reasonable (within 2 years of now)
-                current_year = datetime.now().year
-                if abs(date_obj.year - current_year) > 3:
-                    continue
-                
-                return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
+        # Validate year is reasonable (within 3 years of now)
+        iso_date = parse_date(date_str, tuple(formats), current_year())
+        if iso_date:
+            return iso_date
         
         # Manual parsing fallback
         return self._parse_date_manual(date_str, year)
@@ -539,7 +525,7 @@ class EnhancedBaseBankParser(ABC):
                 else:
                     year_int = int(year_str)
             else:
-                year_int = datetime.now().year
+                year_int = current_year()
             
             try:
                 date_obj = datetime(year_int, month, day)
@@ -591,50 +577,32 @@ class EnhancedBaseBankParser(ABC):
         if date_pattern is None:
             date_pattern = self._get_date_pattern()
         
-        blocks = []
-        i = 0
+        return date_blocks(lines, date_pattern, max_block_lines)
+    
+    def iter_text_blocks(
+        self,
+        page_texts: Iterable[str],
+        date_pattern: str = None,
+        max_block_lines: int = 10
+    ) -> Iterator[List[Dict]]:
+        """
+        Page-incremental group_text_into_blocks() for streaming parsers.
         
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if not line:
-                i += 1
-                continue
-            
-            # Check if line starts with date
-            date_match = re.match(date_pattern, line, re.IGNORECASE)
+        Blocks are released as each page completes; a block still open at
+        the end of a page waits for the next one.
+        
+        Args:
+            page_texts: Text of each page, in order
+            date_pattern: Regex for detecting dates (default: universal)
+            max_block_lines: Maximum lines per block
             
-            if date_match:
-                block_lines = [line]
-                start_idx = i
-                
-                # Look ahead for continuation lines
-                j = i + 1
-                while j < len(lines) and j < i + max_block_lines:
-                    next_line = lines[j].strip()
-                    
-                    # Stop if we hit another date line
-                    if next_line and re.match(date_pattern, next_line, re.IGNORECASE):
-                        break
-                    
-                    if next_line:
-                        block_lines.append(next_line)
-                    
-                    j += 1
-                
-                blocks.append({
-                    'lines': block_lines,
-                    'date_line': line,
-                    'date_match': date_match.group(0),
-                    'start_idx': start_idx,
-                    'end_idx': j - 1
-                })
-                
-                i = j
-            else:
-                i += 1
+        Yields:
+            The block dictionaries completed by each page
+        """
+        if date_pattern is None:
+            date_pattern = self._get_date_pattern()
         
-        return blocks
+        return date_blocks_by_page(page_texts, date_pattern, max_block_lines)
     
     def look_backward_for_description(
         self, 
@@ -785,41 +753,30 @@ class EnhancedBaseBankParser(ABC):
         if not transactions or len(transactions) < 2:
             return transactions
         
-        # Find first known balance
-        first_balance_idx = None
-        for i, txn in enumerate(transactions):
-            if txn.get('balance') is not None:
-                first_balance_idx = i
-                break
-        
+        balances = [
+            NO_BALANCE if txn.get('balance') is None else to_pence(txn['balance'])
+            for txn in transactions
+        ]
+        first_balance_idx = next((i for i, balance in enumerate(balances) if balance != NO_BALANCE), None)
         if first_balance_idx is None:
             return transactions
         
-        # Calculate forward
-        if direction in ('forward', 'both'):
-            current_balance = transactions[first_balance_idx]['balance']
-            for i in range(first_balance_idx + 1, len(transactions)):
-                credit = transactions[i].get('credit', 0) or 0
-                debit = transactions[i].get('debit', 0) or 0
-                current_balance = current_balance + credit - debit
-                
-                if transactions[i].get('balance') is None:
-                    transactions[i]['balance'] = round(current_balance, 2)
-                else:
-                    current_balance = transactions[i]['balance']
-        
-        # Calculate backward
-        if direction in ('backward', 'both') and first_balance_idx > 0:
-            current_balance = transactions[first_balance_idx]['balance']
-            for i in range(first_balance_idx - 1, -1, -1):
-                credit = transactions[i + 1].get('credit', 0) or 0
-                debit = transactions[i + 1].get('debit', 0) or 0
-                current_balance = current_balance - credit + debit
-                
-                if transactions[i].get('balance') is None:
-                    transactions[i]['balance'] = round(current_balance, 2)
-                else:
-                    current_balance = transactions[i]['balance']
+        filled, _ = fill_missing_balances(
+            [to_pence(txn.get('debit', 0) or 0) for txn in transactions],
+            [to_pence(txn.get('credit', 0) or 0) for txn in transactions],
+            balances,
+        )
+        
+        # Rows after the first known balance are filled forwards, rows before it backwards
+        if direction == 'forward':
+            indexes = range(first_balance_idx + 1, len(transactions))
+        elif direction == 'backward':
+            indexes = range(first_balance_idx)
+        else:
+            indexes = range(len(transactions))
+        for i in indexes:
+            if transactions[i].get('balance') is None:
+                transactions[i]['balance'] = filled[i] / 100
         
         return transactions
     
@@ -942,15 +899,18 @@ class EnhancedBaseBankParser(ABC):
     # TEXT EXTRACTION UTILITIES
     # =========================================================================
     
+    @contextmanager
+    def open_pdf(self, pdf_path) -> Iterator[PdfSession]:
+        """Get a PDF session (reusing the converter's), prefetching long documents in parallel"""
+        with open_pdf_session(pdf_path) as pdf:
+            pdf.prefetch(self.PREFETCH_TABLE_SETTINGS)
+            yield pdf
+    
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract all text from PDF"""
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
             
             if not all_text.strip():
                 raise PDFExtractionError("PDF contains no extractable text")
@@ -0,0 +1,246 @@
+"""
+Chunked conversion of long statements.
+A statement is split into page-range chunks that are laid out and parsed
+independently (across a process pool when available), then merged back in
+document order by the parser. Each chunk records the parser state at its
+boundaries, so the merge can stitch transactions that straddle a seam and
+reproduce exactly what a single pass over the document would find.
+
+Finished chunks can be checkpointed to disk: a conversion that is
+interrupted (worker crash, timeout, redeploy) picks up where it stopped
+instead of laying out every page again.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+import io
+import json
+import os
+import tempfile
+
+from .logger import get_parser_logger
+from .page_classifier import BOILERPLATE, PageClassifier
+from .page_region import TransactionRegion
+from .transaction import Transaction
+
+if TYPE_CHECKING:
+    from .pdf_session import PdfSession
+
+
+# Pages per chunk
+CHUNK_PAGES = int(os.getenv('CHUNK_PAGES', '10'))
+
+# Placeholder date for rows a chunk parsed before it saw a date of its own;
+# the merge replaces it with the last date of the previous chunk
+CARRIED_DATE = '<carried>'
+
+logger = get_parser_logger('chunking')
+
+
+@dataclass
+class ChunkResult:
+    """Transactions parsed from one page range, plus its boundary state"""
+    start_page: int
+    end_page: int
+    transactions: List[Transaction] = field(default_factory=list)
+    # Parser-specific position of each transaction (e.g. its first line)
+    positions: List[int] = field(default_factory=list)
+    # Parser-specific boundary state (last date, open block, year, ...)
+    state: Dict[str, Any] = field(default_factory=dict)
+    # Kind of each page in the range (see parsers.page_classifier), if classified
+    page_kinds: List[Optional[str]] = field(default_factory=list)
+
+
+def chunk_ranges(page_count: int, chunk_pages: int) -> List[Tuple[int, int]]:
+    """
+    Split a document into page ranges
+
+    Args:
+        page_count: Pages in the document
+        chunk_pages: Pages per chunk
+
+    Returns:
+        List of (start_page, end_page) half-open ranges, in order
+    """
+    chunk_pages = max(1, chunk_pages)
+    return [(start, min(start + chunk_pages, page_count)) for start in range(0, page_count, chunk_pages)]
+
+
+class ChunkCheckpoint:
+    """
+    Finished chunks of one document, stored as JSON files.
+
+    Files are named after the document key (which should change whenever the
+    PDF or the parser code does) and the page range, and written atomically,
+    so a chunk is either complete on disk or absent.
+    """
+
+    def __init__(self, directory: str, key: str):
+        """
+        Args:
+            directory: Checkpoint directory (created on first save)
+            key: Document key, e.g. result_cache.cache_key() of the PDF
+        """
+        self.directory = directory
+        self.key = key
+
+    def _path(self, start_page: int, end_page: int) -> str:
+        return os.path.join(self.directory, f"{self.key}-{start_page}-{end_page}.json")
+
+    def load(self, start_page: int, end_page: int) -> Optional[ChunkResult]:
+        """Saved result for a page range, or None"""
+        try:
+            with open(self._path(start_page, end_page), 'r', encoding='utf-8') as f:
+                result = ChunkResult(**json.load(f))
+            result.transactions = [Transaction.from_dict(txn) for txn in result.transactions]
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable chunk checkpoint: {e}")
+            return None
+
+    def save(self, result: ChunkResult):
+        """Store a finished chunk (failures are logged, not raised)"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(asdict(result), f)
+            os.replace(tmp_path, self._path(result.start_page, result.end_page))
+        except OSError as e:
+            logger.warning(f"Could not save chunk checkpoint: {e}")
+
+    def clear(self):
+        """Remove every saved chunk of this document"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        prefix = f"{self.key}-"
+        for name in names:
+            if name.startswith(prefix) and name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+def _parse_page_range(bank_id: str, source, start_page: int, end_page: int,
+                      is_last: bool, context: Dict[str, Any],
+                      classifier: Optional[PageClassifier] = None,
+                      region: Optional[TransactionRegion] = None) -> ChunkResult:
+    """
+    Worker for run_chunks: lay out and parse one page range.
+
+    Args:
+        bank_id: Bank whose parser handles the chunk
+        source: PDF path or raw bytes
+        start_page: First page (zero-based)
+        end_page: Page after the last one
+        is_last: Whether the range ends the document
+        context: Document-level state from parser.chunk_context()
+        classifier: Skips boilerplate pages, as the session would
+        region: Transaction region pages are cropped to, as the session would
+
+    Returns:
+        The chunk's ChunkResult
+    """
+    import pdfplumber
+    from . import get_parser
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    page_texts = []
+    page_kinds = []
+    with pdfplumber.open(source) as pdf:
+        for index in range(start_page, end_page):
+            page = pdf.pages[index]
+            kind = classifier.classify(page) if classifier is not None else None
+            page_kinds.append(kind)
+            if kind == BOILERPLATE:
+                page_texts.append('')
+            else:
+                page_texts.append((region.crop(page) if region is not None else page).extract_text() or '')
+            page.close()
+
+    result = get_parser(bank_id).parse_chunk(page_texts, start_page, end_page, is_last, context)
+    result.page_kinds = page_kinds
+    return result
+
+
+def run_chunks(session: 'PdfSession', bank_id: str, chunk_pages: int, context: Dict[str, Any],
+               workers: Optional[int] = None, checkpoint: Optional[ChunkCheckpoint] = None,
+               on_chunk: Optional[Callable[[ChunkResult], None]] = None) -> List[ChunkResult]:
+    """
+    Parse a document as page-range chunks.
+
+    Chunks already in the checkpoint are loaded; the rest are laid out
+    across a process pool (or in-process through the session when the pool
+    is unavailable or workers is 1) and checkpointed as each one finishes.
+
+    Args:
+        session: Open PdfSession of the document
+        bank_id: Bank whose parser handles the chunks
+        chunk_pages: Pages per chunk
+        context: Document-level state from parser.chunk_context()
+        workers: Process count (defaults to PARSER_WORKERS)
+        checkpoint: Where finished chunks are saved and resumed from
+        on_chunk: Called with each chunk as it becomes available
+
+    Returns:
+        ChunkResults in document order
+    """
+    from . import get_parser, pdf_session
+
+    workers = pdf_session.PARSER_WORKERS if workers is None else workers
+    page_count = session.page_count
+    ranges = chunk_ranges(page_count, chunk_pages)
+    results: Dict[int, ChunkResult] = {}
+
+    def finished(result: ChunkResult, resumed: bool = False):
+        results[result.start_page] = result
+        for offset, kind in enumerate(result.page_kinds):
+            page = session.pages[result.start_page + offset]
+            if page.kind is None:
+                page.kind = kind
+        if checkpoint is not None and not resumed:
+            checkpoint.save(result)
+        if on_chunk is not None:
+            on_chunk(result)
+
+    pending = []
+    for start_page, end_page in ranges:
+        saved = checkpoint.load(start_page, end_page) if checkpoint is not None else None
+        if saved is not None:
+            finished(saved, resumed=True)
+        else:
+            pending.append((start_page, end_page))
+
+    if len(ranges) > len(pending):
+        logger.info(f"Resuming: {len(ranges) - len(pending)} of {len(ranges)} chunks already parsed")
+
+    if workers > 1 and len(pending) > 1:
+        try:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            source = session._worker_source()
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                futures = [
+                    pool.submit(_parse_page_range, bank_id, source, start_page, end_page,
+                                end_page == page_count, context, session.classifier, session.region)
+                    for start_page, end_page in pending
+                ]
+                for future in as_completed(futures):
+                    finished(future.result())
+        except Exception as e:
+            logger.warning(f"Parallel chunk parsing unavailable, parsing serially: {e}")
+        pending = [(start, end) for start, end in pending if start not in results]
+
+    parser = get_parser(bank_id)
+    for start_page, end_page in pending:
+        page_texts = [session.pages[index].extract_text() or '' for index in range(start_page, end_page)]
+        result = parser.parse_chunk(page_texts, start_page, end_page, end_page == page_count, context)
+        result.page_kinds = [session.pages[index].kind for index in range(start_page, end_page)]
+        finished(result)
+
+    return [results[start_page] for start_page, _ in ranges]
@@ -0,0 +1,112 @@
+"""
+Description-cleaning rule engine.
+A bank's cleaning rules are an ordered list of regex rewrites. RuleSet
+compiles them once and runs each step as one re.sub pass; rules that can
+be applied together (same replacement, order-independent) are declared as
+one step and compiled into a single alternation.
+
+Merchant strings repeat heavily within and across statements, so whole
+cleaners are memoized from raw to clean text (see cached_cleaner).
+"""
+from functools import lru_cache, partial, wraps
+from typing import Callable, Dict, NamedTuple, Pattern, Sequence, Tuple, Union
+import os
+import re
+
+# Distinct raw descriptions remembered per cleaner
+CLEAN_CACHE_SIZE = int(os.getenv('CLEAN_CACHE_SIZE', '8192'))
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+# Scoped inline flags usable inside a combined alternation
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+
+class Rule(NamedTuple):
+    """One regex rewrite: re.sub(pattern, replacement, text, flags=flags)"""
+    pattern: str
+    replacement: Replacement = ''
+    flags: int = 0
+
+
+def _scoped(rule: Rule) -> str:
+    """The rule's pattern with its flags scoped to it, as (?i:...)"""
+    letters = ''.join(letter for flag, letter in _INLINE_FLAGS if rule.flags & flag)
+    return f"(?{letters}:{rule.pattern})" if letters else f"(?:{rule.pattern})"
+
+
+def compile_step(step: Union[Rule, Sequence[Rule]]) -> Tuple[Pattern, Replacement]:
+    """
+    Compile one step: a single rule, or rules applied in one pass.
+
+    Rules in one pass are tried left to right at each position (like
+    alternation), so they must share a plain-string replacement.
+
+    Raises:
+        ValueError: If combined rules have different or callable replacements
+    """
+    if isinstance(step, Rule):
+        return re.compile(step.pattern, step.flags), step.replacement
+
+    rules = tuple(step)
+    if len(rules) == 1:
+        return compile_step(rules[0])
+    replacement = rules[0].replacement
+    if callable(replacement) or any(rule.replacement != replacement for rule in rules):
+        raise ValueError("Rules combined into one pass need the same string replacement")
+    if '\\' in replacement:
+        raise ValueError("Rules combined into one pass cannot use group references")
+    return re.compile('|'.join(_scoped(rule) for rule in rules)), replacement
+
+
+class RuleSet:
+    """
+    Ordered description-cleaning rules, compiled once.
+
+    Usage:
+        RULES = RuleSet(
+            Rule(r'^\\(\\d+\\)\\s*'),
+            (Rule(r'\\s*Continued.*', flags=re.IGNORECASE), Rule(r'\\s*Registered.*', flags=re.IGNORECASE)),
+            Rule(r'\\s+', ' '),
+        )
+        cleaned = RULES.apply(text)
+    """
+
+    __slots__ = ('passes',)
+
+    def __init__(self, *steps: Union[Rule, Sequence[Rule]]):
+        """
+        Args:
+            steps: Rules in order; a tuple of rules is applied as one pass
+        """
+        self.passes = tuple(compile_step(step) for step in steps)
+
+    def __len__(self) -> int:
+        """Number of re.sub passes per description"""
+        return len(self.passes)
+
+    def apply(self, text: str) -> str:
+        """Run every pass over the text"""
+        for regex, replacement in self.passes:
+            text = regex.sub(replacement, text)
+        return text
+
+
+def cached_cleaner(method: Callable[..., str]) -> Callable[..., str]:
+    """
+    Memoize a parser's description-cleaning method on its arguments.
+
+    Cleaners only read class-level rules, so the cache is kept per parser
+    class (parsers are shared singletons) rather than keyed on the instance.
+    """
+    caches: Dict[type, Callable[..., str]] = {}
+
+    @wraps(method)
+    def cleaner(self, *args, **kwargs):
+        cached = caches.get(type(self))
+        if cached is None:
+            cached = caches.setdefault(type(self), lru_cache(maxsize=CLEAN_CACHE_SIZE)(partial(method, self)))
+        return cached(*args, **kwargs)
+
+    cleaner.caches = caches
+    return cleaner
@@ -28,6 +28,9 @@ class BankConfig:
     # Header detection keywords
     header_keywords: List[str] = field(default_factory=list)
     
+    # Footer text below the transaction table (with page_region.FOOTER_KEYWORDS)
+    footer_keywords: List[str] = field(default_factory=list)
+    
     # Multi-line handling
     max_lookback_lines: int = 3
     max_lookahead_lines: int = 5
@@ -43,6 +46,10 @@ class BankConfig:
     reverse_chronological: bool = False  # True if newest transactions first
     has_running_balance: bool = True
     
+    # Hybrid extraction scheduling (see strategy.py)
+    extraction_order: List[str] = field(default_factory=lambda: ["table", "text"])  # tried first when no history
+    strategy_confidence_threshold: Optional[float] = 0.9  # skip remaining strategies at this confidence (None: never)
+    
     # Additional metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -62,6 +69,7 @@ BANK_CONFIGS: Dict[str, BankConfig] = {
         skip_patterns=["start balance", "end balance", "continued", "barclays bank uk plc"],
         reverse_chronological=False,
         has_running_balance=True,
+        extraction_order=["text", "table"],  # Barclays PDFs work better with text parsing
     ),
     
     "monzo": BankConfig(
@@ -77,6 +85,8 @@ BANK_CONFIGS: Dict[str, BankConfig] = {
         skip_patterns=["reference:", "this relates to"],
         reverse_chronological=True,  # Monzo shows newest first
         has_running_balance=True,
+        extraction_order=["text", "table"],  # Text is usually more reliable for Monzo
+        # Text skips tables at the default threshold only while tables have never won (see MonzoParser)
     ),
     
     "lloyds": BankConfig(
@@ -0,0 +1,237 @@
+"""
+Shared date engine for the bank parsers.
+strptime formats are compiled once into regexes (with the same matching
+rules as datetime.strptime), and every raw date string is parsed once per
+process: statements repeat the same few hundred dates on every row, so
+parse_date() is memoized from (raw string, formats) to the ISO date.
+
+The current year, which year-less and "reasonable year" checks depend on,
+is read once per conversion (see refresh_current_year) instead of on every
+format tried.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+import calendar
+import os
+import re
+
+# Distinct raw date strings remembered (a year of statements has at most 366 per format)
+DATE_CACHE_SIZE = int(os.getenv('DATE_CACHE_SIZE', '4096'))
+
+# Largest distance from the current year accepted for a "reasonable" date
+YEAR_WINDOW = 3
+
+_ORDINAL_SUFFIX = re.compile(r'(\d+)(st|nd|rd|th)\b', re.IGNORECASE)
+
+
+def _alternatives(names: Sequence[str]) -> str:
+    """Regex alternation of names, longest first (as strptime builds it)"""
+    return '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+
+# Field regexes for the strptime directives statements use (same as _strptime)
+_DIRECTIVES = {
+    'd': r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'y': r'(?P<y>\d\d)',
+    'Y': r'(?P<Y>\d\d\d\d)',
+    'b': f"(?P<b>{_alternatives([name.lower() for name in calendar.month_abbr[1:]])})",
+    'B': f"(?P<B>{_alternatives([name.lower() for name in calendar.month_name[1:]])})",
+    '%': '%',
+}
+
+_MONTHS = {name.lower(): index for index, name in enumerate(calendar.month_abbr) if name}
+_MONTHS.update({name.lower(): index for index, name in enumerate(calendar.month_name) if name})
+
+
+class DateFormat:
+    """One strptime format compiled to a regex"""
+
+    __slots__ = ('format', 'regex')
+
+    def __init__(self, fmt: str):
+        """
+        Args:
+            fmt: strptime format using %d, %m, %y, %Y, %b, %B and %%
+
+        Raises:
+            ValueError: If the format uses any other directive
+        """
+        pattern = []
+        index = 0
+        while index < len(fmt):
+            char = fmt[index]
+            if char == '%' and index + 1 < len(fmt):
+                directive = _DIRECTIVES.get(fmt[index + 1])
+                if directive is None:
+                    raise ValueError(f"Unsupported directive '%{fmt[index + 1]}' in date format '{fmt}'")
+                pattern.append(directive)
+                index += 2
+            elif char.isspace():
+                # Any run of whitespace matches any whitespace, as in strptime
+                while index < len(fmt) and fmt[index].isspace():
+                    index += 1
+                pattern.append(r'\s+')
+            else:
+                pattern.append(re.escape(char))
+                index += 1
+        self.format = fmt
+        self.regex = re.compile(''.join(pattern), re.IGNORECASE)
+
+    def match(self, text: str) -> Optional[date]:
+        """The date if the whole text matches the format, else None"""
+        found = self.regex.fullmatch(text)
+        if found is None:
+            return None
+        fields = found.groupdict()
+
+        if fields.get('Y') is not None:
+            year = int(fields['Y'])
+        elif fields.get('y') is not None:
+            # POSIX pivot, as strptime: 69-99 are 1900s, 00-68 are 2000s
+            year = int(fields['y'])
+            year += 1900 if year >= 69 else 2000
+        else:
+            year = 1900
+
+        if fields.get('m') is not None:
+            month = int(fields['m'])
+        elif fields.get('b') is not None or fields.get('B') is not None:
+            month = _MONTHS[(fields.get('b') or fields.get('B')).lower()]
+        else:
+            month = 1
+
+        day = int(fields['d']) if fields.get('d') is not None else 1
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+
+@lru_cache(maxsize=None)
+def compile_format(fmt: str) -> Optional[DateFormat]:
+    """Compiled format (None if it uses a directive strptime would reject here)"""
+    try:
+        return DateFormat(fmt)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(date_str: str, formats: Tuple[str, ...], near_year: Optional[int] = None) -> Optional[str]:
+    """
+    Parse a date with the first matching format.
+
+    Behaves like trying datetime.strptime(date_str, fmt) for each format in
+    turn, but each format is compiled once and each distinct input is only
+    parsed once.
+
+    Args:
+        date_str: Date text (matched as is, not stripped)
+        formats: strptime formats to try, in order (a tuple, so it can be memoized)
+        near_year: If given, skip matches more than YEAR_WINDOW years from it
+
+    Returns:
+        ISO format date (YYYY-MM-DD) or None
+    """
+    for fmt in formats:
+        compiled = compile_format(fmt)
+        if compiled is None:
+            continue
+        parsed = compiled.match(date_str)
+        if parsed is None:
+            continue
+        if near_year is not None and abs(parsed.year - near_year) > YEAR_WINDOW:
+            continue
+        return parsed.strftime('%Y-%m-%d')
+    return None
+
+
+# UK formats parse_date_universal tries, in order
+UK_DATE_FORMATS = (
+    '%d/%m/%Y',       # 18/09/2023
+    '%d/%m/%y',       # 18/09/23
+    '%d-%m-%Y',       # 18-09-2023
+    '%d-%m-%y',       # 18-09-23
+    '%d %B %Y',       # 18 September 2023
+    '%d %b %Y',       # 18 Sep 2023
+    '%d %b %y',       # 18 Sep 23
+)
+
+_DAY_MONTH_NAME = re.compile(r'(\d{1,2})\s+([A-Za-z]{3,9})(?:\s+(\d{2,4}))?')
+_HAS_FULL_YEAR = re.compile(r'\d{4}')
+_ENDS_WITH_YEAR = re.compile(r'\d{2}$')
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_universal(date_str: str, year=None, near_year: Optional[int] = None) -> Optional[str]:
+    """
+    Parse a UK date in any of the formats statements use.
+
+    Handles DD/MM/YYYY, DD/MM/YY, DD-MM-YYYY, DD-MM-YY, DD MMM YYYY,
+    DD MMM YY, DD MMM and ordinal days (1st, 2nd, 3rd, 4th).
+
+    Args:
+        date_str: Date string to parse
+        year: Year to append if not in string
+        near_year: Current year; formatted matches further than YEAR_WINDOW
+                   from it are not trusted
+
+    Returns:
+        ISO format date (YYYY-MM-DD) or None
+    """
+    date_str = strip_ordinals(date_str.strip())
+
+    # Append year if not present
+    if year and not _HAS_FULL_YEAR.search(date_str) and not _ENDS_WITH_YEAR.search(date_str):
+        date_str_with_year = f"{date_str} {year}"
+    else:
+        date_str_with_year = date_str
+
+    iso_date = parse_date(date_str_with_year, UK_DATE_FORMATS, near_year)
+    if iso_date:
+        return iso_date
+
+    # Manual fallback for "DD MMM" with the statement year
+    match = _DAY_MONTH_NAME.match(date_str)
+    if match:
+        month = _MONTHS.get(match.group(2).lower()[:3])
+        year_str = match.group(3) or year
+        if month and year_str:
+            try:
+                if len(str(year_str)) == 2:
+                    year_int = 2000 + int(year_str) if int(year_str) < 50 else 1900 + int(year_str)
+                else:
+                    year_int = int(year_str)
+                return date(year_int, month, int(match.group(1))).strftime('%Y-%m-%d')
+            except (ValueError, TypeError):
+                pass
+    return None
+
+
+def strip_ordinals(date_str: str) -> str:
+    """'1st Mar' -> '1 Mar'"""
+    return _ORDINAL_SUFFIX.sub(r'\1', date_str)
+
+
+def to_uk_date(iso_date: str) -> str:
+    """'YYYY-MM-DD' -> 'DD/MM/YYYY'"""
+    return f"{iso_date[8:10]}/{iso_date[5:7]}/{iso_date[:4]}"
+
+
+_current_year: Optional[int] = None
+
+
+def current_year() -> int:
+    """Current year, as read at the start of this conversion"""
+    if _current_year is None:
+        return refresh_current_year()
+    return _current_year
+
+
+def refresh_current_year() -> int:
+    """Re-read the current year (called once at the start of each conversion)"""
+    global _current_year
+    _current_year = datetime.now().year
+    return _current_year
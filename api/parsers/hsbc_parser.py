@@ -2,17 +2,21 @@
 HSBC Bank Statement Parser
 Handles multi-line transactions with clear payment in/out columns
 """
-import pdfplumber
 import re
 from typing import List, Dict
-from datetime import datetime
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
+    from .transaction import Transaction
+    from .dates import parse_date
+    from .amounts import AmountToken, AmountTokenizer, MONEY_GROUPED
+    from .cleaning import Rule, RuleSet, cached_cleaner
+    from .layout import LayoutColumn, LayoutRow
+    from .line_lexer import BALANCE_MARKER, DATE_START, HEADER, TYPE_CODE, BlockGrouper, LineLexer
+    from .money import parse_pence
     from .config import get_config, get_type_name
     from ..utils import clean_description
 except ImportError:
@@ -20,32 +24,113 @@ except ImportError:
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
+    from parsers.transaction import Transaction
+    from parsers.dates import parse_date
+    from parsers.amounts import AmountToken, AmountTokenizer, MONEY_GROUPED
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
+    from parsers.layout import LayoutColumn, LayoutRow
+    from parsers.line_lexer import BALANCE_MARKER, DATE_START, HEADER, TYPE_CODE, BlockGrouper, LineLexer
+    from parsers.money import parse_pence
     from parsers.config import get_config, get_type_name
     from utils import clean_description
 
 
+# Description prefixes for HSBC type codes (see _clean_hsbc_description)
+DESCRIPTION_PREFIXES = {
+    'ATM/VIS': 'Card Payment - ',
+    'DD': 'Direct Debit - ',
+    'SO': 'Standing Order - ',
+    'ATM': 'ATM - ',
+    'VIS': 'Card Payment - ',
+    'BP': 'Bill Payment - ',
+    'FPI': 'Faster Payment In - ',
+    'FPO': 'Faster Payment Out - ',
+    'BGC': 'Bank Giro Credit - ',
+    'CHQ': 'Cheque - ',
+    'CPT': 'Card Payment - ',
+    'TFR': 'Transfer - ',
+    'CR': 'Credit - ',
+}
+
+
 class HSBCParser(BaseBankParser):
     """Parser for HSBC Bank UK statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('hsbc')
-        self.config = get_config('hsbc')
+    # Money on HSBC lines: 1,234.56 with no noise to skip
+    AMOUNTS = AmountTokenizer(MONEY_GROUPED, noise=())
+
+    # Type codes that start a transaction line (after its date, or alone under the previous one)
+    TYPE_CODES = ('DD', 'SO', 'ATM', 'VIS', 'CR', 'BP', 'FPI', 'FPO', 'BGC', 'CHQ', 'CPT', 'TFR')
+
+    # Text-path lines, lexed once, and how they group into transactions
+    # (see parsers.line_lexer)
+    LEXER = LineLexer(
+        r'^(\d{2}\s+[A-Z][a-z]{2}\s+\d{2})\s+',
+        type_codes=TYPE_CODES,
+        header=r'^(?=.*Date)(?=.*Payment type)(?=.*Balance)',
+        balance_marker=re.compile(r'^(?=.*BALANCE)(?=.*(?:FORWARD|CARRIED))', re.IGNORECASE),
+        balance=r'^\d{1,5}(?:,\d{3})*\.\d{2}\s*$',
+        amounts=AMOUNTS,
+    )
+    BLOCKS = BlockGrouper(
+        stop=(DATE_START, TYPE_CODE, BALANCE_MARKER),
+        skip=(BALANCE_MARKER,),
+        take_balance=True,
+        carry_date=True,
+        min_lines_without_amount=2,
+    )
+
+    # Statement columns, read by word position so paid out and paid in
+    # never need guessing from the description
+    LAYOUT_COLUMNS = (
+        LayoutColumn('date', ('Date',)),
+        LayoutColumn('details', ('Payment type and details', 'Payment type')),
+        LayoutColumn('out', ('Paid out',), numeric=True),
+        LayoutColumn('in', ('Paid in',), numeric=True),
+        LayoutColumn('balance', ('Balance',), numeric=True),
+    )
+
+    # Description cleaning rules (see _clean_hsbc_description)
+    DESCRIPTION_RULES = RuleSet(
+        # Handle special patterns
+        Rule(r'CASH\s+LLOYTSB'),
+        Rule(r'CASHPOINT', 'ATM'),
+
+        # Map type codes (at most one prefix applies, so they share one pass)
+        Rule(
+            r'^(' + '|'.join(re.escape(code) for code in DESCRIPTION_PREFIXES) + r')\s+',
+            lambda match: DESCRIPTION_PREFIXES[match.group(1).upper()],
+            flags=re.IGNORECASE,
+        ),
+
+        # Remove duplicates
+        Rule(r'ATM\s+-\s+ATM Withdrawal', 'ATM'),
+        Rule(r'ATM Withdrawal\s+-\s+ATM Withdrawal', 'ATM Withdrawal'),
+
+        # Remove standalone type codes
+        Rule(r'^(DD|SO|ATM|VIS|CR|BP|FPI|FPO|BGC|CHQ|CPT|TFR|ATM/VIS)\s*$', 'Transaction'),
+
+        # Remove reference numbers
+        Rule(r'\b\d{10,}\b'),
+        Rule(r'\b[A-Z]{3}\d{1,2}\b'),
+        Rule(r'@\d{2}:\d{2}'),
+
+        # Clean spaces
+        Rule(r'\s+', ' '),
+    )
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """Extract transactions from HSBC statement"""
         transactions = []
 
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                transactions = self._parse_hsbc_layout(self.extract_layout_rows(pdf))
 
-            transactions = self._parse_hsbc_text(all_text)
+                if not transactions:
+                    # No recognisable column header: fall back to the text
+                    self.logger.debug("No transactions from layout, parsing text")
+                    transactions = self._parse_hsbc_text(pdf.full_text())
 
         except Exception as e:
             self.logger.error(f"Error parsing HSBC PDF: {str(e)}")
@@ -54,122 +139,99 @@ class HSBCParser(BaseBankParser):
 
         return transactions
 
-    def _parse_hsbc_text(self, text: str) -> List[Dict]:
-        """Parse transactions from HSBC statement text using block-based approach"""
-        transactions = []
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-        self.logger.info(f"Processing {len(lines)} lines")
-
-        # Date pattern: DD MMM YY
-        date_pattern = r'^(\d{2}\s+[A-Z][a-z]{2}\s+\d{2})\s+'
-        amount_pattern = r'\d{1,5}(?:,\d{3})*\.\d{2}'
-
-        # Find header line
-        header_idx = -1
-        for i, line in enumerate(lines):
-            if 'Date' in line and 'Payment type' in line and 'Balance' in line:
-                header_idx = i
-                self.logger.debug(f"Found header at line {i}: {line}")
-                break
-
-        if header_idx == -1:
-            self.logger.warning("No header found")
-            return transactions
+    def _parse_hsbc_layout(self, rows: List[LayoutRow]) -> List[Dict]:
+        """
+        Parse transactions from statement rows split into columns by position.
 
-        # Group lines into transaction blocks
-        self.logger.debug("Grouping lines into transaction blocks...")
-        blocks = []
-        i = header_idx + 1
-        last_date = None
+        A transaction starts on a dated row, or on a row opening with a
+        type code (which carries the previous date). Details can run over
+        several rows; the amounts sit on the last one.
+        """
+        transactions = []
+        date_str = None
+        details = None   # None outside a transaction
 
-        while i < len(lines):
-            line = lines[i]
+        for row in rows:
+            cells = row.cells
+            text = cells['details']
+            tokens = self.LEXER.lex(text).tokens
 
             # Skip balance forward/carried lines
-            if 'BALANCE' in line.upper() and ('FORWARD' in line.upper() or 'CARRIED' in line.upper()):
-                self.logger.debug(f"Skipping: {line}")
-                i += 1
+            if BALANCE_MARKER in tokens:
+                details = None
                 continue
 
-            date_match = re.match(date_pattern, line)
-            type_code_pattern = r'^(DD|SO|ATM|VIS|CR|BP|FPI|FPO|BGC|CHQ|CPT|TFR)\s+'
-            type_match = re.match(type_code_pattern, line) if not date_match else None
-
-            if date_match or (type_match and last_date):
-                block_start_idx = i
-
-                if date_match:
-                    current_date = date_match.group(1)
-                    last_date = current_date
-                    block_lines = [line]
-                else:
-                    current_date = last_date
-                    block_lines = [f"{current_date}  {line}"]
-
-                j = i + 1
-                found_amount = bool(re.search(amount_pattern, line))
-
-                while j < len(lines):
-                    next_line = lines[j]
+            if re.match(r'^\d{2}\s+[A-Z][a-z]{2}\s+\d{2}$', cells['date']):
+                date_str = cells['date']
+                details = []
+            elif date_str and TYPE_CODE in tokens:
+                details = []
+            elif details is None:
+                continue
+            if text:
+                details.append(text)
 
-                    if re.match(date_pattern, next_line):
-                        break
+            paid_out = sum(self.AMOUNTS.amounts(cells['out']))
+            paid_in = sum(self.AMOUNTS.amounts(cells['in']))
+            if not paid_out and not paid_in:
+                continue
 
-                    if 'BALANCE' in next_line.upper() and ('FORWARD' in next_line.upper() or 'CARRIED' in next_line.upper()):
-                        break
+            # Overdrawn balances are marked D (or printed negative)
+            balance_text, _, marker = cells['balance'].partition(' ')
+            balance = parse_pence(balance_text)
+            if balance is not None and marker.upper() == 'D':
+                balance = -balance
+
+            parsed_date = parse_date(date_str, ('%d %b %y',))
+            if parsed_date:
+                transactions.append(Transaction(
+                    date=parsed_date,
+                    description=self._clean_hsbc_description(' '.join(details)),
+                    debit=0.0 if paid_in else paid_out / 100,
+                    credit=paid_in / 100,
+                    balance=balance / 100 if balance is not None else None,
+                    type='income' if paid_in else 'expense',
+                ))
+            details = None
 
-                    if re.match(type_code_pattern, next_line):
-                        break
+        transactions.sort(key=lambda x: x['date'])
 
-                    block_lines.append(next_line)
+        self.logger.info(f"Extracted {len(transactions)} transactions from layout")
 
-                    if re.search(amount_pattern, next_line):
-                        found_amount = True
-                        j += 1
-                        if j < len(lines) and not re.match(date_pattern, lines[j]):
-                            potential_balance_line = lines[j]
-                            if re.match(r'^\d{1,5}(?:,\d{3})*\.\d{2}\s*$', potential_balance_line):
-                                block_lines.append(potential_balance_line)
-                                j += 1
-                        break
+        return transactions
 
-                    j += 1
+    def _parse_hsbc_text(self, text: str) -> List[Dict]:
+        """Parse transactions from HSBC statement text using block-based approach"""
+        transactions = []
+        lines = self.LEXER.lex_lines(line for line in text.split('\n') if line.strip())
 
-                if found_amount or len(block_lines) > 1:
-                    blocks.append({
-                        'lines': block_lines,
-                        'start_idx': block_start_idx,
-                        'end_idx': j - 1
-                    })
-                    self.logger.debug(f"Block {len(blocks)}: {len(block_lines)} lines")
+        self.logger.info(f"Processing {len(lines)} lines")
 
-                i = j
-            else:
-                i += 1
+        # Find header line
+        header_idx = next((i for i, line in enumerate(lines) if HEADER in line.tokens), -1)
+        if header_idx == -1:
+            self.logger.warning("No header found")
+            return transactions
+        self.logger.debug(f"Found header at line {header_idx}: {lines[header_idx].text}")
 
+        # Group lines into transaction blocks
+        blocks = self.BLOCKS.group(lines, start=header_idx + 1)
         self.logger.debug(f"Created {len(blocks)} transaction blocks")
 
         # Parse each block
         for block_num, block in enumerate(blocks, 1):
-            block_lines = block['lines']
-
-            if not block_lines:
-                continue
+            block_lines = block.lines
+            if DATE_START not in block.first.tokens:
+                # Type-code line under the previous transaction's date
+                block_lines = [f"{block.date}  {block_lines[0]}", *block_lines[1:]]
 
+            date_str = block.date
             first_line = block_lines[0]
-            date_match = re.match(date_pattern, first_line)
-
-            if not date_match:
-                self.logger.debug(f"Block {block_num}: No date found")
-                continue
-
-            date_str = date_match.group(1)
             after_date = first_line[len(date_str):].strip()
             combined_text = ' '.join(block_lines)
-            amounts = re.findall(amount_pattern, combined_text)
+            money = self.AMOUNTS.money(combined_text)
 
-            if len(amounts) < 1:
+            if not money:
                 self.logger.debug(f"Block {block_num}: No amounts found, skipping")
                 continue
 
@@ -179,7 +241,7 @@ class HSBCParser(BaseBankParser):
                 description_parts.append(after_date)
 
             for line in block_lines[1:]:
-                line_without_amounts = re.sub(amount_pattern, '', line).strip()
+                line_without_amounts = self.AMOUNTS.strip_money(line).strip()
                 line_without_amounts = re.sub(r'£', '', line_without_amounts).strip()
                 if line_without_amounts and len(line_without_amounts) > 2:
                     description_parts.append(line_without_amounts)
@@ -189,7 +251,7 @@ class HSBCParser(BaseBankParser):
             transaction = self._parse_hsbc_transaction_block(
                 date_str=date_str,
                 description=full_description,
-                amounts=amounts,
+                money=money,
                 block_num=block_num
             )
 
@@ -202,15 +264,15 @@ class HSBCParser(BaseBankParser):
 
         return transactions
 
-    def _parse_hsbc_transaction_block(self, date_str: str, description: str, amounts: list, block_num: int) -> Dict:
+    def _parse_hsbc_transaction_block(self, date_str: str, description: str, money: List[AmountToken], block_num: int) -> Transaction:
         """Parse a transaction block into a transaction dictionary"""
         paid_out = 0.0
         paid_in = 0.0
         balance = None
+        amounts = [token.pence for token in money]
 
         if len(amounts) == 1:
-            transaction_amount_str = amounts[0].replace(',', '')
-            transaction_amount = float(transaction_amount_str)
+            transaction_amount = amounts[0] / 100
 
             if any(keyword in description.upper() for keyword in [' CR ', 'WAGES', 'SALARY', 'DEPOSIT', 'TRANSFER IN', 'CREDIT', 'PAYMENT IN']):
                 paid_in = transaction_amount
@@ -219,11 +281,8 @@ class HSBCParser(BaseBankParser):
             balance = None
 
         elif len(amounts) == 2:
-            transaction_amount_str = amounts[0].replace(',', '')
-            balance_str = amounts[1].replace(',', '')
-
-            transaction_amount = float(transaction_amount_str)
-            balance = float(balance_str)
+            transaction_amount = amounts[0] / 100
+            balance = amounts[1] / 100
 
             if any(keyword in description.upper() for keyword in [' CR ', 'WAGES', 'SALARY', 'DEPOSIT', 'TRANSFER IN', 'CREDIT']):
                 paid_in = transaction_amount
@@ -231,46 +290,28 @@ class HSBCParser(BaseBankParser):
                 paid_out = transaction_amount
 
         elif len(amounts) == 3:
-            balance_str = amounts[2].replace(',', '')
-            balance = float(balance_str)
+            balance = amounts[2] / 100
 
-            try:
-                amt1 = float(amounts[0].replace(',', ''))
-                amt2 = float(amounts[1].replace(',', ''))
-
-                if amt1 > 0:
-                    paid_out = amt1
-                if amt2 > 0:
-                    paid_in = amt2
-            except:
-                pass
+            if amounts[0] > 0:
+                paid_out = amounts[0] / 100
+            if amounts[1] > 0:
+                paid_in = amounts[1] / 100
 
         elif len(amounts) > 3:
-            balance_str = amounts[-1].replace(',', '')
-            balance = float(balance_str)
-
-            try:
-                paid_out = float(amounts[-3].replace(',', ''))
-            except:
-                paid_out = 0.0
-
-            try:
-                paid_in = float(amounts[-2].replace(',', ''))
-            except:
-                paid_in = 0.0
+            balance = amounts[-1] / 100
+            paid_out = amounts[-3] / 100
+            paid_in = amounts[-2] / 100
 
         # Remove amounts from description
         clean_desc = description
-        for amount in amounts:
-            clean_desc = clean_desc.replace(amount, '')
+        for token in money:
+            clean_desc = clean_desc.replace(token.text, '')
         clean_desc = clean_desc.replace('£', '')
         clean_desc = self._clean_hsbc_description(clean_desc)
 
         # Parse date
-        try:
-            date_obj = datetime.strptime(date_str, '%d %b %y')
-            parsed_date = date_obj.strftime('%Y-%m-%d')
-        except:
+        parsed_date = parse_date(date_str, ('%d %b %y',))
+        if not parsed_date:
             self.logger.debug(f"Block {block_num}: Invalid date: {date_str}")
             return None
 
@@ -283,14 +324,14 @@ class HSBCParser(BaseBankParser):
             credit = 0.0
             tx_type = 'expense'
 
-        transaction = {
-            'date': parsed_date,
-            'description': clean_desc,
-            'debit': debit,
-            'credit': credit,
-            'balance': balance,
-            'type': tx_type
-        }
+        transaction = Transaction(
+            date=parsed_date,
+            description=clean_desc,
+            debit=debit,
+            credit=credit,
+            balance=balance,
+            type=tx_type
+        )
 
         amount_display = f"£{credit:.2f}" if credit > 0 else f"-£{debit:.2f}"
         balance_display = f"£{balance:.2f}" if balance else "N/A"
@@ -298,51 +339,13 @@ class HSBCParser(BaseBankParser):
 
         return transaction
 
+    @cached_cleaner
     def _clean_hsbc_description(self, text: str) -> str:
         """Clean HSBC transaction description"""
         if not text:
             return ""
 
-        cleaned = text
-
-        # Handle special patterns
-        cleaned = re.sub(r'CASH\s+LLOYTSB', '', cleaned)
-        cleaned = re.sub(r'CASHPOINT', 'ATM', cleaned)
-
-        # Map type codes
-        type_mappings = {
-            r'^DD\s+': 'Direct Debit - ',
-            r'^SO\s+': 'Standing Order - ',
-            r'^ATM/VIS\s+': 'Card Payment - ',
-            r'^ATM\s+': 'ATM - ',
-            r'^VIS\s+': 'Card Payment - ',
-            r'^BP\s+': 'Bill Payment - ',
-            r'^FPI\s+': 'Faster Payment In - ',
-            r'^FPO\s+': 'Faster Payment Out - ',
-            r'^BGC\s+': 'Bank Giro Credit - ',
-            r'^CHQ\s+': 'Cheque - ',
-            r'^CPT\s+': 'Card Payment - ',
-            r'^TFR\s+': 'Transfer - ',
-            r'^CR\s+': 'Credit - ',
-        }
-
-        for pattern, replacement in type_mappings.items():
-            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
-
-        # Remove duplicates
-        cleaned = re.sub(r'ATM\s+-\s+ATM Withdrawal', 'ATM', cleaned)
-        cleaned = re.sub(r'ATM Withdrawal\s+-\s+ATM Withdrawal', 'ATM Withdrawal', cleaned)
-
-        # Remove standalone type codes
-        cleaned = re.sub(r'^(DD|SO|ATM|VIS|CR|BP|FPI|FPO|BGC|CHQ|CPT|TFR|ATM/VIS)\s*$', 'Transaction', cleaned)
-
-        # Remove reference numbers
-        cleaned = re.sub(r'\b\d{10,}\b', '', cleaned)
-        cleaned = re.sub(r'\b[A-Z]{3}\d{1,2}\b', '', cleaned)
-        cleaned = re.sub(r'@\d{2}:\d{2}', '', cleaned)
-
-        # Clean spaces
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = self.DESCRIPTION_RULES.apply(text)
         cleaned = cleaned.strip()
         cleaned = cleaned.strip('.,;:- ')
 
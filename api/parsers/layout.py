@@ -0,0 +1,167 @@
+"""
+Geometric word layout for statement tables.
+Statements print transactions in fixed columns under a header row
+(Date | Details | Paid out | Paid in | Balance). Rather than flattening the
+page with extract_text() and guessing columns back from the numbers on
+each line, a ColumnLayout learns the columns' x-positions from the header
+row's words and assigns every word below it to a column by position, all
+from one extract_words() pass.
+
+Parsers opt in by declaring their columns as BaseBankParser.LAYOUT_COLUMNS
+and reading rows with extract_layout_rows().
+"""
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import re
+
+
+# Words whose tops are this close (in points) are on the same line
+LINE_TOLERANCE = 3.0
+
+# A word straddling the start of the amount columns is read as an amount
+# only when it looks like one (e.g. a wide balance under a right-aligned header)
+_NUMBER = re.compile(r'[£(+-]*\d[\d,]*(?:\.\d+)?\)?[+-]?$')
+
+
+class LayoutColumn(NamedTuple):
+    """One statement column and the header text that labels it"""
+    name: str
+    headers: Tuple[str, ...]   # Header phrases, tried in order
+    numeric: bool = False      # Right-aligned amounts rather than left-aligned text
+
+
+class LayoutRow(NamedTuple):
+    """One printed line below a header, its words split by column"""
+    page: int
+    top: float
+    cells: Dict[str, str]      # Column name -> text ('' when empty)
+
+
+def group_lines(words: Sequence[Dict], tolerance: float = LINE_TOLERANCE) -> List[List[Dict]]:
+    """
+    Group pdfplumber words into printed lines, top to bottom.
+
+    Args:
+        words: Words from page.extract_words()
+        tolerance: Largest difference in `top` within one line
+
+    Returns:
+        Lines, each a list of words left to right
+    """
+    lines = []
+    line_top = None
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        if line_top is None or word['top'] - line_top > tolerance:
+            lines.append([])
+            line_top = word['top']
+        lines[-1].append(word)
+    for line in lines:
+        line.sort(key=lambda w: w['x0'])
+    return lines
+
+
+def _find_phrase(line: List[Dict], phrase: str) -> Optional[Tuple[float, float]]:
+    """(x0, x1) of the words spelling `phrase` in a line, ignoring case"""
+    target = phrase.lower().split()
+    texts = [word['text'].lower() for word in line]
+    for i in range(len(texts) - len(target) + 1):
+        if texts[i:i + len(target)] == target:
+            return line[i]['x0'], line[i + len(target) - 1]['x1']
+    return None
+
+
+class ColumnLayout:
+    """
+    Column positions learned from a statement's header row.
+
+    Text columns are left-aligned, so a text word belongs to the last text
+    column whose header starts at or before it. Amounts are right-aligned
+    and can run wider than their header, so a word in the amount area
+    belongs to the amount column whose header it overlaps or sits closest to.
+
+    Usage:
+        layout = ColumnLayout.from_header(line, columns)
+        if layout:
+            cells = layout.split(next_line)   # {'date': '01 Jun 24', 'out': '79.60', ...}
+    """
+
+    __slots__ = ('columns', 'spans', '_text_starts', '_text_names', '_numeric', '_numeric_start')
+
+    def __init__(self, columns: Sequence[LayoutColumn], spans: Dict[str, Tuple[float, float]]):
+        """
+        Args:
+            columns: The statement's columns
+            spans: Header (x0, x1) of every column
+        """
+        self.columns = tuple(columns)
+        self.spans = spans
+        text = sorted((spans[c.name][0], c.name) for c in self.columns if not c.numeric)
+        self._text_starts = [x0 for x0, _ in text]
+        self._text_names = [name for _, name in text]
+        self._numeric = [(c.name, spans[c.name]) for c in self.columns if c.numeric]
+        self._numeric_start = min((x0 for _, (x0, _) in self._numeric), default=float('inf'))
+
+    @classmethod
+    def from_header(cls, line: List[Dict], columns: Sequence[LayoutColumn]) -> Optional['ColumnLayout']:
+        """The layout if the line is a header naming every column, else None"""
+        spans = {}
+        for column in columns:
+            for phrase in column.headers:
+                span = _find_phrase(line, phrase)
+                if span:
+                    spans[column.name] = span
+                    break
+            else:
+                return None
+        return cls(columns, spans)
+
+    def column_for(self, word: Dict) -> str:
+        """Name of the column a word sits in"""
+        x0, x1 = word['x0'], word['x1']
+        in_amounts = x0 >= self._numeric_start or (
+            x1 > self._numeric_start and _NUMBER.match(word['text'])
+        )
+        if in_amounts or not self._text_names:
+            return min(
+                self._numeric,
+                key=lambda item: (
+                    max(0.0, item[1][0] - x1, x0 - item[1][1]),
+                    abs((item[1][0] + item[1][1]) - (x0 + x1)),
+                ),
+            )[0]
+        index = bisect_right(self._text_starts, x0 + LINE_TOLERANCE) - 1
+        return self._text_names[max(index, 0)]
+
+    def split(self, line: List[Dict]) -> Dict[str, str]:
+        """A line's text by column (every column present, '' when empty)"""
+        parts: Dict[str, List[str]] = {column.name: [] for column in self.columns}
+        for word in line:
+            parts[self.column_for(word)].append(word['text'])
+        return {name: ' '.join(texts) for name, texts in parts.items()}
+
+
+def read_layout_rows(words: Sequence[Dict], columns: Sequence[LayoutColumn], page: int = 0,
+                     layout: Optional[ColumnLayout] = None) -> Tuple[Optional[ColumnLayout], List[LayoutRow]]:
+    """
+    Split a page's words into table rows under its header.
+
+    Args:
+        words: Words from page.extract_words()
+        columns: The statement's columns
+        page: Page index recorded on each row
+        layout: Layout carried from an earlier page, used when this page
+                has no header row of its own
+
+    Returns:
+        (layout, rows): the page's layout (None if it has no header and
+        none was carried) and its rows below the header
+    """
+    lines = group_lines(words)
+    for index, line in enumerate(lines):
+        header = ColumnLayout.from_header(line, columns)
+        if header is not None:
+            layout, lines = header, lines[index + 1:]
+            break
+    if layout is None:
+        return None, []
+    return layout, [LayoutRow(page, line[0]['top'], layout.split(line)) for line in lines]
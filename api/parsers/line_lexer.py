@@ -0,0 +1,377 @@
+"""
+Line lexing and block grouping for text statements.
+Text parsers group statement lines into transaction blocks: a dated line
+opens a block, continuation lines follow, and the block closes at the next
+date, at a header or footer, or once its amounts have been read. Scanning
+ahead that way re-runs the same date, amount and type-code regexes on each
+line several times. A LineLexer classifies every line once into tokens,
+and a BlockGrouper forms blocks from the token stream in one linear pass.
+
+Token kinds:
+
+    date_start      - the line opens with a date
+    type_code       - the line opens with a transaction type code (DD, SO, ...)
+    amount          - the line holds an amount
+    balance         - the line is nothing but an amount (a wrapped balance)
+    balance_marker  - balance brought/carried forward and similar lines
+    header          - the transaction table's column headings
+    footer          - page furniture and totals between transactions
+    end             - the end of the transaction table
+"""
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Tuple, Union
+import os
+import re
+
+from .amounts import AmountTokenizer
+
+
+# Token kinds
+DATE_START = 'date_start'
+TYPE_CODE = 'type_code'
+AMOUNT = 'amount'
+BALANCE = 'balance'
+BALANCE_MARKER = 'balance_marker'
+HEADER = 'header'
+FOOTER = 'footer'
+END = 'end'
+
+# Distinct lines remembered per lexer
+LEX_CACHE_SIZE = int(os.getenv('LEX_CACHE_SIZE', '8192'))
+
+PatternLike = Union[str, Pattern]
+
+
+def _compile(pattern: Optional[PatternLike]) -> Optional[Pattern]:
+    if pattern is None or isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern)
+
+
+class Line(NamedTuple):
+    """One statement line and the tokens it was lexed into"""
+    text: str                          # The line, stripped
+    tokens: FrozenSet[str]
+    date_match: Optional[re.Match]     # The date_start match, if any
+
+    @property
+    def date(self) -> Optional[str]:
+        """The date text (the date pattern's first group, if it has one)"""
+        if self.date_match is None:
+            return None
+        return self.date_match.group(1) if self.date_match.re.groups else self.date_match.group(0)
+
+
+class LineLexer:
+    """
+    Classifies statement lines into tokens, each distinct line once.
+
+    Usage:
+        lexer = LineLexer(r'^(\\d{2}\\s+[A-Z][a-z]{2}\\s+\\d{2})\\s+', type_codes=('DD', 'SO'),
+                          amounts=SAFE_AMOUNTS)
+        lines = lexer.lex_lines(text.split('\\n'))
+        if DATE_START in lines[0].tokens:
+            ...
+    """
+
+    def __init__(self, date_pattern: PatternLike, type_codes: Iterable[str] = (),
+                 header: Optional[PatternLike] = None, footer: Optional[PatternLike] = None,
+                 balance_marker: Optional[PatternLike] = None, end: Optional[PatternLike] = None,
+                 balance: Optional[PatternLike] = None, amounts: Optional[AmountTokenizer] = None):
+        """
+        Args:
+            date_pattern: Matched at the start of the line (a compiled pattern keeps its flags)
+            type_codes: Transaction type codes, matched at the start followed by whitespace
+            header: Searched for in the line
+            footer: Searched for in the line
+            balance_marker: Searched for in the line
+            end: Searched for in the line
+            balance: Matched against the whole line
+            amounts: Tokenizer deciding whether the line holds an amount
+        """
+        self.date = _compile(date_pattern)
+        codes = '|'.join(re.escape(code) for code in type_codes)
+        self.type_code = re.compile(rf'^({codes})\s+') if codes else None
+        self.searched = [
+            (kind, _compile(pattern))
+            for kind, pattern in ((HEADER, header), (FOOTER, footer), (BALANCE_MARKER, balance_marker), (END, end))
+            if pattern is not None
+        ]
+        self.balance = _compile(balance)
+        self.amounts = amounts
+
+        # Checks for the tokens after date_start, as bound methods
+        checks = [
+            (kind, check)
+            for kind, check in (
+                (TYPE_CODE, self.type_code.match if self.type_code is not None else None),
+                (AMOUNT, amounts.has_amount if amounts is not None else None),
+                (BALANCE, self.balance.match if self.balance is not None else None),
+                *((kind, pattern.search) for kind, pattern in self.searched),
+            )
+            if check is not None
+        ]
+        # Bit n of a line's token mask stands for kinds[n]
+        self.kinds = [DATE_START] + [kind for kind, _ in checks]
+        self.checks = [(2 << n, check) for n, (_, check) in enumerate(checks)]
+
+        # Lines share a handful of token combinations; each set is built once
+        self.token_sets = {}
+        self.lex = lru_cache(maxsize=LEX_CACHE_SIZE)(self._lex)
+
+    def _tokens(self, mask: int) -> FrozenSet[str]:
+        tokens = self.token_sets.get(mask)
+        if tokens is None:
+            tokens = self.token_sets[mask] = frozenset(
+                kind for n, kind in enumerate(self.kinds) if mask & (1 << n)
+            )
+        return tokens
+
+    def _lex(self, line: str) -> Line:
+        text = line.strip()
+        if not text:
+            return Line(text, self._tokens(0), None)
+
+        date_match = self.date.match(text)
+        mask = 1 if date_match else 0
+        for bit, check in self.checks:
+            if check(text):
+                mask |= bit
+        return Line(text, self._tokens(mask), date_match)
+
+    def lex_lines(self, lines: Iterable[str]) -> List[Line]:
+        """Lex every line, in order"""
+        return [self.lex(line) for line in lines]
+
+
+@lru_cache(maxsize=32)
+def date_lexer(date_pattern: str) -> LineLexer:
+    """Shared lexer that only recognises lines starting with a date (case-insensitive)"""
+    return LineLexer(re.compile(date_pattern, re.IGNORECASE))
+
+
+class Block(NamedTuple):
+    """Lines grouped into one transaction"""
+    lines: List[str]
+    first: Line                # The line that opened the block
+    date: Optional[str]        # Its date, or the date carried to a type-code line
+    start_idx: int
+    end_idx: int               # Index of the last line read into the block
+    has_amount: bool
+
+
+class BlockGrouper:
+    """
+    Forms transaction blocks from lexed lines in one linear pass.
+
+    Outside a block, lines with `skip` tokens are passed over and an `end`
+    token stops grouping. A date_start line opens a block (as does a
+    type_code line, with the previous date, when carry_date is set). The
+    block takes following lines until one has a `stop` token, until
+    max_lines lines from its start, or, with close_on_amount, through the
+    first continuation line holding an amount (and, with take_balance, a
+    wrapped balance on the line after it). Scanning resumes after the
+    last line read.
+
+    Usage:
+        grouper = BlockGrouper(stop=(DATE_START, HEADER), skip=(FOOTER,))
+        for block in grouper.group(lexer.lex_lines(lines), start=header_idx + 1):
+            ...
+    """
+
+    def __init__(self, stop: Iterable[str] = (DATE_START,), skip: Iterable[str] = (), end: Iterable[str] = (),
+                 close_on_amount: bool = True, take_balance: bool = False, carry_date: bool = False,
+                 max_lines: Optional[int] = None, min_lines_without_amount: Optional[int] = None):
+        """
+        Args:
+            stop: Tokens of a line that closes the open block (the line is not read)
+            skip: Tokens of a line passed over outside blocks
+            end: Tokens of a line that ends the transaction table
+            close_on_amount: Close a block after the first continuation line with an amount
+            take_balance: Then also read a following balance-only line
+            carry_date: Open blocks on type_code lines, dated like the previous block
+            max_lines: Lines (counting blank ones) a block may span from its start
+            min_lines_without_amount: Keep blocks without amounts that have at least
+                                      this many lines (None drops them)
+        """
+        self.stop = frozenset(stop)
+        self.skip = frozenset(skip)
+        self.end = frozenset(end)
+        self.close_on_amount = close_on_amount
+        self.take_balance = take_balance
+        self.carry_date = carry_date
+        self.max_lines = max_lines
+        self.min_lines_without_amount = min_lines_without_amount
+
+    def group(self, lines: Sequence[Line], start: int = 0) -> List[Block]:
+        """
+        Group lexed lines into blocks.
+
+        Args:
+            lines: Lines from LineLexer.lex_lines()
+            start: Index to start at (e.g. the line after the header)
+
+        Returns:
+            Blocks in statement order
+        """
+        return self._scan(lines, start, None, final=True)[0]
+
+    def group_pages(self, pages: Iterable[Sequence[Line]], start: int = 0) -> Iterator[List[Block]]:
+        """
+        Incremental form of group(), fed one page of lexed lines at a time.
+
+        A block still open at the end of a page is held back and grouped
+        again with the next page's lines, so the blocks are the ones group()
+        finds on all the lines together, released as each page completes.
+
+        Args:
+            pages: Lexed lines of each page, in order
+            start: Index to start at, counted over all pages' lines
+
+        Yields:
+            The blocks completed by each page (indexes count over all pages)
+        """
+        held: List[Line] = []
+        offset = 0          # Index of held[0] over all pages
+        last_date = None
+        for page in pages:
+            lines = held + list(page)
+            blocks, resume, last_date, ended = self._scan(lines, max(0, start - offset), last_date, final=False)
+            yield [block._replace(start_idx=block.start_idx + offset, end_idx=block.end_idx + offset)
+                   for block in blocks]
+            if ended:
+                return
+            held = lines[resume:]
+            offset += resume
+
+        if held:
+            blocks = self._scan(held, max(0, start - offset), last_date, final=True)[0]
+            yield [block._replace(start_idx=block.start_idx + offset, end_idx=block.end_idx + offset)
+                   for block in blocks]
+
+    def _scan(self, lines: Sequence[Line], start: int, last_date: Optional[str],
+              final: bool) -> Tuple[List[Block], int, Optional[str], bool]:
+        """
+        One pass of group() over `lines`.
+
+        Returns:
+            Tuple of (blocks, index to resume from once more lines are known,
+            the carried date there, whether an end token was reached). Unless
+            `final`, a block running into the last line is not returned; the
+            resume index is its first line.
+        """
+        blocks = []
+        stop, skip, end = self.stop, self.skip, self.end
+        count = len(lines)
+        i = start
+
+        while i < count:
+            line = lines[i]
+            tokens = line.tokens
+            if not skip.isdisjoint(tokens):
+                i += 1
+                continue
+            if not end.isdisjoint(tokens):
+                return blocks, count, last_date, True
+
+            if DATE_START in tokens:
+                date = line.date
+            elif self.carry_date and TYPE_CODE in tokens and last_date:
+                date = last_date
+            else:
+                i += 1
+                continue
+
+            block_lines = [line.text]
+            has_amount = AMOUNT in tokens
+            limit = min(count, i + self.max_lines) if self.max_lines else count
+            j = i + 1
+            while j < limit:
+                next_line = lines[j]
+                if not stop.isdisjoint(next_line.tokens):
+                    break
+                if next_line.text:
+                    block_lines.append(next_line.text)
+                j += 1
+
+                if AMOUNT in next_line.tokens:
+                    has_amount = True
+                    if self.close_on_amount:
+                        if (self.take_balance and j < count and BALANCE in lines[j].tokens
+                                and DATE_START not in lines[j].tokens):
+                            block_lines.append(lines[j].text)
+                            j += 1
+                        break
+
+            if j >= count and not final:
+                # The block may go on over the next page
+                return blocks, i, last_date, False
+
+            last_date = date
+            keep = has_amount or (
+                self.min_lines_without_amount is not None and len(block_lines) >= self.min_lines_without_amount
+            )
+            if keep:
+                blocks.append(Block(block_lines, line, date, i, j - 1, has_amount))
+            i = j
+
+        return blocks, count, last_date, False
+
+
+def _block_dict(block: Block) -> Dict:
+    return {
+        'lines': block.lines,
+        'date_line': block.first.text,
+        'date_match': block.first.date_match.group(0),
+        'start_idx': block.start_idx,
+        'end_idx': block.end_idx,
+    }
+
+
+def _date_grouper(max_block_lines: int) -> BlockGrouper:
+    return BlockGrouper(close_on_amount=False, max_lines=max_block_lines, min_lines_without_amount=1)
+
+
+def date_blocks(lines: Iterable[str], date_pattern: str, max_block_lines: int = 10) -> List[Dict]:
+    """
+    Group lines into blocks that run from one dated line to the next.
+
+    Backs the generic BaseBankParser/EnhancedBaseBankParser helpers, which
+    return plain dicts.
+
+    Args:
+        lines: Text lines
+        date_pattern: Regex matched at the start of a line (case-insensitive)
+        max_block_lines: Lines (counting blank ones) a block may span
+
+    Returns:
+        Block dicts with 'lines', 'date_line', 'date_match', 'start_idx' and 'end_idx'
+    """
+    lexer = date_lexer(date_pattern)
+    return [_block_dict(block) for block in _date_grouper(max_block_lines).group(lexer.lex_lines(lines))]
+
+
+def date_blocks_by_page(page_texts: Iterable[str], date_pattern: str,
+                        max_block_lines: int = 10) -> Iterator[List[Dict]]:
+    """
+    Page-incremental date_blocks() over the text of each page.
+
+    Pages are split into lines the way PdfSession.full_text() joins them,
+    so the blocks match date_blocks() on the full text's lines.
+
+    Args:
+        page_texts: Text of each page, in order (empty pages are skipped)
+        date_pattern: Regex matched at the start of a line (case-insensitive)
+        max_block_lines: Lines (counting blank ones) a block may span
+
+    Yields:
+        The block dicts completed by each page
+    """
+    lexer = date_lexer(date_pattern)
+    pages = chain(
+        (lexer.lex_lines(page_text.split('\n')) for page_text in page_texts if page_text),
+        [[lexer.lex('')]],      # full_text() ends in a newline
+    )
+    for blocks in _date_grouper(max_block_lines).group_pages(pages):
+        yield [_block_dict(block) for block in blocks]
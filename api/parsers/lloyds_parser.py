@@ -2,36 +2,81 @@
 Lloyds Bank Statement Parser v3
 Improved version with better merchant name extraction and multi-line handling
 """
-import pdfplumber
 import re
 from typing import List, Dict
-from datetime import datetime
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
-    from .config import get_config
+    from .transaction import Transaction
+    from .dates import parse_date
+    from .amounts import AmountTokenizer, MONEY_PLAIN, ACCOUNT_NUMBER, CARD_REF
+    from .cleaning import Rule, RuleSet, cached_cleaner
+    from .line_lexer import DATE_START, BlockGrouper, LineLexer
     from ..utils import clean_description
 except ImportError:
     api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
-    from parsers.config import get_config
+    from parsers.transaction import Transaction
+    from parsers.dates import parse_date
+    from parsers.amounts import AmountTokenizer, MONEY_PLAIN, ACCOUNT_NUMBER, CARD_REF
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
+    from parsers.line_lexer import DATE_START, BlockGrouper, LineLexer
     from utils import clean_description
 
 
 class LloydsParser(BaseBankParser):
     """Parser for Lloyds Bank UK statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('lloyds')
-        self.config = get_config('lloyds')
+    # Money on Lloyds lines: 1234.56 (no thousands separator), with account
+    # numbers and card references on the same line
+    AMOUNTS = AmountTokenizer(MONEY_PLAIN, noise=(ACCOUNT_NUMBER, CARD_REF))
+
+    # A transaction starts on any line holding a DD MMM YY date (e.g. "06 JUN 25"),
+    # or its OCR-mangled "D2ate 06 JUN 25" form
+    LEXER = LineLexer(r'.*?(?:(\d{2}\s+[A-Z]{3}\s+\d{2})|D2ate\s+(\d+)\s+([A-Z]{3})\s+(\d{2}))')
+
+    # Merchant name cleaning rules (see _clean_merchant_name)
+    MERCHANT_RULES = RuleSet(
+        # Remove type code patterns
+        (
+            Rule(r'\b(T[FDy]?ype\s+[A-Z]{2,3})\b'),
+            Rule(r'\b(TDype|TFype|Dype|Ttype)\b'),
+            Rule(r'\b(FPI|FPO|DEB|EB|DD|PI|PO|MPI|MPO|BGC|DEP|TFR|CHQ|CPT|SO|BP)\b'),
+            Rule(r'\bE\s+B\b'),
+        ),
+
+        # Remove card references
+        Rule(r'\bCD\s+\d+'),
+
+        # Remove date references
+        Rule(r'\b\d{1,2}[A-Z]{3}\d{2}\b'),
+
+        # Remove account/reference numbers
+        Rule(r'\b\d{6,}\b'),
+
+        # Remove artifacts
+        Rule(r'MboInlneay n\(k£\.\)'),
+        Rule(r'Mbounle ayt On\( £k \) \.'),
+        Rule(r'\.?Money (Out|In)\(£\)'),
+        Rule(r'\(£\)\.?'),
+
+        # Remove OCR errors
+        Rule(r'D\s+Eescriptio'),
+
+        # Remove amounts
+        Rule(r'\b\d+\.\d{2}\b'),
+
+        # Clean spaces
+        Rule(r'\s+\.\s+', ' '),
+        Rule(r'^\s*\.\s*'),
+        Rule(r'\s*\.\s*$'),
+        Rule(r'\s+', ' '),
+    )
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """Extract transactions from Lloyds statement"""
@@ -39,12 +84,8 @@ class LloydsParser(BaseBankParser):
 
         try:
             # Extract text from all pages
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
 
             # Parse transactions
             transactions = self._parse_lloyds_text(all_text)
@@ -67,44 +108,20 @@ class LloydsParser(BaseBankParser):
         date_pattern = r'(\d{2}\s+[A-Z]{3}\s+\d{2})'
         ocr_date_pattern = r'D2ate\s+(\d+)\s+([A-Z]{3})\s+(\d{2})'
 
-        # Group lines into transaction blocks
-        blocks = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Check if line contains a date
-            date_match = re.search(date_pattern, line)
-            ocr_match = re.search(ocr_date_pattern, line)
-
-            if date_match or ocr_match:
-                block_lines = [line]
-                max_lookahead = self.config.max_lookahead_lines if self.config else 5
-
-                # Look ahead for continuation
-                j = i + 1
-                while j < len(lines) and j < i + max_lookahead:
-                    next_line = lines[j]
-                    # Stop if we hit another date line
-                    if re.search(date_pattern, next_line) or re.search(ocr_date_pattern, next_line):
-                        break
-                    block_lines.append(next_line)
-                    j += 1
-
-                blocks.append({
-                    'lines': block_lines,
-                    'start_index': i,
-                    'preview': block_lines[0][:70] if block_lines else ''
-                })
-                i = j
-            else:
-                i += 1
+        # Group lines into transaction blocks, up to max_lookahead_lines each
+        grouper = BlockGrouper(
+            stop=(DATE_START,),
+            close_on_amount=False,
+            max_lines=self.config.max_lookahead_lines if self.config else 5,
+            min_lines_without_amount=1,
+        )
+        blocks = grouper.group(self.LEXER.lex_lines(lines))
 
         self.logger.debug(f"Found {len(blocks)} potential transaction blocks")
 
         # Parse each block
         for block in blocks:
-            combined_text = ' '.join(block['lines'])
+            combined_text = ' '.join(block.lines)
 
             # Extract date
             date_match = re.search(date_pattern, combined_text)
@@ -142,60 +159,45 @@ class LloydsParser(BaseBankParser):
             is_credit = bool(re.search(r'\bF?PI\b|\bTFype\s+PI\b', combined_text))
             is_debit = bool(re.search(r'\bF?PO\b|\bTFype\s+PO\b|\bE\s?B\b|\bTFype\s+E\s?B\b|\bDEB\b|\bTDype\s+EB\b', combined_text))
 
-            # Extract amounts
+            # Extract amounts (split amounts glued to the next word first)
             cleaned_text = re.sub(r'(\d{1,5}\.\d{2})([A-Z])', r'\1 \2', combined_text)
-            cleaned_text = re.sub(r'\b\d{10,}\b', ' ', cleaned_text)
-            cleaned_text = re.sub(r'\bCD\s+\d+', ' ', cleaned_text)
+            amounts = self.AMOUNTS.amounts(cleaned_text)
 
-            amount_pattern = r'(\d{1,5}\.\d{2})'
-            amounts = re.findall(amount_pattern, cleaned_text)
-
-            if not amounts or len(amounts) < 2:
+            if len(amounts) < 2:
                 continue
 
-            amount_str = amounts[0]
-            balance_str = amounts[-1]
-
             # Parse date
-            try:
-                date_obj = datetime.strptime(date_str, '%d %b %y')
-                parsed_date = date_obj.strftime('%Y-%m-%d')
-            except:
+            parsed_date = parse_date(date_str, ('%d %b %y',))
+            if not parsed_date:
                 self.logger.debug(f"Invalid date: {date_str}")
                 continue
 
-            # Parse amount
-            try:
-                amount = float(amount_str.replace(',', ''))
-                balance = float(balance_str.replace(',', ''))
-
-                if is_credit:
-                    debit = 0.0
-                    credit = amount
-                    tx_type = 'income'
-                elif is_debit:
-                    debit = amount
-                    credit = 0.0
-                    tx_type = 'expense'
-                else:
-                    debit = amount
-                    credit = 0.0
-                    tx_type = 'expense'
-
-            except ValueError as e:
-                self.logger.debug(f"Invalid amount: {amount_str} - {e}")
-                continue
+            amount = amounts[0] / 100
+            balance = amounts[-1] / 100
+
+            if is_credit:
+                debit = 0.0
+                credit = amount
+                tx_type = 'income'
+            elif is_debit:
+                debit = amount
+                credit = 0.0
+                tx_type = 'expense'
+            else:
+                debit = amount
+                credit = 0.0
+                tx_type = 'expense'
 
             description = merchant_name if merchant_name else "Transaction"
 
-            transaction = {
-                'date': parsed_date,
-                'description': description,
-                'debit': debit,
-                'credit': credit,
-                'balance': balance,
-                'type': tx_type
-            }
+            transaction = Transaction(
+                date=parsed_date,
+                description=description,
+                debit=debit,
+                credit=credit,
+                balance=balance,
+                type=tx_type
+            )
 
             transactions.append(transaction)
             self.logger.debug(f"{parsed_date} | {description[:40]:40} | {'£'+str(credit) if credit > 0 else '-£'+str(debit):>8} | Balance: £{balance}")
@@ -207,44 +209,10 @@ class LloydsParser(BaseBankParser):
 
         return transactions
 
+    @cached_cleaner
     def _clean_merchant_name(self, text: str) -> str:
         """Clean merchant name by removing common artifacts"""
         if not text:
             return ""
 
-        cleaned = text
-
-        # Remove type code patterns
-        cleaned = re.sub(r'\b(T[FDy]?ype\s+[A-Z]{2,3})\b', '', cleaned)
-        cleaned = re.sub(r'\b(TDype|TFype|Dype|Ttype)\b', '', cleaned)
-        cleaned = re.sub(r'\b(FPI|FPO|DEB|EB|DD|PI|PO|MPI|MPO|BGC|DEP|TFR|CHQ|CPT|SO|BP)\b', '', cleaned)
-        cleaned = re.sub(r'\bE\s+B\b', '', cleaned)
-
-        # Remove card references
-        cleaned = re.sub(r'\bCD\s+\d+', '', cleaned)
-
-        # Remove date references
-        cleaned = re.sub(r'\b\d{1,2}[A-Z]{3}\d{2}\b', '', cleaned)
-
-        # Remove account/reference numbers
-        cleaned = re.sub(r'\b\d{6,}\b', '', cleaned)
-
-        # Remove artifacts
-        cleaned = re.sub(r'MboInlneay n\(k£\.\)', '', cleaned)
-        cleaned = re.sub(r'Mbounle ayt On\( £k \) \.', '', cleaned)
-        cleaned = re.sub(r'\.?Money (Out|In)\(£\)', '', cleaned)
-        cleaned = re.sub(r'\(£\)\.?', '', cleaned)
-
-        # Remove OCR errors
-        cleaned = re.sub(r'D\s+Eescriptio', '', cleaned)
-
-        # Remove amounts
-        cleaned = re.sub(r'\b\d+\.\d{2}\b', '', cleaned)
-
-        # Clean spaces
-        cleaned = re.sub(r'\s+\.\s+', ' ', cleaned)
-        cleaned = re.sub(r'^\s*\.\s*', '', cleaned)
-        cleaned = re.sub(r'\s*\.\s*$', '', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-
-        return cleaned.strip()
+        return self.MERCHANT_RULES.apply(text).strip()
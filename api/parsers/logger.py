@@ -25,9 +25,16 @@ class ParserFormatter(logging.Formatter):
         logging.CRITICAL: "🚨 %(name)s - %(message)s",
     }
     
+    def __init__(self):
+        super().__init__()
+        # One formatter per level, built once rather than per record
+        self._formatters = {
+            level: logging.Formatter(log_fmt) for level, log_fmt in self.FORMATS.items()
+        }
+        self._default_formatter = logging.Formatter("%(name)s - %(message)s")
+    
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno, "%(name)s - %(message)s")
-        formatter = logging.Formatter(log_fmt)
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
 
@@ -35,6 +42,9 @@ class ParserFormatter(logging.Formatter):
 _handler_initialized = False
 _console_handler = None
 
+# Loggers already configured by get_parser_logger, by parser name
+_configured_loggers = {}
+
 
 def _init_handler():
     """Initialize the console handler once"""
@@ -56,6 +66,12 @@ def get_parser_logger(parser_name: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    # Configured once per name: setLevel() clears logging's level cache
+    # for every logger, so repeat calls are not free
+    logger = _configured_loggers.get(parser_name)
+    if logger is not None:
+        return logger
+    
     logger = logging.getLogger(f"bankparser.{parser_name}")
     
     # Set level based on debug mode
@@ -72,6 +88,7 @@ def get_parser_logger(parser_name: str) -> logging.Logger:
     # Prevent propagation to root logger
     logger.propagate = False
     
+    _configured_loggers[parser_name] = logger
     return logger
 
 
@@ -0,0 +1,118 @@
+"""
+Integer-pence money values.
+Amounts are parsed straight from the matched digit string into whole pence,
+so sums, running balances and comparisons are exact integers; pounds (float)
+or decimal strings are only produced when results are serialized.
+"""
+import math
+import re
+from typing import Any, Optional
+
+from .logger import get_parser_logger
+
+# Balance column marker for "not shown on the statement"
+NO_BALANCE = -(2 ** 63)
+
+_PLAIN_AMOUNT = re.compile(r'(\d*)(?:\.(\d{0,2}))?')
+_SUB_PENNY_AMOUNT = re.compile(r'\d*\.\d{3,}')
+
+logger = get_parser_logger('money')
+
+
+def parse_pence(amount_str: Any) -> Optional[int]:
+    """
+    Parse a UK amount string into pence without going through float.
+
+    Accepts the same forms as parse_uk_amount: £1,234.56, 1234.5,
+    (1234.56) and -1234.56 (brackets and minus both mean negative).
+
+    Args:
+        amount_str: Amount string
+
+    Returns:
+        Amount in pence, or None if the string is not a plain amount with
+        at most two decimal places
+    """
+    if not amount_str:
+        return None
+
+    clean = str(amount_str).strip()
+
+    is_negative = False
+    if clean.startswith('(') and clean.endswith(')'):
+        clean = clean[1:-1]
+        is_negative = True
+
+    clean = clean.replace('£', '').replace(',', '').replace(' ', '').strip()
+
+    if clean.startswith('-'):
+        is_negative = True
+        clean = clean[1:]
+
+    match = _PLAIN_AMOUNT.fullmatch(clean)
+    if match is None:
+        return None
+    pounds, fraction = match.groups()
+    if not pounds and not fraction:
+        return None
+
+    pence = int(pounds or '0') * 100 + int((fraction or '').ljust(2, '0'))
+    return -pence if is_negative else pence
+
+
+def is_sub_penny(clean: str) -> bool:
+    """
+    Whether a cleaned amount string (no sign, £ or commas) has more than two
+    decimal places, which no statement amount has; a warning is logged, so
+    the caller can reject it instead of rounding it away.
+
+    Args:
+        clean: Amount string after cleaning, e.g. '1234.567'
+
+    Returns:
+        True if the amount should be rejected
+    """
+    if _SUB_PENNY_AMOUNT.fullmatch(clean) is None:
+        return False
+    logger.warning(f"Rejected amount {clean!r}: more than two decimal places")
+    return True
+
+
+def to_pence(value: Any) -> int:
+    """
+    Pence for an amount already held as pounds (int, float or string).
+
+    Float pounds from the parsers carry at most two decimal places, so
+    rounding value * 100 recovers the exact pence. A value with a fraction
+    of a penny is still rounded, but logged, since it means a parser read
+    something that is not a money amount.
+
+    Args:
+        value: Amount in pounds
+
+    Returns:
+        Amount in pence
+    """
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, str):
+        pence = parse_pence(value)
+        if pence is not None:
+            return pence
+    exact = float(value) * 100
+    pence = round(exact)
+    if not math.isclose(exact, pence, rel_tol=1e-9, abs_tol=1e-6):
+        logger.warning(f"Amount {value!r} has more than two decimal places, rounded to {format_pence(pence)}")
+    return pence
+
+
+def pence_to_pounds(pence: int) -> float:
+    """Pounds as a float (the closest double to the exact decimal amount)"""
+    return pence / 100
+
+
+def format_pence(pence: int) -> str:
+    """Exact decimal string in pounds, e.g. 123456 -> '1234.56', -5 -> '-0.05'"""
+    sign = '-' if pence < 0 else ''
+    pounds, remainder = divmod(abs(pence), 100)
+    return f"{sign}{pounds}.{remainder:02d}"
@@ -19,7 +19,6 @@ Patterns identified:
 Author: Bank Statement Converter Team
 Last Updated: December 2024
 """
-import pdfplumber
 import re
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -29,15 +28,19 @@ import os
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
-    from .config import get_config
+    from .transaction import Transaction
+    from .pdf_session import PdfSession
+    from .strategy import get_strategy_scheduler
+    from .cleaning import Rule, RuleSet, cached_cleaner
 except ImportError:
     api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
-    from parsers.config import get_config
+    from parsers.transaction import Transaction
+    from parsers.pdf_session import PdfSession
+    from parsers.strategy import get_strategy_scheduler
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
 
 
 class MonzoParser(BaseBankParser):
@@ -55,18 +58,63 @@ class MonzoParser(BaseBankParser):
     DATE_PATTERN = r'^\d{1,2}/\d{1,2}/\d{4}'
     HEADER_KEYWORDS = ['Date', 'Description', 'Amount', 'Balance']
     
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('monzo')
-        self.config = get_config('monzo')
+    # Table extraction strategies, all read on every page
+    TABLE_STRATEGIES = [
+        {"vertical_strategy": "lines", "horizontal_strategy": "lines"},
+        {"vertical_strategy": "text", "horizontal_strategy": "text"},
+    ]
+    
+    # Description cleaning rules (see _clean_monzo_description)
+    DESCRIPTION_RULES = RuleSet(
+        # Remove "Reference:" and everything after
+        Rule(r'\s*Reference:.*$', flags=re.IGNORECASE),
+        
+        # Remove payment type indicators (in turn: removing one can join
+        # whitespace the next one strips)
+        Rule(r'\(?\s*Faster\s+Payments?\s*\)?', flags=re.IGNORECASE),
+        Rule(r'\(?\s*Direct\s+Debit\s*\)?', flags=re.IGNORECASE),
+        Rule(r'\(?\s*Standing\s+Order\s*\)?', flags=re.IGNORECASE),
+        Rule(r'\(?\s*Bank\s+Transfer\s*\)?', flags=re.IGNORECASE),
+        Rule(r'\(?\s*Card\s+Payment\s*\)?', flags=re.IGNORECASE),
+        
+        # Remove standalone "Payments)" at start (artifact from split)
+        Rule(r'^\s*Payments?\)\s*'),
+        
+        # Remove "This relates to" text
+        Rule(r'\s*This\s+relates\s+to.*$', flags=re.IGNORECASE),
+        
+        # Remove country codes at start
+        Rule(r'^(ACC|GBR|IRL|USA|EUR|USD|GBP)\s+'),
+        
+        # Remove empty parentheses
+        Rule(r'\s*\(\s*\)\s*'),
+        
+        # Normalize whitespace
+        Rule(r'\s+', ' '),
+    )
+    
+    @property
+    def PREFETCH_TABLE_SETTINGS(self) -> List[Dict]:
+        """Tables are laid out by a parallel prefetch only once they always run"""
+        return [] if self._tables_skippable() else self.TABLE_STRATEGIES
+    
+    def _tables_skippable(self) -> bool:
+        """
+        Whether confident text extraction may skip the tables.
+        
+        Tables are kept whenever they find as many rows as text, so skipping
+        them is only safe while they have never won a comparison for Monzo.
+        """
+        return not get_strategy_scheduler().has_won('monzo', 'table')
     
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """
         Extract transactions from Monzo statement.
         
         Strategy:
-        1. Try table extraction first (cleanest when it works)
-        2. Fall back to text extraction (handles edge cases)
+        1. Run text extraction first; skip tables if it is confident and
+           tables have never won a comparison, otherwise run both
+        2. Keep tables if they found at least as many rows as text
         3. Reverse to chronological order
         4. Fill missing balances
         5. Deduplicate
@@ -74,22 +122,21 @@ class MonzoParser(BaseBankParser):
         transactions = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Strategy 1: Try table extraction
-                table_transactions = self._extract_from_tables(pdf)
-                self.logger.debug(f"Table extraction: {len(table_transactions)} transactions")
-                
-                # Strategy 2: Text extraction (usually more reliable for Monzo)
-                text_transactions = self._extract_from_text(pdf)
-                self.logger.debug(f"Text extraction: {len(text_transactions)} transactions")
-                
-                # Use whichever got more results
-                if len(table_transactions) >= len(text_transactions):
-                    transactions = table_transactions
-                    self.logger.info(f"Using table extraction: {len(transactions)} transactions")
-                else:
-                    transactions = text_transactions
-                    self.logger.info(f"Using text extraction: {len(transactions)} transactions")
+            with self.open_pdf(pdf_path) as pdf:
+                method, transactions = get_strategy_scheduler().run(
+                    'monzo',
+                    {
+                        'table': lambda: self._extract_from_tables(pdf),
+                        'text': lambda: self._extract_from_text(pdf),
+                    },
+                    threshold=self.config.strategy_confidence_threshold if self._tables_skippable() else None,
+                    default_order=self.config.extraction_order,
+                    # Use whichever got more results
+                    select=lambda results: (
+                        'table' if len(results['table'][0]) >= len(results['text'][0]) else 'text'
+                    ),
+                )
+                self.logger.info(f"Using {method} extraction: {len(transactions)} transactions")
             
             # Sort by date (chronological order)
             # Monzo shows newest first, but sorting is more reliable than reversing
@@ -114,36 +161,40 @@ class MonzoParser(BaseBankParser):
     # TABLE EXTRACTION
     # =========================================================================
     
-    def _extract_from_tables(self, pdf: pdfplumber.PDF) -> List[Dict]:
+    def _extract_from_tables(self, pdf: PdfSession) -> List[Dict]:
         """Extract transactions from PDF tables"""
         transactions = []
         
         for page_num, page in enumerate(pdf.pages):
-            # Try different table extraction strategies
-            for settings in [
-                {"vertical_strategy": "lines", "horizontal_strategy": "lines"},
-                {"vertical_strategy": "text", "horizontal_strategy": "text"},
-            ]:
-                tables = page.extract_tables(settings)
-                
-                for table in tables:
-                    if not table or len(table) < 2:
-                        continue
-                    
-                    # Check if this looks like a transaction table
-                    header = table[0] if table[0] else []
-                    header_text = ' '.join(str(cell or '') for cell in header).lower()
-                    
-                    if 'date' in header_text and ('amount' in header_text or 'balance' in header_text):
-                        # Parse rows
-                        for row in table[1:]:
-                            txn = self._parse_table_row(row)
-                            if txn:
-                                transactions.append(txn)
+            # Every strategy, not just the first with rows: each can miss rows
+            # the other finds on a page, and the union is deduplicated after
+            for settings in self.TABLE_STRATEGIES:
+                transactions.extend(self._read_tables(page.extract_tables(settings)))
         
         return transactions
     
-    def _parse_table_row(self, row: List[Optional[str]]) -> Optional[Dict]:
+    def _read_tables(self, tables: List[List[List[Optional[str]]]]) -> List[Dict]:
+        """Parse the transactions in a page's tables"""
+        transactions = []
+        
+        for table in tables:
+            if not table or len(table) < 2:
+                continue
+            
+            # Check if this looks like a transaction table
+            header = table[0] if table[0] else []
+            header_text = ' '.join(str(cell or '') for cell in header).lower()
+            
+            if 'date' in header_text and ('amount' in header_text or 'balance' in header_text):
+                # Parse rows
+                for row in table[1:]:
+                    txn = self._parse_table_row(row)
+                    if txn:
+                        transactions.append(txn)
+        
+        return transactions
+    
+    def _parse_table_row(self, row: List[Optional[str]]) -> Optional[Transaction]:
         """Parse a single table row into transaction dict"""
         if not row or len(row) < 3:
             return None
@@ -196,14 +247,14 @@ class MonzoParser(BaseBankParser):
             if not clean_desc:
                 clean_desc = "Monzo Transaction"
             
-            return {
-                'date': parsed_date,
-                'description': clean_desc,
-                'debit': debit,
-                'credit': credit,
-                'balance': balance,
-                'type': 'income' if credit > 0 else 'expense'
-            }
+            return Transaction(
+                date=parsed_date,
+                description=clean_desc,
+                debit=debit,
+                credit=credit,
+                balance=balance,
+                type='income' if credit > 0 else 'expense'
+            )
             
         except Exception as e:
             self.logger.debug(f"Error parsing table row: {e}")
@@ -213,14 +264,10 @@ class MonzoParser(BaseBankParser):
     # TEXT EXTRACTION (Primary method for Monzo)
     # =========================================================================
     
-    def _extract_from_text(self, pdf: pdfplumber.PDF) -> List[Dict]:
+    def _extract_from_text(self, pdf: PdfSession) -> List[Dict]:
         """Extract transactions from PDF text"""
         # Combine text from all pages
-        all_text = ''
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                all_text += page_text + '\n'
+        all_text = pdf.full_text()
         
         return self._parse_monzo_text(all_text)
     
@@ -292,7 +339,7 @@ class MonzoParser(BaseBankParser):
                 return i
         return -1
     
-    def _parse_text_transaction(self, lines: List[str], date_line_idx: int, header_idx: int) -> Optional[Dict]:
+    def _parse_text_transaction(self, lines: List[str], date_line_idx: int, header_idx: int) -> Optional[Transaction]:
         """
         Parse a transaction starting from a date line.
         
@@ -365,14 +412,14 @@ class MonzoParser(BaseBankParser):
             debit = 0.0
             credit = amount
         
-        return {
-            'date': parsed_date,
-            'description': description,
-            'debit': debit,
-            'credit': credit,
-            'balance': balance,
-            'type': 'income' if credit > 0 else 'expense'
-        }
+        return Transaction(
+            date=parsed_date,
+            description=description,
+            debit=debit,
+            credit=credit,
+            balance=balance,
+            type='income' if credit > 0 else 'expense'
+        )
     
     def _build_description(self, merchant_name: str, desc_on_line: str) -> str:
         """Build final description from merchant name and date line text"""
@@ -548,6 +595,7 @@ class MonzoParser(BaseBankParser):
     # DESCRIPTION CLEANING
     # =========================================================================
     
+    @cached_cleaner
     def _clean_monzo_description(self, text: str) -> str:
         """
         Clean Monzo transaction description.
@@ -561,36 +609,7 @@ class MonzoParser(BaseBankParser):
         if not text:
             return ""
         
-        cleaned = text
-        
-        # Remove "Reference:" and everything after
-        cleaned = re.sub(r'\s*Reference:.*$', '', cleaned, flags=re.IGNORECASE)
-        
-        # Remove payment type indicators
-        payment_types = [
-            r'\(?\s*Faster\s+Payments?\s*\)?',
-            r'\(?\s*Direct\s+Debit\s*\)?',
-            r'\(?\s*Standing\s+Order\s*\)?',
-            r'\(?\s*Bank\s+Transfer\s*\)?',
-            r'\(?\s*Card\s+Payment\s*\)?',
-        ]
-        for pattern in payment_types:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        
-        # Remove standalone "Payments)" at start (artifact from split)
-        cleaned = re.sub(r'^\s*Payments?\)\s*', '', cleaned)
-        
-        # Remove "This relates to" text
-        cleaned = re.sub(r'\s*This\s+relates\s+to.*$', '', cleaned, flags=re.IGNORECASE)
-        
-        # Remove country codes at start
-        cleaned = re.sub(r'^(ACC|GBR|IRL|USA|EUR|USD|GBP)\s+', '', cleaned)
-        
-        # Remove empty parentheses
-        cleaned = re.sub(r'\s*\(\s*\)\s*', '', cleaned)
-        
-        # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = self.DESCRIPTION_RULES.apply(text).strip()
         
         # Remove trailing punctuation
         cleaned = cleaned.strip('.,;:- ')
@@ -2,36 +2,53 @@
 NatWest Bank Statement Parser
 Handles table-based transactions with multi-row descriptions
 """
-import pdfplumber
 import re
 from typing import List, Dict
-from datetime import datetime
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
-    from .config import get_config
+    from .transaction import Transaction
+    from .dates import parse_date
+    from .cleaning import Rule, RuleSet, cached_cleaner
     from ..utils import clean_description
 except ImportError:
     api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
-    from parsers.config import get_config
+    from parsers.transaction import Transaction
+    from parsers.dates import parse_date
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
     from utils import clean_description
 
 
 class NatWestParser(BaseBankParser):
     """Parser for NatWest UK Bank statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('natwest')
-        self.config = get_config('natwest')
+    # Default pdfplumber table settings, laid out by a parallel prefetch
+    PREFETCH_TABLE_SETTINGS = [None]
+
+    # Description cleaning rules (see _clean_natwest_description)
+    DESCRIPTION_RULES = RuleSet(
+        # Remove card reference numbers
+        Rule(r'\d{4}\s+\d{2}[A-Z]{3}\d{2}\s*(?:CD|D)?\s*,?\s*'),
+
+        # Clean up patterns
+        Rule(r'FROM A/C \d+\s*,\s*'),
+        Rule(r',?\s*VIA MOBILE XFER'),
+        Rule(r'\b\d{12,}\b'),
+        Rule(r',?\s*FP\s+\d{2}/\d{2}/\d{2}\s+\d+'),
+
+        # Remove extra commas and spaces
+        Rule(r'\s*,\s*,\s*', ', '),
+        Rule(r'\s+,\s+', ', '),
+        Rule(r',\s*$'),
+        Rule(r'^\s*,\s*'),
+        Rule(r'\s+', ' '),
+    )
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """Extract transactions from NatWest statement"""
@@ -39,7 +56,7 @@ class NatWestParser(BaseBankParser):
 
         try:
             all_tables = []
-            with pdfplumber.open(pdf_path) as pdf:
+            with self.open_pdf(pdf_path) as pdf:
                 for page in pdf.pages:
                     tables = page.extract_tables()
                     if tables:
@@ -148,7 +165,7 @@ class NatWestParser(BaseBankParser):
 
         return transactions
 
-    def _parse_natwest_transaction_block(self, block: Dict, block_num: int) -> Dict:
+    def _parse_natwest_transaction_block(self, block: Dict, block_num: int) -> Transaction:
         """Parse a transaction block into a transaction dictionary"""
         date_str = block['date']
 
@@ -190,16 +207,11 @@ class NatWestParser(BaseBankParser):
                 pass
 
         # Parse date
-        try:
-            date_obj = datetime.strptime(date_str, '%d %b %Y')
-            parsed_date = date_obj.strftime('%Y-%m-%d')
-        except:
-            try:
-                date_obj = datetime.strptime(date_str, '%-d %b %Y')
-                parsed_date = date_obj.strftime('%Y-%m-%d')
-            except Exception as e:
-                self.logger.debug(f"Block {block_num}: Invalid date: {date_str} - {e}")
-                return None
+        # %d also accepts single-digit days
+        parsed_date = parse_date(date_str, ('%d %b %Y',))
+        if not parsed_date:
+            self.logger.debug(f"Block {block_num}: Invalid date: {date_str}")
+            return None
 
         cleaned_description = self._clean_natwest_description(description, tx_type)
 
@@ -212,14 +224,14 @@ class NatWestParser(BaseBankParser):
             credit = 0.0
             tx_category = 'expense'
 
-        transaction = {
-            'date': parsed_date,
-            'description': cleaned_description,
-            'debit': debit,
-            'credit': credit,
-            'balance': balance,
-            'type': tx_category
-        }
+        transaction = Transaction(
+            date=parsed_date,
+            description=cleaned_description,
+            debit=debit,
+            credit=credit,
+            balance=balance,
+            type=tx_category
+        )
 
         amount_display = f"£{credit:.2f}" if credit > 0 else f"-£{debit:.2f}"
         balance_display = f"£{balance:.2f}" if balance else "N/A"
@@ -227,6 +239,7 @@ class NatWestParser(BaseBankParser):
 
         return transaction
 
+    @cached_cleaner
     def _clean_natwest_description(self, description: str, tx_type: str) -> str:
         """Clean NatWest transaction description"""
         if not description:
@@ -249,21 +262,7 @@ class NatWestParser(BaseBankParser):
         elif "REFUND" in tx_type.upper():
             type_prefix = "Refund"
 
-        # Remove card reference numbers
-        cleaned = re.sub(r'\d{4}\s+\d{2}[A-Z]{3}\d{2}\s*(?:CD|D)?\s*,?\s*', '', cleaned)
-
-        # Clean up patterns
-        cleaned = re.sub(r'FROM A/C \d+\s*,\s*', '', cleaned)
-        cleaned = re.sub(r',?\s*VIA MOBILE XFER', '', cleaned)
-        cleaned = re.sub(r'\b\d{12,}\b', '', cleaned)
-        cleaned = re.sub(r',?\s*FP\s+\d{2}/\d{2}/\d{2}\s+\d+', '', cleaned)
-
-        # Remove extra commas and spaces
-        cleaned = re.sub(r'\s*,\s*,\s*', ', ', cleaned)
-        cleaned = re.sub(r'\s+,\s+', ', ', cleaned)
-        cleaned = re.sub(r',\s*$', '', cleaned)
-        cleaned = re.sub(r'^\s*,\s*', '', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = self.DESCRIPTION_RULES.apply(cleaned)
         cleaned = cleaned.strip()
         cleaned = cleaned.strip('.,;:- ')
 
@@ -0,0 +1,98 @@
+"""
+Cheap page classification ahead of extraction.
+Statements end with pages of terms and conditions, FSCS notices, interest
+rate tables and marketing, and laying those out (text, then table
+detection) costs as much as a page of transactions. A PageClassifier looks
+only at the page's first characters, which pdfplumber parses anyway and
+keeps for the real extraction, and sorts pages into:
+
+    transaction  - column headers, or dates alongside amounts: fully extracted
+    summary      - balances without dates: fully extracted, counted apart
+    boilerplate  - everything else: no extraction at all
+
+Only pages with no sign of transactions are skipped, so a misjudged page
+costs time, never transactions. Summary pages still get table detection:
+a table whose dates are in a format the sample check does not know would
+otherwise be lost.
+"""
+from typing import Iterable, Optional, Sequence
+import os
+import re
+
+# Page kinds
+TRANSACTION = 'transaction'
+SUMMARY = 'summary'
+BOILERPLATE = 'boilerplate'
+
+# Characters sampled from the start of each page
+PAGE_SAMPLE_CHARS = int(os.getenv('PAGE_SAMPLE_CHARS', '2000'))
+
+# Pages with fewer characters than this hold nothing to parse
+MIN_PAGE_CHARS = 20
+
+# Set PARSER_SKIP_PAGES=0 to lay out every page
+PARSER_SKIP_PAGES = os.getenv('PARSER_SKIP_PAGES', '1') != '0'
+
+# Tokens matched against the sample with whitespace removed and lowercased
+_DATE = re.compile(
+    r'\d{1,2}(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)'
+    r'|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}'
+    r'|\d{4}-\d{2}-\d{2}'
+)
+_AMOUNT = re.compile(r'\d\.\d{2}(?![\d%])')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _compact(text: str) -> str:
+    return _WHITESPACE.sub('', text).lower()
+
+
+class PageClassifier:
+    """
+    Sorts a statement's pages into transaction, summary and boilerplate.
+
+    Usage:
+        classifier = PageClassifier(config.header_keywords)
+        if classifier.classify(page) == BOILERPLATE:
+            ...  # skip the page
+    """
+
+    __slots__ = ('keywords', 'sample_chars')
+
+    def __init__(self, header_keywords: Iterable[str] = (), sample_chars: int = PAGE_SAMPLE_CHARS):
+        """
+        Args:
+            header_keywords: Transaction table column headings (BankConfig.header_keywords)
+            sample_chars: Characters sampled from the start of each page
+        """
+        self.keywords: Sequence[str] = tuple(_compact(keyword) for keyword in header_keywords if keyword.strip())
+        self.sample_chars = sample_chars
+
+    def classify_text(self, text: str) -> str:
+        """Kind of a page from a sample of its text"""
+        sample = _compact(text)
+        if len(sample) < MIN_PAGE_CHARS:
+            return BOILERPLATE
+
+        # Two column headings mark a transaction table
+        if sum(1 for keyword in self.keywords if keyword in sample) >= 2:
+            return TRANSACTION
+
+        has_amount = _AMOUNT.search(sample) is not None
+        if has_amount and _DATE.search(sample):
+            return TRANSACTION
+        if has_amount and 'balance' in sample:
+            return SUMMARY
+        return BOILERPLATE
+
+    def classify(self, page) -> str:
+        """Kind of a pdfplumber page, from its first characters"""
+        chars = page.chars
+        return self.classify_text(''.join(char['text'] for char in chars[:self.sample_chars]))
+
+
+def bank_page_classifier(header_keywords: Optional[Iterable[str]]) -> Optional[PageClassifier]:
+    """Classifier for a bank's pages, or None when page skipping is turned off"""
+    if not PARSER_SKIP_PAGES:
+        return None
+    return PageClassifier(header_keywords or ())
@@ -0,0 +1,142 @@
+"""
+Transaction-region cropping.
+After the first page, a statement prints its transaction table in the same
+place on every page: below the bank's logo, address and account block,
+above its legal footer. pdfplumber's layout cost grows with the objects it
+analyses, so the region is found once, from the header row and footer
+line of the first continuation page, and later pages are cropped to it
+before text, words or tables are extracted.
+
+A page is only cropped when its header row sits where the region's does,
+and only loses its bottom when the footer sits there too, so a page laid
+out differently is extracted whole rather than cut short. The first page
+(statement period, account details) is never cropped.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import os
+import re
+
+from .layout import LINE_TOLERANCE, group_lines
+
+
+# Set PARSER_CROP_PAGES=0 to extract whole pages
+PARSER_CROP_PAGES = os.getenv('PARSER_CROP_PAGES', '1') != '0'
+
+# Footer text shared by UK statements (BankConfig.footer_keywords adds a bank's own)
+FOOTER_KEYWORDS = (
+    'Authorised by the Prudential Regulation Authority',
+    'Registered in England',
+    'Registered office',
+    'Continued on next page',
+)
+
+# Footer lines never carry amounts; a line that does is a transaction
+_AMOUNT = re.compile(r'\d\.\d{2}(?![\d%])')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _compact(text: str) -> str:
+    return _WHITESPACE.sub('', text).lower()
+
+
+def _line_text(chars: Sequence[Dict], top: float) -> str:
+    """Compacted text of the characters on the line at `top`, left to right"""
+    line = [char for char in chars if abs(char['top'] - top) <= LINE_TOLERANCE]
+    return _compact(''.join(char['text'] for char in sorted(line, key=lambda char: char['x0'])))
+
+
+class TransactionRegion(NamedTuple):
+    """Where a statement's transaction table sits on its continuation pages"""
+    first_page: int            # Zero-based index of the first page to crop
+    top: float                 # Top of the header row
+    header: str                # Header row text, compacted
+    crop_top: float            # Halfway up to the line above the header
+    bottom: Optional[float]    # Top of the footer (None when no footer was found)
+    crop_bottom: float         # Halfway down to the footer (the page bottom without one)
+    footer: str                # Footer keyword found on that line, compacted ('' if none)
+
+    def crop(self, page):
+        """
+        The page cropped to the region, or the page itself when it does not fit.
+
+        Args:
+            page: pdfplumber page (or SessionPage)
+
+        Returns:
+            Cropped pdfplumber page, or `page` for earlier pages and pages
+            whose header row is elsewhere
+        """
+        if page.page_number - 1 < self.first_page:
+            return page
+        chars = page.chars
+        if _line_text(chars, self.top) != self.header:
+            return page
+        x0, top, x1, bottom = page.bbox
+        if self.bottom is not None and self.footer in _line_text(chars, self.bottom):
+            bottom = min(bottom, self.crop_bottom)
+        return page.crop((x0, max(top, self.crop_top), x1, bottom))
+
+
+def find_transaction_region(page, header_keywords: Iterable[str],
+                            footer_keywords: Iterable[str] = ()) -> Optional[TransactionRegion]:
+    """
+    Find the transaction table on a page from its header row and footer.
+
+    The header row is the first line naming at least two column headings
+    (as find_header_line decides); the footer is the first line below it
+    containing footer text and no amounts.
+
+    Args:
+        page: pdfplumber page (or SessionPage)
+        header_keywords: Transaction table column headings (BankConfig.header_keywords)
+        footer_keywords: Bank footer text, checked with FOOTER_KEYWORDS
+
+    Returns:
+        Region applying to this page onwards, or None without a header row
+    """
+    headers = [_compact(keyword) for keyword in header_keywords if keyword.strip()]
+    footers = [_compact(keyword) for keyword in (*footer_keywords, *FOOTER_KEYWORDS) if keyword.strip()]
+    chars = page.chars
+
+    lines: List[Tuple[float, float, str]] = [
+        (line[0]['top'], max(char['bottom'] for char in line), _compact(''.join(char['text'] for char in line)))
+        for line in group_lines(chars)
+    ]
+    for index, (top, _, text) in enumerate(lines):
+        if sum(1 for keyword in headers if keyword in text) < 2:
+            continue
+
+        # Stored as crop() will read it back on other pages
+        header = _line_text(chars, top)
+
+        # pdfplumber keeps objects touching a crop edge, so edges fall
+        # halfway between the table and the page furniture around it
+        crop_top = (lines[index - 1][1] + top) / 2 if index else page.bbox[1]
+        above = lines[index][1]
+        for bottom, line_bottom, text in lines[index + 1:]:
+            footer = None if _AMOUNT.search(text) else next((k for k in footers if k in text), None)
+            if footer:
+                return TransactionRegion(page.page_number - 1, top, header, crop_top,
+                                         bottom, (above + bottom) / 2, footer)
+            above = line_bottom
+        return TransactionRegion(page.page_number - 1, top, header, crop_top, None, page.bbox[3], '')
+    return None
+
+
+def statement_region(pages: Sequence, header_keywords: Optional[Iterable[str]],
+                     footer_keywords: Optional[Iterable[str]] = None) -> Optional[TransactionRegion]:
+    """
+    Transaction region of a statement, found on its first continuation page.
+
+    Args:
+        pages: The statement's pages
+        header_keywords: Transaction table column headings
+        footer_keywords: Bank footer text (optional)
+
+    Returns:
+        The region, or None for single-page statements, when no header row
+        is found, or when cropping is turned off (PARSER_CROP_PAGES=0)
+    """
+    if not PARSER_CROP_PAGES or len(pages) < 2 or not header_keywords:
+        return None
+    return find_transaction_region(pages[1], header_keywords, footer_keywords or ())
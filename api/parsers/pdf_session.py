@@ -0,0 +1,408 @@
+"""
+Shared PDF session for a single conversion.
+Opens the PDF once and memoizes per-page text, words and tables so that
+detection, metadata extraction and parsing never lay out a page twice.
+Long documents can be laid out across a process pool with prefetch().
+"""
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Dict, List, Optional
+import io
+import os
+
+from .logger import get_parser_logger
+from .page_classifier import BOILERPLATE, SUMMARY, TRANSACTION, PageClassifier
+from .page_region import TransactionRegion
+
+# pdfplumber (and pdfminer under it) dominate import time, so they are
+# imported when the first PDF is opened rather than at cold start
+if TYPE_CHECKING:
+    import pdfplumber
+
+
+# Parallel extraction tuning (PARSER_WORKERS=1 disables the process pool)
+PARSER_WORKERS = int(os.getenv('PARSER_WORKERS', '0')) or (os.cpu_count() or 1)
+PARALLEL_MIN_PAGES = int(os.getenv('PARSER_PARALLEL_MIN_PAGES', '8'))
+
+logger = get_parser_logger('pdf_session')
+
+
+def settings_key(settings: Optional[Dict[str, Any]]) -> str:
+    """Build a hashable memo key from a pdfplumber settings dict"""
+    if not settings:
+        return ''
+    return repr(sorted(settings.items()))
+
+
+class SessionPage:
+    """
+    Memoizing wrapper around a pdfplumber page.
+
+    Exposes the same extract_text / extract_words / extract_tables calls
+    parsers already use, so existing `for page in pdf.pages` loops work
+    unchanged. Any other attribute is proxied to the underlying page.
+
+    With a classifier set (see parsers.page_classifier), boilerplate pages
+    extract as empty. With a region set
+    (see parsers.page_region), extraction runs on the page cropped to it.
+    """
+
+    def __init__(self, page, on_laid_out: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            page: pdfplumber page
+            on_laid_out: Called once, the first time anything on the page is extracted
+        """
+        self._page = page
+        self._text: Dict[str, str] = {}
+        self._words: Dict[str, List[Dict]] = {}
+        self._tables: Dict[str, List[List[List[Optional[str]]]]] = {}
+        self._on_laid_out = on_laid_out
+        self._laid_out = False
+        self.classifier: Optional[PageClassifier] = None
+        self.kind: Optional[str] = None
+        self.region: Optional[TransactionRegion] = None
+        self._layout_page = None
+
+    def _mark_laid_out(self):
+        if not self._laid_out:
+            self._laid_out = True
+            if self._on_laid_out is not None:
+                self._on_laid_out()
+
+    def classify(self) -> Optional[str]:
+        """The page's kind (classified on first call), or None without a classifier"""
+        if self.kind is None and self.classifier is not None:
+            self.kind = self.classifier.classify(self._page)
+        return self.kind
+
+    def layout_page(self):
+        """The pdfplumber page extraction runs on (cropped to the region when it fits)"""
+        if self._layout_page is None:
+            self._layout_page = self.region.crop(self._page) if self.region is not None else self._page
+        return self._layout_page
+
+    def extract_text(self, **kwargs) -> str:
+        """Extract (and memoize) the page text"""
+        if self.classify() == BOILERPLATE:
+            self._mark_laid_out()
+            return ''
+        key = settings_key(kwargs)
+        if key not in self._text:
+            self._text[key] = self.layout_page().extract_text(**kwargs) or ''
+            self._mark_laid_out()
+        return self._text[key]
+
+    def extract_words(self, **kwargs) -> List[Dict]:
+        """Extract (and memoize) the positioned words on the page"""
+        if self.classify() == BOILERPLATE:
+            self._mark_laid_out()
+            return []
+        key = settings_key(kwargs)
+        if key not in self._words:
+            self._words[key] = self.layout_page().extract_words(**kwargs)
+            self._mark_laid_out()
+        return self._words[key]
+
+    def extract_tables(self, table_settings: Optional[Dict[str, Any]] = None) -> List[List[List[Optional[str]]]]:
+        """Extract (and memoize) tables for the given table settings"""
+        if self.classify() == BOILERPLATE:
+            self._mark_laid_out()
+            return []
+        key = settings_key(table_settings)
+        if key not in self._tables:
+            self._tables[key] = self.layout_page().extract_tables(table_settings)
+            self._mark_laid_out()
+        return self._tables[key]
+
+    def is_prefetched(self, table_settings: List[Optional[Dict[str, Any]]], words: bool = False) -> bool:
+        """Whether text (or words) and every given table layout are already memoized"""
+        if self.kind == BOILERPLATE:
+            return True
+        return '' in (self._words if words else self._text) and all(
+            settings_key(settings) in self._tables for settings in table_settings
+        )
+
+    def prime(self, text: Optional[str], tables: Dict[str, List[List[List[Optional[str]]]]],
+              words: Optional[List[Dict]] = None, kind: Optional[str] = None):
+        """Seed memoized text, words, tables and kind found elsewhere (e.g. a worker process)"""
+        if kind is not None:
+            self.kind = kind
+        if text is not None:
+            self._text.setdefault('', text)
+        if words is not None:
+            self._words.setdefault('', words)
+        for key, page_tables in tables.items():
+            self._tables.setdefault(key, page_tables)
+        self._mark_laid_out()
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+
+class PdfSession:
+    """
+    A PDF opened once and shared from bank detection through parsing.
+
+    The underlying file is opened lazily on first access and closed by
+    whoever created the session. Parsers handed an existing session via
+    open_pdf_session() borrow it and leave it open.
+
+    Usage:
+        with PdfSession(pdf_path) as session:
+            text = session.full_text(max_pages=3)
+            transactions = parser.extract_transactions(session)
+    """
+
+    def __init__(self, pdf_file, on_progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Args:
+            pdf_file: File path or file-like object of the PDF
+            on_progress: Called with (pages_done, pages_total) as each page
+                         is first laid out
+        """
+        self.source = pdf_file
+        self.on_progress = on_progress
+        self.pages_done = 0
+        self._pdf = None
+        self._pages: Optional[List[SessionPage]] = None
+        self.classifier: Optional[PageClassifier] = None
+        self.region: Optional[TransactionRegion] = None
+        self.prepared = False
+
+    def __enter__(self) -> 'PdfSession':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    @property
+    def pdf(self) -> 'pdfplumber.PDF':
+        """The open pdfplumber document (opened on first access)"""
+        if self._pdf is None:
+            import pdfplumber
+            self._pdf = pdfplumber.open(self.source)
+        return self._pdf
+
+    @property
+    def pages(self) -> List[SessionPage]:
+        """Memoizing page wrappers, in document order"""
+        if self._pages is None:
+            self._pages = [SessionPage(page, self._page_laid_out) for page in self.pdf.pages]
+        return self._pages
+
+    def _page_laid_out(self):
+        self.pages_done += 1
+        if self.on_progress is not None:
+            self.on_progress(self.pages_done, len(self._pages))
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """PDF document info dictionary"""
+        return self.pdf.metadata
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document"""
+        return len(self.pages)
+
+    def classify_pages(self, classifier: Optional[PageClassifier]):
+        """
+        Classify pages with this classifier as each is first extracted.
+
+        Args:
+            classifier: Classifier for the statement's bank (None to extract every page)
+        """
+        self.classifier = classifier
+        for page in self.pages:
+            page.classifier = classifier
+
+    def crop_pages(self, region: Optional[TransactionRegion]):
+        """
+        Crop pages to the statement's transaction region before extraction.
+
+        Only pages not yet extracted are affected.
+
+        Args:
+            region: Region found by parsers.page_region (None to extract whole pages)
+        """
+        self.region = region
+        for page in self.pages:
+            page.region = region
+
+    def page_stats(self) -> Dict[str, Any]:
+        """
+        How many pages were classified as each kind and skipped.
+
+        Returns:
+            {'pages', 'transaction_pages', 'summary_pages', 'skipped_pages',
+             'skipped_page_ratio'}; pages never extracted are not counted
+             as any kind
+        """
+        kinds = [page.kind for page in self.pages]
+        skipped = kinds.count(BOILERPLATE)
+        return {
+            'pages': len(kinds),
+            'transaction_pages': kinds.count(TRANSACTION),
+            'summary_pages': kinds.count(SUMMARY),
+            'skipped_pages': skipped,
+            'skipped_page_ratio': round(skipped / len(kinds), 3) if kinds else 0.0,
+        }
+
+    def full_text(self, max_pages: Optional[int] = None) -> str:
+        """
+        Combined text of the document, one page after another.
+
+        Args:
+            max_pages: Only include the first N pages (all pages if None)
+
+        Returns:
+            Page texts joined with newlines (empty pages skipped)
+        """
+        pages = self.pages if max_pages is None else self.pages[:max_pages]
+        text = ''
+        for page in pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + '\n'
+        return text
+
+    def prefetch(self, table_settings: Optional[List[Optional[Dict[str, Any]]]] = None,
+                 workers: Optional[int] = None, min_pages: Optional[int] = None,
+                 words: bool = False) -> bool:
+        """
+        Lay out pages across a process pool ahead of parsing.
+
+        Each worker opens its own copy of the PDF, extracts text (or words,
+        for parsers that read pages by layout) and tables for each of
+        table_settings for a contiguous page range, and the
+        results are memoized on the session pages in document order. Parsers
+        then run unchanged against the memoized pages. Short documents, and
+        environments without multiprocessing, stay single-process.
+
+        Args:
+            table_settings: Table settings the parser will extract per page
+            workers: Process count (defaults to PARSER_WORKERS)
+            min_pages: Page count below which nothing is done
+                       (defaults to PARALLEL_MIN_PAGES)
+            words: Extract positioned words instead of text
+
+        Returns:
+            True if pages were extracted in parallel
+        """
+        workers = PARSER_WORKERS if workers is None else workers
+        min_pages = PARALLEL_MIN_PAGES if min_pages is None else min_pages
+        table_settings = list(table_settings or [])
+
+        if workers <= 1 or self.page_count < min_pages:
+            return False
+
+        # Pages laid out during detection are already memoized
+        pending = [
+            index for index, page in enumerate(self.pages)
+            if not page.is_prefetched(table_settings, words)
+        ]
+        if len(pending) < min_pages:
+            return False
+
+        workers = min(workers, len(pending))
+        chunk_size = -(-len(pending) // workers)
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            source = self._worker_source()
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                futures = [
+                    pool.submit(_extract_page_range, source, chunk, table_settings, words,
+                                self.classifier, self.region)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    for index, text, tables, page_words, kind in future.result():
+                        self.pages[index].prime(text, tables, page_words, kind)
+        except Exception as e:
+            logger.warning(f"Parallel extraction unavailable, extracting serially: {e}")
+            return False
+
+        logger.debug(f"Prefetched {len(pending)} pages across {len(chunks)} workers")
+        return True
+
+    def _worker_source(self):
+        """Path or bytes of the PDF that a worker process can reopen"""
+        if isinstance(self.source, (str, bytes, os.PathLike)):
+            return self.source
+        position = self.source.tell()
+        self.source.seek(0)
+        data = self.source.read()
+        self.source.seek(position)
+        return data
+
+    def close(self):
+        """Close the underlying PDF and drop memoized page data"""
+        if self._pdf is not None:
+            self._pdf.close()
+        self._pdf = None
+        self._pages = None
+
+
+def _extract_page_range(source, page_indexes: List[int],
+                        table_settings: List[Optional[Dict[str, Any]]],
+                        words: bool = False, classifier: Optional[PageClassifier] = None,
+                        region: Optional[TransactionRegion] = None) -> List[tuple]:
+    """
+    Worker for PdfSession.prefetch: extract text (or words) and tables for some pages.
+
+    Args:
+        source: PDF path or raw bytes
+        page_indexes: Zero-based page indexes to extract
+        table_settings: Table settings to extract per page
+        words: Extract positioned words instead of text
+        classifier: Skips boilerplate pages
+        region: Transaction region pages are cropped to
+
+    Returns:
+        List of (page_index, text, {settings_key: tables}, words, kind)
+        tuples, with text None when words were extracted (or the page was
+        skipped), words None otherwise, and kind None without a classifier
+    """
+    import pdfplumber
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    results = []
+    with pdfplumber.open(source) as pdf:
+        for index in page_indexes:
+            page = pdf.pages[index]
+            kind = classifier.classify(page) if classifier is not None else None
+            if kind == BOILERPLATE:
+                results.append((index, None, {}, None, kind))
+                page.close()
+                continue
+            layout_page = region.crop(page) if region is not None else page
+            page_words = layout_page.extract_words() if words else None
+            text = None if words else (layout_page.extract_text() or '')
+            tables = {
+                settings_key(settings): layout_page.extract_tables(settings)
+                for settings in table_settings
+            }
+            results.append((index, text, tables, page_words, kind))
+            page.close()
+    return results
+
+
+def open_pdf_session(pdf_file) -> ContextManager[PdfSession]:
+    """
+    Get a session for a PDF, borrowing it if one was passed in.
+
+    Args:
+        pdf_file: PdfSession, file path or file-like object
+
+    Returns:
+        Context manager yielding a PdfSession. A borrowed session is left
+        open on exit; a newly created one is closed.
+    """
+    if isinstance(pdf_file, PdfSession):
+        return nullcontext(pdf_file)
+    return PdfSession(pdf_file)
@@ -0,0 +1,174 @@
+"""
+Running-balance reconciliation over transaction columns.
+One engine for every parser: filling balances the statement does not show,
+and finding rows whose shown balance disagrees with the running balance.
+
+Both work on integer-pence columns (debits, credits and balances, with
+NO_BALANCE for an unknown balance), as kept by TransactionTable, so every
+running balance is exact. With NumPy installed, long statements are
+reconciled with cumulative sums instead of a Python loop; without it (or
+for short statements) the same rules run in pure Python.
+"""
+from array import array
+from typing import NamedTuple, Optional, Sequence, Tuple
+import os
+
+from .money import NO_BALANCE
+
+# Row count from which NumPy is used (below it, converting columns costs more than it saves)
+VECTORIZE_MIN_ROWS = int(os.getenv('RECONCILE_VECTORIZE_MIN_ROWS', '64'))
+
+# Largest running-balance difference accepted, in pence
+BALANCE_TOLERANCE = 1
+
+_numpy = None
+_numpy_checked = False
+
+
+def _get_numpy():
+    """numpy module, or None if not installed (imported on first long statement)"""
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _numpy_checked = True
+    return _numpy
+
+
+class BalanceMismatches(NamedTuple):
+    """Rows whose statement balance disagrees with the running balance"""
+    indexes: array   # array('q') of row indexes
+    expected: array  # array('q') running balance at each row, in pence
+    actual: array    # array('q') balance shown on the statement, in pence
+
+
+def fill_missing_balances(debits: Sequence[int], credits: Sequence[int], balances: Sequence[int],
+                          opening_balance: Optional[int] = None) -> Tuple[array, Optional[int]]:
+    """
+    Fill unknown balances from the known ones.
+
+    Each unknown balance is the nearest known balance before it plus the
+    credits and minus the debits since. Rows before the first known balance
+    are worked backwards from it, unless an opening balance (the running
+    balance before the first row) is given.
+
+    Args:
+        debits: Debit column, in pence
+        credits: Credit column, in pence
+        balances: Balance column, in pence (NO_BALANCE where unknown)
+        opening_balance: Running balance before the first row, if known
+
+    Returns:
+        Tuple of (filled balance column, running balance after the last
+        row or None if there is no known balance to work from)
+    """
+    count = len(balances)
+    np = _get_numpy() if count >= VECTORIZE_MIN_ROWS else None
+    if np is not None:
+        return _fill_vectorized(np, debits, credits, balances, opening_balance)
+
+    filled = array('q', balances)
+    if opening_balance is not None:
+        first = -1
+        current = opening_balance
+    else:
+        first = next((index for index, balance in enumerate(filled) if balance != NO_BALANCE), None)
+        if first is None:
+            return filled, None
+        current = filled[first]
+
+        # Backwards: the balance before row i+1 is the balance after row i
+        for index in range(first - 1, -1, -1):
+            current = current - credits[index + 1] + debits[index + 1]
+            if filled[index] == NO_BALANCE:
+                filled[index] = current
+            else:
+                current = filled[index]
+        current = filled[first]
+
+    for index in range(first + 1, count):
+        current = current + credits[index] - debits[index]
+        balance = filled[index]
+        if balance == NO_BALANCE:
+            filled[index] = current
+        else:
+            current = balance
+
+    return filled, current
+
+
+def _fill_vectorized(np, debits, credits, balances, opening_balance):
+    """fill_missing_balances with cumulative sums against the known-balance anchors"""
+    balance_column = np.asarray(balances, dtype=np.int64)
+    count = len(balance_column)
+    net = np.cumsum(np.asarray(credits, dtype=np.int64) - np.asarray(debits, dtype=np.int64))
+
+    known = balance_column != NO_BALANCE
+    # Index of the nearest known balance at or before each row (-1 if none yet)
+    anchors = np.maximum.accumulate(np.where(known, np.arange(count), -1))
+
+    running = np.empty(count, dtype=np.int64)
+    has_anchor = anchors >= 0
+    anchor_rows = anchors[has_anchor]
+    running[has_anchor] = balance_column[anchor_rows] + (net[has_anchor] - net[anchor_rows])
+
+    leading = ~has_anchor
+    if leading.any():
+        if opening_balance is not None:
+            running[leading] = opening_balance + net[leading]
+        elif known.any():
+            first = int(np.argmax(known))
+            running[leading] = balance_column[first] - (net[first] - net[leading])
+        else:
+            return array('q', balance_column.tobytes()), None
+
+    return array('q', running.tobytes()), int(running[-1])
+
+
+def balance_mismatches(debits: Sequence[int], credits: Sequence[int], balances: Sequence[int],
+                       tolerance: int = BALANCE_TOLERANCE) -> BalanceMismatches:
+    """
+    Rows whose statement balance disagrees with the running balance.
+
+    The running balance starts from the first row's balance (nothing is
+    checked if it has none), adding each row's credit and subtracting its
+    debit, and is compared with every known balance after it.
+
+    Args:
+        debits: Debit column, in pence
+        credits: Credit column, in pence
+        balances: Balance column, in pence (NO_BALANCE where unknown)
+        tolerance: Largest difference accepted, in pence
+
+    Returns:
+        BalanceMismatches with the row indexes, expected and actual balances
+    """
+    count = len(balances)
+    if count == 0 or balances[0] == NO_BALANCE:
+        return BalanceMismatches(array('q'), array('q'), array('q'))
+
+    np = _get_numpy() if count >= VECTORIZE_MIN_ROWS else None
+    if np is not None:
+        net = np.asarray(credits, dtype=np.int64)[1:] - np.asarray(debits, dtype=np.int64)[1:]
+        expected = balances[0] + np.cumsum(net)
+        actual = np.asarray(balances, dtype=np.int64)[1:]
+        rows = np.flatnonzero((actual != NO_BALANCE) & (np.abs(expected - actual) > tolerance))
+        return BalanceMismatches(
+            array('q', (rows + 1).tobytes()),
+            array('q', expected[rows].tobytes()),
+            array('q', actual[rows].tobytes()),
+        )
+
+    indexes, expected, actual = array('q'), array('q'), array('q')
+    calculated = balances[0]
+    for index in range(1, count):
+        calculated = calculated + credits[index] - debits[index]
+        balance = balances[index]
+        if balance != NO_BALANCE and abs(calculated - balance) > tolerance:
+            indexes.append(index)
+            expected.append(calculated)
+            actual.append(balance)
+    return BalanceMismatches(indexes, expected, actual)
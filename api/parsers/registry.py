@@ -0,0 +1,93 @@
+"""
+Lazy parser registry.
+Maps bank identifiers to parser classes without importing the parser
+modules until a parser is actually requested, so cold starts only pay for
+the bank being converted.
+"""
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple, Type
+
+
+class LazyParserRegistry(Mapping):
+    """
+    Read-only mapping of bank_id -> parser class, importing on first access.
+
+    Membership tests, len() and iterating over bank ids never import a
+    parser module; looking up a bank imports only its module.
+
+    Usage:
+        registry = LazyParserRegistry(__name__, {
+            'barclays': ('.barclays_parser', 'BarclaysParser'),
+        })
+        parser_class = registry.get('barclays')
+        parser = registry.instance('barclays')  # shared, stateless
+    """
+
+    def __init__(self, package: str, entries: Dict[str, Tuple[str, str]]):
+        """
+        Args:
+            package: Package that relative module names resolve against
+            entries: bank_id -> (module name, class name)
+        """
+        self._package = package
+        self._entries = dict(entries)
+        self._classes: Dict[str, Type] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, bank_id: str) -> Type:
+        parser_class = self._classes.get(bank_id)
+        if parser_class is not None:
+            return parser_class
+
+        module_name, class_name = self._entries[bank_id]
+        with self._lock:
+            if bank_id not in self._classes:
+                module = importlib.import_module(module_name, self._package)
+                self._classes[bank_id] = getattr(module, class_name)
+        return self._classes[bank_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, bank_id) -> bool:
+        return bank_id in self._entries
+
+    def instance(self, bank_id: str) -> Any:
+        """
+        Shared parser instance for a bank, created on first use.
+
+        Parsers keep no per-conversion state (only their logger and config),
+        so one instance serves every request, including concurrent ones.
+
+        Args:
+            bank_id: Bank identifier
+
+        Returns:
+            Parser instance
+
+        Raises:
+            KeyError: If the bank is not registered
+        """
+        parser = self._instances.get(bank_id)
+        if parser is not None:
+            return parser
+
+        parser_class = self[bank_id]
+        with self._lock:
+            if bank_id not in self._instances:
+                self._instances[bank_id] = parser_class()
+        return self._instances[bank_id]
+
+    def class_names(self) -> Dict[str, str]:
+        """Parser class name -> bank_id, for resolving exported names"""
+        return {class_name: bank_id for bank_id, (_, class_name) in self._entries.items()}
+
+    def is_loaded(self, bank_id: str) -> bool:
+        """Whether the parser module for a bank has been imported"""
+        return bank_id in self._classes
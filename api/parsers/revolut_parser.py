@@ -2,48 +2,44 @@
 Revolut Bank Statement Parser
 Clean format with clear Money In/Out columns
 """
-import pdfplumber
 import re
 from typing import List, Dict
-from datetime import datetime
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
-    from .config import get_config
+    from .transaction import Transaction
+    from .dates import parse_date
+    from .money import parse_pence
     from ..utils import clean_description
 except ImportError:
     api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
-    from parsers.config import get_config
+    from parsers.transaction import Transaction
+    from parsers.dates import parse_date
+    from parsers.money import parse_pence
     from utils import clean_description
 
 
 class RevolutParser(BaseBankParser):
     """Parser for Revolut Bank statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('revolut')
-        self.config = get_config('revolut')
+    # Money on Revolut lines always carries the pound sign: £1,234.56. The
+    # shared AmountTokenizer is no faster for this one shape (see
+    # benchmarks/bench_amount_tokenizer.py), so it stays a plain regex.
+    AMOUNT_PATTERN = re.compile(r'£[\d,]+\.\d{2}')
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """Extract transactions from Revolut statement"""
         transactions = []
 
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
 
             transactions = self._parse_revolut_text(all_text)
 
@@ -77,8 +73,7 @@ class RevolutParser(BaseBankParser):
             after_date = line[len(date_str):].strip()
 
             # Extract amounts (£X,XXX.XX or £XXX.XX)
-            amount_pattern = r'£[\d,]+\.\d{2}'
-            amounts = re.findall(amount_pattern, line)
+            amounts = self.AMOUNT_PATTERN.findall(line)
 
             # Get description
             description_part = after_date
@@ -97,80 +92,47 @@ class RevolutParser(BaseBankParser):
                     is_credit = True
 
             if len(amounts) >= 2:
-                amount_str = amounts[0].replace('£', '').replace(',', '')
-                balance_str = amounts[-1].replace('£', '').replace(',', '')
-
-                try:
-                    amount = float(amount_str)
-                    balance = float(balance_str)
-
-                    if is_credit or 'Transfer from' in description or 'From:' in line:
-                        debit = 0.0
-                        credit = amount
-                        tx_type = 'income'
-                    else:
-                        debit = amount
-                        credit = 0.0
-                        tx_type = 'expense'
-
-                except ValueError:
-                    self.logger.debug(f"Invalid amount: {amounts}")
-                    i += 1
-                    continue
+                amount = parse_pence(amounts[0]) / 100
+                balance = parse_pence(amounts[-1]) / 100
 
             elif len(amounts) == 1:
                 # Single amount - check next line for balance (e.g., "Fee: £0.12 £257.07")
-                amount_str = amounts[0].replace('£', '').replace(',', '')
+                amount = parse_pence(amounts[0]) / 100
                 balance = None
 
                 if i + 1 < len(lines):
-                    next_line = lines[i + 1]
-                    next_amounts = re.findall(amount_pattern, next_line)
-                    if next_amounts and len(next_amounts) >= 1:
+                    next_amounts = self.AMOUNT_PATTERN.findall(lines[i + 1])
+                    if next_amounts:
                         # Last amount on next line is likely the balance
-                        balance_str = next_amounts[-1].replace('£', '').replace(',', '')
-                        try:
-                            balance = float(balance_str)
-                        except ValueError:
-                            balance = None
-
-                try:
-                    amount = float(amount_str)
-
-                    if is_credit or 'Transfer from' in description or 'From:' in line:
-                        debit = 0.0
-                        credit = amount
-                        tx_type = 'income'
-                    else:
-                        debit = amount
-                        credit = 0.0
-                        tx_type = 'expense'
-
-                except ValueError:
-                    self.logger.debug(f"Invalid single amount: {amounts}")
-                    i += 1
-                    continue
+                        balance = parse_pence(next_amounts[-1]) / 100
             else:
                 i += 1
                 continue
 
+            if is_credit or 'Transfer from' in description or 'From:' in line:
+                debit = 0.0
+                credit = amount
+                tx_type = 'income'
+            else:
+                debit = amount
+                credit = 0.0
+                tx_type = 'expense'
+
             # Parse date
-            try:
-                date_obj = datetime.strptime(date_str, '%d %b %Y')
-                parsed_date = date_obj.strftime('%Y-%m-%d')
-            except:
+            parsed_date = parse_date(date_str, ('%d %b %Y',))
+            if not parsed_date:
                 self.logger.debug(f"Invalid date: {date_str}")
                 i += 1
                 continue
 
-            transaction = {
-                'date': parsed_date,
-                'description': description,
-                'debit': debit,
-                'credit': credit,
-                'balance': balance,
-                'type': tx_type
-            }
+            transaction = Transaction(
+                date=parsed_date,
+                description=description,
+                debit=debit,
+                credit=credit,
+                balance=balance,
+                type=tx_type
+            )
 
             transactions.append(transaction)
             self.logger.debug(f"{parsed_date} | {description[:40]:40} | {'£'+str(credit) if credit > 0 else '-£'+str(debit):>10} | Balance: £{balance}")
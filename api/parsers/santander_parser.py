@@ -2,7 +2,6 @@
 Santander Bank Statement Parser
 Handles multi-line transactions with Credits/Debits/Balance columns
 """
-import pdfplumber
 import re
 from typing import List, Dict
 from datetime import datetime
@@ -12,38 +11,95 @@ import os
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
-    from .config import get_config
+    from .transaction import Transaction
+    from .dates import current_year
+    from .amounts import AmountTokenizer, MONEY_GROUPED
+    from .cleaning import Rule, RuleSet, cached_cleaner
+    from .line_lexer import BALANCE_MARKER, DATE_START, END, FOOTER, HEADER, Block, BlockGrouper, LineLexer
     from ..utils import clean_description
 except ImportError:
     api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
-    from parsers.config import get_config
+    from parsers.transaction import Transaction
+    from parsers.dates import current_year
+    from parsers.amounts import AmountTokenizer, MONEY_GROUPED
+    from parsers.cleaning import Rule, RuleSet, cached_cleaner
+    from parsers.line_lexer import BALANCE_MARKER, DATE_START, END, FOOTER, HEADER, Block, BlockGrouper, LineLexer
     from utils import clean_description
 
 
 class SantanderParser(BaseBankParser):
     """Parser for Santander UK Business Bank statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('santander')
-        self.config = get_config('santander')
+    # Money on Santander lines: 1,234.56 with no noise to skip
+    AMOUNTS = AmountTokenizer(MONEY_GROUPED, noise=())
+
+    # Text lines, lexed once, and how they group into transactions (see
+    # parsers.line_lexer). Dates read "3rd Dec"; the table ends at the
+    # current statement balance
+    LEXER = LineLexer(
+        r'^(\d{1,2}(?:st|nd|rd|th)\s+[A-Z][a-z]{2})\s+',
+        header=r'^(?=.*Date)(?=.*Description)',
+        footer=r'Total credits|Total debits',
+        balance_marker=r'Previous statement balance',
+        end=r'Current statement balance',
+        balance=r'^-?\d{1,5}(?:,\d{3})*\.\d{2}$',
+        amounts=AMOUNTS,
+    )
+    BLOCKS = BlockGrouper(
+        stop=(DATE_START, HEADER, FOOTER, BALANCE_MARKER),
+        skip=(FOOTER, BALANCE_MARKER),
+        end=(END,),
+        take_balance=True,
+    )
+
+    # Description rules for each transaction type, tried in order (the
+    # first type found in the description applies)
+    DESCRIPTION_TYPE_RULES = (
+        ('DIRECT DEBIT PAYMENT TO', RuleSet(
+            Rule(r'DIRECT DEBIT PAYMENT TO\s+', 'Direct Debit - '),
+            Rule(r'\s*REF\s+', ' Ref: '),
+            Rule(r',?\s*MANDATE NO\s+\d+'),
+        )),
+        ('BILL PAYMENT VIA FASTER PAYMENT TO', RuleSet(
+            Rule(r'BILL PAYMENT VIA FASTER PAYMENT TO\s+', 'Faster Payment - '),
+            Rule(r'\s*REFERENCE\s+', ' Ref: '),
+            Rule(r',?\s*MANDATE NO\s+\d+'),
+        )),
+        ('CARD PAYMENT TO', RuleSet(
+            Rule(r'CARD PAYMENT TO\s+', 'Card Payment - '),
+            Rule(r'\s+ON\s+\d{2}-\d{2}-\d{4}'),
+        )),
+        ('BANK GIRO CREDIT', RuleSet(
+            Rule(r'BANK GIRO CREDIT\s+REF\s+', 'Bank Giro - '),
+        )),
+        ('FASTER PAYMENTS RECEIPT', RuleSet(
+            Rule(r'FASTER PAYMENTS RECEIPT\s+REF\.?', 'Received from'),
+            Rule(r'\s+FROM\s+', ' - '),
+        )),
+        ('TRANSFER FROM', RuleSet(
+            Rule(r'TRANSFER FROM\s+', 'Transfer from '),
+        )),
+    )
+
+    # Description rules for every transaction
+    DESCRIPTION_RULES = RuleSet(
+        # Remove extra reference codes
+        Rule(r'\b[A-Z]{3}\d{12,}\b'),
+
+        # Clean up
+        Rule(r'\s+', ' '),
+    )
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """Extract transactions from Santander statement"""
         transactions = []
 
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
 
             transactions = self._parse_santander_text(all_text)
 
@@ -57,20 +113,16 @@ class SantanderParser(BaseBankParser):
     def _parse_santander_text(self, text: str) -> List[Dict]:
         """Parse transactions from Santander statement text using block-based approach"""
         transactions = []
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = self.LEXER.lex_lines(line for line in text.split('\n') if line.strip())
 
         self.logger.info(f"Processing {len(lines)} lines")
 
-        # Date pattern: 3rd Dec, 10th Dec, etc.
-        date_pattern = r'^(\d{1,2}(?:st|nd|rd|th)\s+[A-Z][a-z]{2})\s+'
-        amount_pattern = r'\d{1,5}(?:,\d{3})*\.\d{2}'
-
         # Find header line
         header_idx = -1
         for i, line in enumerate(lines):
-            if 'Date' in line and 'Description' in line and 'Credits' in line and 'Debits' in line:
+            if HEADER in line.tokens and 'Credits' in line.text and 'Debits' in line.text:
                 header_idx = i
-                self.logger.debug(f"Found header at line {i}: {line}")
+                self.logger.debug(f"Found header at line {i}: {line.text}")
                 break
 
         if header_idx == -1:
@@ -78,82 +130,21 @@ class SantanderParser(BaseBankParser):
             return transactions
 
         # Group lines into transaction blocks
-        self.logger.debug("Grouping lines into transaction blocks...")
-        blocks = []
-        i = header_idx + 1
-
-        while i < len(lines):
-            line = lines[i]
-
-            # Skip footer/summary lines
-            if 'Previous statement balance' in line or 'Total credits' in line or 'Total debits' in line:
-                i += 1
-                continue
-
-            if 'Current statement balance' in line:
-                break
-
-            date_match = re.match(date_pattern, line)
-
-            if date_match:
-                block_lines = [line]
-                block_start_idx = i
-
-                j = i + 1
-                found_amounts = bool(re.findall(amount_pattern, line))
-
-                while j < len(lines):
-                    next_line = lines[j]
-
-                    if re.match(date_pattern, next_line):
-                        break
-
-                    if 'Date' in next_line and 'Description' in next_line:
-                        break
-                    if 'Previous statement balance' in next_line or 'Total credits' in next_line:
-                        break
-
-                    block_lines.append(next_line)
-
-                    if re.search(amount_pattern, next_line):
-                        found_amounts = True
-                        j += 1
-                        if j < len(lines) and not re.match(date_pattern, lines[j]):
-                            potential_balance = lines[j].strip()
-                            if re.match(r'^-?\d{1,5}(?:,\d{3})*\.\d{2}$', potential_balance):
-                                block_lines.append(potential_balance)
-                                j += 1
-                        break
-
-                    j += 1
-
-                if found_amounts:
-                    blocks.append({
-                        'lines': block_lines,
-                        'date_str': date_match.group(1),
-                        'start_idx': block_start_idx,
-                        'end_idx': j - 1
-                    })
-                    self.logger.debug(f"Block {len(blocks)}: {len(block_lines)} lines")
-
-                i = j
-            else:
-                i += 1
-
+        blocks = self.BLOCKS.group(lines, start=header_idx + 1)
         self.logger.debug(f"Created {len(blocks)} transaction blocks")
 
         # Infer year from statement
-        current_year = datetime.now().year
+        statement_year = current_year()
         for line in lines[:30]:
-            year_match = re.search(r'\b(20\d{2})\b', line)
+            year_match = re.search(r'\b(20\d{2})\b', line.text)
             if year_match:
-                current_year = int(year_match.group(1))
+                statement_year = int(year_match.group(1))
                 break
 
         previous_month = None
 
         for block_num, block in enumerate(blocks, 1):
-            date_str = block['date_str']
+            date_str = block.date
             day_match = re.match(r'(\d{1,2})(?:st|nd|rd|th)\s+([A-Z][a-z]{2})', date_str)
             if day_match:
                 month_abbr = day_match.group(2)
@@ -165,15 +156,15 @@ class SantanderParser(BaseBankParser):
 
                 # Detect year rollover
                 if previous_month == 12 and current_month == 1:
-                    current_year += 1
-                    self.logger.debug(f"Year rollover detected: Dec -> Jan, year now {current_year}")
+                    statement_year += 1
+                    self.logger.debug(f"Year rollover detected: Dec -> Jan, year now {statement_year}")
 
                 previous_month = current_month
 
             transaction = self._parse_santander_transaction_block(
                 block=block,
                 block_num=block_num,
-                year=current_year
+                year=statement_year
             )
 
             if transaction:
@@ -185,15 +176,15 @@ class SantanderParser(BaseBankParser):
 
         return transactions
 
-    def _parse_santander_transaction_block(self, block: Dict, block_num: int, year: int) -> Dict:
+    def _parse_santander_transaction_block(self, block: Block, block_num: int, year: int) -> Transaction:
         """Parse a transaction block into a transaction dictionary"""
-        block_lines = block['lines']
-        date_str = block['date_str']
+        block_lines = block.lines
+        date_str = block.date
 
         combined_text = ' '.join(block_lines)
 
-        amount_pattern = r'(\d{1,5}(?:,\d{3})*\.\d{2})'
-        amounts = re.findall(amount_pattern, combined_text)
+        money = self.AMOUNTS.money(combined_text)
+        amounts = [token.pence for token in money]
 
         if len(amounts) < 1:
             self.logger.debug(f"Block {block_num}: No amounts found, skipping")
@@ -204,7 +195,7 @@ class SantanderParser(BaseBankParser):
         balance = None
 
         if len(amounts) == 1:
-            amount_val = float(amounts[0].replace(',', ''))
+            amount_val = amounts[0] / 100
 
             if any(keyword in combined_text.upper() for keyword in [
                 'RECEIPT', 'TRANSFER FROM', 'BANK GIRO CREDIT', 'CREDIT REF'
@@ -222,35 +213,35 @@ class SantanderParser(BaseBankParser):
             ])
 
             if has_credit_keyword and not has_debit_keyword:
-                credit = float(amounts[0].replace(',', ''))
-                balance = float(amounts[1].replace(',', ''))
+                credit = amounts[0] / 100
+                balance = amounts[1] / 100
             elif has_debit_keyword and not has_credit_keyword:
-                debit = float(amounts[0].replace(',', ''))
-                balance = float(amounts[1].replace(',', ''))
+                debit = amounts[0] / 100
+                balance = amounts[1] / 100
             else:
                 if has_credit_keyword:
-                    credit = float(amounts[0].replace(',', ''))
+                    credit = amounts[0] / 100
                 else:
-                    debit = float(amounts[0].replace(',', ''))
-                balance = float(amounts[1].replace(',', ''))
+                    debit = amounts[0] / 100
+                balance = amounts[1] / 100
 
         elif len(amounts) >= 3:
-            balance = float(amounts[-1].replace(',', ''))
+            balance = amounts[-1] / 100
 
             has_credit_keyword = any(keyword in combined_text.upper() for keyword in [
                 'RECEIPT', 'TRANSFER FROM', 'BANK GIRO CREDIT', 'CREDIT REF'
             ])
 
             if has_credit_keyword:
-                credit = float(amounts[-2].replace(',', ''))
+                credit = amounts[-2] / 100
             else:
-                debit = float(amounts[-2].replace(',', ''))
+                debit = amounts[-2] / 100
 
         # Extract description
         description = combined_text
         description = re.sub(r'\d{1,2}(?:st|nd|rd|th)\s+[A-Z][a-z]{2}', '', description)
-        for amount in amounts:
-            description = description.replace(amount, '')
+        for token in money:
+            description = description.replace(token.text, '')
         description = self._clean_santander_description(description)
 
         # Parse date
@@ -279,14 +270,14 @@ class SantanderParser(BaseBankParser):
         else:
             tx_type = 'expense'
 
-        transaction = {
-            'date': parsed_date,
-            'description': description,
-            'debit': debit,
-            'credit': credit,
-            'balance': balance,
-            'type': tx_type
-        }
+        transaction = Transaction(
+            date=parsed_date,
+            description=description,
+            debit=debit,
+            credit=credit,
+            balance=balance,
+            type=tx_type
+        )
 
         amount_display = f"£{credit:.2f}" if credit > 0 else f"-£{debit:.2f}"
         balance_display = f"£{balance:.2f}" if balance else "N/A"
@@ -294,6 +285,7 @@ class SantanderParser(BaseBankParser):
 
         return transaction
 
+    @cached_cleaner
     def _clean_santander_description(self, text: str) -> str:
         """Clean Santander transaction description"""
         if not text:
@@ -302,35 +294,12 @@ class SantanderParser(BaseBankParser):
         cleaned = text
 
         # Handle different transaction types
-        if 'DIRECT DEBIT PAYMENT TO' in cleaned:
-            cleaned = re.sub(r'DIRECT DEBIT PAYMENT TO\s+', 'Direct Debit - ', cleaned)
-            cleaned = re.sub(r'\s*REF\s+', ' Ref: ', cleaned)
-            cleaned = re.sub(r',?\s*MANDATE NO\s+\d+', '', cleaned)
-
-        elif 'BILL PAYMENT VIA FASTER PAYMENT TO' in cleaned:
-            cleaned = re.sub(r'BILL PAYMENT VIA FASTER PAYMENT TO\s+', 'Faster Payment - ', cleaned)
-            cleaned = re.sub(r'\s*REFERENCE\s+', ' Ref: ', cleaned)
-            cleaned = re.sub(r',?\s*MANDATE NO\s+\d+', '', cleaned)
-
-        elif 'CARD PAYMENT TO' in cleaned:
-            cleaned = re.sub(r'CARD PAYMENT TO\s+', 'Card Payment - ', cleaned)
-            cleaned = re.sub(r'\s+ON\s+\d{2}-\d{2}-\d{4}', '', cleaned)
-
-        elif 'BANK GIRO CREDIT' in cleaned:
-            cleaned = re.sub(r'BANK GIRO CREDIT\s+REF\s+', 'Bank Giro - ', cleaned)
-
-        elif 'FASTER PAYMENTS RECEIPT' in cleaned:
-            cleaned = re.sub(r'FASTER PAYMENTS RECEIPT\s+REF\.?', 'Received from', cleaned)
-            cleaned = re.sub(r'\s+FROM\s+', ' - ', cleaned)
-
-        elif 'TRANSFER FROM' in cleaned:
-            cleaned = re.sub(r'TRANSFER FROM\s+', 'Transfer from ', cleaned)
-
-        # Remove extra reference codes
-        cleaned = re.sub(r'\b[A-Z]{3}\d{12,}\b', '', cleaned)
+        for transaction_type, rules in self.DESCRIPTION_TYPE_RULES:
+            if transaction_type in cleaned:
+                cleaned = rules.apply(cleaned)
+                break
 
-        # Clean up
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = self.DESCRIPTION_RULES.apply(cleaned)
         cleaned = cleaned.strip()
         cleaned = cleaned.strip('.,;:- ')
 
@@ -0,0 +1,260 @@
+"""
+Confidence-gated scheduling of table/text extraction strategies.
+
+Hybrid parsers used to run every strategy and keep one result. The scheduler
+runs the strategy that has historically won for the bank first and stops as
+soon as its result clears the bank's confidence threshold.
+
+Wins are only counted when every strategy ran and the results were compared,
+so a strategy that happens to run first can't win by default. Comparisons
+still happen while a bank's win counts are close and every
+PARSER_STRATEGY_EXPLORE_EVERY runs after that, so the order keeps adapting.
+
+A parser whose selection rule favours one strategy on ties (Monzo keeps
+tables whenever they find as many rows as text) only lets the other skip it
+while the favoured strategy has never won a comparison (see has_won).
+"""
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .logger import get_parser_logger
+
+
+# Optional JSON file the win counts are persisted to (in-memory only if unset)
+PARSER_STRATEGY_STATS = os.getenv('PARSER_STRATEGY_STATS', '')
+
+# Threshold used when a bank has no config
+DEFAULT_CONFIDENCE_THRESHOLD = 0.9
+
+# Compare every strategy on every Nth run for a bank (0 turns this off) ...
+PARSER_STRATEGY_EXPLORE_EVERY = int(os.getenv('PARSER_STRATEGY_EXPLORE_EVERY', '20'))
+
+# ... and on every run while the leader is fewer than this many wins ahead
+PARSER_STRATEGY_EXPLORE_MARGIN = int(os.getenv('PARSER_STRATEGY_EXPLORE_MARGIN', '3'))
+
+logger = get_parser_logger('strategy')
+
+# (transactions, confidence) for each strategy that ran
+StrategyResults = Dict[str, Tuple[List[Dict], float]]
+
+
+def calculate_extraction_confidence(transactions: List[Dict]) -> float:
+    """
+    Calculate confidence score based on extraction quality.
+
+    Factors:
+    - Number of transactions
+    - Completeness of fields
+    - Balance reconciliation
+
+    Args:
+        transactions: Extracted transactions
+
+    Returns:
+        Confidence between 0.0 and 1.0
+    """
+    if not transactions:
+        return 0.0
+
+    score = 0.0
+
+    # Base score from transaction count
+    score += min(len(transactions) / 10, 1.0) * 0.3  # 30% for having transactions
+
+    # Completeness score
+    complete_count = sum(
+        1 for txn in transactions
+        if txn.get('date') and txn.get('description') and
+        (txn.get('debit', 0) > 0 or txn.get('credit', 0) > 0)
+    )
+    score += (complete_count / len(transactions)) * 0.4  # 40% for completeness
+
+    # Balance score
+    has_balance = sum(1 for txn in transactions if txn.get('balance') is not None)
+    score += (has_balance / len(transactions)) * 0.3  # 30% for balances
+
+    return min(score, 1.0)
+
+
+class StrategyScheduler:
+    """
+    Orders extraction strategies per bank and skips ones that can't win.
+
+    Usage:
+        method, transactions = get_strategy_scheduler().run(
+            'monzo',
+            {'table': lambda: self._extract_from_tables(pdf),
+             'text': lambda: self._extract_from_text(pdf)},
+            threshold=self.config.strategy_confidence_threshold,
+            default_order=self.config.extraction_order,
+        )
+    """
+
+    def __init__(self, stats_path: Optional[str] = None, explore_every: Optional[int] = None,
+                 explore_margin: Optional[int] = None):
+        """
+        Args:
+            stats_path: JSON file to load and persist win counts (optional)
+            explore_every: Compare every strategy on every Nth run for a bank
+                           (default PARSER_STRATEGY_EXPLORE_EVERY, 0 = never)
+            explore_margin: Compare while the leader has fewer than this many
+                            more wins (default PARSER_STRATEGY_EXPLORE_MARGIN)
+        """
+        self.stats_path = stats_path
+        self.explore_every = PARSER_STRATEGY_EXPLORE_EVERY if explore_every is None else explore_every
+        self.explore_margin = PARSER_STRATEGY_EXPLORE_MARGIN if explore_margin is None else explore_margin
+        self._wins: Dict[str, Dict[str, int]] = {}
+        self._runs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if stats_path and os.path.exists(stats_path):
+            try:
+                with open(stats_path, 'r', encoding='utf-8') as f:
+                    self._wins = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable strategy stats {stats_path}: {e}")
+
+    def order(self, bank_id: str, methods: List[str]) -> List[str]:
+        """
+        Order strategies by how often they have won for a bank.
+
+        Args:
+            bank_id: Bank identifier
+            methods: Strategy names in their default order (breaks ties)
+
+        Returns:
+            Strategy names, historically best first
+        """
+        with self._lock:
+            wins = dict(self._wins.get(bank_id, {}))
+        return sorted(methods, key=lambda method: -wins.get(method, 0))
+
+    def should_compare(self, bank_id: str, methods: List[str]) -> bool:
+        """
+        Whether this run should try every strategy rather than stop early.
+
+        Counts the run. True while the leading strategy is fewer than
+        explore_margin wins ahead of the next one, and on every
+        explore_every-th run after that.
+        """
+        with self._lock:
+            runs = self._runs.get(bank_id, 0) + 1
+            self._runs[bank_id] = runs
+            wins = sorted((self._wins.get(bank_id, {}).get(method, 0) for method in methods), reverse=True)
+
+        if len(wins) > 1 and wins[0] - wins[1] < self.explore_margin:
+            return True
+        return bool(self.explore_every) and runs % self.explore_every == 0
+
+    def record(self, bank_id: str, method: str):
+        """
+        Record that a strategy won a comparison for a bank.
+
+        Counts accumulate in memory; the file is rewritten only when the
+        bank's preferred strategy changes, which is all another worker
+        needs to pick it up.
+        """
+        with self._lock:
+            bank_wins = self._wins.setdefault(bank_id, {})
+            before = max(bank_wins, key=bank_wins.get) if bank_wins else None
+            bank_wins[method] = bank_wins.get(method, 0) + 1
+            changed = max(bank_wins, key=bank_wins.get) != before
+            snapshot = json.dumps(self._wins) if changed else None
+
+        if snapshot is not None and self.stats_path:
+            temp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(snapshot)
+                os.replace(temp_path, self.stats_path)
+            except OSError as e:
+                logger.debug(f"Could not persist strategy stats: {e}")
+
+    def has_won(self, bank_id: str, method: str) -> bool:
+        """Whether a strategy has won any comparison for a bank"""
+        with self._lock:
+            return self._wins.get(bank_id, {}).get(method, 0) > 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Win counts per bank and strategy"""
+        with self._lock:
+            return json.loads(json.dumps(self._wins))
+
+    def run(self, bank_id: str, strategies: Dict[str, Callable[[], List[Dict]]],
+            threshold: Optional[float] = DEFAULT_CONFIDENCE_THRESHOLD,
+            default_order: Optional[List[str]] = None,
+            select: Optional[Callable[[StrategyResults], str]] = None,
+            confidence: Callable[[List[Dict]], float] = calculate_extraction_confidence
+            ) -> Tuple[str, List[Dict]]:
+        """
+        Run strategies until one is confident enough.
+
+        Args:
+            bank_id: Bank identifier (win counts are kept per bank)
+            strategies: Strategy name -> callable returning transactions,
+                        in default order
+            threshold: Confidence at which remaining strategies are skipped
+                       (None runs and compares every strategy each time)
+            default_order: Order to try strategies in while a bank has no
+                           history (defaults to the order of strategies)
+            select: Picks the winner when every strategy ran (defaults to
+                    the highest confidence, earliest run on ties)
+            confidence: Scores a strategy's transactions
+
+        Returns:
+            Tuple of (winning strategy name, its transactions)
+        """
+        results: StrategyResults = {}
+        winner = None
+
+        methods = [name for name in (default_order or []) if name in strategies]
+        methods += [name for name in strategies if name not in methods]
+
+        compare = threshold is None or self.should_compare(bank_id, methods)
+
+        for method in self.order(bank_id, methods):
+            transactions = strategies[method]()
+            score = confidence(transactions)
+            results[method] = (transactions, score)
+            logger.debug(f"{bank_id}: {method} extraction {len(transactions)} transactions ({score:.0%} confidence)")
+
+            if not compare and score >= threshold:
+                winner = method
+                skipped = [name for name in strategies if name not in results]
+                if skipped:
+                    logger.debug(f"{bank_id}: skipping {', '.join(skipped)} extraction")
+                break
+
+        if winner is None:
+            if select is not None:
+                winner = select(results)
+            else:
+                winner = max(results, key=lambda method: results[method][1])
+            if len(results) > 1:
+                self.record(bank_id, winner)
+
+        return winner, results[winner][0]
+
+
+# Process-wide scheduler so win counts accumulate across conversions
+_scheduler: Optional[StrategyScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_strategy_scheduler() -> StrategyScheduler:
+    """
+    Get the shared strategy scheduler.
+
+    Win counts are persisted to PARSER_STRATEGY_STATS when it is set.
+
+    Returns:
+        Shared StrategyScheduler instance
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = StrategyScheduler(PARSER_STRATEGY_STATS or None)
+    return _scheduler
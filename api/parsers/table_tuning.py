@@ -0,0 +1,174 @@
+"""
+Per-bank table-settings autotuning.
+
+Parsers that read tables try several pdfplumber table settings per page
+(ruled lines, then text alignment), and every setting that finds nothing
+costs a full table detection. Which setting works depends on the bank and
+on the software that produced the PDF, so the tuner counts, per bank and
+producer fingerprint, which setting produced valid rows and tries the
+winner first on later documents.
+"""
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from .logger import get_parser_logger
+from .pdf_session import PdfSession, settings_key
+
+
+# Optional JSON file the learned settings are persisted to (in-memory only if unset)
+PARSER_TABLE_TUNING = os.getenv('PARSER_TABLE_TUNING', '')
+
+logger = get_parser_logger('table_tuning')
+
+TableSettings = Optional[Dict[str, Any]]
+Row = TypeVar('Row')
+
+
+def producer_fingerprint(pdf: PdfSession) -> str:
+    """
+    Normalized Producer/Creator of a PDF.
+
+    Version numbers are dropped so a bank's statements keep one fingerprint
+    across upgrades of the software generating them.
+
+    Args:
+        pdf: Open PdfSession
+
+    Returns:
+        e.g. 'reportlab pdf library - (opensource)', or '' if unknown
+    """
+    try:
+        metadata = pdf.metadata or {}
+    except Exception:
+        return ''
+    parts = [str(metadata.get(key) or '') for key in ('Producer', 'Creator')]
+    fingerprint = re.sub(r'\bv?\d+(?:[.\-]\d+)*\b', '', ' | '.join(part for part in parts if part))
+    return re.sub(r'\s+', ' ', fingerprint).strip().lower()
+
+
+class TableSettingsTuner:
+    """
+    Orders table settings per bank and PDF producer by past success.
+
+    Usage:
+        rows = get_table_tuner().read_tables(
+            page, 'tide', producer_fingerprint(pdf),
+            [LINES_SETTINGS, TEXT_SETTINGS],
+            read=self._read_tables,
+        )
+    """
+
+    def __init__(self, tuning_path: Optional[str] = None):
+        """
+        Args:
+            tuning_path: JSON file to load and persist learned settings (optional)
+        """
+        self.tuning_path = tuning_path
+        self._wins: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+        if tuning_path and os.path.exists(tuning_path):
+            try:
+                with open(tuning_path, 'r', encoding='utf-8') as f:
+                    self._wins = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable table tuning {tuning_path}: {e}")
+
+    @staticmethod
+    def _key(bank_id: str, fingerprint: str) -> str:
+        return f"{bank_id}|{fingerprint}"
+
+    def order(self, bank_id: str, fingerprint: str, candidates: Sequence[TableSettings]) -> List[TableSettings]:
+        """
+        Order table settings by how often they have produced rows.
+
+        Args:
+            bank_id: Bank identifier
+            fingerprint: PDF producer fingerprint (see producer_fingerprint)
+            candidates: Settings in their default order (breaks ties)
+
+        Returns:
+            Settings, historically best first
+        """
+        with self._lock:
+            wins = dict(self._wins.get(self._key(bank_id, fingerprint), {}))
+        return sorted(candidates, key=lambda settings: -wins.get(settings_key(settings), 0))
+
+    def record(self, bank_id: str, fingerprint: str, settings: TableSettings):
+        """
+        Record that a table setting produced rows.
+
+        Counts accumulate in memory; the file is rewritten only when the
+        preferred setting for the bank and producer changes, which is all
+        another worker needs to pick it up.
+        """
+        key = self._key(bank_id, fingerprint)
+        with self._lock:
+            wins = self._wins.setdefault(key, {})
+            before = max(wins, key=wins.get) if wins else None
+            name = settings_key(settings)
+            wins[name] = wins.get(name, 0) + 1
+            changed = max(wins, key=wins.get) != before
+            snapshot = json.dumps(self._wins) if changed else None
+
+        if snapshot is not None and self.tuning_path:
+            temp_path = f"{self.tuning_path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(snapshot)
+                os.replace(temp_path, self.tuning_path)
+            except OSError as e:
+                logger.debug(f"Could not persist table tuning: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Win counts per bank|producer and settings key"""
+        with self._lock:
+            return json.loads(json.dumps(self._wins))
+
+    def read_tables(self, page, bank_id: str, fingerprint: str, candidates: Sequence[TableSettings],
+                    read: Callable[[List[List[List[Optional[str]]]]], List[Row]]) -> List[Row]:
+        """
+        Read a page's tables with the first settings that produce rows.
+
+        Args:
+            page: PDF page (pdfplumber or SessionPage)
+            bank_id: Bank identifier
+            fingerprint: PDF producer fingerprint
+            candidates: Table settings in default order
+            read: Parses a page's tables into rows (empty if none are valid)
+
+        Returns:
+            Rows from the first settings, in learned order, that produced
+            any (empty if none did)
+        """
+        for settings in self.order(bank_id, fingerprint, candidates):
+            rows = read(page.extract_tables(settings))
+            if rows:
+                self.record(bank_id, fingerprint, settings)
+                return rows
+        return []
+
+
+# Process-wide tuner so learned settings accumulate across conversions
+_tuner: Optional[TableSettingsTuner] = None
+_tuner_lock = threading.Lock()
+
+
+def get_table_tuner() -> TableSettingsTuner:
+    """
+    Get the shared table-settings tuner.
+
+    Learned settings are persisted to PARSER_TABLE_TUNING when it is set.
+
+    Returns:
+        Shared TableSettingsTuner instance
+    """
+    global _tuner
+    if _tuner is None:
+        with _tuner_lock:
+            if _tuner is None:
+                _tuner = TableSettingsTuner(PARSER_TABLE_TUNING or None)
+    return _tuner
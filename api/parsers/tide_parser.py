@@ -2,17 +2,17 @@
 Tide Bank Statement Parser
 Parses Tide business bank statement PDFs
 """
-import pdfplumber
 import re
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime
 import sys
 import os
 
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
+    from .transaction import Transaction
+    from .dates import parse_date, to_uk_date
+    from .amounts import AmountTokenizer, MONEY_LOOSE
     from .config import get_config, should_skip_line
     from ..utils import parse_uk_date, parse_uk_amount, clean_description
 except ImportError:
@@ -21,7 +21,9 @@ except ImportError:
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
+    from parsers.transaction import Transaction
+    from parsers.dates import parse_date, to_uk_date
+    from parsers.amounts import AmountTokenizer, MONEY_LOOSE
     from parsers.config import get_config, should_skip_line
     from utils import parse_uk_date, parse_uk_amount, clean_description
 
@@ -29,9 +31,26 @@ except ImportError:
 class TideParser(BaseBankParser):
     """Parser for Tide Bank business statements"""
 
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('tide')
+    TABLE_SETTINGS = {
+        "vertical_strategy": "lines",
+        "horizontal_strategy": "lines",
+        "snap_tolerance": 5,
+        "join_tolerance": 5,
+    }
+    TEXT_TABLE_SETTINGS = {
+        "vertical_strategy": "text",
+        "horizontal_strategy": "text",
+        "snap_tolerance": 10,
+        "join_tolerance": 10,
+    }
+    # Tried per page in the order the table tuner has learned works
+    TABLE_CANDIDATES = [TABLE_SETTINGS, TEXT_TABLE_SETTINGS]
+    # The text strategy only runs on pages without ruled transaction
+    # tables, so only the lines layout is prefetched
+    PREFETCH_TABLE_SETTINGS = [TABLE_SETTINGS]
+
+    # Money in the text fallback: digits and commas with two decimals
+    AMOUNTS = AmountTokenizer(MONEY_LOOSE, noise=())
 
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """
@@ -48,7 +67,7 @@ class TideParser(BaseBankParser):
         """
         transactions = []
 
-        with pdfplumber.open(pdf_path) as pdf:
+        with self.open_pdf(pdf_path) as pdf:
             # First try table extraction (most reliable for Tide's structured format)
             table_transactions = self._extract_from_tables(pdf)
 
@@ -56,11 +75,7 @@ class TideParser(BaseBankParser):
                 transactions = table_transactions
             else:
                 # Fallback to text-based parsing
-                full_text = ''
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text += page_text + '\n'
+                full_text = pdf.full_text()
 
                 transactions = self._parse_from_text(full_text)
 
@@ -78,53 +93,46 @@ class TideParser(BaseBankParser):
         transactions = []
 
         for page_num, page in enumerate(pdf.pages):
-            # Try to extract tables with various strategies
-            tables = page.extract_tables({
-                "vertical_strategy": "lines",
-                "horizontal_strategy": "lines",
-                "snap_tolerance": 5,
-                "join_tolerance": 5,
-            })
-
-            if not tables:
-                # Try text-based strategy if lines don't work
-                tables = page.extract_tables({
-                    "vertical_strategy": "text",
-                    "horizontal_strategy": "text",
-                    "snap_tolerance": 10,
-                    "join_tolerance": 10,
-                })
-
-            for table in tables:
-                if not table or len(table) < 2:
-                    continue
-
-                # Find header row to identify column positions
-                header_idx = self._find_header_row(table)
-                if header_idx < 0:
-                    continue
-
-                # Process rows after header
-                current_transaction = None
-
-                for row_idx in range(header_idx + 1, len(table)):
-                    row = table[row_idx]
-
-                    if self._is_transaction_row(row):
-                        # Save previous transaction if exists
-                        if current_transaction:
-                            transactions.append(current_transaction)
-
-                        # Parse new transaction
-                        current_transaction = self._parse_tide_row(row)
-
-                    elif current_transaction and self._is_continuation_row(row):
-                        # Append continuation details to current transaction
-                        self._append_continuation(current_transaction, row)
-
-                # Don't forget last transaction
-                if current_transaction:
-                    transactions.append(current_transaction)
+            # Ruled lines, then text alignment, in the order that has
+            # worked before for statements from this PDF producer
+            transactions.extend(self.read_tuned_tables(pdf, page, self.TABLE_CANDIDATES, self._read_tables))
+
+        return transactions
+
+    def _read_tables(self, tables: List[List[List[Optional[str]]]]) -> List[Dict]:
+        """Parse the transactions in a page's tables"""
+        transactions = []
+
+        for table in tables:
+            if not table or len(table) < 2:
+                continue
+
+            # Find header row to identify column positions
+            header_idx = self._find_header_row(table)
+            if header_idx < 0:
+                continue
+
+            # Process rows after header
+            current_transaction = None
+
+            for row_idx in range(header_idx + 1, len(table)):
+                row = table[row_idx]
+
+                if self._is_transaction_row(row):
+                    # Save previous transaction if exists
+                    if current_transaction:
+                        transactions.append(current_transaction)
+
+                    # Parse new transaction
+                    current_transaction = self._parse_tide_row(row)
+
+                elif current_transaction and self._is_continuation_row(row):
+                    # Append continuation details to current transaction
+                    self._append_continuation(current_transaction, row)
+
+            # Don't forget last transaction
+            if current_transaction:
+                transactions.append(current_transaction)
 
         return transactions
 
@@ -167,7 +175,7 @@ class TideParser(BaseBankParser):
         has_content = any(str(cell or '').strip() for cell in row[1:])
         return has_content
 
-    def _parse_tide_row(self, row: List[Optional[str]]) -> Optional[Dict]:
+    def _parse_tide_row(self, row: List[Optional[str]]) -> Optional[Transaction]:
         """
         Parse a single Tide transaction row from table
 
@@ -197,15 +205,15 @@ class TideParser(BaseBankParser):
             # Determine type
             type_field = 'income' if credit > 0 else 'expense'
 
-            return {
-                'date': parsed_date,
-                'description': description or 'Tide Transaction',
-                'debit': debit,
-                'credit': credit,
-                'balance': parsed_balance,
-                'type': type_field,
-                'transaction_type': transaction_type,
-            }
+            return Transaction(
+                date=parsed_date,
+                description=description or 'Tide Transaction',
+                debit=debit,
+                credit=credit,
+                balance=parsed_balance,
+                type=type_field,
+                category=transaction_type,
+            )
 
         except Exception as e:
             self.logger.debug(f"Error parsing Tide row: {e}")
@@ -326,38 +334,38 @@ class TideParser(BaseBankParser):
 
         return transactions
 
-    def _parse_text_transaction(self, date: str, line_content: str, lines: List[str], line_idx: int) -> Dict:
+    def _parse_text_transaction(self, date: str, line_content: str, lines: List[str], line_idx: int) -> Transaction:
         """Parse transaction from text line"""
-        transaction = {
-            'date': date,
-            'description': '',
-            'debit': 0.0,
-            'credit': 0.0,
-            'balance': None,
-            'type': 'expense',
-        }
+        transaction = Transaction(
+            date=date,
+            description='',
+            debit=0.0,
+            credit=0.0,
+            balance=None,
+            type='expense',
+        )
 
         # Try to extract amounts from line
-        amounts = re.findall(r'([\d,]+\.\d{2})', line_content)
+        money = self.AMOUNTS.money(line_content)
 
-        if amounts:
+        if money:
+            amounts = [token.pence / 100 for token in money]
             # Last amount is usually balance, others are transaction amounts
             if len(amounts) >= 3:
                 # paid_in, paid_out, balance
-                transaction['credit'] = self._parse_amount(amounts[0]) if amounts[0] else 0.0
-                transaction['debit'] = self._parse_amount(amounts[1]) if amounts[1] else 0.0
-                transaction['balance'] = self._parse_amount(amounts[-1])
+                transaction['credit'] = amounts[0]
+                transaction['debit'] = amounts[1]
+                transaction['balance'] = amounts[-1]
             elif len(amounts) == 2:
                 # Amount and balance
-                transaction['debit'] = self._parse_amount(amounts[0])
-                transaction['balance'] = self._parse_amount(amounts[1])
+                transaction['debit'] = amounts[0]
+                transaction['balance'] = amounts[1]
             elif len(amounts) == 1:
-                transaction['debit'] = self._parse_amount(amounts[0])
+                transaction['debit'] = amounts[0]
 
             # Extract description (text before amounts)
-            first_amount_pos = line_content.find(amounts[0])
-            if first_amount_pos > 0:
-                transaction['description'] = line_content[:first_amount_pos].strip()
+            if money[0].start > 0:
+                transaction['description'] = line_content[:money[0].start].strip()
         else:
             transaction['description'] = line_content
 
@@ -378,14 +386,13 @@ class TideParser(BaseBankParser):
             return
 
         # Check for amounts
-        amounts = re.findall(r'([\d,]+\.\d{2})', line)
+        amounts = self.AMOUNTS.amounts(line)
         if amounts and not transaction.get('balance'):
             # Might have found balance
-            if len(amounts) >= 1:
-                transaction['balance'] = self._parse_amount(amounts[-1])
+            transaction['balance'] = amounts[-1] / 100
 
         # Append to description if meaningful
-        desc_part = re.sub(r'[\d,]+\.\d{2}', '', line).strip()
+        desc_part = self.AMOUNTS.strip_money(line).strip()
         if desc_part and len(desc_part) > 2:
             current_desc = transaction.get('description', '')
             if desc_part not in current_desc:
@@ -393,30 +400,12 @@ class TideParser(BaseBankParser):
 
     def _parse_tide_date(self, date_str: str) -> Optional[str]:
         """Parse Tide date format: 'DD MMM YYYY' -> 'DD/MM/YYYY'"""
-        try:
-            # Handle various formats
-            formats = ['%d %b %Y', '%d %B %Y']
-
-            for fmt in formats:
-                try:
-                    parsed = datetime.strptime(date_str.strip(), fmt)
-                    return parsed.strftime('%d/%m/%Y')
-                except ValueError:
-                    continue
+        iso_date = parse_date(date_str.strip(), ('%d %b %Y', '%d %B %Y'))
+        return to_uk_date(iso_date) if iso_date else None
 
-            return None
-
-        except Exception as e:
-            self.logger.debug(f"Error parsing date '{date_str}': {e}")
-            return None
-
-    def _parse_date_for_sorting(self, date_str: str) -> datetime:
-        """Parse date string for sorting purposes"""
-        try:
-            # Date is in DD/MM/YYYY format
-            return datetime.strptime(date_str, '%d/%m/%Y')
-        except:
-            return datetime.min
+    def _parse_date_for_sorting(self, date_str: str) -> str:
+        """Sort key for a DD/MM/YYYY date (the ISO date, '' if it does not parse)"""
+        return parse_date(date_str, ('%d/%m/%Y',)) or ''
 
     def _parse_amount(self, amount_str: str) -> float:
         """Parse UK amount format"""
@@ -432,48 +421,4 @@ class TideParser(BaseBankParser):
 
     def _calculate_missing_balances(self, transactions: List[Dict]) -> List[Dict]:
         """Calculate missing balances based on known balances and debits/credits"""
-        if not transactions:
-            return transactions
-
-        # Find first known balance
-        first_balance_idx = None
-        for i, txn in enumerate(transactions):
-            if txn.get('balance') is not None:
-                first_balance_idx = i
-                break
-
-        if first_balance_idx is None:
-            return transactions
-
-        # Calculate forward from first known balance
-        current_balance = transactions[first_balance_idx]['balance']
-
-        for i in range(first_balance_idx + 1, len(transactions)):
-            if transactions[i]['credit'] > 0:
-                current_balance += transactions[i]['credit']
-            if transactions[i]['debit'] > 0:
-                current_balance -= transactions[i]['debit']
-
-            if transactions[i].get('balance') is None:
-                transactions[i]['balance'] = round(current_balance, 2)
-            else:
-                # Use the actual balance if present
-                current_balance = transactions[i]['balance']
-
-        # Calculate backwards if needed
-        if first_balance_idx > 0:
-            current_balance = transactions[first_balance_idx]['balance']
-
-            for i in range(first_balance_idx - 1, -1, -1):
-                # Go backwards: subtract credits, add debits
-                if transactions[i+1]['credit'] > 0:
-                    current_balance -= transactions[i+1]['credit']
-                if transactions[i+1]['debit'] > 0:
-                    current_balance += transactions[i+1]['debit']
-
-                if transactions[i].get('balance') is None:
-                    transactions[i]['balance'] = round(current_balance, 2)
-                else:
-                    current_balance = transactions[i]['balance']
-
-        return transactions
+        return self.calculate_missing_balances(transactions)
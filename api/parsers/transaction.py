@@ -0,0 +1,116 @@
+"""
+Transaction record emitted by the bank parsers.
+A slotted dataclass instead of a dict per transaction: no per-row hash table
+and no repeated key strings, which is most of a worker's memory on long
+statements. It still reads like the dicts it replaces (txn['balance'],
+txn.get('debit', 0)), so parser and base-class helpers work on either;
+to_dict() builds the plain dict the JSON layer sends.
+"""
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class Transaction:
+    """
+    One statement transaction.
+
+    Fields:
+        date: 'YYYY-MM-DD'
+        description: Cleaned description
+        debit, credit: Amounts in pounds (0.0 when not set)
+        balance: Statement balance in pounds (None if not shown)
+        type: 'income' or 'expense'
+        amount: The non-zero one of credit/debit (set by normalize_transaction)
+        category: Bank-specific transaction category or type code, if any
+        extra: Any other parser-specific keys (None when there are none)
+    """
+    date: Any = ''
+    description: str = ''
+    debit: float = 0.0
+    credit: float = 0.0
+    balance: Optional[float] = None
+    type: str = 'expense'
+    amount: Optional[float] = None
+    category: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'Transaction':
+        """
+        Build a record from a transaction dict (as parsers used to emit, or
+        as saved by a chunk checkpoint); unknown keys go into extra
+        """
+        values = {}
+        extra = dict(data.get('extra') or {})
+        for key, value in data.items():
+            if key in _FIELD_NAMES:
+                if key != 'extra':
+                    values[key] = value
+            else:
+                extra[key] = value
+        return cls(**values, extra=extra or None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for the JSON response (unset optional fields are left out)"""
+        data = {
+            'date': self.date,
+            'description': self.description,
+            'debit': self.debit,
+            'credit': self.credit,
+            'balance': self.balance,
+            'type': self.type,
+        }
+        if self.amount is not None:
+            data['amount'] = self.amount
+        if self.category is not None:
+            data['category'] = self.category
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # Dict-style access, so code written against transaction dicts keeps working
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_NAMES and key != 'extra':
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Field or extra value by key (default if unset)"""
+        if key in _FIELD_NAMES and key != 'extra':
+            value = getattr(self, key)
+            # amount and category count as missing until set, like an absent key
+            if value is None and key in _OPTIONAL_KEYS:
+                return default
+            return value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+
+_FIELD_NAMES = frozenset(field.name for field in fields(Transaction))
+_OPTIONAL_KEYS = frozenset(('amount', 'category'))
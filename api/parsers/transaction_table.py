@@ -0,0 +1,288 @@
+"""
+Columnar transaction storage for post-processing.
+Parsers produce one dict per transaction; everything after parsing
+(normalization, balance checks, gap filling, deduplication) works on a
+TransactionTable instead: one typed array per numeric field (amounts in
+integer pence) and interned strings for the text fields. Dicts are only
+built again, with amounts in pounds, when the response is serialized.
+"""
+from array import array
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import sys
+
+from .money import NO_BALANCE, to_pence
+from .reconciliation import BALANCE_TOLERANCE, balance_mismatches, fill_missing_balances
+
+INF = float('inf')
+
+
+def safe_float(value: Any) -> float:
+    """float(value), with None, NaN and unparseable values as 0.0"""
+    if value is None:
+        return 0.0
+    try:
+        f = float(value)
+    except (ValueError, TypeError):
+        return 0.0
+    # NaN check
+    return 0.0 if f != f else f
+
+
+def safe_balance(value: Any) -> Optional[float]:
+    """float(value) for a balance, with None, NaN and unparseable values as None"""
+    if value is None:
+        return None
+    try:
+        f = float(value)
+    except (ValueError, TypeError):
+        return None
+    return None if f != f else f
+
+
+def _date_ordinal(value: Any) -> int:
+    """Proleptic ordinal of a 'YYYY-MM-DD' string (0 for anything else)"""
+    if (isinstance(value, str) and len(value) == 10 and value[4] == '-' and value[7] == '-'
+            and value[:4].isdigit() and value[5:7].isdigit() and value[8:].isdigit()):
+        try:
+            return date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal()
+        except ValueError:
+            return 0
+    return 0
+
+
+def _amount_pence(value: float) -> int:
+    """Pence for a normalized debit/credit (non-finite amounts count as 0)"""
+    if value in (INF, -INF):
+        return 0
+    return to_pence(value)
+
+
+def _balance_pence(value: Optional[float]) -> int:
+    """Pence for a normalized balance (NO_BALANCE if unknown or not finite)"""
+    if value is None or value != value or value in (INF, -INF):
+        return NO_BALANCE
+    return to_pence(value)
+
+
+class TransactionTable:
+    """
+    Struct-of-arrays transaction list.
+
+    Columns:
+        date_ordinals: array('l') of date.toordinal() (0 if the date is not
+                       an ISO date; the original value is kept aside)
+        debits, credits: array('q') of pence
+        balances: array('q') of pence, NO_BALANCE where the statement
+                  shows none
+        descriptions, types: lists of interned strings
+
+    Usage:
+        table = TransactionTable.from_transactions(parser_output)
+        errors = parser.validate_running_balance(table)
+        response['transactions'] = table.to_dicts()
+    """
+
+    __slots__ = ('date_ordinals', 'debits', 'credits', 'balances', 'descriptions', 'types', '_raw_dates')
+
+    def __init__(self):
+        self.date_ordinals = array('l')
+        self.debits = array('q')
+        self.credits = array('q')
+        self.balances = array('q')
+        self.descriptions: List[str] = []
+        self.types: List[str] = []
+        # Row index -> date value that is not an ISO date string
+        self._raw_dates: Dict[int, Any] = {}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Dict]) -> 'TransactionTable':
+        """
+        Normalize parser output into columns.
+
+        Applies the same rules as BaseBankParser.normalize_transaction (the
+        type follows whichever of credit/debit is set, invalid numbers become
+        0 and invalid balances unknown) and converts amounts to pence.
+
+        Args:
+            transactions: Raw transaction dicts, in statement order
+
+        Returns:
+            New TransactionTable
+        """
+        ordinals: Dict[str, int] = {}
+        raw_dates: Dict[int, Any] = {}
+        intern = sys.intern
+        date_ordinals, debits, credits, balances, descriptions, types = [], [], [], [], [], []
+
+        for index, txn in enumerate(transactions):
+            raw_date = txn.get('date', '')
+            ordinal = ordinals.get(raw_date) if type(raw_date) is str else None
+            if ordinal is None:
+                ordinal = _date_ordinal(raw_date)
+                if type(raw_date) is str:
+                    ordinals[raw_date] = ordinal
+            if not ordinal:
+                raw_dates[index] = raw_date
+            date_ordinals.append(ordinal)
+
+            # Parsers almost always give floats already; anything else goes
+            # through the same conversion as normalize_transaction
+            debit = txn.get('debit', 0)
+            if type(debit) is not float or debit != debit:
+                debit = safe_float(debit)
+            credit = txn.get('credit', 0)
+            if type(credit) is not float or credit != credit:
+                credit = safe_float(credit)
+            balance = txn.get('balance')
+            if type(balance) is not float:
+                balance = safe_balance(balance)
+            debits.append(_amount_pence(debit))
+            credits.append(_amount_pence(credit))
+            balances.append(_balance_pence(balance))
+
+            description = txn.get('description', '')
+            descriptions.append(intern((description if type(description) is str else str(description)).strip()))
+            if credit > 0:
+                types.append('income')
+            elif debit > 0:
+                types.append('expense')
+            else:
+                txn_type = txn.get('type', 'expense')
+                types.append(intern(txn_type) if type(txn_type) is str else txn_type)
+
+        table = cls()
+        table.date_ordinals = array('l', date_ordinals)
+        table.debits = array('q', debits)
+        table.credits = array('q', credits)
+        table.balances = array('q', balances)
+        table.descriptions = descriptions
+        table.types = types
+        table._raw_dates = raw_dates
+        return table
+
+    def __len__(self) -> int:
+        return len(self.date_ordinals)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.row(index) for index in range(len(self)))
+
+    def date(self, index: int) -> Any:
+        """Date of a row as it was given ('YYYY-MM-DD' for parsed dates)"""
+        ordinal = self.date_ordinals[index]
+        if ordinal:
+            return date.fromordinal(ordinal).isoformat()
+        return self._raw_dates.get(index, '')
+
+    def balance(self, index: int) -> Optional[float]:
+        """Balance of a row in pounds (None if unknown)"""
+        balance = self.balances[index]
+        return None if balance == NO_BALANCE else balance / 100
+
+    def row(self, index: int) -> Dict:
+        """One row in the normalized transaction dict shape (amounts in pounds)"""
+        debit = self.debits[index] / 100
+        credit = self.credits[index] / 100
+        if credit > 0:
+            amount = credit
+        elif debit > 0:
+            amount = debit
+        else:
+            amount = 0.0
+        return {
+            'date': self.date(index),
+            'description': self.descriptions[index],
+            'debit': debit,
+            'credit': credit,
+            'balance': self.balance(index),
+            'type': self.types[index],
+            'amount': amount,
+        }
+
+    def to_dicts(self) -> List[Dict]:
+        """All rows as normalized transaction dicts (for the response)"""
+        iso_dates = {}
+        rows = []
+        for index in range(len(self)):
+            ordinal = self.date_ordinals[index]
+            if not ordinal:
+                rows.append(self.row(index))
+                continue
+            # Statements repeat dates, so each one is formatted once
+            iso = iso_dates.get(ordinal)
+            if iso is None:
+                iso = iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+            debit = self.debits[index] / 100
+            credit = self.credits[index] / 100
+            balance = self.balances[index]
+            rows.append({
+                'date': iso,
+                'description': self.descriptions[index],
+                'debit': debit,
+                'credit': credit,
+                'balance': None if balance == NO_BALANCE else balance / 100,
+                'type': self.types[index],
+                'amount': credit if credit > 0 else (debit if debit > 0 else 0.0),
+            })
+        return rows
+
+    def take(self, indexes: Iterable[int]) -> 'TransactionTable':
+        """New table holding the given rows, in the given order"""
+        indexes = list(indexes)
+        table = TransactionTable()
+        for name in ('date_ordinals', 'debits', 'credits', 'balances'):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, [column[index] for index in indexes]))
+        table.descriptions = [self.descriptions[index] for index in indexes]
+        table.types = [self.types[index] for index in indexes]
+        table._raw_dates = {
+            new_index: self._raw_dates[index]
+            for new_index, index in enumerate(indexes) if index in self._raw_dates
+        }
+        return table
+
+    def deduplicated(self) -> 'TransactionTable':
+        """
+        Rows with duplicates removed (same rule as
+        BaseBankParser.deduplicate_transactions: date, total amount and the
+        first 30 characters of the description, case-insensitively)
+        """
+        seen = set()
+        keep = []
+        raw_dates = self._raw_dates
+        # Descriptions are interned and repeat, so each prefix is built once
+        prefixes: Dict[str, str] = {}
+        rows = zip(self.date_ordinals, self.debits, self.credits, self.descriptions)
+        for index, (ordinal, debit, credit, description) in enumerate(rows):
+            prefix = prefixes.get(description)
+            if prefix is None:
+                prefix = prefixes[description] = description[:30].lower()
+            key = (ordinal or raw_dates.get(index), debit + credit, prefix)
+            if key not in seen:
+                seen.add(key)
+                keep.append(index)
+        return self if len(keep) == len(self) else self.take(keep)
+
+    def fill_missing_balances(self) -> 'TransactionTable':
+        """
+        Fill unknown balances in place from the known ones (same rule as
+        BaseBankParser.calculate_missing_balances, see reconciliation)
+
+        Returns:
+            self
+        """
+        if len(self) >= 2:
+            self.balances, _ = fill_missing_balances(self.debits, self.credits, self.balances)
+        return self
+
+    def balance_mismatches(self, tolerance: int = BALANCE_TOLERANCE) -> List[Tuple[int, int, int]]:
+        """
+        Rows whose statement balance disagrees with the running balance
+
+        Args:
+            tolerance: Largest difference accepted, in pence
+
+        Returns:
+            List of (row index, expected balance, statement balance), in pence
+        """
+        return list(zip(*balance_mismatches(self.debits, self.credits, self.balances, tolerance)))
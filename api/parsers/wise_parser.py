@@ -1,7 +1,6 @@
 """
 Wise (formerly TransferWise) Bank Statement Parser
 """
-import pdfplumber
 import re
 from typing import List, Dict, Optional
 import sys
@@ -10,8 +9,7 @@ import os
 # Handle imports
 try:
     from .base_parser import BaseBankParser
-    from .logger import get_parser_logger
-    from .config import get_config
+    from .transaction import Transaction
     from ..utils import parse_uk_date, parse_uk_amount, clean_description
 except ImportError:
     # Fallback for direct execution
@@ -19,19 +17,13 @@ except ImportError:
     if api_dir not in sys.path:
         sys.path.insert(0, api_dir)
     from parsers.base_parser import BaseBankParser
-    from parsers.logger import get_parser_logger
-    from parsers.config import get_config
+    from parsers.transaction import Transaction
     from utils import parse_uk_date, parse_uk_amount, clean_description
 
 
 class WiseParser(BaseBankParser):
     """Parser for Wise (formerly TransferWise) statements"""
     
-    def __init__(self):
-        super().__init__()
-        self.logger = get_parser_logger('wise')
-        self.config = get_config('wise')
-    
     def extract_transactions(self, pdf_path: str) -> List[Dict]:
         """
         Extract transactions from Wise statement
@@ -45,12 +37,8 @@ class WiseParser(BaseBankParser):
         transactions = []
         
         try:
-            all_text = ''
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + '\n'
+            with self.open_pdf(pdf_path) as pdf:
+                all_text = pdf.full_text()
             
             transactions = self._parse_wise_text(all_text)
             
@@ -171,14 +159,14 @@ class WiseParser(BaseBankParser):
                     
                     cleaned_description = clean_description(description, max_length=80)
                     
-                    transactions.append({
-                        'date': date_str,
-                        'description': cleaned_description,
-                        'debit': debit,
-                        'credit': credit,
-                        'balance': balance,
-                        'type': 'income' if credit > 0 else 'expense'
-                    })
+                    transactions.append(Transaction(
+                        date=date_str,
+                        description=cleaned_description,
+                        debit=debit,
+                        credit=credit,
+                        balance=balance,
+                        type='income' if credit > 0 else 'expense'
+                    ))
                     
                     self.logger.debug(f"Transaction: {date_str} | {cleaned_description[:40]} | {amount}")
                     
@@ -0,0 +1,287 @@
+"""
+Content-addressed cache for conversion results.
+Repeat uploads of the same statement are served from memory (or disk)
+instead of being parsed again.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+
+
+# Bump when the shape of conversion results changes
+CONVERTER_VERSION = '2.0'
+
+# Environment configuration
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '64'))
+RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR', '')
+RESULT_CACHE_MAX_MB = float(os.getenv('RESULT_CACHE_MAX_MB', '256'))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv('RESULT_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+_API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=1)
+def parser_version_tag() -> str:
+    """
+    Version tag mixed into every cache key.
+
+    Combines CONVERTER_VERSION with a digest of the converter and parser
+    sources, so deploying a parser fix invalidates previously cached results.
+
+    Returns:
+        Tag like '2.0-1a2b3c4d5e6f'
+    """
+    digest = hashlib.sha256()
+    sources = ['converter.py', 'bank_detector.py', 'bank_fingerprint.py', 'utils.py']
+    parsers_dir = os.path.join(_API_DIR, 'parsers')
+    sources += [
+        os.path.join('parsers', name)
+        for name in sorted(os.listdir(parsers_dir))
+        if name.endswith('.py')
+    ]
+    for rel_path in sources:
+        try:
+            with open(os.path.join(_API_DIR, rel_path), 'rb') as f:
+                digest.update(rel_path.encode())
+                digest.update(f.read())
+        except OSError:
+            continue
+    return f"{CONVERTER_VERSION}-{digest.hexdigest()[:12]}"
+
+
+def cache_key(pdf_bytes: bytes) -> str:
+    """
+    Build the cache key for an uploaded PDF.
+
+    Args:
+        pdf_bytes: Raw bytes of the uploaded file
+
+    Returns:
+        Hex SHA-256 of the version tag and file content
+    """
+    digest = hashlib.sha256(parser_version_tag().encode())
+    digest.update(b'\0')
+    digest.update(pdf_bytes)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of conversion results keyed by cache_key().
+
+    The memory tier is a bounded LRU. The optional disk tier stores one JSON
+    file per result and evicts by TTL and total size (least recently used
+    first). Only successful conversions are cached; failures may be
+    transient and are always retried.
+
+    Usage:
+        cache = get_result_cache()
+        key = cache_key(pdf_bytes)
+        result = cache.get(key)
+        if result is None:
+            result = converter.convert(pdf_path)
+            cache.put(key, result)
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE,
+                 cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = int(RESULT_CACHE_MAX_MB * 1024 * 1024),
+                 ttl_seconds: int = RESULT_CACHE_TTL_SECONDS):
+        """
+        Args:
+            max_entries: Maximum results kept in memory (0 disables the tier)
+            cache_dir: Directory for the disk tier (disabled if None)
+            max_disk_bytes: Disk tier size limit
+            ttl_seconds: Maximum age of a disk entry
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        # Results are held serialized: cheap to copy out, and callers can't mutate them
+        self._memory: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            A fresh copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+
+        if payload is None and self.cache_dir:
+            payload = self._disk_get(key)
+            if payload is not None:
+                self._memory_put(key, payload)
+
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, key: str, result: Dict):
+        """
+        Store a conversion result (ignored unless the conversion succeeded).
+
+        Args:
+            key: Cache key from cache_key()
+            result: Result dictionary returned by BankStatementConverter.convert
+        """
+        if not result.get('success'):
+            return
+        payload = json.dumps(result)
+        self._memory_put(key, payload)
+        if self.cache_dir:
+            self._disk_put(key, payload)
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for path, _, _ in self._disk_entries():
+                self._remove(path)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'disk_enabled': bool(self.cache_dir),
+            }
+
+    # ========================================================================
+    # MEMORY TIER
+    # ========================================================================
+
+    def _memory_put(self, key: str, payload: str):
+        """Insert into the LRU, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # ========================================================================
+    # DISK TIER
+    # ========================================================================
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        """Read an entry from disk, discarding it if it has expired"""
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                self._remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = f.read()
+            # Touch so size eviction removes least recently used entries first
+            os.utime(path)
+            return payload
+        except OSError:
+            return None
+
+    def _disk_put(self, key: str, payload: str):
+        """Write an entry atomically, then enforce TTL and size limits"""
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError:
+            self._remove(temp_path)
+            return
+        self._evict_disk()
+
+    def _disk_entries(self):
+        """Yield (path, mtime, size) for every entry in the disk tier"""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield path, stat.st_mtime, stat.st_size
+
+    def _evict_disk(self):
+        """Remove expired entries, then the oldest until under the size limit"""
+        now = time.time()
+        live = []
+        for path, mtime, size in self._disk_entries():
+            if now - mtime > self.ttl_seconds:
+                self._remove(path)
+            else:
+                live.append((mtime, size, path))
+
+        total = sum(size for _, size, _ in live)
+        if total <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(live):
+            self._remove(path)
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Process-wide cache shared by the HTTP handlers
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Get the shared result cache, configured from the environment.
+
+    RESULT_CACHE_SIZE sets the memory tier size, RESULT_CACHE_DIR enables the
+    disk tier, RESULT_CACHE_MAX_MB and RESULT_CACHE_TTL_SECONDS bound it.
+
+    Returns:
+        Shared ResultCache instance
+    """
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(cache_dir=RESULT_CACHE_DIR or None)
+    return _result_cache
@@ -0,0 +1,45 @@
+"""Chunked parsing matches a single pass over the whole statement."""
+import random
+
+import pytest
+
+from conftest import barclays_lines, paginate
+from parsers.chunking import chunk_ranges
+
+
+def parse_chunked(parser, pages, chunk_pages, context):
+    chunks = [
+        parser.parse_chunk(pages[start:end], start, end, end == len(pages), context)
+        for start, end in chunk_ranges(len(pages), chunk_pages)
+    ]
+    return parser.merge_chunks(chunks, context)
+
+
+@pytest.mark.parametrize('chunk_pages', [1, 2, 3, 5, 8])
+@pytest.mark.parametrize('seed', range(6))
+def test_barclays_chunked_matches_single_pass(barclays_parser, seed, chunk_pages):
+    rnd = random.Random(seed)
+    pages = paginate(barclays_lines(200, seed), rnd)
+    context = {'year': '2023'}
+    expected = barclays_parser.parse_page_texts(pages, context)
+
+    assert expected
+    assert parse_chunked(barclays_parser, pages, chunk_pages, context) == expected
+
+
+def test_base_chunking_concatenates_single_pass_chunks():
+    from parsers import get_parser
+    from parsers.base_parser import BaseBankParser
+
+    class PerLineParser(BaseBankParser):
+        def extract_transactions(self, pdf_path):
+            return []
+
+        def parse_page_texts(self, page_texts, context):
+            return [line for page_text in page_texts for line in page_text.split('\n')]
+
+    pages = [f'row {n}\nrow {n}b' for n in range(7)]
+    assert parse_chunked(PerLineParser(), pages, 3, {}) == PerLineParser().parse_page_texts(pages, {})
+
+    # A parser that needs more than text parses nothing, so the converter falls back
+    assert parse_chunked(get_parser('hsbc'), pages, 3, {}) == []
@@ -0,0 +1,68 @@
+"""The compiled date engine agrees with datetime.strptime."""
+from datetime import datetime
+import itertools
+import random
+
+import pytest
+
+from parsers.dates import UK_DATE_FORMATS, compile_format, parse_date, parse_date_universal
+
+FORMATS = UK_DATE_FORMATS + ('%d %b', '%b %d, %Y', '%Y-%m-%d', '%d.%m.%Y', '%d%%%m')
+
+EDGE_CASES = [
+    '18/09/2023', '18/9/2023', '1/1/23', '01/01/69', '31/12/68', '29/02/2024', '29/02/2023', '31/04/2023',
+    '00/01/2023', '32/01/2023', '18/13/2023', '18-09-23', ' 1/02/2023', '1/02/2023 ', '18/09/20234',
+    '18 September 2023', '18 september 2023', '18 SEP 2023', '18 Sept 2023', '18  Sep\t2023', '18 Sep 23',
+    '18Sep2023', '18 May 2023', '18 Mar', 'Mar 18, 2023', 'mar 18,2023', '2023-09-18', '2023-9-18',
+    '18.09.2023', '18%09', '', 'Sep', '1st Mar 2023',
+]
+
+
+def strptime_iso(date_str, formats):
+    """What trying datetime.strptime with each format in turn returns"""
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def random_dates(seed, count=300):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        moment = datetime(rnd.randint(1960, 2040), rnd.randint(1, 12), rnd.randint(1, 31) % 28 + 1)
+        text = moment.strftime(rnd.choice(FORMATS))
+        if rnd.random() < 0.3:
+            text = text.upper() if rnd.random() < 0.5 else text.lower()
+        if rnd.random() < 0.1:
+            text = text.replace('0', '', 1)
+        yield text
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_each_format_matches_strptime_on_edge_cases(fmt):
+    for date_str in EDGE_CASES:
+        assert parse_date(date_str, (fmt,)) == strptime_iso(date_str, (fmt,)), date_str
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_format_lists_match_strptime_on_random_dates(seed):
+    for date_str, formats in zip(random_dates(seed), itertools.cycle([FORMATS, UK_DATE_FORMATS, FORMATS[::-1]])):
+        assert parse_date(date_str, formats) == strptime_iso(date_str, formats), (date_str, formats)
+
+
+def test_near_year_skips_to_the_next_format():
+    assert parse_date('01/02/20', ('%y/%m/%d', '%d/%m/%y'), near_year=2020) == '2020-02-01'
+    assert parse_date('01/02/03', ('%y/%m/%d',), near_year=2020) is None
+
+
+def test_unsupported_directives_are_skipped():
+    assert compile_format('%d %H') is None
+    assert parse_date('18 10', ('%d %H', '%d %m')) == strptime_iso('18 10', ('%d %m',))
+
+
+def test_universal_fills_the_year_and_strips_ordinals():
+    assert parse_date_universal('1st Mar', '2024') == '2024-03-01'
+    assert parse_date_universal('22nd Sept 2023') == '2023-09-22'
+    assert parse_date_universal('18/09/23') == strptime_iso('18/09/23', ('%d/%m/%y',))
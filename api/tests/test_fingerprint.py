@@ -0,0 +1,101 @@
+"""Fingerprint detections are checked against the first page's text."""
+import pytest
+
+import converter
+from bank_fingerprint import FingerprintTable
+from parsers import PDFExtractionError
+
+BARCLAYS_PAGE = 'Barclays Bank UK PLC barclays.co.uk\nYour statement 01 - 28 Apr 2023 Sort Code 20-00-00'
+HSBC_PAGE = 'HSBC UK Bank plc hsbc.co.uk\nYour Statement 1 March to 31 March 2024 Sort Code 40-00-00'
+PLAIN_PAGE = 'Statement of account\nDate Description Money out Money in Balance 1,234.56'
+
+
+class FakePage:
+    def __init__(self, text):
+        self.text = text
+        self.reads = 0
+
+    def extract_text(self):
+        self.reads += 1
+        return self.text
+
+
+class FakeSession:
+    def __init__(self, *texts):
+        self.pages = [FakePage(text) for text in texts]
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FingerprintTable(min_confirmations=2)
+    monkeypatch.setattr(converter, 'get_fingerprint_table', lambda: table)
+    monkeypatch.setattr(converter.BankStatementConverter, '_fingerprint', lambda self, session: 'fp')
+    return table
+
+
+def select(*texts):
+    session = FakeSession(*texts)
+    return converter.BankStatementConverter()._select_parser(session), session
+
+
+def test_table_trusts_a_fingerprint_after_enough_confirmations():
+    table = FingerprintTable(min_confirmations=2)
+    table.confirm('fp', 'barclays')
+    assert table.lookup('fp') is None
+    table.confirm('fp', 'barclays')
+    assert table.lookup('fp') == 'barclays'
+
+    table.reject('fp', 'barclays')
+    table.confirm('fp', 'barclays')
+    assert table.lookup('fp') is None
+
+
+def test_table_distrusts_a_fingerprint_seen_with_two_banks():
+    table = FingerprintTable(min_confirmations=1)
+    table.confirm('fp', 'barclays')
+    table.confirm('fp', 'hsbc')
+    assert table.lookup('fp') is None
+    assert table.known_fingerprints() == []
+
+
+def test_unknown_fingerprint_detects_by_text(table):
+    selection, _ = select(BARCLAYS_PAGE, HSBC_PAGE)
+    assert (selection.bank_id, selection.method, selection.text_agrees) == ('barclays', 'text', True)
+
+
+def test_trusted_fingerprint_still_reads_only_the_first_page(table):
+    table.confirm('fp', 'barclays')
+    table.confirm('fp', 'barclays')
+
+    selection, session = select(BARCLAYS_PAGE, HSBC_PAGE)
+
+    assert (selection.bank_id, selection.method, selection.text_agrees) == ('barclays', 'fingerprint', True)
+    assert [page.reads for page in session.pages] == [1, 0]
+
+
+def test_fingerprint_disagreeing_with_text_is_rejected(table):
+    table.confirm('fp', 'barclays')
+    table.confirm('fp', 'barclays')
+
+    selection, _ = select(HSBC_PAGE)
+
+    assert (selection.bank_id, selection.method, selection.text_agrees) == ('hsbc', 'text', True)
+    assert table.lookup('fp') is None
+
+
+def test_undecided_text_keeps_the_fingerprint_but_does_not_confirm_it(table):
+    table.confirm('fp', 'barclays')
+    table.confirm('fp', 'barclays')
+
+    selection, _ = select(PLAIN_PAGE)
+
+    assert (selection.bank_id, selection.method, selection.text_agrees) == ('barclays', 'fingerprint', False)
+    assert table.lookup('fp') == 'barclays'
+
+
+def test_readable_text_is_required_on_the_fingerprint_path(table):
+    table.confirm('fp', 'barclays')
+    table.confirm('fp', 'barclays')
+
+    with pytest.raises(PDFExtractionError):
+        select('', '  ')
@@ -0,0 +1,83 @@
+"""Job ownership: a requeued job belongs to its new worker."""
+import pytest
+
+import job_queue
+from job_queue import JOB_DONE, JOB_QUEUED, JOB_RUNNING, SQLiteJobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteJobStore(str(tmp_path))
+
+
+def requeue_now(store):
+    """Requeue every running job, as if all workers went silent"""
+    return store.requeue_stale(-1)
+
+
+def test_holder_finishes_its_job(store):
+    job_id = store.submit('a.pdf', b'%PDF')
+    assert store.claim('w1') == job_id
+
+    assert store.finish(job_id, 'w1', {'count': 3})
+    job = store.get(job_id)
+    assert (job['status'], job['result']) == (JOB_DONE, {'count': 3})
+
+
+def test_late_finish_after_requeue_is_dropped(store):
+    job_id = store.submit('a.pdf', b'%PDF')
+    store.claim('w1')
+    assert requeue_now(store) == 1
+    assert store.get(job_id)['status'] == JOB_QUEUED
+    assert store.claim('w2') == job_id
+
+    # The silent worker comes back while the new one is still running
+    assert not store.finish(job_id, 'w1', {'count': 1})
+    assert not store.fail(job_id, 'w1', 'late')
+    store.report_progress(job_id, 'w1', 5, 5)
+    job = store.get(job_id)
+    assert (job['status'], job['progress'], job['attempts']) == (JOB_RUNNING, {'pages_done': 0, 'pages_total': 0}, 2)
+    assert store.load_pdf(job_id) == b'%PDF'
+
+    assert store.finish(job_id, 'w2', {'count': 2})
+    assert store.get(job_id)['result'] == {'count': 2}
+
+
+def test_late_finish_after_new_worker_finished_is_dropped(store):
+    job_id = store.submit('a.pdf', b'%PDF')
+    store.claim('w1')
+    requeue_now(store)
+    store.claim('w2')
+    assert store.fail(job_id, 'w2', 'Conversion failed: bad PDF')
+
+    assert not store.finish(job_id, 'w1', {'count': 1})
+    job = store.get(job_id)
+    assert (job['status'], job['error']) == ('failed', 'Conversion failed: bad PDF')
+
+
+def test_late_finish_of_queued_job_is_dropped(store):
+    job_id = store.submit('a.pdf', b'%PDF')
+    store.claim('w1')
+    requeue_now(store)
+
+    assert not store.finish(job_id, 'w1', {'count': 1})
+    assert store.get(job_id)['status'] == JOB_QUEUED
+    assert store.claim('w2') == job_id
+
+
+def test_progress_is_a_heartbeat_only_for_the_holder(store):
+    job_id = store.submit('a.pdf', b'%PDF')
+    store.claim('w1')
+    store.report_progress(job_id, 'w1', 2, 9)
+    assert store.get(job_id)['progress'] == {'pages_done': 2, 'pages_total': 9}
+    assert requeue_now(store) == 1
+
+
+def test_workers_are_not_daemonic_and_stop_on_request(store, monkeypatch):
+    monkeypatch.setattr(job_queue, '_job_store', store)
+    workers = job_queue.start_workers(2)
+    try:
+        assert all(not worker.daemon for worker in workers)
+    finally:
+        job_queue.stop_workers(workers, timeout=30)
+    assert [worker.exitcode for worker in workers] == [0, 0]
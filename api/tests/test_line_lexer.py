@@ -0,0 +1,74 @@
+"""Lexed block grouping matches the look-ahead loops it replaced."""
+import random
+import re
+
+import pytest
+
+from conftest import barclays_lines, full_text, paginate
+from parsers.line_lexer import date_blocks, date_blocks_by_page
+
+DATE_PATTERN = r'^\d{2}\s+[A-Z][a-z]{2}'
+
+
+def lookahead_blocks(lines, date_pattern, max_block_lines=10):
+    """The loop group_lines_into_blocks() ran before the line lexer"""
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if not line:
+            i += 1
+            continue
+        date_match = re.match(date_pattern, line, re.IGNORECASE)
+        if date_match:
+            block_lines = [line]
+            j = i + 1
+            while j < len(lines) and j < i + max_block_lines:
+                next_line = lines[j].strip()
+                if next_line and re.match(date_pattern, next_line, re.IGNORECASE):
+                    break
+                if next_line:
+                    block_lines.append(next_line)
+                j += 1
+            blocks.append({
+                'lines': block_lines,
+                'date_line': line,
+                'date_match': date_match.group(0),
+                'start_idx': i,
+                'end_idx': j - 1,
+            })
+            i = j
+        else:
+            i += 1
+    return blocks
+
+
+@pytest.mark.parametrize('max_block_lines', [1, 2, 3, 10])
+@pytest.mark.parametrize('seed', range(4))
+def test_date_blocks_match_lookahead_loop(seed, max_block_lines):
+    lines = barclays_lines(150, seed)
+    expected = lookahead_blocks(lines, DATE_PATTERN, max_block_lines)
+
+    assert expected
+    assert date_blocks(lines, DATE_PATTERN, max_block_lines) == expected
+
+
+def test_date_blocks_ignore_case_like_the_loop():
+    lines = ['01 APR Card Payment', 'Ref: 1', '', '02 apr Direct Debit 9.99', 'Page 2']
+    assert date_blocks(lines, DATE_PATTERN) == lookahead_blocks(lines, DATE_PATTERN)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_date_blocks_by_page_match_full_text(seed):
+    rnd = random.Random(seed)
+    pages = paginate(barclays_lines(150, seed), rnd)
+    expected = lookahead_blocks(full_text(pages).split('\n'), DATE_PATTERN)
+
+    assert [block for blocks in date_blocks_by_page(pages, DATE_PATTERN) for block in blocks] == expected
+
+
+def test_anna_lexer_is_built_once_per_class():
+    from parsers.anna_parser import ANNAParser
+
+    assert ANNAParser().line_lexer() is ANNAParser().line_lexer()
+    assert 'lexer' not in vars(ANNAParser())
@@ -0,0 +1,55 @@
+"""Integer-pence amount parsing."""
+import random
+
+import pytest
+
+from parsers import get_parser
+from parsers.money import format_pence, parse_pence, to_pence
+from utils import parse_uk_amount
+
+
+@pytest.mark.parametrize('text, pence', [
+    ('1,234.56', 123456), ('£1,234.56', 123456), ('1234.5', 123450), ('1234', 123400),
+    ('.5', 50), ('0.07', 7), ('(1,234.56)', -123456), ('-12.30', -1230), ('£ 1 234.56', 123456),
+])
+def test_parse_pence(text, pence):
+    assert parse_pence(text) == pence
+
+
+@pytest.mark.parametrize('text', ['', None, '-', '.', 'abc', '12.345', '1.2.3', '12,34a', '1e3'])
+def test_parse_pence_rejects_non_amounts(text):
+    assert parse_pence(text) is None
+
+
+def test_parse_pence_is_exact_where_float_is_not():
+    rnd = random.Random(7)
+    for _ in range(2000):
+        pence = rnd.randint(0, 10 ** 11)
+        text = f"{pence // 100:,}.{pence % 100:02d}"
+        assert parse_pence(text) == pence
+        assert format_pence(pence) == text.replace(',', '')
+
+
+def test_to_pence():
+    assert to_pence(12) == 1200
+    assert to_pence(0.29) == 29
+    assert to_pence(0.1 + 0.2) == 30
+    assert to_pence('1,234.56') == 123456
+    assert to_pence(-45.1) == -4510
+
+
+def test_to_pence_logs_sub_penny_amounts(monkeypatch):
+    warnings = []
+    monkeypatch.setattr('parsers.money.logger.warning', warnings.append)
+
+    assert to_pence(1.235) == 124
+    assert to_pence(12.34) == 1234
+    assert len(warnings) == 1 and '1.235' in warnings[0]
+
+
+@pytest.mark.parametrize('parse', [parse_uk_amount, get_parser('barclays').parse_amount])
+def test_amount_parsers_reject_sub_penny_amounts(parse):
+    assert parse('1,234.56') == 1234.56
+    assert parse('(12.50)') == -12.5
+    assert parse('1.2345') == 0.0
+    assert parse('-£3.999') == 0.0
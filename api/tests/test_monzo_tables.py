@@ -0,0 +1,74 @@
+"""Monzo keeps the rows of every table strategy, and skips tables only while they never win."""
+from parsers import get_parser
+
+HEADER = ['Date', 'Description', 'Amount (GBP)', 'Balance (GBP)']
+
+
+class FakePage:
+    """Page whose table detection finds different rows per strategy"""
+
+    def __init__(self, tables_by_strategy):
+        self.tables_by_strategy = tables_by_strategy
+
+    def extract_tables(self, settings):
+        return self.tables_by_strategy[settings['vertical_strategy']]
+
+
+class FakeSession:
+    def __init__(self, *pages):
+        self.pages = list(pages)
+
+
+def test_rows_only_one_strategy_finds_are_kept():
+    parser = get_parser('monzo')
+    ruled = [[HEADER, ['01/03/2024', 'Tesco', '-12.50', '987.50']]]
+    aligned = [[HEADER, ['01/03/2024', 'Tesco', '-12.50', '987.50'], ['02/03/2024', 'Salary', '2,000.00', '2,987.50']]]
+    later = [[HEADER, ['03/03/2024', 'Pret', '-4.20', '2,983.30']]]
+    pages = [FakePage({'lines': ruled, 'text': aligned}), FakePage({'lines': [], 'text': later})]
+
+    transactions = parser._extract_from_tables(FakeSession(*pages))
+    unique = parser.deduplicate_transactions(transactions)
+
+    assert [(txn['date'], txn['credit'], txn['debit']) for txn in unique] == [
+        ('2024-03-01', 0.0, 12.5), ('2024-03-02', 2000.0, 0.0), ('2024-03-03', 0.0, 4.2),
+    ]
+
+
+def monzo_rows(n):
+    return [{'date': f'2024-03-{day:02d}', 'description': 'Tesco', 'debit': 1.0, 'credit': 0.0, 'balance': 100.0 - day}
+            for day in range(1, n + 1)]
+
+
+def run_monzo(monkeypatch, scheduler, text_rows, table_rows, runs):
+    """Convert `runs` statements; the number of times tables were read"""
+    import contextlib
+    from parsers import monzo_parser
+
+    parser = get_parser('monzo')
+    calls = []
+    monkeypatch.setattr(monzo_parser, 'get_strategy_scheduler', lambda: scheduler)
+    monkeypatch.setattr(parser, 'open_pdf', lambda path: contextlib.nullcontext(FakeSession()))
+    monkeypatch.setattr(parser, '_extract_from_text', lambda pdf: monzo_rows(text_rows))
+    monkeypatch.setattr(parser, '_extract_from_tables', lambda pdf: calls.append(pdf) or monzo_rows(table_rows))
+
+    for _ in range(runs):
+        assert len(parser.extract_transactions('statement.pdf')) == max(text_rows, table_rows)
+    return len(calls)
+
+
+def test_confident_text_skips_tables_that_never_won(monkeypatch):
+    from parsers.strategy import StrategyScheduler
+    scheduler = StrategyScheduler(explore_every=0, explore_margin=3)
+
+    # Three comparisons while text's lead is small, then text alone
+    assert run_monzo(monkeypatch, scheduler, text_rows=12, table_rows=8, runs=10) == 3
+    assert get_parser('monzo').PREFETCH_TABLE_SETTINGS == []
+
+
+def test_tables_run_every_time_once_they_have_won(monkeypatch):
+    from parsers.strategy import StrategyScheduler
+    scheduler = StrategyScheduler(explore_every=0, explore_margin=3)
+
+    assert run_monzo(monkeypatch, scheduler, text_rows=12, table_rows=12, runs=10) == 10
+    assert scheduler.stats() == {'monzo': {'table': 10}}
+    assert get_parser('monzo').PREFETCH_TABLE_SETTINGS == get_parser('monzo').TABLE_STRATEGIES
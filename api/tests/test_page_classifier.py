@@ -0,0 +1,77 @@
+"""Page classification never costs a page its transactions."""
+import pdfplumber
+
+from parsers.page_classifier import BOILERPLATE, SUMMARY, TRANSACTION, PageClassifier
+from parsers.pdf_session import SessionPage, _extract_page_range, settings_key
+
+# Dates written "1st of March 2024", which the classifier's sample check does not know
+TABLE = [
+    ['When', 'What', 'Paid', 'Balance'],
+    ['1st of March 2024', 'TESCO STORES', '12.50', '1,987.50'],
+    ['2nd of March 2024', 'PRET A MANGER', '4.20', '1,983.30'],
+]
+TEXT = '\n'.join(' '.join(row) for row in TABLE)
+SETTINGS = {'vertical_strategy': 'lines', 'horizontal_strategy': 'lines'}
+
+
+class FakePage:
+    """pdfplumber page with fixed text and one table"""
+
+    def __init__(self, text, tables):
+        self.chars = [{'text': char} for char in text]
+        self.text = text
+        self.tables = tables
+
+    def extract_text(self, **kwargs):
+        return self.text
+
+    def extract_tables(self, table_settings=None):
+        return self.tables
+
+    def close(self):
+        pass
+
+
+def session_page(text, tables):
+    page = SessionPage(FakePage(text, tables))
+    page.classifier = PageClassifier(['Date', 'Description'])
+    return page
+
+
+def test_kinds():
+    classifier = PageClassifier(['Date', 'Description'])
+    assert classifier.classify_text('Date Description Amount Balance 01 Mar TESCO 12.50') == TRANSACTION
+    assert classifier.classify_text('01 Mar 2024 TESCO STORES 12.50 1,987.50') == TRANSACTION
+    assert classifier.classify_text(TEXT) == SUMMARY
+    assert classifier.classify_text('Terms and conditions apply to your account at all times.') == BOILERPLATE
+
+
+def test_summary_page_keeps_its_tables():
+    page = session_page(TEXT, [TABLE])
+    assert page.classify() == SUMMARY
+    assert page.extract_tables(SETTINGS) == [TABLE]
+    assert page.extract_text() == TEXT
+
+
+def test_boilerplate_page_is_not_laid_out():
+    page = session_page('Terms and conditions apply to your account at all times.', [TABLE])
+    assert page.extract_tables(SETTINGS) == []
+    assert page.extract_text() == ''
+
+
+def test_prefetch_keeps_summary_page_tables(monkeypatch):
+    class FakePdf:
+        pages = [FakePage(TEXT, [TABLE]), FakePage('Terms and conditions apply at all times.', [TABLE])]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(pdfplumber, 'open', lambda source: FakePdf())
+    classifier = PageClassifier(['Date', 'Description'])
+    results = _extract_page_range(b'%PDF', [0, 1], [SETTINGS], classifier=classifier)
+
+    assert results[0] == (0, TEXT, {settings_key(SETTINGS): [TABLE]}, None, SUMMARY)
+    assert results[1] == (1, None, {}, None, BOILERPLATE)
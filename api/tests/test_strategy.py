@@ -0,0 +1,99 @@
+"""StrategyScheduler ordering, comparison runs and persistence."""
+import json
+
+from parsers.strategy import StrategyScheduler
+
+
+def rows(n):
+    return [{'date': '2024-01-01', 'description': 'x', 'debit': 1.0, 'credit': 0.0, 'balance': 1.0}] * n
+
+
+class Counting:
+    """Strategy callables that count how often each ran"""
+
+    def __init__(self, **results):
+        self.results = results
+        self.calls = {name: 0 for name in results}
+
+    def strategies(self):
+        return {name: (lambda name=name: self._run(name)) for name in self.results}
+
+    def _run(self, name):
+        self.calls[name] += 1
+        return self.results[name]
+
+
+def by_count(results):
+    return max(results, key=lambda method: len(results[method][0]))
+
+
+def test_early_exit_does_not_count_as_a_win():
+    scheduler = StrategyScheduler(explore_every=0, explore_margin=0)
+    runs = Counting(text=rows(10), table=rows(20))
+
+    for _ in range(5):
+        method, _ = scheduler.run('bank', runs.strategies(), default_order=['text', 'table'], select=by_count)
+        assert method == 'text'
+
+    assert runs.calls == {'text': 5, 'table': 0}
+    assert scheduler.stats() == {}
+
+
+def test_close_win_counts_compare_and_let_the_other_method_take_over():
+    scheduler = StrategyScheduler(explore_every=0, explore_margin=3)
+    runs = Counting(text=rows(10), table=rows(20))
+
+    for _ in range(3):
+        method, transactions = scheduler.run('bank', runs.strategies(), default_order=['text', 'table'],
+                                             select=by_count)
+        assert (method, len(transactions)) == ('table', 20)
+    assert runs.calls == {'text': 3, 'table': 3}
+    assert scheduler.stats() == {'bank': {'table': 3}}
+
+    # Table is now far enough ahead to run first and stop early
+    assert scheduler.order('bank', ['text', 'table']) == ['table', 'text']
+    scheduler.run('bank', runs.strategies(), default_order=['text', 'table'], select=by_count)
+    assert runs.calls == {'text': 3, 'table': 4}
+
+
+def test_periodic_comparison_runs_every_strategy():
+    scheduler = StrategyScheduler(explore_every=4, explore_margin=0)
+    runs = Counting(text=rows(10), table=rows(20))
+
+    for _ in range(8):
+        scheduler.run('bank', runs.strategies(), default_order=['text', 'table'], select=by_count)
+
+    # Runs 4 and 8 compare; after run 4 table leads, so it runs first and alone
+    assert runs.calls == {'text': 3 + 1 + 1, 'table': 1 + 3 + 1}
+    assert scheduler.stats() == {'bank': {'table': 2}}
+
+
+def test_no_threshold_always_compares():
+    scheduler = StrategyScheduler(explore_every=0, explore_margin=0)
+    runs = Counting(text=rows(10), table=rows(10))
+
+    def tables_on_ties(results):
+        return 'table' if len(results['table'][0]) >= len(results['text'][0]) else 'text'
+
+    for _ in range(10):
+        method, _ = scheduler.run('monzo', runs.strategies(), threshold=None, default_order=['text', 'table'],
+                                  select=tables_on_ties)
+        assert method == 'table'
+
+    assert runs.calls == {'text': 10, 'table': 10}
+
+
+def test_stats_persisted_only_when_preferred_method_changes(tmp_path, monkeypatch):
+    path = tmp_path / 'stats.json'
+    scheduler = StrategyScheduler(str(path), explore_every=1, explore_margin=0)
+    writes = []
+    monkeypatch.setattr('parsers.strategy.os.replace', lambda src, dst: writes.append(dst) or path.write_text(
+        open(src, encoding='utf-8').read()))
+
+    for winner in ['text', 'text', 'text', 'table', 'table', 'table', 'table']:
+        scheduler.record('bank', winner)
+
+    # First winner, then table overtaking text
+    assert len(writes) == 2
+    assert json.loads(path.read_text()) == {'bank': {'text': 3, 'table': 4}}
+    assert StrategyScheduler(str(path)).order('bank', ['text', 'table']) == ['table', 'text']
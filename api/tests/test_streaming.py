@@ -0,0 +1,182 @@
+"""Page-incremental parsing matches parsing the whole text at once."""
+import random
+
+import pytest
+
+from conftest import barclays_lines, full_text, paginate
+from parsers.line_lexer import date_blocks, date_blocks_by_page
+from parsers.money import NO_BALANCE, to_pence
+from parsers.reconciliation import fill_missing_balances
+
+
+def single_pass(parser, text: str, year: str):
+    """Barclays text parse of the whole statement in one _parse_lines run"""
+    lines = text.split('\n')
+    start = parser._find_transaction_start(lines, 0, True)
+    parsed, _, _ = parser._parse_lines(lines, start, len(lines), None, year)
+    return parser._deduplicate_transactions([txn for _, txn in parsed], set())
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_barclays_stream_matches_full_text(barclays_parser, seed):
+    rnd = random.Random(seed)
+    pages = paginate(barclays_lines(150, seed), rnd)
+    expected = single_pass(barclays_parser, full_text(pages), '2023')
+
+    batches = list(barclays_parser._iter_text_batches(iter(pages), '2023'))
+
+    assert expected
+    assert [txn for batch in batches for txn in batch] == expected
+    assert len(batches) > 1
+
+
+def test_barclays_stream_keeps_page_separator_lines(barclays_parser):
+    # A page ending in a newline leaves an empty line before the next page,
+    # which counts towards a block's look-ahead window
+    lines = barclays_lines(60, seed=3)
+    pages = ['\n'.join(lines[:30]) + '\n', '\n'.join(lines[30:])]
+    expected = single_pass(barclays_parser, full_text(pages), '2023')
+    streamed = [txn for batch in barclays_parser._iter_text_batches(iter(pages), '2023') for txn in batch]
+    assert streamed == expected
+
+
+class FakePage:
+    """Session page with fixed text and tables"""
+
+    def __init__(self, text, tables=()):
+        self.text = text
+        self.tables = list(tables)
+
+    def extract_text(self):
+        return self.text
+
+    def extract_tables(self, table_settings=None):
+        return self.tables
+
+
+class FakePdf:
+    def __init__(self, *pages):
+        self.pages = list(pages)
+
+
+BARCLAYS_TABLE = [
+    ['Date', 'Description', 'Money out', 'Money in', 'Balance'],
+    ['03 Apr', 'Card Payment to Tesco', '12.50', '', ''],
+    ['04 Apr', 'Received From Acme Ltd', '', '100.00', '1,087.50'],
+    ['05 Apr', 'Direct Debit to Netflix', '9.99', '', ''],
+]
+
+
+@pytest.mark.parametrize('page_texts', [[], [''], ['Barclays Bank UK PLC\nNo transactions this period']])
+def test_barclays_text_parse_without_rows_is_empty(barclays_parser, page_texts):
+    assert barclays_parser.parse_page_texts(page_texts, {'year': '2023'}) == []
+    assert list(barclays_parser._fill_missing_balances(iter([]))) == []
+
+
+def test_barclays_falls_back_to_tables_when_text_finds_nothing(barclays_parser):
+    pdf = FakePdf(FakePage('Your statement 01 - 28 Apr 2023\nSee the table below', [BARCLAYS_TABLE]))
+
+    transactions = [txn for batch in barclays_parser._iter_transaction_batches(pdf) for txn in batch]
+
+    assert [(txn['date'], txn['debit'], txn['credit'], txn['balance']) for txn in transactions] == [
+        ('03/04/2023', 12.5, 0.0, 987.5),
+        ('04/04/2023', 0.0, 100.0, 1087.5),
+        ('05/04/2023', 9.99, 0.0, 1077.51),
+    ]
+
+
+def barclays_table(rows, seed):
+    """Barclays table rows with a sparse balance column, the first balance missing"""
+    rnd = random.Random(seed)
+    balance = 2500.00
+    table = [BARCLAYS_TABLE[0]]
+    for n in range(rows):
+        amount = round(rnd.uniform(0.01, 180), 2)
+        income = rnd.random() < 0.2
+        balance += amount if income else -amount
+        table.append([
+            f'{1 + n * 27 // rows:02d} Apr',
+            'Received From Acme Ltd' if income else 'Card Payment to Tesco',
+            '' if income else f'{amount:,.2f}',
+            f'{amount:,.2f}' if income else '',
+            f'{balance:,.2f}' if n % 4 == 3 else '',
+        ])
+    return table
+
+
+def engine_balances(transactions):
+    """Balances from fill_missing_balances over the parsed rows, in pence"""
+    filled, _ = fill_missing_balances(
+        [to_pence(txn['debit']) for txn in transactions],
+        [to_pence(txn['credit']) for txn in transactions],
+        [NO_BALANCE if txn['balance'] is None else to_pence(txn['balance']) for txn in transactions],
+    )
+    return list(filled)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_barclays_balances_come_from_the_shared_engine(barclays_parser, seed):
+    table = barclays_table(120, seed)
+    pdf = FakePdf(FakePage('Your statement 01 - 28 Apr 2023', [table]))
+    expected = engine_balances(barclays_parser._extract_from_tables(pdf, '2023'))
+
+    filled = [txn for batch in barclays_parser._iter_transaction_batches(pdf) for txn in batch]
+
+    assert filled[0]['balance'] is not None and not table[1][4]
+    assert [to_pence(txn['balance']) for txn in filled] == expected
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_barclays_batched_balances_match_one_pass(barclays_parser, seed):
+    rnd = random.Random(seed)
+    pdf = FakePdf(FakePage('Your statement 01 - 28 Apr 2023', [barclays_table(120, seed)]))
+    transactions = barclays_parser._extract_from_tables(pdf, '2023')
+    expected = engine_balances(transactions)
+    cuts = sorted(rnd.sample(range(1, len(transactions)), 10))
+    batches = [transactions[a:b] for a, b in zip([0] + cuts, cuts + [len(transactions)])]
+
+    filled = [txn for batch in barclays_parser._fill_missing_balances(iter(batches)) for txn in batch]
+
+    assert [to_pence(txn['balance']) for txn in filled] == expected
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_date_blocks_by_page_matches_date_blocks(seed):
+    rnd = random.Random(seed)
+    pages = paginate(barclays_lines(120, seed), rnd)
+    pattern = r'^\d{1,2}\s+\w{3}'
+
+    expected = date_blocks(full_text(pages).split('\n'), pattern, 6)
+    by_page = list(date_blocks_by_page(pages, pattern, 6))
+
+    assert [block for blocks in by_page for block in blocks] == expected
+
+
+HSBC_LINES = [
+    '03 Mar 24 VIS TESCO STORES 12.50', '03 Mar 24 DD BRITISH GAS', 'SO RENT', 'VIS PRET A MANGER 4.20',
+    'LONDON GB', '1,234.56', '45.00 1,189.56', 'BALANCE CARRIED FORWARD 1,189.56', '',
+    'Date Payment type and details Paid out Paid in Balance', 'BP SAVINGS', 'CR SALARY 2,000.00',
+]
+SANTANDER_LINES = [
+    '3rd Dec CARD PAYMENT TO TESCO 12.50 1,000.00', '4th Dec DIRECT DEBIT', 'BRITISH GAS 45.00',
+    '955.00', 'Total credits 0.00', 'Previous statement balance 1,000.00', 'Date Description Credits Debits',
+    'REFERENCE 123', 'Current statement balance 955.00', '',
+]
+
+
+@pytest.mark.parametrize('bank, pool', [('hsbc', HSBC_LINES), ('santander', SANTANDER_LINES)])
+@pytest.mark.parametrize('seed', range(20))
+def test_group_pages_matches_group(bank, pool, seed):
+    from parsers import get_parser
+    parser = get_parser(bank)
+    rnd = random.Random(seed)
+    # Mostly transaction lines; the end line (if any) late in the text
+    lines = parser.LEXER.lex_lines(rnd.choice(pool[:-2]) for _ in range(200))
+    lines += parser.LEXER.lex_lines(rnd.sample(pool, 3))
+    cuts = sorted(rnd.sample(range(1, len(lines)), 25))
+    pages = [lines[a:b] for a, b in zip([0] + cuts, cuts + [len(lines)])]
+    start = rnd.randint(0, 20)
+
+    by_page = list(parser.BLOCKS.group_pages(pages, start=start))
+
+    assert [block for blocks in by_page for block in blocks] == parser.BLOCKS.group(lines, start=start)
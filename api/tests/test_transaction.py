@@ -0,0 +1,62 @@
+"""Transaction records round-trip through the dicts parsers used to emit."""
+import json
+
+import pytest
+
+from parsers.transaction import Transaction
+
+DICTS = [
+    {'date': '2024-03-01', 'description': 'Tesco Stores', 'debit': 12.5, 'credit': 0.0, 'balance': 987.5,
+     'type': 'expense'},
+    {'date': '2024-03-02', 'description': 'Salary', 'debit': 0.0, 'credit': 2000.0, 'balance': None,
+     'type': 'income', 'amount': 2000.0, 'category': 'BGC'},
+    {'date': '2024-03-03', 'description': 'Card Payment', 'debit': 4.2, 'credit': 0.0, 'balance': 983.3,
+     'type': 'expense', 'reference': 'REF123', 'page': 2},
+]
+
+
+@pytest.mark.parametrize('data', DICTS)
+def test_from_dict_to_dict_round_trips(data):
+    txn = Transaction.from_dict(data)
+
+    assert txn.to_dict() == data
+    assert Transaction.from_dict(txn.to_dict()) == txn
+    assert json.loads(json.dumps(txn.to_dict())) == data
+
+
+@pytest.mark.parametrize('data', DICTS)
+def test_reads_like_the_dict(data):
+    txn = Transaction.from_dict(data)
+
+    assert dict(txn.items()) == data
+    assert set(txn) == set(data)
+    for key, value in data.items():
+        assert key in txn
+        assert txn[key] == value
+        assert txn.get(key) == value
+    for key in ('amount', 'category', 'reference'):
+        if key not in data:
+            assert key not in txn
+            assert txn.get(key, 'missing') == 'missing'
+            with pytest.raises(KeyError):
+                txn[key]
+
+
+def test_unknown_keys_go_into_extra():
+    txn = Transaction.from_dict({'date': '2024-03-01', 'page': 2, 'extra': {'reference': 'R1'}})
+
+    assert txn.extra == {'reference': 'R1', 'page': 2}
+    assert txn.to_dict()['page'] == 2
+
+
+def test_setting_keys_updates_fields_or_extra():
+    txn = Transaction(date='2024-03-01', description='Netflix', debit=9.99)
+    txn['balance'] = 100.0
+    txn['reference'] = 'R2'
+
+    assert txn.balance == 100.0
+    assert txn.extra == {'reference': 'R2'}
+    assert txn.to_dict() == {
+        'date': '2024-03-01', 'description': 'Netflix', 'debit': 9.99, 'credit': 0.0, 'balance': 100.0,
+        'type': 'expense', 'reference': 'R2',
+    }
@@ -3,13 +3,36 @@ Common utilities for bank statement parsing
 """
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
 
+try:
+    from .parsers.money import is_sub_penny, parse_pence
+    from .parsers.dates import DATE_CACHE_SIZE
+    from .parsers.cleaning import CLEAN_CACHE_SIZE, Rule, RuleSet
+except ImportError:
+    from parsers.money import is_sub_penny, parse_pence
+    from parsers.dates import DATE_CACHE_SIZE
+    from parsers.cleaning import CLEAN_CACHE_SIZE, Rule, RuleSet
+
+
+_UK_DATE_NUMERIC = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+_UK_DATE_NUMERIC_SHORT = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})')
+_UK_DATE_MONTH_NAME = re.compile(r'(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})')
+_UK_DATE_NO_YEAR = re.compile(r'(\d{1,2})\s+([A-Za-z]{3})')
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
 
 def parse_uk_date(date_str: str) -> Optional[str]:
     """
     Parse UK date formats: DD/MM/YYYY, DD/MM/YY, DD-MM-YYYY, DD MMM YYYY
     
+    Results are memoized (statements repeat the same dates on every row).
+    
     Args:
         date_str: Date string in various UK formats
         
@@ -18,11 +41,16 @@ def parse_uk_date(date_str: str) -> Optional[str]:
     """
     if not date_str or not isinstance(date_str, str):
         return None
-    
+    return _parse_uk_date(date_str)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_uk_date(date_str: str) -> Optional[str]:
+    """parse_uk_date for a non-empty string"""
     date_str = date_str.strip()
     
     # Pattern 1: DD/MM/YYYY or DD-MM-YYYY
-    match = re.match(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})', date_str)
+    match = _UK_DATE_NUMERIC.match(date_str)
     if match:
         try:
             day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
@@ -32,7 +60,7 @@ def parse_uk_date(date_str: str) -> Optional[str]:
             pass
     
     # Pattern 2: DD/MM/YY (2-digit year)
-    match = re.match(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})', date_str)
+    match = _UK_DATE_NUMERIC_SHORT.match(date_str)
     if match:
         try:
             day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
@@ -44,33 +72,28 @@ def parse_uk_date(date_str: str) -> Optional[str]:
             pass
     
     # Pattern 3: DD MMM YYYY (e.g., "03 Apr 2023")
-    month_map = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
-    
-    match = re.match(r'(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})', date_str)
+    match = _UK_DATE_MONTH_NAME.match(date_str)
     if match:
         try:
             day = int(match.group(1))
             month_name = match.group(2).lower()[:3]
             year = int(match.group(3))
             
-            if month_name in month_map:
-                month = month_map[month_name]
+            if month_name in _MONTHS:
+                month = _MONTHS[month_name]
                 if 1 <= day <= 31:
                     return datetime(year, month, day).strftime('%Y-%m-%d')
         except (ValueError, IndexError):
             pass
     
     # Pattern 4: DD MMM (without year - will use statement year if available)
-    match = re.match(r'(\d{1,2})\s+([A-Za-z]{3})', date_str)
+    match = _UK_DATE_NO_YEAR.match(date_str)
     if match:
         try:
             day = int(match.group(1))
             month_name = match.group(2).lower()[:3]
             
-            if month_name in month_map:
+            if month_name in _MONTHS:
                 # Return format that indicates year needs to be added
                 return f"{day:02d} {month_name.capitalize()}"
         except (ValueError, IndexError):
@@ -89,6 +112,11 @@ def parse_uk_amount(amount_str: str) -> float:
     Returns:
         Float value (negative for debits in brackets)
     """
+    # Plain amounts are read digit by digit as pence, never through float
+    pence = parse_pence(amount_str)
+    if pence:
+        return pence / 100
+    
     if not amount_str:
         return 0.0
     
@@ -109,6 +137,10 @@ def parse_uk_amount(amount_str: str) -> float:
         is_negative = True
         clean = clean[1:]
     
+    # Sub-penny amounts are not money: reject them rather than round them
+    if is_sub_penny(clean):
+        return 0.0
+    
     try:
         amount = float(clean)
         return -amount if is_negative else amount
@@ -130,9 +162,20 @@ def calculate_accuracy_score(transactions: List[Dict], validation_errors: List[s
     if not transactions:
         return 0.0
     
-    error_count = len(validation_errors)
-    total_transactions = len(transactions)
+    return accuracy_from_counts(len(transactions), len(validation_errors))
+
+
+def accuracy_from_counts(total_transactions: int, error_count: int) -> float:
+    """
+    Accuracy score from counts alone (for streamed conversions)
     
+    Args:
+        total_transactions: Number of transactions
+        error_count: Number of validation errors
+        
+    Returns:
+        Accuracy score 0-100
+    """
     if total_transactions == 0:
         return 0.0
     
@@ -140,6 +183,45 @@ def calculate_accuracy_score(transactions: List[Dict], validation_errors: List[s
     return round(max(0.0, min(100.0, accuracy)), 2)
 
 
+# Generic description cleaning rules, in order
+DESCRIPTION_RULES = RuleSet(
+    # Remove common prefixes that add no value, and reference numbers
+    (
+        Rule(r'^(card payment to|direct debit to|payment to|card purchase)\s*', flags=re.IGNORECASE),
+        Rule(r'Ref:\s*\w+', flags=re.IGNORECASE),
+    ),
+    
+    # Remove card numbers (after references: "Card: Ref: 1234" leaves "Card: 1234")
+    Rule(r'Card:\s*\d+', flags=re.IGNORECASE),
+    
+    # Remove "On DD MMM" patterns (date continuation markers)
+    Rule(r'\s*On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?', flags=re.IGNORECASE),
+    Rule(r'\s+On\s+\d{1,2}(\s+[A-Za-z]{3})?$', flags=re.IGNORECASE),  # Remove trailing "On DD" or "On DD MMM"
+    Rule(r'\s+On\s+\d{1,2}\s*$', flags=re.IGNORECASE),  # Remove "On 01" at end
+    
+    # Remove exchange rate details (common in foreign transactions)
+    Rule(r'\s*EUR\s+\d+\.\d+\s+at\s+VISA\s+Exchange\s+Rate[^.]*\.', flags=re.IGNORECASE),
+    
+    # Cut exchange rate notes and Barclays footer/legal text (each runs to the end of the line)
+    (
+        Rule(r'\s*The\s+Final\s+GBP\s+Amount\s+Includes.*', flags=re.IGNORECASE),
+        Rule(r'\s*Non-Sterling\s+Transaction\s+Fee.*', flags=re.IGNORECASE),
+        Rule(r'\s*Barclays Bank UK PLC.*', flags=re.IGNORECASE),
+        Rule(r'\s*Authorised by.*', flags=re.IGNORECASE),
+        Rule(r'\s*Continued.*', flags=re.IGNORECASE),
+        Rule(r'\s*Registered.*', flags=re.IGNORECASE),
+    ),
+    
+    # Remove country codes and locations that are redundant
+    Rule(r'\s*Spain\s+', ' ', flags=re.IGNORECASE),
+    Rule(r'\s*\(Hotel\s+\d+.*?\)', flags=re.IGNORECASE),
+    
+    # Normalize spaces
+    Rule(r'\s+', ' '),
+)
+
+
+@lru_cache(maxsize=CLEAN_CACHE_SIZE)
 def clean_description(description: str, max_length: int = 50) -> str:
     """
     Clean transaction description by removing common noise and truncating
@@ -154,39 +236,7 @@ def clean_description(description: str, max_length: int = 50) -> str:
     if not description:
         return ''
     
-    cleaned = description
-    
-    # Remove common prefixes that add no value
-    cleaned = re.sub(r'^(card payment to|direct debit to|payment to|card purchase)\s*', '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove reference numbers
-    cleaned = re.sub(r'Ref:\s*\w+', '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove card numbers
-    cleaned = re.sub(r'Card:\s*\d+', '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove "On DD MMM" patterns (date continuation markers)
-    cleaned = re.sub(r'\s*On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+On\s+\d{1,2}(\s+[A-Za-z]{3})?$', '', cleaned, flags=re.IGNORECASE)  # Remove trailing "On DD" or "On DD MMM"
-    cleaned = re.sub(r'\s+On\s+\d{1,2}\s*$', '', cleaned, flags=re.IGNORECASE)  # Remove "On 01" at end
-    
-    # Remove exchange rate details (common in foreign transactions)
-    cleaned = re.sub(r'\s*EUR\s+\d+\.\d+\s+at\s+VISA\s+Exchange\s+Rate[^.]*\.', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s*The\s+Final\s+GBP\s+Amount\s+Includes.*', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s*Non-Sterling\s+Transaction\s+Fee.*', '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove Barclays footer/legal text
-    cleaned = re.sub(r'\s*Barclays Bank UK PLC.*', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s*Authorised by.*', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s*Continued.*', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s*Registered.*', '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove country codes and locations that are redundant
-    cleaned = re.sub(r'\s*Spain\s+', ' ', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s*\(Hotel\s+\d+.*?\)', '', cleaned, flags=re.IGNORECASE)
-    
-    # Normalize spaces
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = DESCRIPTION_RULES.apply(description).strip()
     
     # Truncate intelligently at word boundary
     if len(cleaned) > max_length:
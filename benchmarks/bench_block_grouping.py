@@ -0,0 +1,153 @@
+"""
+Benchmark: block grouping, per-parser lookahead loops vs the shared line lexer.
+
+Builds statement-like text (dated lines with wrapped descriptions and
+amounts, page headers and footers repeating between pages) and times the
+look-ahead loop group_lines_into_blocks used to run, which re-matches the
+date regex on lines it scans, against lexing every line once and grouping
+the token stream in one pass, from a cold lexer cache and a warm one (a
+statement re-read, or chunk boundaries parsed twice). With a single date
+regex a cold lex costs more than the loop it replaces; the saving comes
+from parsers checking several patterns per line and from lines seen
+before, so keep the statement within LEX_CACHE_SIZE lines. The measured
+cold-path regression is printed whenever the lexer loses. The HSBC text
+path is timed end to end on the same statement.
+
+Usage:
+    python benchmarks/bench_block_grouping.py
+    python benchmarks/bench_block_grouping.py --transactions 1000 --repeat 7
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from parsers import get_parser  # noqa: E402
+from parsers.line_lexer import date_blocks, date_lexer  # noqa: E402
+
+DATE_PATTERN = r'^\d{2}\s+[A-Z][a-z]{2}\s+\d{2}'
+
+MERCHANTS = [
+    'TESCO STORES 3217', 'TFL TRAVEL CH', 'PRET A MANGER', 'AMAZON.CO.UK*WR9P2', 'COSTA COFFEE',
+    'SAINSBURYS S/MKTS', 'UBER *TRIP', 'NETFLIX.COM', 'SHELL KINGS CROSS', 'DELIVEROO',
+]
+TYPE_CODES = ['VIS', 'DD', 'SO', 'BP', 'CR', ')))']
+HEADER = 'Date Payment type and details Paid out Paid in Balance'
+FOOTER = ['BALANCE CARRIED FORWARD 1,234.56', 'HSBC UK Bank plc', 'Page 2 of 9']
+
+
+def synthetic_statement(transactions: int, per_page: int = 40, seed: int = 1) -> str:
+    """HSBC-style statement text with `transactions` rows"""
+    rnd = random.Random(seed)
+    lines = ['Your Statement', HEADER]
+    day = 1
+    for n in range(transactions):
+        if n and n % per_page == 0:
+            lines.extend(FOOTER)
+            lines.extend(['BALANCE BROUGHT FORWARD 1,234.56', HEADER])
+            day = day % 28 + 1
+        amount = f"{rnd.randint(1, 999)}.{rnd.randint(0, 99):02d}"
+        merchant = rnd.choice(MERCHANTS)
+        code = rnd.choice(TYPE_CODES)
+        if rnd.random() < 0.5:
+            lines.append(f"{day:02d} Mar 24 {code} {merchant} {amount}")
+        else:
+            lines.append(f"{day:02d} Mar 24 {code} {merchant}")
+            lines.append(f"LONDON GB {rnd.randint(1000, 9999)}")
+            lines.append(f"{amount} {rnd.randint(1000, 9999)}.{rnd.randint(0, 99):02d}")
+    lines.extend(FOOTER)
+    return '\n'.join(lines)
+
+
+def legacy_blocks(lines, date_pattern: str, max_block_lines: int = 10):
+    """The look-ahead loop group_lines_into_blocks ran before the line lexer"""
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if not line:
+            i += 1
+            continue
+        date_match = re.match(date_pattern, line, re.IGNORECASE)
+        if date_match:
+            block_lines = [line]
+            j = i + 1
+            while j < len(lines) and j < i + max_block_lines:
+                next_line = lines[j].strip()
+                if next_line and re.match(date_pattern, next_line, re.IGNORECASE):
+                    break
+                if next_line:
+                    block_lines.append(next_line)
+                j += 1
+            blocks.append({
+                'lines': block_lines,
+                'date_line': line,
+                'date_match': date_match.group(0),
+                'start_idx': i,
+                'end_idx': j - 1,
+            })
+            i = j
+        else:
+            i += 1
+    return blocks
+
+
+def best_ms(run, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--transactions', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = synthetic_statement(args.transactions)
+    lines = text.split('\n')
+    lexer = date_lexer(DATE_PATTERN)
+    same = legacy_blocks(lines, DATE_PATTERN) == date_blocks(lines, DATE_PATTERN)
+
+    legacy_ms = best_ms(lambda: legacy_blocks(lines, DATE_PATTERN), args.repeat)
+
+    def cold():
+        lexer.lex.cache_clear()
+        date_blocks(lines, DATE_PATTERN)
+    cold_ms = best_ms(cold, args.repeat)
+    warm_ms = best_ms(lambda: date_blocks(lines, DATE_PATTERN), args.repeat)
+
+    print(f"{len(lines)} lines, {args.transactions} transactions")
+    print(f"{'grouping':<14} {'ms':>8} {'speedup':>8}")
+    print(f"{'lookahead':<14} {legacy_ms:8.1f}")
+    print(f"{'lexer cold':<14} {cold_ms:8.1f} {legacy_ms / cold_ms:7.2f}x")
+    print(f"{'lexer warm':<14} {warm_ms:8.1f} {legacy_ms / warm_ms:7.2f}x  same={same}")
+    if cold_ms > legacy_ms:
+        print(f"cold-path regression: a first read with one date regex is "
+              f"{(cold_ms / legacy_ms - 1) * 100:.0f}% slower than the lookahead loop")
+
+    hsbc = get_parser('hsbc')
+
+    def hsbc_cold():
+        hsbc.LEXER.lex.cache_clear()
+        hsbc._parse_hsbc_text(text)
+    count = len(hsbc._parse_hsbc_text(text))
+    hsbc_ms = best_ms(hsbc_cold, args.repeat)
+    print(f"\nhsbc text path {hsbc_ms:.1f} ms for {count} transactions "
+          f"({hsbc_ms * 1000 / max(count, 1):.1f} us/transaction)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: single-pass vs chunked conversion of long statements.
+
+Converts each PDF normally and as page-range chunks merged in order, checks
+the chunked transactions match the single pass exactly, and times resuming
+a chunked conversion that was interrupted halfway (half of its chunks
+already checkpointed).
+
+Usage:
+    python benchmarks/bench_chunked_conversion.py statement.pdf
+    python benchmarks/bench_chunked_conversion.py --chunk-pages 5 --workers 4 a.pdf b.pdf
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from converter import get_converter  # noqa: E402
+from parsers import ChunkCheckpoint, PdfSession, get_parser, pdf_session, run_chunks  # noqa: E402
+
+
+def timed_convert(path: str, **kwargs):
+    """(seconds, result) of one conversion"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = get_converter().convert(path, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def checkpoint_first_half(path: str, bank_id: str, chunk_pages: int, checkpoint: ChunkCheckpoint) -> int:
+    """Checkpoint the chunks of the first half of a document, as an interrupted run would have"""
+    parser = get_parser(bank_id)
+    with PdfSession(path) as session:
+        if not parser.SUPPORTS_CHUNKING:
+            return session.page_count
+        context = parser.chunk_context(session)
+        for chunk in run_chunks(session, bank_id, chunk_pages, context, workers=1):
+            if chunk.end_page <= session.page_count // 2:
+                checkpoint.save(chunk)
+        return session.page_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='+', help='Statement PDFs')
+    parser.add_argument('--chunk-pages', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=0, help='Process count (default PARSER_WORKERS)')
+    args = parser.parse_args()
+
+    if args.workers:
+        pdf_session.PARSER_WORKERS = args.workers
+
+    print(f"{'file':28} {'pages':>5} {'single s':>9} {'chunked s':>10} {'resumed s':>10} match")
+    all_match = True
+    for path in args.pdfs:
+        single_time, single = timed_convert(path)
+        chunked_time, chunked = timed_convert(path, chunk_pages=args.chunk_pages)
+        match = (
+            chunked['transactions'] == single['transactions']
+            and chunked['validation_errors'] == single['validation_errors']
+        )
+        all_match = all_match and match
+
+        checkpoint_dir = tempfile.mkdtemp()
+        try:
+            checkpoint = ChunkCheckpoint(checkpoint_dir, 'bench')
+            page_count = checkpoint_first_half(path, single['bank'], args.chunk_pages, checkpoint)
+            resumed_time, resumed = timed_convert(path, chunk_pages=args.chunk_pages, checkpoint=checkpoint)
+            all_match = all_match and resumed['transactions'] == single['transactions']
+        finally:
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+        print(f"{os.path.basename(path)[:28]:28} {page_count:5} {single_time:9.2f} "
+              f"{chunked_time:10.2f} {resumed_time:10.2f} {'yes' if match else 'NO'}")
+
+    if not all_match:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
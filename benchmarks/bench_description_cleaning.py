@@ -0,0 +1,155 @@
+"""
+Benchmark: per-row description cleaning cost, rule passes vs memoized cleaners.
+
+For each bank's cleaner, times a statement-like stream of raw descriptions
+(a few merchants repeat most of the time, as on real statements) through
+the compiled RuleSet on every row, and through the memoized cleaner the
+parsers call, from a cold cache and a warm one. Barclays is also timed
+against the inline re.sub chain its cleaner used to run.
+
+Usage:
+    python benchmarks/bench_description_cleaning.py
+    python benchmarks/bench_description_cleaning.py --rows 50000 --distinct 500
+    python benchmarks/bench_description_cleaning.py --bank barclays utils --repeat 7
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+from parsers import get_parser  # noqa: E402
+import utils  # noqa: E402
+
+MERCHANTS = [
+    'Tesco Stores', 'Tfl Travel Ch', 'Pret A Manger', 'Amazon.co.uk*Wr9P2', 'Costa Coffee',
+    'Sainsburys S/Mkts', 'Uber *Trip', 'Netflix.com', 'Shell Kings Cross', 'Deliveroo',
+]
+
+# Raw description shapes per cleaner: a function of (rnd, merchant)
+DESCRIPTION_SHAPES = {
+    'barclays': lambda rnd, m: rnd.choice([
+        f"Card Payment to {m} On {rnd.randint(1, 28)} Nov",
+        f"(1) Direct Debit to {m} Ref: {rnd.randint(10 ** 8, 10 ** 9)}",
+        f"Transfer to Sort Code 20-{rnd.randint(10, 99)}-00 Account {rnd.randint(10 ** 7, 10 ** 8)}",
+    ]),
+    'hsbc': lambda rnd, m: f"VIS {m.upper()} {rnd.randint(1000, 9999)} LONDON",
+    'monzo': lambda rnd, m: f"{m} Card payment Reference: {rnd.randint(10 ** 5, 10 ** 6)}",
+    'anna': lambda rnd, m: f"{m} INV{rnd.randint(10 ** 5, 10 ** 6)} GB{rnd.randint(10 ** 6, 10 ** 7)}",
+    'santander': lambda rnd, m: (f"CARD PAYMENT TO {m.upper()},{rnd.randint(1, 99)}.{rnd.randint(10, 99)} "
+                                 f"GBP, RATE 1.00/GBP, ON {rnd.randint(10, 28)}-12-2023"),
+    'lloyds': lambda rnd, m: f"{m.upper()} CD {rnd.randint(1000, 9999)} DEB",
+    'utils': lambda rnd, m: f"Card Payment to {m} Ref: {rnd.randint(10 ** 5, 10 ** 6)} On {rnd.randint(1, 28)} Mar",
+}
+
+# The memoized cleaner method each parser calls
+CLEANER_METHODS = {
+    'barclays': '_clean_barclays_description',
+    'hsbc': '_clean_hsbc_description',
+    'monzo': '_clean_monzo_description',
+    'anna': '_clean_anna_description',
+    'santander': '_clean_santander_description',
+    'lloyds': '_clean_merchant_name',
+}
+
+
+def _cleaner(bank: str):
+    """(cached, uncached) callables for a bank's description cleaner"""
+    if bank == 'utils':
+        return utils.clean_description, utils.clean_description.__wrapped__
+    parser = get_parser(bank)
+    method = getattr(parser, CLEANER_METHODS[bank])
+    return method, lambda text, wrapped=method.__wrapped__: wrapped(parser, text)
+
+
+def _clear(bank: str, cached):
+    if bank == 'utils':
+        cached.cache_clear()
+    else:
+        for cache in cached.__func__.caches.values():
+            cache.cache_clear()
+
+
+def legacy_barclays(description: str) -> str:
+    """The re.sub chain _clean_barclays_description ran before RuleSet"""
+    cleaned = description.strip()
+    cleaned = re.sub(r'^\(\d+\)\s*', '', cleaned)
+    cleaned = re.sub(r'\s*Ref:\s*[A-Za-z0-9\-_/\.\s]+$', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s*Ref:\s*[A-Za-z0-9\-_/\.]+', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s+On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?$', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s+On\s+\d{1,2}\s+[A-Za-z]{3}(\s+\d{4})?\s*$', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s+On\s+\d{1,2}\s*$', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s+On\s*$', '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\*[A-Za-z0-9]+(?:\s|$)', ' ', cleaned)
+    cleaned = re.sub(r'^Giro\s+Received\s+From\s+', 'Received From ', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'(Sort\s+Code\s+[\d\-]+)\s+(Account\s+\d+)', r'\1, \2', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'(Sort\s+Code\s+[A-Za-z0-9\-]+)\s+(Account\s+[A-Za-z0-9]+)', r'\1, \2',
+                     cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    return cleaned.rstrip('.,;:- ')
+
+
+def synthetic_rows(bank: str, rows: int, distinct: int, seed: int = 1):
+    """`rows` descriptions drawn from `distinct` raw strings, most-used first"""
+    rnd = random.Random(seed)
+    shape = DESCRIPTION_SHAPES[bank]
+    pool = [shape(rnd, rnd.choice(MERCHANTS)) for _ in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rnd.choices(pool, weights=weights, k=rows)
+
+
+def best_ms(run, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--distinct', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--bank', nargs='+', choices=sorted(DESCRIPTION_SHAPES), default=list(DESCRIPTION_SHAPES))
+    args = parser.parse_args()
+
+    def per_row(ms):
+        return ms * 1000 / args.rows
+
+    print(f"{'cleaner':<10} {'rules us/row':>13} {'cold us/row':>12} {'warm us/row':>12} {'speedup':>8}  same")
+    for bank in args.bank:
+        rows = synthetic_rows(bank, args.rows, args.distinct)
+        cached, uncached = _cleaner(bank)
+        _clear(bank, cached)
+        same = [uncached(row) for row in rows] == [cached(row) for row in rows]
+
+        rules_ms = best_ms(lambda: [uncached(row) for row in rows], args.repeat)
+
+        def cold():
+            _clear(bank, cached)
+            for row in rows:
+                cached(row)
+        cold_ms = best_ms(cold, args.repeat)
+        warm_ms = best_ms(lambda: [cached(row) for row in rows], args.repeat)
+        print(f"{bank:<10} {per_row(rules_ms):13.2f} {per_row(cold_ms):12.2f} {per_row(warm_ms):12.2f} "
+              f"{rules_ms / cold_ms:7.2f}x  {same}")
+
+    if 'barclays' in args.bank:
+        rows = synthetic_rows('barclays', args.rows, args.distinct)
+        _, uncached = _cleaner('barclays')
+        same = [legacy_barclays(row) for row in rows] == [uncached(row) for row in rows]
+        legacy_ms = best_ms(lambda: [legacy_barclays(row) for row in rows], args.repeat)
+        rules_ms = best_ms(lambda: [uncached(row) for row in rows], args.repeat)
+        print(f"\nbarclays re.sub chain {per_row(legacy_ms):.2f} us/row, "
+              f"RuleSet {per_row(rules_ms):.2f} us/row ({legacy_ms / rules_ms:.2f}x)  same={same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: cold-start import time of the converter.
+
+Runs `python -X importtime` in fresh processes and reports the cumulative
+import time of each entry module, the heaviest modules beneath it, and
+whether heavy dependencies (pdfplumber/pdfminer, parser modules) were
+imported at cold start. They should only load once a PDF is converted.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 10 --top 15 --budget-ms 150
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+# Entry points a cold start goes through
+ENTRY_MODULES = ['converter', 'convert']
+
+# Modules that should not load until a PDF is opened
+DEFERRED_PREFIXES = ('pdfplumber', 'pdfminer', 'parsers.barclays_parser', 'parsers.monzo_parser')
+
+
+def import_times(module: str):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of ({module: (self_us, cumulative_us)}, list of loaded module names)
+    """
+    code = f"import sys; import {module}; print('\\n'.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=API_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times, proc.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per entry module')
+    parser.add_argument('--top', type=int, default=10, help='Heaviest modules to list')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Exit non-zero if the converter import exceeds this (median)')
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in ENTRY_MODULES:
+        runs = [import_times(module) for _ in range(args.runs)]
+        totals = [times[module][1] / 1000 for times, _ in runs]
+        median_ms = statistics.median(totals)
+
+        print(f"\n{module}: median {median_ms:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}) "
+              f"over {args.runs} runs")
+
+        # Heaviest modules by cumulative time, from the fastest run
+        times, loaded = runs[totals.index(min(totals))]
+        heaviest = sorted(times.items(), key=lambda item: -item[1][1])[1:args.top + 1]
+        print(f"  {'module':45} {'self ms':>9} {'cumulative ms':>14}")
+        for name, (self_us, cumulative_us) in heaviest:
+            print(f"  {name:45} {self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}")
+
+        eager = sorted({name for name in loaded if name.startswith(DEFERRED_PREFIXES)})
+        print(f"  deferred modules imported at cold start: {', '.join(eager) or 'none'}")
+
+        if module == 'converter' and args.budget_ms is not None and median_ms > args.budget_ms:
+            print(f"  over budget: {median_ms:.1f} ms > {args.budget_ms:.1f} ms")
+            over_budget = True
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: text extraction plus regex columns vs the geometric word layout.
+
+For each statement, times the parser's text path (extract_text() on every
+page, then lines regrouped and amounts assigned to columns by regex)
+against its layout path (one extract_words() pass, words assigned to
+columns by position), each on a fresh session so pages are laid out from
+scratch, and counts the transactions on which the two paths disagree.
+
+Usage:
+    python benchmarks/bench_layout_extraction.py hsbc.pdf
+    python benchmarks/bench_layout_extraction.py --repeat 5 a.pdf b.pdf
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from parsers import PdfSession, get_parser  # noqa: E402
+
+# Parsers with both paths: bank id -> (text method, layout method)
+LAYOUT_PARSERS = {
+    'hsbc': ('_parse_hsbc_text', '_parse_hsbc_layout'),
+}
+
+
+def text_path(parser, method: str, path: str):
+    with PdfSession(path) as session:
+        return getattr(parser, method)(session.full_text())
+
+
+def layout_path(parser, method: str, path: str):
+    with PdfSession(path) as session:
+        return getattr(parser, method)(parser.extract_layout_rows(session))
+
+
+def best_ms(run, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='+', help='Statement PDFs')
+    parser.add_argument('--bank', choices=sorted(LAYOUT_PARSERS), default='hsbc')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    bank_parser = get_parser(args.bank)
+    text_method, layout_method = LAYOUT_PARSERS[args.bank]
+
+    print(f"{'file':28} {'text ms':>8} {'layout ms':>10} {'speedup':>8} {'text':>5} {'layout':>7} {'differ':>7}")
+    for path in args.pdfs:
+        by_text = text_path(bank_parser, text_method, path)
+        by_layout = layout_path(bank_parser, layout_method, path)
+        differ = sum(a != b for a, b in zip(by_text, by_layout)) + abs(len(by_text) - len(by_layout))
+
+        text_ms = best_ms(lambda: text_path(bank_parser, text_method, path), args.repeat)
+        layout_ms = best_ms(lambda: layout_path(bank_parser, layout_method, path), args.repeat)
+        print(f"{os.path.basename(path):28} {text_ms:8.1f} {layout_ms:10.1f} {text_ms / layout_ms:7.2f}x "
+              f"{len(by_text):5} {len(by_layout):7} {differ:7}")
+
+
+if __name__ == '__main__':
+    main()
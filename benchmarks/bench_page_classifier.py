@@ -0,0 +1,63 @@
+"""
+Benchmark: conversion with and without page classification.
+
+For each statement, times a full conversion with every page laid out
+(PARSER_SKIP_PAGES off) against one where boilerplate pages are skipped
+and summary pages get no table detection, and reports how many pages were
+skipped. Transactions must match between the two runs.
+
+Usage:
+    python benchmarks/bench_page_classifier.py statement.pdf
+    python benchmarks/bench_page_classifier.py --repeat 5 a.pdf b.pdf
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from converter import get_converter  # noqa: E402
+from parsers import page_classifier  # noqa: E402
+
+
+def run(path: str, skip_pages: bool):
+    page_classifier.PARSER_SKIP_PAGES = skip_pages
+    return get_converter().convert(path)
+
+
+def best_ms(path: str, skip_pages: bool, repeat: int) -> float:
+    """Fastest of `repeat` conversions, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(path, skip_pages)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='+', help='Statement PDFs')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'file':28} {'pages':>6} {'skipped':>8} {'all ms':>8} {'skip ms':>8} {'speedup':>8} match")
+    for path in args.pdfs:
+        every_page = run(path, False)
+        skipping = run(path, True)
+        stats = skipping.get('metadata', {})
+        match = every_page.get('transactions') == skipping.get('transactions')
+
+        all_ms = best_ms(path, False, args.repeat)
+        skip_ms = best_ms(path, True, args.repeat)
+        print(f"{os.path.basename(path):28} {stats.get('pages', 0):6} {stats.get('skipped_pages', 0):8} "
+              f"{all_ms:8.1f} {skip_ms:8.1f} {all_ms / skip_ms:7.2f}x {match}")
+
+
+if __name__ == '__main__':
+    main()
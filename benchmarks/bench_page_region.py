@@ -0,0 +1,76 @@
+"""
+Benchmark: conversion on whole pages vs pages cropped to the transaction region.
+
+For each statement, times a full conversion with cropping off
+(PARSER_CROP_PAGES=0) against one where pages after the first are cropped
+to the region found from the header row and footer, and reports how many
+pages were cropped and the share of their characters left for pdfplumber
+to lay out. Transactions should match; where they differ, page furniture
+was leaking into descriptions.
+
+Usage:
+    python benchmarks/bench_page_region.py statement.pdf
+    python benchmarks/bench_page_region.py --repeat 5 a.pdf b.pdf
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from converter import get_converter  # noqa: E402
+from parsers import PdfSession, get_parser, page_region  # noqa: E402
+
+
+def run(path: str, crop_pages: bool):
+    page_region.PARSER_CROP_PAGES = crop_pages
+    return get_converter().convert(path)
+
+
+def best_ms(path: str, crop_pages: bool, repeat: int) -> float:
+    """Fastest of `repeat` conversions, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(path, crop_pages)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def crop_stats(path: str, bank_id: str):
+    """(pages cropped, share of their characters kept)"""
+    page_region.PARSER_CROP_PAGES = True
+    with PdfSession(path) as session:
+        get_parser(bank_id).prepare_pages(session)
+        cropped = [page for page in session.pages if page.layout_page() is not page._page]
+        total = sum(len(page.chars) for page in cropped)
+        kept = sum(len(page.layout_page().chars) for page in cropped)
+    return len(cropped), kept / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='+', help='Statement PDFs')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'file':28} {'cropped':>8} {'kept':>6} {'whole ms':>9} {'crop ms':>8} {'speedup':>8} match")
+    for path in args.pdfs:
+        whole = run(path, False)
+        cropped = run(path, True)
+        pages, kept = crop_stats(path, cropped['bank'])
+        match = whole.get('transactions') == cropped.get('transactions')
+
+        whole_ms = best_ms(path, False, args.repeat)
+        crop_ms = best_ms(path, True, args.repeat)
+        print(f"{os.path.basename(path):28} {pages:8} {kept:6.0%} {whole_ms:9.1f} {crop_ms:8.1f} "
+              f"{whole_ms / crop_ms:7.2f}x {match}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: post-processing of parsed transactions, per-row records vs TransactionTable.
+
+Times the steps between extraction and the response (normalize, balance
+validation, missing-balance fill, deduplication) on a synthetic statement,
+once over per-row Transaction records and once over the columnar TransactionTable, and
+checks both produce the same transactions and validation errors.
+
+Usage:
+    python benchmarks/bench_post_processing.py
+    python benchmarks/bench_post_processing.py --rows 20000 --repeat 5
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from parsers import Transaction, TransactionTable, get_parser  # noqa: E402
+
+MERCHANTS = ['TESCO STORES', 'AMAZON MARKETPLACE', 'TFL TRAVEL', 'SALARY ACME LTD', 'COSTA COFFEE', 'RENT']
+
+
+def synthetic_statement(rows: int, seed: int = 1):
+    """Raw parser output: sparse balances, a few duplicates and bad values"""
+    rnd = random.Random(seed)
+    balance = 1000.0
+    day = date(2023, 1, 1)
+    transactions = []
+    for index in range(rows):
+        if rnd.random() < 0.3:
+            day += timedelta(days=1)
+        amount = round(rnd.uniform(1, 250), 2)
+        is_credit = rnd.random() < 0.1
+        balance += amount if is_credit else -amount
+        transactions.append(Transaction(
+            date=day.isoformat(),
+            description=f"  {rnd.choice(MERCHANTS)} {rnd.randint(1, 40)} ",
+            debit=0.0 if is_credit else amount,
+            credit=amount if is_credit else 0.0,
+            balance=round(balance, 2) if rnd.random() < 0.4 else None,
+            type='income' if is_credit else 'expense',
+        ))
+        if rnd.random() < 0.01:
+            transactions.append(replace(transactions[-1]))
+    return transactions
+
+
+def record_pipeline(parser, transactions):
+    normalized = [parser.normalize_transaction(txn) for txn in transactions]
+    normalized = parser.calculate_missing_balances(normalized)
+    normalized = parser.deduplicate_transactions(normalized)
+    errors = parser.validate_running_balance(normalized)
+    return normalized, errors
+
+
+def table_pipeline(parser, transactions):
+    return table_core(parser, TransactionTable.from_transactions(transactions))
+
+
+def table_core(parser, table):
+    table = parser.calculate_missing_balances(table)
+    table = parser.deduplicate_transactions(table)
+    errors = parser.validate_running_balance(table)
+    return table, errors
+
+
+def best_ms(run, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    bank_parser = get_parser('monzo')
+    transactions = synthetic_statement(args.rows)
+
+    expected, expected_errors = record_pipeline(bank_parser, transactions)
+    table, errors = table_pipeline(bank_parser, transactions)
+    match = table.to_dicts() == [txn.to_dict() for txn in expected] and errors == expected_errors
+
+    record_ms = best_ms(lambda: record_pipeline(bank_parser, transactions), args.repeat)
+    build_ms = best_ms(lambda: TransactionTable.from_transactions(transactions), args.repeat)
+    built = TransactionTable.from_transactions(transactions)
+    core_ms = best_ms(lambda: table_core(bank_parser, built.take(range(len(built)))), args.repeat)
+    take_ms = best_ms(lambda: built.take(range(len(built))), args.repeat)
+    serialize_ms = best_ms(table.to_dicts, args.repeat)
+
+    print(f"{len(transactions)} rows, {len(expected)} after dedupe, {len(errors)} balance errors")
+    print(f"{'list of records (normalize+fill+dedupe+validate)':50} {record_ms:8.2f} ms")
+    print(f"{'table: build from records':50} {build_ms:8.2f} ms")
+    print(f"{'table: fill+dedupe+validate':50} {core_ms - take_ms:8.2f} ms")
+    print(f"{'table: to_dicts for the response':50} {serialize_ms:8.2f} ms")
+    print(f"results match: {'yes' if match else 'NO'}")
+    if not match:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: balance reconciliation, row-by-row vs vectorized.
+
+Fills missing balances and finds balance mismatches on synthetic statement
+columns of increasing length, once with the pure-Python loop and once with
+NumPy cumulative sums (when NumPy is installed), and checks both agree.
+
+Usage:
+    python benchmarks/bench_reconciliation.py
+    python benchmarks/bench_reconciliation.py --rows 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+from parsers import reconciliation  # noqa: E402
+from parsers.money import NO_BALANCE  # noqa: E402
+
+
+def synthetic_columns(rows: int, seed: int = 1):
+    """Debit, credit and sparse balance columns with occasional statement drift"""
+    rnd = random.Random(seed)
+    debits, credits, balances = [], [], []
+    balance = 250000
+    for _ in range(rows):
+        amount = rnd.randint(1, 50000)
+        credit, debit = (amount, 0) if rnd.random() < 0.15 else (0, amount)
+        balance = balance + credit - debit
+        if rnd.random() < 0.01:
+            balance += 2
+        debits.append(debit)
+        credits.append(credit)
+        balances.append(balance if rnd.random() < 0.3 else NO_BALANCE)
+    balances[0] = 250000
+    # array('q') pence columns, as TransactionTable keeps them
+    return array('q', debits), array('q', credits), array('q', balances)
+
+
+def best_ms(run, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def reconcile(columns):
+    filled, _ = reconciliation.fill_missing_balances(*columns)
+    return filled, reconciliation.balance_mismatches(*columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 5000, 50000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    has_numpy = reconciliation._get_numpy() is not None
+    default_min_rows = reconciliation.VECTORIZE_MIN_ROWS
+    print(f"{'rows':>8} {'loop ms':>9} {'vectorized ms':>14} mismatches agree")
+    all_agree = True
+    for rows in args.rows:
+        columns = synthetic_columns(rows)
+
+        reconciliation.VECTORIZE_MIN_ROWS = rows + 1
+        loop_ms = best_ms(lambda: reconcile(columns), args.repeat)
+        loop_filled, loop_mismatches = reconcile(columns)
+
+        if has_numpy:
+            reconciliation.VECTORIZE_MIN_ROWS = 0
+            vector_ms = best_ms(lambda: reconcile(columns), args.repeat)
+            vector_filled, vector_mismatches = reconcile(columns)
+            agree = tuple(vector_mismatches) == tuple(loop_mismatches) and vector_filled == loop_filled
+        else:
+            vector_ms, agree = float('nan'), True
+        all_agree = all_agree and agree
+
+        print(f"{rows:8} {loop_ms:9.2f} {vector_ms:14.2f} {len(loop_mismatches.indexes):10} "
+              f"{'yes' if agree else 'NO'}")
+
+    reconciliation.VECTORIZE_MIN_ROWS = default_min_rows
+    if not has_numpy:
+        print("NumPy not installed: only the loop was timed")
+    if not all_agree:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: per-request setup overhead of the converter and parsers.
+
+Compares building a converter and parser per request (what the handlers
+used to do) with reusing the warm process-wide instances from
+get_converter()/get_parser(). With statement PDFs given, it also converts
+them concurrently from several threads through the shared converter and
+checks the results match a serial run.
+
+Usage:
+    python benchmarks/bench_request_overhead.py
+    python benchmarks/bench_request_overhead.py --threads 4 statement1.pdf statement2.pdf
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+import converter as converter_module  # noqa: E402
+import parsers  # noqa: E402
+
+
+def per_request_us(setup, iterations: int) -> float:
+    """Mean microseconds per call of setup()"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        setup()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def fresh_setup(bank_id: str):
+    """New converter and parser, as each request used to build"""
+    converter_module.BankStatementConverter()
+    parsers.PARSER_REGISTRY[bank_id]()
+
+
+def warm_setup(bank_id: str):
+    """Shared converter and parser"""
+    converter_module.get_converter()
+    parsers.get_parser(bank_id)
+
+
+def check_threaded(pdf_paths, threads: int, rounds: int):
+    """Convert concurrently through the shared converter and compare with serial results"""
+    shared = converter_module.get_converter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = {path: shared.convert(path) for path in pdf_paths}
+        jobs = [path for _ in range(rounds) for path in pdf_paths]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(lambda path: (path, shared.convert(path)), jobs))
+        elapsed = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for path, result in results
+        if result['transactions'] != expected[path]['transactions']
+        or result['validation_errors'] != expected[path]['validation_errors']
+    )
+    print(f"\nthreaded: {len(jobs)} conversions on {threads} threads in {elapsed:.2f}s, "
+          f"{mismatches} mismatches against serial results")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='*', help='Statement PDFs for the threaded check')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=2, help='Conversions per PDF in the threaded check')
+    args = parser.parse_args()
+
+    has_warm = hasattr(converter_module, 'get_converter')
+    print(f"{'bank':12} {'fresh us/request':>17} {'warm us/request':>16}")
+    for bank_id in parsers.list_supported_banks():
+        fresh = per_request_us(lambda: fresh_setup(bank_id), args.iterations)
+        warm = per_request_us(lambda: warm_setup(bank_id), args.iterations) if has_warm else float('nan')
+        print(f"{bank_id:12} {fresh:17.1f} {warm:16.2f}")
+
+    if args.pdfs and has_warm and not check_threaded(args.pdfs, args.threads, args.rounds):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: table extraction with default vs learned table-settings order.
+
+For each statement, runs the parser's table extraction on a fresh session
+with an empty table tuner (settings tried in the parser's default order)
+and again with the tuner that first run trained, and reports the time and
+the number of pdfplumber table detections each needed. Transactions must
+match between the two runs.
+
+Usage:
+    python benchmarks/bench_table_tuning.py --bank tide statement.pdf
+    python benchmarks/bench_table_tuning.py --bank tide --repeat 5 a.pdf b.pdf
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+logging.disable(logging.CRITICAL)
+
+from parsers import PdfSession, TableSettingsTuner, get_parser, table_tuning  # noqa: E402
+
+# Parsers whose table extraction goes through the tuner (Monzo reads every
+# setting and keeps the union of their rows)
+TUNED_PARSERS = ('tide',)
+
+
+def run_tables(parser, path: str):
+    """(seconds, table detections, transactions) of one table extraction"""
+    with PdfSession(path) as session:
+        start = time.perf_counter()
+        transactions = parser._extract_from_tables(session)
+        elapsed = time.perf_counter() - start
+        detections = sum(len(page._tables) for page in session.pages)
+    return elapsed, detections, transactions
+
+
+def best_run(parser, path: str, repeat: int, tuner_factory):
+    """Fastest of `repeat` runs, each with the tuner tuner_factory() returns"""
+    best = None
+    for _ in range(repeat):
+        table_tuning._tuner = tuner_factory()
+        result = run_tables(parser, path)
+        if best is None or result[0] < best[0]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='+', help='Statement PDFs')
+    parser.add_argument('--bank', choices=TUNED_PARSERS, default='tide')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    bank_parser = get_parser(args.bank)
+
+    print(f"{'file':28} {'default ms':>11} {'tables':>7} {'learned ms':>11} {'tables':>7} {'speedup':>8} match")
+    for path in args.pdfs:
+        # Train a tuner on this document, as earlier conversions would have
+        trained = TableSettingsTuner()
+        table_tuning._tuner = trained
+        run_tables(bank_parser, path)
+        learned_wins = trained.stats()
+
+        def learned_tuner():
+            tuner = TableSettingsTuner()
+            tuner._wins = {key: dict(wins) for key, wins in learned_wins.items()}
+            return tuner
+
+        cold_s, cold_tables, cold_txns = best_run(bank_parser, path, args.repeat, TableSettingsTuner)
+        warm_s, warm_tables, warm_txns = best_run(bank_parser, path, args.repeat, learned_tuner)
+        print(f"{os.path.basename(path):28} {cold_s * 1000:11.1f} {cold_tables:7} {warm_s * 1000:11.1f} "
+              f"{warm_tables:7} {cold_s / warm_s:7.2f}x {cold_txns == warm_txns}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: memory held by parsed transactions, dicts vs Transaction records.
+
+Builds the same synthetic statement as per-row dicts (what parsers used to
+emit, and what normalize_transaction used to build again) and as slotted
+Transaction records, and reports the memory each list holds, measured with
+tracemalloc.
+
+Usage:
+    python benchmarks/bench_transaction_memory.py
+    python benchmarks/bench_transaction_memory.py --rows 10000 100000 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from datetime import date, timedelta
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+from parsers import Transaction  # noqa: E402
+
+MERCHANTS = ['TESCO STORES', 'AMAZON MARKETPLACE', 'TFL TRAVEL', 'SALARY ACME LTD', 'COSTA COFFEE', 'RENT']
+
+
+def synthetic_rows(rows: int, seed: int = 1):
+    """Field values for each row (shared by both layouts, so only the containers differ)"""
+    rnd = random.Random(seed)
+    day = date(2023, 1, 1)
+    dates = {}
+    balance = 1000.0
+    values = []
+    for _ in range(rows):
+        if rnd.random() < 0.3:
+            day += timedelta(days=1)
+        amount = round(rnd.uniform(1, 250), 2)
+        is_credit = rnd.random() < 0.1
+        balance += amount if is_credit else -amount
+        iso = dates.setdefault(day, day.isoformat())
+        values.append((
+            iso,
+            f"{rnd.choice(MERCHANTS)} {rnd.randint(1, 40)}",
+            0.0 if is_credit else amount,
+            amount if is_credit else 0.0,
+            round(balance, 2) if rnd.random() < 0.4 else None,
+            'income' if is_credit else 'expense',
+        ))
+    return values
+
+
+def as_dicts(values):
+    return [
+        {'date': d, 'description': desc, 'debit': debit, 'credit': credit,
+         'balance': balance, 'type': txn_type, 'amount': credit or debit}
+        for d, desc, debit, credit, balance, txn_type in values
+    ]
+
+
+def as_records(values):
+    return [
+        Transaction(date=d, description=desc, debit=debit, credit=credit,
+                    balance=balance, type=txn_type, amount=credit or debit)
+        for d, desc, debit, credit, balance, txn_type in values
+    ]
+
+
+def held_bytes(build, values) -> int:
+    """Bytes still allocated by build(values) while its result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(values)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'dicts MB':>10} {'records MB':>11} {'saved':>7} {'bytes/row':>15}")
+    for rows in args.rows:
+        values = synthetic_rows(rows)
+        dict_bytes = held_bytes(as_dicts, values)
+        record_bytes = held_bytes(as_records, values)
+        saved = 1 - record_bytes / dict_bytes
+        print(f"{rows:8} {dict_bytes / 1e6:10.2f} {record_bytes / 1e6:11.2f} {saved:7.0%} "
+              f"{dict_bytes // rows:7} -> {record_bytes // rows}")
+
+
+if __name__ == '__main__':
+    main()
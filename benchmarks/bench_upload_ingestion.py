@@ -0,0 +1,152 @@
+"""
+Benchmark: upload ingestion in api/convert.py, before and after in-place multipart parsing.
+
+Compares the previous handler path (read body, split it on the boundary,
+rstrip the part, write a temp file, convert from disk) with the current one
+(read body into one buffer, view the file part in place, convert from
+memory). Each mode runs in a fresh process so peak RSS is not shared.
+
+Scenarios:
+    ingest   Request parsing only, with a synthetic upload of --size-mb
+    convert  Full conversion of the given statement PDF
+
+Usage:
+    python benchmarks/bench_upload_ingestion.py statement.pdf
+    python benchmarks/bench_upload_ingestion.py statement.pdf --size-mb 10 --iterations 5
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+BOUNDARY = '----BenchmarkBoundary7MA4YWxkTrZu0gW'
+
+
+def build_request(file_data: bytes):
+    """Multipart body as a browser would send it, plus its Content-Type"""
+    head = (
+        f'--{BOUNDARY}\r\n'
+        'Content-Disposition: form-data; name="file"; filename="statement.pdf"\r\n'
+        'Content-Type: application/pdf\r\n\r\n'
+    ).encode()
+    tail = f'\r\n--{BOUNDARY}--\r\n'.encode()
+    return head + file_data + tail, f'multipart/form-data; boundary={BOUNDARY}'
+
+
+def legacy_ingest(rfile, content_length, content_type):
+    """Previous handler: returns (temp_path, temp_dir) of the uploaded file"""
+    body = rfile.read(content_length)
+    boundary_bytes = ('--' + content_type.split('boundary=')[1]).encode()
+    file_data = None
+    for section in body.split(boundary_bytes)[1:-1]:
+        header_end = section.find(b'\r\n\r\n')
+        if header_end == -1:
+            continue
+        headers_raw = section[:header_end].decode('utf-8', errors='ignore')
+        if 'filename=' in headers_raw:
+            file_data = section[header_end + 4:].rstrip(b'\r\n--')
+            break
+
+    temp_dir = tempfile.mkdtemp()
+    temp_path = os.path.join(temp_dir, 'statement.pdf')
+    with open(temp_path, 'wb') as f:
+        f.write(file_data)
+    return temp_path, temp_dir
+
+
+def inplace_ingest(rfile, content_length, content_type):
+    """Current handler: returns a reader over the file part of the body"""
+    from multipart import BufferReader, find_file_part, parse_boundary, read_body
+
+    body = read_body(rfile, content_length)
+    upload = find_file_part(body, parse_boundary(content_type))
+    return BufferReader(upload.data)
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process (KB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_worker(mode: str, scenario: str, pdf_path: str, size_mb: float, iterations: int) -> dict:
+    """Run one mode/scenario in this process and measure it"""
+    if scenario == 'ingest':
+        file_data = os.urandom(int(size_mb * 1024 * 1024))
+    else:
+        with open(pdf_path, 'rb') as f:
+            file_data = f.read()
+        import logging
+        logging.disable(logging.CRITICAL)
+        from converter import BankStatementConverter
+        converter = BankStatementConverter()
+
+    body, content_type = build_request(file_data)
+    del file_data
+    baseline_kb = peak_rss_kb()
+
+    timings = []
+    for _ in range(iterations):
+        rfile = io.BufferedReader(io.BytesIO(body))
+        start = time.perf_counter()
+
+        if mode == 'legacy':
+            temp_path, temp_dir = legacy_ingest(rfile, len(body), content_type)
+            if scenario == 'convert':
+                converter.convert(temp_path)
+            os.remove(temp_path)
+            os.rmdir(temp_dir)
+        else:
+            reader = inplace_ingest(rfile, len(body), content_type)
+            if scenario == 'convert':
+                converter.convert(reader)
+            del reader
+
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'mode': mode,
+        'scenario': scenario,
+        'best_ms': min(timings) * 1000,
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'peak_rss_delta_mb': (peak_rss_kb() - baseline_kb) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdf', help='Statement PDF for the convert scenario')
+    parser.add_argument('--size-mb', type=float, default=10.0, help='Upload size for the ingest scenario')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'SCENARIO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, scenario = args.worker
+        print(json.dumps(run_worker(mode, scenario, args.pdf, args.size_mb, args.iterations)))
+        return
+
+    print(f"{'scenario':10} {'mode':8} {'best ms':>10} {'mean ms':>10} {'peak RSS +MB':>13}")
+    for scenario in ('ingest', 'convert'):
+        for mode in ('legacy', 'inplace'):
+            output = subprocess.run(
+                [sys.executable, __file__, args.pdf, '--size-mb', str(args.size_mb),
+                 '--iterations', str(args.iterations), '--worker', mode, scenario],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{scenario:10} {mode:8} {result['best_ms']:10.1f} {result['mean_ms']:10.1f} "
+                  f"{result['peak_rss_delta_mb']:13.1f}")
+
+
+if __name__ == '__main__':
+    main()
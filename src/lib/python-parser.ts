@@ -20,6 +20,13 @@ export interface PythonParserResult {
   validation_errors: string[];
   validation_warnings: string[];
   accuracy_score: number;
+  metadata?: {
+    pages: number;
+    transaction_pages: number;
+    summary_pages: number;
+    skipped_pages: number;
+    skipped_page_ratio: number;
+  };
   error?: string;
 }
 